@@ -3,6 +3,7 @@
 Database Manager for PGP_BATCHPROCESSOR_v1 (Batch Payout Processor Service).
 Handles database connections and operations for payout_batches and payout_accumulation tables.
 """
+import os
 from decimal import Decimal
 from typing import List, Dict, Optional
 from PGP_COMMON.database import BaseDatabaseManager
@@ -37,13 +38,24 @@ class DatabaseManager(BaseDatabaseManager):
         return self.get_connection()
 
 
-    def find_clients_over_threshold(self) -> List[Dict]:
+    def find_clients_over_threshold(self, debug: Optional[bool] = None) -> List[Dict]:
         """
         Find clients with accumulated USDT >= threshold.
 
+        A single aggregated query returns, per client, the converted USDT total,
+        the payment count and the summed ACTUAL ETH (same rows as
+        get_accumulated_actual_eth()), so callers need no per-client follow-up query.
+
+        Args:
+            debug: Log full-table diagnostics before the main query
+                   (default: BATCH_THRESHOLD_DEBUG environment variable)
+
         Returns:
             List of client data dictionaries
         """
+        if debug is None:
+            debug = (os.getenv('BATCH_THRESHOLD_DEBUG') or '').strip().lower() in ('1', 'true', 'yes')
+
         conn = None
         try:
             conn = self.get_connection()
@@ -54,62 +66,50 @@ class DatabaseManager(BaseDatabaseManager):
             cur = conn.cursor()
             print(f"🔍 [DATABASE] Searching for clients over threshold")
 
-            # Debug: Check total unpaid records
-            cur.execute("SELECT COUNT(*) FROM payout_accumulation WHERE is_paid_out = FALSE")
-            unpaid_count = cur.fetchone()[0]
-            print(f"🔍 [DATABASE DEBUG] Total unpaid accumulation records: {unpaid_count}")
-
-            # Debug: Check if JOIN works
-            cur.execute("""
-                SELECT COUNT(*)
-                FROM payout_accumulation pa
-                JOIN main_clients_database mc ON pa.client_id = mc.closed_channel_id
-                WHERE pa.is_paid_out = FALSE
-            """)
-            join_count = cur.fetchone()[0]
-            print(f"🔍 [DATABASE DEBUG] Records after JOIN: {join_count}")
-
-            # Debug: Show aggregated values before HAVING
-            cur.execute("""
-                SELECT
-                    pa.client_id,
-                    SUM(pa.accumulated_amount_usdt) as total_usdt,
-                    COUNT(*) as payment_count,
-                    mc.payout_threshold_usd as threshold
-                FROM payout_accumulation pa
-                JOIN main_clients_database mc ON pa.client_id = mc.closed_channel_id
-                WHERE pa.is_paid_out = FALSE
-                GROUP BY pa.client_id, mc.payout_threshold_usd
-            """)
-            agg_results = cur.fetchall()
-            print(f"🔍 [DATABASE DEBUG] Aggregated clients (before HAVING): {len(agg_results)}")
-            for row in agg_results:
-                is_over = row[1] >= row[3] if row[3] is not None else False
-                print(f"🔍 [DATABASE DEBUG]   Client {row[0]}: ${row[1]} / ${row[3]} (over: {is_over})")
-
-            # Main query with HAVING clause
+            if debug:
+                self._log_threshold_diagnostics(cur)
+
             # CRITICAL FIX: Added is_conversion_complete = TRUE check to prevent race condition
             # This ensures we only process payments that have been converted to USDT
+            # The eligible CTE is served by idx_payout_accumulation_unpaid_converted (migration 006)
             cur.execute(
-                """SELECT
-                    pa.client_id,
-                    pa.client_wallet_address,
-                    pa.client_payout_currency,
-                    pa.client_payout_network,
-                    SUM(pa.accumulated_amount_usdt) as total_usdt,
-                    COUNT(*) as payment_count,
-                    mc.payout_threshold_usd as threshold
-                FROM payout_accumulation pa
-                JOIN main_clients_database mc ON pa.client_id = mc.closed_channel_id
-                WHERE pa.is_paid_out = FALSE
-                  AND pa.is_conversion_complete = TRUE
-                GROUP BY
-                    pa.client_id,
-                    pa.client_wallet_address,
-                    pa.client_payout_currency,
-                    pa.client_payout_network,
-                    mc.payout_threshold_usd
-                HAVING SUM(pa.accumulated_amount_usdt) >= mc.payout_threshold_usd"""
+                """WITH eligible AS (
+                    SELECT
+                        pa.client_id,
+                        pa.client_wallet_address,
+                        pa.client_payout_currency,
+                        pa.client_payout_network,
+                        SUM(pa.accumulated_amount_usdt) as total_usdt,
+                        COUNT(*) as payment_count,
+                        mc.payout_threshold_usd as threshold
+                    FROM payout_accumulation pa
+                    JOIN main_clients_database mc ON pa.client_id = mc.closed_channel_id
+                    WHERE pa.is_paid_out = FALSE
+                      AND pa.is_conversion_complete = TRUE
+                    GROUP BY
+                        pa.client_id,
+                        pa.client_wallet_address,
+                        pa.client_payout_currency,
+                        pa.client_payout_network,
+                        mc.payout_threshold_usd
+                    HAVING SUM(pa.accumulated_amount_usdt) >= mc.payout_threshold_usd
+                )
+                SELECT
+                    e.client_id,
+                    e.client_wallet_address,
+                    e.client_payout_currency,
+                    e.client_payout_network,
+                    e.total_usdt,
+                    e.payment_count,
+                    e.threshold,
+                    COALESCE((
+                        SELECT SUM(CAST(p.nowpayments_outcome_amount AS NUMERIC))
+                        FROM payout_accumulation p
+                        WHERE p.client_id = e.client_id
+                          AND p.is_paid_out = FALSE
+                          AND p.nowpayments_outcome_amount IS NOT NULL
+                    ), 0) as actual_eth_total
+                FROM eligible e"""
             )
 
             results = []
@@ -121,7 +121,8 @@ class DatabaseManager(BaseDatabaseManager):
                     'payout_network': row[3],
                     'total_usdt': Decimal(str(row[4])),
                     'payment_count': row[5],
-                    'threshold': Decimal(str(row[6]))
+                    'threshold': Decimal(str(row[6])),
+                    'actual_eth_total': float(row[7]) if row[7] else 0.0
                 })
 
             cur.close()
@@ -136,6 +137,46 @@ class DatabaseManager(BaseDatabaseManager):
             if conn:
                 conn.close()
 
+    def _log_threshold_diagnostics(self, cur) -> None:
+        """
+        Print full-table threshold diagnostics (opt-in, scans payout_accumulation).
+
+        Args:
+            cur: Open database cursor
+        """
+        # Debug: Check total unpaid records
+        cur.execute("SELECT COUNT(*) FROM payout_accumulation WHERE is_paid_out = FALSE")
+        unpaid_count = cur.fetchone()[0]
+        print(f"🔍 [DATABASE DEBUG] Total unpaid accumulation records: {unpaid_count}")
+
+        # Debug: Check if JOIN works
+        cur.execute("""
+            SELECT COUNT(*)
+            FROM payout_accumulation pa
+            JOIN main_clients_database mc ON pa.client_id = mc.closed_channel_id
+            WHERE pa.is_paid_out = FALSE
+        """)
+        join_count = cur.fetchone()[0]
+        print(f"🔍 [DATABASE DEBUG] Records after JOIN: {join_count}")
+
+        # Debug: Show aggregated values before HAVING
+        cur.execute("""
+            SELECT
+                pa.client_id,
+                SUM(pa.accumulated_amount_usdt) as total_usdt,
+                COUNT(*) as payment_count,
+                mc.payout_threshold_usd as threshold
+            FROM payout_accumulation pa
+            JOIN main_clients_database mc ON pa.client_id = mc.closed_channel_id
+            WHERE pa.is_paid_out = FALSE
+            GROUP BY pa.client_id, mc.payout_threshold_usd
+        """)
+        agg_results = cur.fetchall()
+        print(f"🔍 [DATABASE DEBUG] Aggregated clients (before HAVING): {len(agg_results)}")
+        for row in agg_results:
+            is_over = row[1] >= row[3] if row[3] is not None else False
+            print(f"🔍 [DATABASE DEBUG]   Client {row[0]}: ${row[1]} / ${row[3]} (over: {is_over})")
+
     def create_payout_batch(
         self,
         batch_id: str,
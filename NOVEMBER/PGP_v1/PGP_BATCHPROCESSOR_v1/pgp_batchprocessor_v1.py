@@ -67,11 +67,11 @@ def process_batches():
 
     Flow:
     1. Query payout_accumulation for clients >= threshold
-    2. For each client:
-       a. Create batch record
-       b. Enqueue to PGP_SPLIT1_v1 for USDT→XMR swap
-       c. Mark accumulations as paid_out after batch creation
-    3. Return summary
+    2. For each client: create batch record and encrypt batch token
+    3. Enqueue all batches to PGP_SPLIT1_v1 in one bulk call (concurrent fan-out)
+    4. Mark accumulations as paid_out for every enqueued batch
+       (batches whose task could not be enqueued are marked failed)
+    5. Return summary
 
     Returns:
         JSON response with processing summary
@@ -99,10 +99,18 @@ def process_batches():
 
         logger.debug(f"📊 [ENDPOINT] Found {len(clients_over_threshold)} client(s) ready for payout")
 
+        pgp_split1_queue = config.get('pgp_split1_batch_queue')
+        pgp_split1_url = config.get('pgp_split1_url')
+
+        if not pgp_split1_queue or not pgp_split1_url:
+            logger.error(f"❌ [ENDPOINT] PGP_SPLIT1_v1 configuration missing")
+            abort(500, "PGP_SPLIT1_v1 configuration missing")
+
         batches_created = []
         errors = []
+        prepared_batches = []
 
-        # Process each client
+        # Phase 1: create batch records and tokens for each client
         for client_data in clients_over_threshold:
             try:
                 client_id = client_data['client_id']
@@ -118,8 +126,9 @@ def process_batches():
                 logger.debug(f"📊 [ENDPOINT] Payment count: {payment_count}")
                 logger.info(f"🎯 [ENDPOINT] Target: {payout_currency.upper()} on {payout_network.upper()}")
 
-                # Get summed ACTUAL ETH for this client (for PGP_HOSTPAY1_v1 payment)
-                actual_eth_total = db_manager.get_accumulated_actual_eth(client_id)
+                # Summed ACTUAL ETH for this client (for PGP_HOSTPAY1_v1 payment),
+                # returned by the same aggregated threshold query
+                actual_eth_total = client_data['actual_eth_total']
                 logger.info(f"💎 [ENDPOINT] ACTUAL ETH accumulated: {actual_eth_total} ETH")
 
                 if actual_eth_total <= 0:
@@ -166,35 +175,47 @@ def process_batches():
                     errors.append(f"Client {client_id}: token encryption failed")
                     continue
 
-                # Enqueue to PGP_SPLIT1_v1 for batch payout
-                pgp_split1_queue = config.get('pgp_split1_batch_queue')
-                pgp_split1_url = config.get('pgp_split1_url')
-
-                if not pgp_split1_queue or not pgp_split1_url:
-                    logger.error(f"❌ [ENDPOINT] PGP_SPLIT1_v1 configuration missing")
-                    db_manager.update_batch_status(batch_id, 'failed')
-                    errors.append(f"Client {client_id}: PGP_SPLIT1_v1 config missing")
-                    continue
+                prepared_batches.append({
+                    'batch_id': batch_id,
+                    'client_id': client_id,
+                    'total_usdt': total_usdt,
+                    'payment_count': payment_count,
+                    'token': batch_token
+                })
 
-                logger.info(f"🚀 [ENDPOINT] Enqueueing to PGP_SPLIT1_v1")
+            except Exception as e:
+                logger.error(f"❌ [ENDPOINT] Error processing client {client_data.get('client_id', 'unknown')}: {e}", exc_info=True)
+                errors.append(f"Client {client_data.get('client_id', 'unknown')}: {str(e)}")
+                continue
 
-                task_payload = {
-                    'token': batch_token,
-                    'batch_mode': True
+        # Phase 2: enqueue every prepared batch to PGP_SPLIT1_v1 concurrently
+        task_results = []
+        if prepared_batches:
+            logger.info(f"🚀 [ENDPOINT] Enqueueing {len(prepared_batches)} batch(es) to PGP_SPLIT1_v1")
+            task_results = cloudtasks_client.create_tasks_bulk([
+                {
+                    'queue_name': pgp_split1_queue,
+                    'target_url': f"{pgp_split1_url}/batch-payout",
+                    'payload': {
+                        'token': batch['token'],
+                        'batch_mode': True
+                    }
                 }
+                for batch in prepared_batches
+            ])
 
-                task_name = cloudtasks_client.create_task(
-                    queue_name=pgp_split1_queue,
-                    target_url=f"{pgp_split1_url}/batch-payout",
-                    payload=task_payload
-                )
-
-                if not task_name:
-                    logger.error(f"❌ [ENDPOINT] Failed to enqueue task for batch {batch_id}")
+        # Phase 3: mark accumulations paid for enqueued batches, fail the rest
+        for batch, result in zip(prepared_batches, task_results):
+            batch_id = batch['batch_id']
+            client_id = batch['client_id']
+            try:
+                if not result['success']:
+                    logger.error(f"❌ [ENDPOINT] Failed to enqueue task for batch {batch_id}: {result['error']}")
                     db_manager.update_batch_status(batch_id, 'failed')
                     errors.append(f"Client {client_id}: task enqueue failed")
                     continue
 
+                task_name = result['task_name']
                 logger.info(f"✅ [ENDPOINT] Task enqueued successfully: {task_name}")
 
                 # Mark accumulations as paid
@@ -204,16 +225,16 @@ def process_batches():
                 batches_created.append({
                     'batch_id': batch_id,
                     'client_id': client_id,
-                    'total_usdt': str(total_usdt),
-                    'payment_count': payment_count,
+                    'total_usdt': str(batch['total_usdt']),
+                    'payment_count': batch['payment_count'],
                     'task_name': task_name
                 })
 
                 logger.info(f"🎉 [ENDPOINT] Batch {batch_id} processed successfully")
 
             except Exception as e:
-                logger.error(f"❌ [ENDPOINT] Error processing client {client_data.get('client_id', 'unknown')}: {e}", exc_info=True)
-                errors.append(f"Client {client_data.get('client_id', 'unknown')}: {str(e)}")
+                logger.error(f"❌ [ENDPOINT] Error finalizing batch {batch_id} for client {client_id}: {e}", exc_info=True)
+                errors.append(f"Client {client_id}: {str(e)}")
                 continue
 
         logger.info(f"🎉 [ENDPOINT] Batch processing completed")
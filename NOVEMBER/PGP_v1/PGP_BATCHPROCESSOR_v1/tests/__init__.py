@@ -0,0 +1,3 @@
+"""
+Tests for PGP_BATCHPROCESSOR_v1 application.
+"""
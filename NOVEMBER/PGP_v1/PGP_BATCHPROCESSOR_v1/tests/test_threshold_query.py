@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+"""
+Unit tests for the batched threshold query.
+
+Tests verify that find_clients_over_threshold() returns the same clients,
+USDT totals, payment counts and ACTUAL ETH totals as the per-client check it
+replaced (one threshold query plus get_accumulated_actual_eth() per client),
+including clients exactly at their threshold, clients just under it, and
+clients with no unpaid or no converted rows.
+
+The queries run against an in-memory SQLite database holding the columns
+they read.
+"""
+import os
+import sqlite3
+import sys
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database_manager import DatabaseManager
+
+SCHEMA = """
+CREATE TABLE main_clients_database (
+    closed_channel_id TEXT PRIMARY KEY,
+    payout_threshold_usd NUMERIC
+);
+CREATE TABLE payout_accumulation (
+    id INTEGER PRIMARY KEY,
+    client_id TEXT NOT NULL,
+    accumulated_amount_usdt NUMERIC NOT NULL,
+    client_wallet_address TEXT NOT NULL,
+    client_payout_currency TEXT NOT NULL,
+    client_payout_network TEXT NOT NULL,
+    is_paid_out BOOLEAN DEFAULT FALSE,
+    is_conversion_complete BOOLEAN DEFAULT FALSE,
+    nowpayments_outcome_amount NUMERIC
+);
+"""
+
+CLIENTS = [
+    ('-100over', 50),       # Over threshold
+    ('-100exact', 50),      # Exactly at threshold
+    ('-100under', 50),      # Just under threshold
+    ('-100unpaid', 10),     # Only paid-out rows
+    ('-100empty', 10),      # No rows at all
+    ('-100pending', 10)     # Unpaid but not yet converted
+]
+
+# client_id, usdt, is_paid_out, is_conversion_complete, outcome ETH
+ROWS = [
+    ('-100over', 40.0, False, True, '0.0125'),
+    ('-100over', 30.0, False, True, None),
+    ('-100over', 99.0, True, True, '0.5'),
+    ('-100over', 5.0, False, False, '0.002'),
+    ('-100exact', 25.5, False, True, '0.01'),
+    ('-100exact', 24.5, False, True, '0.0075'),
+    ('-100under', 49.5, False, True, '0.02'),
+    ('-100unpaid', 80.0, True, True, '0.03'),
+    ('-100pending', 20.0, False, False, '0.004')
+]
+
+
+class SqliteConnection:
+    """DB-API connection double translating psycopg placeholders for SQLite."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def cursor(self):
+        return SqliteCursor(self.conn.cursor())
+
+    def close(self):
+        pass
+
+
+class SqliteCursor:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def execute(self, sql, params=()):
+        self.cursor.execute(sql.replace('%s', '?'), params)
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def close(self):
+        self.cursor.close()
+
+
+def make_manager():
+    """DatabaseManager backed by a seeded in-memory SQLite database."""
+    conn = sqlite3.connect(':memory:')
+    conn.executescript(SCHEMA)
+    conn.executemany("INSERT INTO main_clients_database VALUES (?, ?)", CLIENTS)
+    conn.executemany(
+        """INSERT INTO payout_accumulation (
+               client_id, accumulated_amount_usdt, client_wallet_address,
+               client_payout_currency, client_payout_network,
+               is_paid_out, is_conversion_complete, nowpayments_outcome_amount
+           ) VALUES (?, ?, '0xwallet', 'usdt', 'eth', ?, ?, ?)""",
+        [(client_id, usdt, paid, converted, eth) for client_id, usdt, paid, converted, eth in ROWS]
+    )
+
+    manager = DatabaseManager.__new__(DatabaseManager)
+    manager.get_connection = Mock(side_effect=lambda: SqliteConnection(conn))
+    return manager, conn
+
+
+def per_client_check(manager, conn):
+    """The pre-batching flow: one threshold query, then one ETH query per client."""
+    cur = conn.cursor()
+    cur.execute(
+        """SELECT
+               pa.client_id,
+               pa.client_wallet_address,
+               pa.client_payout_currency,
+               pa.client_payout_network,
+               SUM(pa.accumulated_amount_usdt) as total_usdt,
+               COUNT(*) as payment_count,
+               mc.payout_threshold_usd as threshold
+           FROM payout_accumulation pa
+           JOIN main_clients_database mc ON pa.client_id = mc.closed_channel_id
+           WHERE pa.is_paid_out = FALSE
+             AND pa.is_conversion_complete = TRUE
+           GROUP BY
+               pa.client_id,
+               pa.client_wallet_address,
+               pa.client_payout_currency,
+               pa.client_payout_network,
+               mc.payout_threshold_usd
+           HAVING SUM(pa.accumulated_amount_usdt) >= mc.payout_threshold_usd"""
+    )
+    return [{
+        'client_id': row[0],
+        'wallet_address': row[1],
+        'payout_currency': row[2],
+        'payout_network': row[3],
+        'total_usdt': Decimal(str(row[4])),
+        'payment_count': row[5],
+        'threshold': Decimal(str(row[6])),
+        'actual_eth_total': manager.get_accumulated_actual_eth(row[0])
+    } for row in cur.fetchall()]
+
+
+def by_client(results):
+    return {result['client_id']: result for result in results}
+
+
+class TestFindClientsOverThreshold(unittest.TestCase):
+    """Test suite for find_clients_over_threshold()."""
+
+    def setUp(self):
+        self.manager, self.conn = make_manager()
+
+    def test_matches_per_client_check(self):
+        batched = by_client(self.manager.find_clients_over_threshold(debug=False))
+        expected = by_client(per_client_check(self.manager, self.conn))
+
+        self.assertEqual(set(batched), {'-100over', '-100exact'})
+        self.assertEqual(set(batched), set(expected))
+        for client_id, result in batched.items():
+            self.assertEqual(result.keys(), expected[client_id].keys())
+            for key, value in result.items():
+                if key == 'actual_eth_total':
+                    self.assertAlmostEqual(value, expected[client_id][key], places=12)
+                else:
+                    self.assertEqual(value, expected[client_id][key], f"{client_id}.{key}")
+
+    def test_client_at_threshold_is_included(self):
+        exact = by_client(self.manager.find_clients_over_threshold(debug=False))['-100exact']
+
+        self.assertEqual(exact['total_usdt'], exact['threshold'])
+        self.assertEqual(exact['payment_count'], 2)
+        self.assertAlmostEqual(exact['actual_eth_total'], 0.0175, places=12)
+
+    def test_eth_total_covers_all_unpaid_rows(self):
+        over = by_client(self.manager.find_clients_over_threshold(debug=False))['-100over']
+
+        # Unconverted unpaid ETH counts (as in get_accumulated_actual_eth), paid-out ETH does not
+        self.assertEqual(over['total_usdt'], Decimal('70.0'))
+        self.assertEqual(over['payment_count'], 2)
+        self.assertAlmostEqual(over['actual_eth_total'], 0.0145, places=12)
+
+    def test_clients_without_unpaid_converted_rows_are_excluded(self):
+        results = by_client(self.manager.find_clients_over_threshold(debug=False))
+
+        for client_id in ('-100under', '-100unpaid', '-100empty', '-100pending'):
+            self.assertNotIn(client_id, results)
+        self.assertEqual(self.manager.get_accumulated_actual_eth('-100empty'), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,15 +2,31 @@
 """
 BroadcastExecutor - Executes broadcast operations
 Sends subscription and donation messages to Telegram channels
+
+Broadcasts in a batch run concurrently on one asyncio event loop (pooled
+HTTP connections via TelegramClient's async API). Telegram's global and
+per-chat limits are enforced by TelegramRateLimiter; database writes run on
+a small thread pool so they never block the event loop. A batch is tracked
+through BroadcastTracker.buffered(), so status writes are bulk statements.
+
+Configuration (environment variables):
+    BROADCAST_MAX_CONCURRENCY  Broadcasts executed at the same time (default: 20)
+    BROADCAST_DB_WORKERS       Threads for tracker database writes (default: 8)
 """
 
+import os
+import asyncio
 import logging
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from telegram_client import TelegramClient
 from broadcast_tracker import BroadcastTracker
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_CONCURRENCY = 20
+DEFAULT_DB_WORKERS = 8  # Below the DatabaseManager pool limit (5 + 10 overflow)
+
 
 class BroadcastExecutor:
     """
@@ -19,6 +35,7 @@ class BroadcastExecutor:
     Responsibilities:
     - Send subscription tier messages to open channels
     - Send donation messages to closed channels
+    - Run many broadcasts concurrently within Telegram's rate limits
     - Handle Telegram API errors gracefully
     - Update broadcast status via BroadcastTracker
     """
@@ -26,7 +43,8 @@ class BroadcastExecutor:
     def __init__(
         self,
         telegram_client: TelegramClient,
-        broadcast_tracker: BroadcastTracker
+        broadcast_tracker: BroadcastTracker,
+        max_concurrency: Optional[int] = None
     ):
         """
         Initialize the BroadcastExecutor.
@@ -34,15 +52,58 @@ class BroadcastExecutor:
         Args:
             telegram_client: TelegramClient instance for sending messages
             broadcast_tracker: BroadcastTracker instance for updating status
+            max_concurrency: Broadcasts executed at the same time
+                             (default: BROADCAST_MAX_CONCURRENCY or 20)
         """
         self.telegram = telegram_client
         self.tracker = broadcast_tracker
         self.logger = logging.getLogger(__name__)
 
+        self.max_concurrency = max(1, max_concurrency or int(
+            os.getenv('BROADCAST_MAX_CONCURRENCY') or DEFAULT_MAX_CONCURRENCY
+        ))
+        self._db_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('BROADCAST_DB_WORKERS') or DEFAULT_DB_WORKERS),
+            thread_name_prefix="broadcast-db"
+        )
+
+    async def _db(self, func, *args, **kwargs):
+        """Run a blocking tracker call on the database thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_executor, lambda: func(*args, **kwargs))
+
+    def _run(self, coro):
+        """Run a coroutine on a fresh event loop and release its HTTP connections."""
+        async def runner():
+            try:
+                return await coro
+            finally:
+                await self.telegram.aclose()
+
+        return asyncio.run(runner())
+
     def execute_broadcast(self, broadcast_entry: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute a single broadcast operation.
 
+        Synchronous entry point for _execute_broadcast_async().
+
+        Args:
+            broadcast_entry: Broadcast entry from get_due_broadcasts()
+
+        Returns:
+            Same result dictionary as _execute_broadcast_async()
+        """
+        return self._run(self._execute_broadcast_async(broadcast_entry))
+
+    async def _execute_broadcast_async(
+        self,
+        broadcast_entry: Dict[str, Any],
+        tracker=None
+    ) -> Dict[str, Any]:
+        """
+        Execute a single broadcast operation.
+
         NEW BEHAVIOR:
         1. Delete old open channel message (if exists)
         2. Send new subscription message to open channel
@@ -52,6 +113,7 @@ class BroadcastExecutor:
 
         Args:
             broadcast_entry: Broadcast entry from get_due_broadcasts()
+            tracker: BroadcastTracker or BufferedBroadcastTracker (default: self.tracker)
 
         Returns:
             {
@@ -63,6 +125,7 @@ class BroadcastExecutor:
                 'new_closed_message_id': int or None
             }
         """
+        tracker = tracker or self.tracker
         broadcast_id = broadcast_entry['id']
         open_channel_id = broadcast_entry['open_channel_id']
         closed_channel_id = broadcast_entry['closed_channel_id']
@@ -73,9 +136,6 @@ class BroadcastExecutor:
 
         self.logger.info(f"🚀 Executing broadcast {str(broadcast_id)[:8]}...")
 
-        # Mark as in-progress
-        self.tracker.update_status(broadcast_id, 'in_progress')
-
         errors = []
         open_sent = False
         closed_sent = False
@@ -83,12 +143,15 @@ class BroadcastExecutor:
         new_closed_msg_id = None
 
         try:
+            # Mark as in-progress
+            await self._db(tracker.update_status, broadcast_id, 'in_progress')
+
             # STEP 1: Delete old open channel message (if exists)
             if old_open_msg_id:
                 self.logger.info(
                     f"🗑️ Deleting old open message {old_open_msg_id} from {open_channel_id}"
                 )
-                delete_result = self.telegram.delete_message(
+                delete_result = await self.telegram.delete_message_async(
                     open_channel_id,
                     old_open_msg_id
                 )
@@ -100,7 +163,7 @@ class BroadcastExecutor:
 
             # STEP 2: Send new subscription message to open channel
             self.logger.info(f"📤 Sending to open channel: {open_channel_id}")
-            open_result = self._send_subscription_message(broadcast_entry)
+            open_result = await self._send_subscription_message(broadcast_entry)
             open_sent = open_result['success']
             new_open_msg_id = open_result.get('message_id')
 
@@ -114,7 +177,7 @@ class BroadcastExecutor:
                 self.logger.info(
                     f"🗑️ Deleting old closed message {old_closed_msg_id} from {closed_channel_id}"
                 )
-                delete_result = self.telegram.delete_message(
+                delete_result = await self.telegram.delete_message_async(
                     closed_channel_id,
                     old_closed_msg_id
                 )
@@ -126,7 +189,7 @@ class BroadcastExecutor:
 
             # STEP 4: Send new donation message to closed channel
             self.logger.info(f"📤 Sending to closed channel: {closed_channel_id}")
-            closed_result = self._send_donation_message(broadcast_entry)
+            closed_result = await self._send_donation_message(broadcast_entry)
             closed_sent = closed_result['success']
             new_closed_msg_id = closed_result.get('message_id')
 
@@ -137,7 +200,8 @@ class BroadcastExecutor:
 
             # STEP 5: Update message IDs in database
             if new_open_msg_id or new_closed_msg_id:
-                self.tracker.update_message_ids(
+                await self._db(
+                    tracker.update_message_ids,
                     broadcast_id,
                     open_message_id=new_open_msg_id,
                     closed_message_id=new_closed_msg_id
@@ -148,13 +212,13 @@ class BroadcastExecutor:
 
             # Update broadcast status
             if success:
-                self.tracker.mark_success(broadcast_id)
+                await self._db(tracker.mark_success, broadcast_id)
                 self.logger.info(
                     f"✅ Broadcast {str(broadcast_id)[:8]}... completed successfully"
                 )
             else:
                 error_msg = '; '.join(errors)
-                self.tracker.mark_failure(broadcast_id, error_msg)
+                await self._db(tracker.mark_failure, broadcast_id, error_msg)
                 self.logger.error(
                     f"❌ Broadcast {str(broadcast_id)[:8]}... failed: {error_msg}"
                 )
@@ -172,7 +236,7 @@ class BroadcastExecutor:
         except Exception as e:
             error_msg = f"Unexpected error: {str(e)}"
             errors.append(error_msg)
-            self.tracker.mark_failure(broadcast_id, error_msg)
+            await self._db(tracker.mark_failure, broadcast_id, error_msg)
             self.logger.error(f"❌ Broadcast {str(broadcast_id)[:8]}... exception: {e}", exc_info=True)
 
             return {
@@ -185,7 +249,7 @@ class BroadcastExecutor:
                 'new_closed_message_id': new_closed_msg_id
             }
 
-    def _send_subscription_message(
+    async def _send_subscription_message(
         self,
         broadcast_entry: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -223,7 +287,7 @@ class BroadcastExecutor:
                 return {'success': False, 'error': 'No subscription tiers configured'}
 
             # Send via TelegramClient
-            result = self.telegram.send_subscription_message(
+            result = await self.telegram.send_subscription_message_async(
                 chat_id=open_channel_id,
                 open_title=open_title,
                 open_desc=open_desc,
@@ -238,7 +302,7 @@ class BroadcastExecutor:
             self.logger.error(f"❌ Exception sending subscription message: {e}", exc_info=True)
             return {'success': False, 'error': str(e)}
 
-    def _send_donation_message(
+    async def _send_donation_message(
         self,
         broadcast_entry: Dict[str, Any]
     ) -> Dict[str, Any]:
@@ -260,7 +324,7 @@ class BroadcastExecutor:
             open_channel_id = broadcast_entry['open_channel_id']
 
             # Send via TelegramClient
-            result = self.telegram.send_donation_message(
+            result = await self.telegram.send_donation_message_async(
                 chat_id=closed_channel_id,
                 donation_message=donation_message,
                 open_channel_id=open_channel_id
@@ -274,7 +338,12 @@ class BroadcastExecutor:
 
     def execute_batch(self, broadcast_entries: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
-        Execute multiple broadcasts in sequence.
+        Execute multiple broadcasts concurrently.
+
+        At most max_concurrency broadcasts are in flight; the four Telegram calls
+        of one broadcast keep their order. Results keep the input order.
+        The batch is claimed 'in_progress' in one statement and results are
+        written in bulk at checkpoints (BroadcastTracker.buffered()).
 
         Args:
             broadcast_entries: List of broadcast entries
@@ -288,15 +357,20 @@ class BroadcastExecutor:
             }
         """
         total = len(broadcast_entries)
+
+        self.logger.info(
+            f"📊 Executing batch of {total} broadcasts (concurrency={self.max_concurrency})"
+        )
+
+        broadcast_ids = [entry['id'] for entry in broadcast_entries]
+        with self.tracker.buffered(broadcast_ids) as tracker:
+            broadcast_results = self._run(self._execute_batch_async(broadcast_entries, tracker))
+
         successful = 0
         failed = 0
         results = []
 
-        self.logger.info(f"📊 Executing batch of {total} broadcasts")
-
-        for entry in broadcast_entries:
-            result = self.execute_broadcast(entry)
-
+        for entry, result in zip(broadcast_entries, broadcast_results):
             if result['success']:
                 successful += 1
             else:
@@ -318,3 +392,17 @@ class BroadcastExecutor:
             'failed': failed,
             'results': results
         }
+
+    async def _execute_batch_async(
+        self,
+        broadcast_entries: List[Dict[str, Any]],
+        tracker=None
+    ) -> List[Dict[str, Any]]:
+        """Run broadcasts concurrently, bounded by max_concurrency."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_one(entry: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._execute_broadcast_async(entry, tracker)
+
+        return await asyncio.gather(*(run_one(entry) for entry in broadcast_entries))
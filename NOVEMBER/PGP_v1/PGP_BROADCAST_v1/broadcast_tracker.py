@@ -2,17 +2,29 @@
 """
 BroadcastTracker - Tracks broadcast state and updates database
 Handles state transitions, statistics, and error tracking
+
+Buffered mode (BroadcastTracker.buffered()) claims a whole batch as
+'in_progress' with one statement, collects message IDs and success/failure
+transitions in memory, and writes them in bulk every BROADCAST_TRACKER_FLUSH_SIZE
+results (default: 50) and when the batch ends. Claimed broadcasts whose result
+was never written (final flush failed, or the batch raised) are reset to
+'pending' so the next scheduler run picks them up again.
 """
 
+import os
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, List
 from sqlalchemy import text
 from database_manager import DatabaseManager
 from config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_FLUSH_SIZE = 50
+
 
 class BroadcastTracker:
     """
@@ -69,9 +81,7 @@ class BroadcastTracker:
         Returns:
             True if successful, False otherwise
         """
-        # Get auto interval from config
-        auto_interval_hours = self.config.get_broadcast_auto_interval()
-        next_send = datetime.now() + timedelta(hours=auto_interval_hours)
+        next_send = self._next_send_time()
 
         success = self.db.update_broadcast_success(broadcast_id, next_send)
 
@@ -102,9 +112,7 @@ class BroadcastTracker:
         Returns:
             True if successful, False otherwise
         """
-        # Truncate error message if too long (database TEXT field can handle it, but keep it reasonable)
-        if len(error_message) > 500:
-            error_message = error_message[:497] + "..."
+        error_message = self._truncate_error(error_message)
 
         success = self.db.update_broadcast_failure(broadcast_id, error_message)
 
@@ -115,6 +123,63 @@ class BroadcastTracker:
 
         return success
 
+    def _next_send_time(self) -> datetime:
+        """Next send time after a successful broadcast (now + BROADCAST_AUTO_INTERVAL)."""
+        auto_interval_hours = self.config.get_broadcast_auto_interval()
+        return datetime.now() + timedelta(hours=auto_interval_hours)
+
+    @staticmethod
+    def _truncate_error(error_message: str) -> str:
+        """Truncate error message if too long (database TEXT field can handle it, but keep it reasonable)."""
+        if len(error_message) > 500:
+            return error_message[:497] + "..."
+        return error_message
+
+    def claim_in_progress(self, broadcast_ids: List[str]) -> bool:
+        """
+        Mark a whole batch as in-progress with a single statement.
+
+        Args:
+            broadcast_ids: UUIDs of the broadcast entries about to be executed
+
+        Returns:
+            True if at least one broadcast was claimed, False on error or
+            when no row matched
+        """
+        return self.db.bulk_update_broadcast_status(broadcast_ids, 'in_progress') > 0
+
+    @contextmanager
+    def buffered(self, broadcast_ids: List[str], flush_size: Optional[int] = None):
+        """
+        Track a batch run with bulk writes.
+
+        The batch is claimed as 'in_progress' up front (crash-safe marker), then
+        results are buffered and flushed at checkpoints and when the block exits.
+        Claimed broadcasts without a written result are then reset to 'pending'
+        (fetch_due_broadcasts() only selects 'pending').
+
+        Args:
+            broadcast_ids: UUIDs of the broadcast entries in the batch
+            flush_size: Buffered results per checkpoint flush
+                        (default: BROADCAST_TRACKER_FLUSH_SIZE or 50)
+
+        Yields:
+            BufferedBroadcastTracker with the same tracking methods as BroadcastTracker
+        """
+        claimed = self.claim_in_progress(broadcast_ids)
+        buffer = BufferedBroadcastTracker(
+            self,
+            claimed_ids=broadcast_ids if claimed else [],
+            flush_size=flush_size or int(
+                os.getenv('BROADCAST_TRACKER_FLUSH_SIZE') or DEFAULT_FLUSH_SIZE
+            )
+        )
+        try:
+            yield buffer
+        finally:
+            buffer.flush()
+            buffer.release_unfinished()
+
     def reset_consecutive_failures(self, broadcast_id: str) -> bool:
         """
         Reset consecutive failure count (useful for manual re-enable).
@@ -216,3 +281,153 @@ class BroadcastTracker:
             self.logger.error(f"❌ Failed to update message IDs: {e}")
             # Don't raise - this is supplementary functionality
             return False
+
+
+class BufferedBroadcastTracker:
+    """
+    Collects broadcast state transitions of one batch run and writes them in bulk.
+
+    Created by BroadcastTracker.buffered(). Thread-safe: tracking methods may be
+    called from several threads; flushes are serialized and keep call order.
+    """
+
+    def __init__(self, tracker: BroadcastTracker, claimed_ids: List[str], flush_size: int):
+        """
+        Initialize the BufferedBroadcastTracker.
+
+        Args:
+            tracker: BroadcastTracker used for config and database access
+            claimed_ids: Broadcasts already marked 'in_progress' by the bulk claim
+            flush_size: Buffered results per checkpoint flush
+        """
+        self.tracker = tracker
+        self.db = tracker.db
+        self.flush_size = max(1, flush_size)
+        self.logger = logging.getLogger(__name__)
+
+        self._claimed = {str(b) for b in claimed_ids}
+        self._finished = set()  # Broadcasts whose result was written
+        self._message_ids = []
+        self._successes = []
+        self._failures = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+    def update_status(self, broadcast_id: str, status: str) -> bool:
+        """
+        Update broadcast status ('in_progress' is a no-op for claimed broadcasts).
+        """
+        if status == 'in_progress' and str(broadcast_id) in self._claimed:
+            return True
+        return self.tracker.update_status(broadcast_id, status)
+
+    def update_message_ids(
+        self,
+        broadcast_id: str,
+        open_message_id: Optional[int] = None,
+        closed_message_id: Optional[int] = None
+    ) -> bool:
+        """
+        Buffer the last sent message IDs for a broadcast.
+        """
+        if open_message_id is None and closed_message_id is None:
+            self.logger.warning("⚠️ No message IDs provided to update")
+            return False
+
+        with self._lock:
+            self._message_ids.append((broadcast_id, open_message_id, closed_message_id))
+        return True
+
+    def mark_success(self, broadcast_id: str) -> bool:
+        """
+        Buffer a successful broadcast (next send time is computed now).
+        """
+        with self._lock:
+            self._successes.append((broadcast_id, self.tracker._next_send_time()))
+        self._maybe_flush()
+        return True
+
+    def mark_failure(self, broadcast_id: str, error_message: str) -> bool:
+        """
+        Buffer a failed broadcast.
+        """
+        with self._lock:
+            self._failures.append((broadcast_id, self.tracker._truncate_error(error_message)))
+        self._maybe_flush()
+        return True
+
+    def _maybe_flush(self) -> None:
+        with self._lock:
+            due = len(self._successes) + len(self._failures) >= self.flush_size
+        if due:
+            self.flush()
+
+    def flush(self) -> bool:
+        """
+        Write all buffered transitions in one transaction.
+
+        On failure the transitions stay buffered and are retried by the next flush.
+
+        Returns:
+            True if the buffer is empty afterwards, False otherwise
+        """
+        with self._flush_lock:
+            with self._lock:
+                message_ids, self._message_ids = self._message_ids, []
+                successes, self._successes = self._successes, []
+                failures, self._failures = self._failures, []
+
+            if not (message_ids or successes or failures):
+                return True
+
+            if self.db.apply_broadcast_updates(message_ids, successes, failures):
+                self._finished.update(str(b) for b, _ in successes)
+                self._finished.update(str(b) for b, _ in failures)
+                self.logger.info(
+                    f"💾 Flushed {len(successes)} success(es) and {len(failures)} failure(s)"
+                )
+                return True
+
+            with self._lock:
+                self._message_ids = message_ids + self._message_ids
+                self._successes = successes + self._successes
+                self._failures = failures + self._failures
+
+            self.logger.error(
+                f"❌ Flush failed, {len(successes) + len(failures)} result(s) kept for retry"
+            )
+            return False
+
+    def release_unfinished(self) -> int:
+        """
+        Reset claimed broadcasts without a written result back to 'pending'.
+
+        Called when the batch ends. Their buffered results are dropped; the
+        broadcasts are executed again by the next scheduler run instead of
+        staying 'in_progress' forever.
+
+        Returns:
+            Number of broadcasts reset (-1 if the reset failed)
+        """
+        with self._flush_lock:
+            unfinished_ids = self._claimed - self._finished
+            if not unfinished_ids:
+                return 0
+            unfinished = sorted(unfinished_ids)
+
+            with self._lock:
+                self._message_ids = [m for m in self._message_ids if str(m[0]) not in unfinished_ids]
+                self._successes = [s for s in self._successes if str(s[0]) not in unfinished_ids]
+                self._failures = [f for f in self._failures if str(f[0]) not in unfinished_ids]
+
+            reset = self.db.bulk_update_broadcast_status(unfinished, 'pending')
+            if reset < 0:
+                self.logger.error(
+                    f"❌ Could not reset {len(unfinished)} unfinished broadcast(s) to pending - "
+                    f"they stay in_progress: {', '.join(unfinished)}"
+                )
+                return -1
+
+            self._claimed.difference_update(unfinished)
+            self.logger.warning(f"⚠️ Reset {len(unfinished)} unfinished broadcast(s) to pending")
+            return len(unfinished)
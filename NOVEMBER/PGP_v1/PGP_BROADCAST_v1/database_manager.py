@@ -10,12 +10,15 @@ from datetime import datetime
 from contextlib import contextmanager
 from google.cloud.sql.connector import Connector
 import sqlalchemy
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, text, bindparam
 from sqlalchemy.pool import QueuePool  # ✅ H-06 FIX: Use QueuePool for connection reuse
 from config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+# Rows per bulk UPDATE ... FROM (VALUES ...) statement
+BULK_UPDATE_CHUNK_SIZE = 500
+
 
 class DatabaseManager:
     """
@@ -397,6 +400,168 @@ class DatabaseManager:
             self.logger.error(f"❌ Error marking failure: {e}")
             return False
 
+    def bulk_update_broadcast_status(self, broadcast_ids: List[str], status: str) -> int:
+        """
+        Update the status of many broadcasts in one statement.
+
+        Args:
+            broadcast_ids: UUIDs of the broadcast entries
+            status: New status ('pending', 'in_progress', 'completed', 'failed', 'skipped')
+
+        Returns:
+            Number of rows updated (-1 on error)
+        """
+        if not broadcast_ids:
+            return 0
+
+        try:
+            engine = self._get_engine()
+            with engine.connect() as conn:
+                query = text("""
+                    UPDATE broadcast_manager
+                    SET broadcast_status = :status
+                    WHERE id IN :broadcast_ids
+                """).bindparams(bindparam("broadcast_ids", expanding=True))
+
+                result = conn.execute(query, {
+                    "status": status,
+                    "broadcast_ids": [str(b) for b in broadcast_ids]
+                })
+                conn.commit()
+
+                self.logger.info(f"📝 Bulk status update: {result.rowcount} broadcast(s) → {status}")
+                return result.rowcount
+
+        except Exception as e:
+            self.logger.error(f"❌ Error bulk updating status: {e}")
+            return -1
+
+    def apply_broadcast_updates(
+        self,
+        message_ids: List[Tuple[str, Optional[int], Optional[int]]],
+        successes: List[Tuple[str, datetime]],
+        failures: List[Tuple[str, str]]
+    ) -> bool:
+        """
+        Apply buffered broadcast results in one transaction.
+
+        Runs one UPDATE ... FROM (VALUES ...) per kind of change (chunked), with
+        the same column changes as update_message_ids(), update_broadcast_success()
+        and update_broadcast_failure().
+
+        Args:
+            message_ids: (broadcast_id, open_message_id, closed_message_id) tuples;
+                         None keeps the stored message ID
+            successes: (broadcast_id, next_send_time) tuples
+            failures: (broadcast_id, error_message) tuples
+
+        Returns:
+            True if every update was committed, False otherwise (nothing committed)
+        """
+        if not (message_ids or successes or failures):
+            return True
+
+        try:
+            engine = self._get_engine()
+            with engine.connect() as conn:
+                for start in range(0, len(message_ids), BULK_UPDATE_CHUNK_SIZE):
+                    chunk = message_ids[start:start + BULK_UPDATE_CHUNK_SIZE]
+                    values, params = self._values_clause(
+                        chunk, ("uuid", "bigint", "bigint")
+                    )
+                    conn.execute(text(f"""
+                        UPDATE broadcast_manager AS bm
+                        SET
+                            last_open_message_id = COALESCE(v.open_message_id, bm.last_open_message_id),
+                            last_open_message_sent_at = CASE
+                                WHEN v.open_message_id IS NULL THEN bm.last_open_message_sent_at
+                                ELSE NOW()
+                            END,
+                            last_closed_message_id = COALESCE(v.closed_message_id, bm.last_closed_message_id),
+                            last_closed_message_sent_at = CASE
+                                WHEN v.closed_message_id IS NULL THEN bm.last_closed_message_sent_at
+                                ELSE NOW()
+                            END
+                        FROM (VALUES {values}) AS v(id, open_message_id, closed_message_id)
+                        WHERE bm.id = v.id
+                    """), params)
+
+                for start in range(0, len(successes), BULK_UPDATE_CHUNK_SIZE):
+                    chunk = successes[start:start + BULK_UPDATE_CHUNK_SIZE]
+                    values, params = self._values_clause(chunk, ("uuid", "timestamptz"))
+                    conn.execute(text(f"""
+                        UPDATE broadcast_manager AS bm
+                        SET
+                            broadcast_status = 'completed',
+                            last_sent_time = NOW(),
+                            next_send_time = v.next_send_time,
+                            total_broadcasts = bm.total_broadcasts + 1,
+                            successful_broadcasts = bm.successful_broadcasts + 1,
+                            consecutive_failures = 0,
+                            last_error_message = NULL,
+                            last_error_time = NULL
+                        FROM (VALUES {values}) AS v(id, next_send_time)
+                        WHERE bm.id = v.id
+                    """), params)
+
+                deactivated = []
+                for start in range(0, len(failures), BULK_UPDATE_CHUNK_SIZE):
+                    chunk = failures[start:start + BULK_UPDATE_CHUNK_SIZE]
+                    values, params = self._values_clause(chunk, ("uuid", "text"))
+                    result = conn.execute(text(f"""
+                        UPDATE broadcast_manager AS bm
+                        SET
+                            broadcast_status = 'failed',
+                            failed_broadcasts = bm.failed_broadcasts + 1,
+                            consecutive_failures = bm.consecutive_failures + 1,
+                            last_error_message = v.error_message,
+                            last_error_time = NOW(),
+                            is_active = CASE
+                                WHEN bm.consecutive_failures + 1 >= 5 THEN false
+                                ELSE bm.is_active
+                            END
+                        FROM (VALUES {values}) AS v(id, error_message)
+                        WHERE bm.id = v.id
+                        RETURNING bm.id, bm.consecutive_failures, bm.is_active
+                    """), params)
+                    deactivated.extend(row for row in result.fetchall() if not row[2])
+
+                conn.commit()
+
+                self.logger.info(
+                    f"📝 Applied broadcast updates: {len(message_ids)} message ID(s), "
+                    f"{len(successes)} success(es), {len(failures)} failure(s)"
+                )
+                for broadcast_id, failures_count, _ in deactivated:
+                    self.logger.warning(
+                        f"⚠️ Broadcast {broadcast_id} deactivated after {failures_count} consecutive failures"
+                    )
+
+                return True
+
+        except Exception as e:
+            self.logger.error(f"❌ Error applying broadcast updates: {e}")
+            return False
+
+    @staticmethod
+    def _values_clause(rows: List[Tuple], types: Tuple[str, ...]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build a VALUES list with named, type-cast parameters.
+
+        Returns:
+            (values SQL, parameters dict)
+        """
+        tuples = []
+        params = {}
+        for i, row in enumerate(rows):
+            names = []
+            for j, (value, sql_type) in enumerate(zip(row, types)):
+                name = f"v{i}_{j}"
+                params[name] = str(value) if sql_type == "uuid" else value
+                names.append(f"CAST(:{name} AS {sql_type})")
+            tuples.append(f"({', '.join(names)})")
+        return ", ".join(tuples), params
+
     def get_manual_trigger_info(self, broadcast_id: str) -> Optional[Tuple[str, Optional[datetime]]]:
         """
         Get last manual trigger time for rate limiting.
@@ -4,13 +4,27 @@ TelegramClient - Telegram Bot API wrapper for broadcast operations
 Handles message sending with proper formatting and error handling
 """
 
+import os
+import re
+import asyncio
 import logging
 import base64
+import threading
+import weakref
+import httpx
 import requests
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from telegram_rate_limiter import TelegramRateLimiter, get_telegram_rate_limiter
 
 logger = logging.getLogger(__name__)
 
+# httpx logs every request URL at INFO, and Bot API URLs contain the bot token
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_MAX_RETRY_AFTER_SECONDS = 60
+DEFAULT_HTTP_MAX_CONNECTIONS = 50
+
 
 class TelegramClient:
     """
@@ -21,21 +35,39 @@ class TelegramClient:
     - Send donation messages with inline buttons
     - Format messages with proper HTML
     - Handle Telegram API errors gracefully
+    - Async variants (*_async) for concurrent broadcasts, rate limited and
+      retrying on 429 retry_after
     """
 
-    def __init__(self, bot_token: str, bot_username: str):
+    def __init__(
+        self,
+        bot_token: str,
+        bot_username: str,
+        rate_limiter: Optional[TelegramRateLimiter] = None
+    ):
         """
         Initialize the TelegramClient.
 
         Args:
             bot_token: Telegram bot token
             bot_username: Bot username (for deep links)
+            rate_limiter: Rate limiter for async calls (default: process-wide limiter)
         """
         self.bot_token = bot_token
         self.bot_username = bot_username
         self.api_base = f"https://api.telegram.org/bot{bot_token}"
         self.logger = logging.getLogger(__name__)
 
+        self.rate_limiter = rate_limiter or get_telegram_rate_limiter()
+        self.max_retries = int(os.getenv('TELEGRAM_MAX_RETRIES') or DEFAULT_MAX_RETRIES)
+        self.max_retry_after = float(
+            os.getenv('TELEGRAM_MAX_RETRY_AFTER_SECONDS') or DEFAULT_MAX_RETRY_AFTER_SECONDS
+        )
+
+        # One httpx.AsyncClient per event loop (connection pools are loop-bound)
+        self._http_clients = weakref.WeakKeyDictionary()
+        self._http_clients_lock = threading.Lock()
+
         # Test bot connection immediately
         try:
             response = requests.get(f"{self.api_base}/getMe", timeout=10)
@@ -63,6 +95,123 @@ class TelegramClient:
         """
         return base64.urlsafe_b64encode(str(channel_id).encode()).decode()
 
+    # ========== MESSAGE PAYLOADS ==========
+
+    def _build_subscription_payload(
+        self,
+        chat_id: str,
+        open_title: str,
+        open_desc: str,
+        closed_title: str,
+        closed_desc: str,
+        tier_buttons: List[Dict[str, Any]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Build the sendMessage payload for a subscription tier message.
+
+        Returns:
+            sendMessage payload, or None if no tier button is valid
+        """
+        # Build message text
+        message_text = (
+            f"Hello, welcome to <b>{open_title}: {open_desc}</b>\n\n"
+            f"Choose your Subscription Tier to gain access to <b>{closed_title}: {closed_desc}</b>."
+        )
+
+        # Validate message length (Telegram limit: 4096 characters)
+        if len(message_text) > 4096:
+            self.logger.warning(f"⚠️ Message too long ({len(message_text)} chars), truncating")
+            message_text = message_text[:4093] + "..."
+
+        # Build inline keyboard
+        tier_emojis = {1: "🥇", 2: "🥈", 3: "🥉"}
+        inline_keyboard = []
+
+        for tier_info in tier_buttons:
+            tier_num = tier_info.get('tier')
+            price = tier_info.get('price')
+            days = tier_info.get('time')
+
+            if price is None or days is None:
+                continue
+
+            # Encode subscription token
+            base_hash = self.encode_id(chat_id)
+            safe_sub = str(price).replace(".", "d")
+            token = f"{base_hash}_{safe_sub}_{days}"
+            url = f"https://t.me/{self.bot_username}?start={token}"
+
+            emoji = tier_emojis.get(tier_num, "💰")
+            button_text = f"{emoji} ${price} for {days} days"
+
+            # Each button in its own row (vertical layout)
+            inline_keyboard.append([{
+                "text": button_text,
+                "url": url
+            }])
+
+        if not inline_keyboard:
+            return None
+
+        # Prepare payload
+        payload = {
+            "chat_id": chat_id,
+            "text": message_text,
+            "parse_mode": "HTML",
+            "reply_markup": {
+                "inline_keyboard": inline_keyboard
+            }
+        }
+
+        return payload
+
+    def _build_donation_payload(
+        self,
+        chat_id: str,
+        donation_message: str,
+        open_channel_id: str
+    ) -> Dict[str, Any]:
+        """
+        Build the sendMessage payload for a donation message.
+
+        Returns:
+            sendMessage payload
+        """
+        # Build message text
+        message_text = (
+            f"Enjoying the content? Consider making a donation.\n<b>{donation_message}</b>"
+        )
+
+        # Validate message length (Telegram limit: 4096 characters)
+        if len(message_text) > 4096:
+            self.logger.warning(f"⚠️ Message too long ({len(message_text)} chars), truncating")
+            message_text = message_text[:4093] + "..."
+
+        # Build inline keyboard
+        callback_data = f"donate_start_{open_channel_id}"
+
+        # Validate callback_data length (Telegram limit: 64 bytes)
+        if len(callback_data.encode('utf-8')) > 64:
+            self.logger.warning(f"⚠️ Callback data too long, truncating")
+            callback_data = callback_data[:60]  # Leave some margin
+
+        inline_keyboard = [[{
+            "text": "💝 Donate to Support This Channel",
+            "callback_data": callback_data
+        }]]
+
+        # Prepare payload
+        payload = {
+            "chat_id": chat_id,
+            "text": message_text,
+            "parse_mode": "HTML",
+            "reply_markup": {
+                "inline_keyboard": inline_keyboard
+            }
+        }
+
+        return payload
+
     def send_subscription_message(
         self,
         chat_id: str,
@@ -87,59 +236,14 @@ class TelegramClient:
             {'success': bool, 'error': str (if failed), 'message_id': int (if success)}
         """
         try:
-            # Build message text
-            message_text = (
-                f"Hello, welcome to <b>{open_title}: {open_desc}</b>\n\n"
-                f"Choose your Subscription Tier to gain access to <b>{closed_title}: {closed_desc}</b>."
+            payload = self._build_subscription_payload(
+                chat_id, open_title, open_desc, closed_title, closed_desc, tier_buttons
             )
-
-            # Validate message length (Telegram limit: 4096 characters)
-            if len(message_text) > 4096:
-                self.logger.warning(f"⚠️ Message too long ({len(message_text)} chars), truncating")
-                message_text = message_text[:4093] + "..."
-
-            # Build inline keyboard
-            tier_emojis = {1: "🥇", 2: "🥈", 3: "🥉"}
-            inline_keyboard = []
-
-            for tier_info in tier_buttons:
-                tier_num = tier_info.get('tier')
-                price = tier_info.get('price')
-                days = tier_info.get('time')
-
-                if price is None or days is None:
-                    continue
-
-                # Encode subscription token
-                base_hash = self.encode_id(chat_id)
-                safe_sub = str(price).replace(".", "d")
-                token = f"{base_hash}_{safe_sub}_{days}"
-                url = f"https://t.me/{self.bot_username}?start={token}"
-
-                emoji = tier_emojis.get(tier_num, "💰")
-                button_text = f"{emoji} ${price} for {days} days"
-
-                # Each button in its own row (vertical layout)
-                inline_keyboard.append([{
-                    "text": button_text,
-                    "url": url
-                }])
-
-            if not inline_keyboard:
+            if payload is None:
                 error_msg = "No valid tier buttons to display"
                 self.logger.warning(f"⚠️ {error_msg} for {chat_id}")
                 return {'success': False, 'error': error_msg}
 
-            # Prepare payload
-            payload = {
-                "chat_id": chat_id,
-                "text": message_text,
-                "parse_mode": "HTML",
-                "reply_markup": {
-                    "inline_keyboard": inline_keyboard
-                }
-            }
-
             # Send message via direct HTTP
             self.logger.info(f"📤 Sending subscription message to {chat_id}")
             response = requests.post(
@@ -321,38 +425,7 @@ class TelegramClient:
             {'success': bool, 'error': str (if failed), 'message_id': int (if success)}
         """
         try:
-            # Build message text
-            message_text = (
-                f"Enjoying the content? Consider making a donation.\n<b>{donation_message}</b>"
-            )
-
-            # Validate message length (Telegram limit: 4096 characters)
-            if len(message_text) > 4096:
-                self.logger.warning(f"⚠️ Message too long ({len(message_text)} chars), truncating")
-                message_text = message_text[:4093] + "..."
-
-            # Build inline keyboard
-            callback_data = f"donate_start_{open_channel_id}"
-
-            # Validate callback_data length (Telegram limit: 64 bytes)
-            if len(callback_data.encode('utf-8')) > 64:
-                self.logger.warning(f"⚠️ Callback data too long, truncating")
-                callback_data = callback_data[:60]  # Leave some margin
-
-            inline_keyboard = [[{
-                "text": "💝 Donate to Support This Channel",
-                "callback_data": callback_data
-            }]]
-
-            # Prepare payload
-            payload = {
-                "chat_id": chat_id,
-                "text": message_text,
-                "parse_mode": "HTML",
-                "reply_markup": {
-                    "inline_keyboard": inline_keyboard
-                }
-            }
+            payload = self._build_donation_payload(chat_id, donation_message, open_channel_id)
 
             # Send message via direct HTTP
             self.logger.info(f"📤 Sending donation message to {chat_id}")
@@ -395,3 +468,203 @@ class TelegramClient:
             error_msg = f"Unexpected error: {str(e)}"
             self.logger.error(f"❌ {error_msg}: {chat_id}", exc_info=True)
             return {'success': False, 'error': error_msg}
+
+    # ========== ASYNC API (concurrent broadcasts) ==========
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._http_clients_lock:
+            client = self._http_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    base_url=self.api_base,
+                    timeout=10,
+                    limits=httpx.Limits(
+                        max_connections=DEFAULT_HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=DEFAULT_HTTP_MAX_CONNECTIONS
+                    )
+                )
+                self._http_clients[loop] = client
+            return client
+
+    async def aclose(self) -> None:
+        """Close the HTTP connection pool bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._http_clients_lock:
+            client = self._http_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    async def _call_api_async(self, method: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Call a Bot API method through the rate limiter, honouring 429 retry_after.
+
+        Args:
+            method: Bot API method name (e.g. 'sendMessage')
+            payload: JSON payload (must contain chat_id)
+
+        Returns:
+            {'ok': bool, 'result': Any, 'status_code': int or None, 'description': str or None}
+        """
+        chat_id = payload['chat_id']
+        http = self._get_http_client()
+
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire(chat_id)
+
+            try:
+                response = await http.post(f"/{method}", json=payload)
+            except httpx.HTTPError as e:
+                return {
+                    'ok': False, 'result': None, 'status_code': None,
+                    'description': f"Network error: {type(e).__name__}: {e}"
+                }
+
+            try:
+                data = response.json()
+            except ValueError:
+                data = {'ok': False, 'description': response.text}
+
+            if response.status_code == 429 or data.get('error_code') == 429:
+                retry_after = (data.get('parameters') or {}).get('retry_after')
+                if retry_after is None:
+                    match = re.search(r'retry after (\d+)', str(data.get('description', '')).lower())
+                    retry_after = int(match.group(1)) if match else 5
+
+                # Hold back every pending call to this chat, not only this one
+                self.rate_limiter.penalize(chat_id, retry_after)
+
+                if attempt < self.max_retries and retry_after <= self.max_retry_after:
+                    self.logger.warning(
+                        f"⏱️ Rate limited on {method} for {chat_id}, "
+                        f"retry_after={retry_after}s (attempt {attempt + 1}/{self.max_retries})"
+                    )
+                    continue
+
+                return {
+                    'ok': False, 'result': None, 'status_code': 429,
+                    'description': f"Rate limited: retry after {retry_after}s"
+                }
+
+            return {
+                'ok': bool(data.get('ok')),
+                'result': data.get('result'),
+                'status_code': response.status_code,
+                'description': data.get('description', 'Unknown error')
+            }
+
+    def _send_error_message(self, response: Dict[str, Any]) -> str:
+        """Map a failed sendMessage response to the error strings used by the sync API."""
+        status_code = response['status_code']
+        description = response['description']
+
+        if status_code == 403:
+            return "Bot not admin or kicked from channel"
+        if status_code == 400:
+            return f"Invalid request: {description}"
+        if status_code and status_code >= 400 and status_code != 429:
+            return f"HTTP {status_code}: {description}"
+        return description
+
+    async def _send_message_async(self, chat_id: str, payload: Dict[str, Any], kind: str) -> Dict[str, Any]:
+        """
+        Send a prepared sendMessage payload.
+
+        Returns:
+            {'success': bool, 'error': str (if failed), 'message_id': int (if success)}
+        """
+        try:
+            self.logger.info(f"📤 Sending {kind} message to {chat_id}")
+            response = await self._call_api_async('sendMessage', payload)
+
+            if not response['ok']:
+                error_msg = self._send_error_message(response)
+                self.logger.error(f"❌ {error_msg}: {chat_id}")
+                return {'success': False, 'error': error_msg}
+
+            message_id = response['result']['message_id']
+            self.logger.info(f"✅ {kind.capitalize()} message sent to {chat_id}, message_id: {message_id}")
+            return {'success': True, 'error': None, 'message_id': message_id}
+
+        except Exception as e:
+            error_msg = f"Unexpected error: {str(e)}"
+            self.logger.error(f"❌ {error_msg}: {chat_id}", exc_info=True)
+            return {'success': False, 'error': error_msg}
+
+    async def send_subscription_message_async(
+        self,
+        chat_id: str,
+        open_title: str,
+        open_desc: str,
+        closed_title: str,
+        closed_desc: str,
+        tier_buttons: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Async variant of send_subscription_message() (same arguments and result).
+        """
+        payload = self._build_subscription_payload(
+            chat_id, open_title, open_desc, closed_title, closed_desc, tier_buttons
+        )
+        if payload is None:
+            error_msg = "No valid tier buttons to display"
+            self.logger.warning(f"⚠️ {error_msg} for {chat_id}")
+            return {'success': False, 'error': error_msg}
+
+        return await self._send_message_async(chat_id, payload, 'subscription')
+
+    async def send_donation_message_async(
+        self,
+        chat_id: str,
+        donation_message: str,
+        open_channel_id: str
+    ) -> Dict[str, Any]:
+        """
+        Async variant of send_donation_message() (same arguments and result).
+        """
+        payload = self._build_donation_payload(chat_id, donation_message, open_channel_id)
+        return await self._send_message_async(chat_id, payload, 'donation')
+
+    async def delete_message_async(self, chat_id: str, message_id: int) -> Dict[str, Any]:
+        """
+        Async variant of delete_message() (same result).
+
+        Rate limits are retried through _call_api_async() instead of sleeping.
+
+        Returns:
+            {'success': bool, 'error': str or None, 'deleted': bool}
+        """
+        try:
+            if not message_id or message_id <= 0:
+                self.logger.warning(f"⚠️ Invalid message_id: {message_id}")
+                return {'success': False, 'error': 'Invalid message_id', 'deleted': False}
+
+            self.logger.info(f"🗑️ Deleting message {message_id} from {chat_id}")
+            response = await self._call_api_async(
+                'deleteMessage',
+                {"chat_id": chat_id, "message_id": message_id}
+            )
+
+            if response['ok']:
+                self.logger.info(f"✅ Message {message_id} deleted from {chat_id}")
+                return {'success': True, 'error': None, 'deleted': True}
+
+            error_desc = response['description']
+            error_lower = error_desc.lower()
+
+            # Message already deleted - treat as success (idempotent)
+            if "message to delete not found" in error_lower:
+                self.logger.debug(f"⚠️ Message {message_id} already deleted from {chat_id}")
+                return {'success': True, 'error': None, 'deleted': False}
+
+            if "not enough rights" in error_lower or "chat administrator" in error_lower:
+                self.logger.warning(f"⚠️ No permission to delete message {message_id} from {chat_id}")
+                return {'success': False, 'error': f"No permission: {error_desc}", 'deleted': False}
+
+            self.logger.error(f"❌ Cannot delete message {message_id} from {chat_id}: {error_desc}")
+            return {'success': False, 'error': error_desc, 'deleted': False}
+
+        except Exception as e:
+            error_msg = f"Unexpected error: {str(e)}"
+            self.logger.error(f"❌ {error_msg} while deleting message {message_id}", exc_info=True)
+            return {'success': False, 'error': error_msg, 'deleted': False}
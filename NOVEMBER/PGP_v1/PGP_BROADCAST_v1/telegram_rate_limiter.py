@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+TelegramRateLimiter - Bot API rate limiting for concurrent broadcasts
+Keeps concurrent sends under Telegram's global and per-chat limits
+"""
+
+import os
+import time
+import asyncio
+import logging
+import threading
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# Telegram Bot API: ~30 messages/second per bot, ~1 message/second per chat
+DEFAULT_GLOBAL_RATE_PER_SECOND = 30.0
+DEFAULT_PER_CHAT_INTERVAL_SECONDS = 1.0
+
+# Per-chat bookkeeping is pruned once it grows past this many chats
+_CHAT_PRUNE_THRESHOLD = 10000
+
+
+class TelegramRateLimiter:
+    """
+    Thread-safe rate limiter for Telegram Bot API calls, usable from any event loop.
+
+    Every call first waits for its chat's next free slot, then for the next
+    global slot. Slots are reserved under a threading lock and the caller
+    sleeps with asyncio.sleep(), so waiting never blocks a thread.
+
+    Responsibilities:
+    - Space calls globally at 1 / global_rate seconds
+    - Space calls to the same chat at per_chat_interval seconds
+    - Hold back a chat for retry_after seconds after a 429
+    """
+
+    def __init__(
+        self,
+        global_rate: float = DEFAULT_GLOBAL_RATE_PER_SECOND,
+        per_chat_interval: float = DEFAULT_PER_CHAT_INTERVAL_SECONDS
+    ):
+        """
+        Initialize the TelegramRateLimiter.
+
+        Args:
+            global_rate: Maximum Bot API calls per second (<= 0 disables global limiting)
+            per_chat_interval: Minimum seconds between calls to one chat (<= 0 disables)
+        """
+        self.global_rate = global_rate
+        self.per_chat_interval = per_chat_interval
+        self._next_global_slot = 0.0
+        self._next_chat_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _reserve_chat(self, chat_id: str) -> float:
+        """Reserve the chat's next slot and return how long the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            key = str(chat_id)
+            slot = max(now, self._next_chat_slot.get(key, 0.0))
+            if self.per_chat_interval > 0:
+                self._next_chat_slot[key] = slot + self.per_chat_interval
+
+            if len(self._next_chat_slot) > _CHAT_PRUNE_THRESHOLD:
+                self._next_chat_slot = {
+                    k: v for k, v in self._next_chat_slot.items() if v > now
+                }
+
+            return slot - now
+
+    def _reserve_global(self) -> float:
+        """Reserve the next global slot and return how long the caller must wait."""
+        if self.global_rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_global_slot)
+            self._next_global_slot = slot + 1.0 / self.global_rate
+            return slot - now
+
+    async def acquire(self, chat_id: str) -> None:
+        """
+        Wait (without blocking the event loop) until a call to chat_id may be sent.
+
+        Args:
+            chat_id: Target chat of the Bot API call
+        """
+        wait = self._reserve_chat(chat_id)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+        wait = self._reserve_global()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, chat_id: str, retry_after: float) -> None:
+        """
+        Hold back all calls to a chat after Telegram answered 429.
+
+        Args:
+            chat_id: Chat that was rate limited
+            retry_after: Seconds from Telegram's retry_after parameter
+        """
+        with self._lock:
+            key = str(chat_id)
+            until = time.monotonic() + max(0.0, retry_after)
+            self._next_chat_slot[key] = max(self._next_chat_slot.get(key, 0.0), until)
+
+
+def _env_float(var_name: str, default: float) -> float:
+    value = (os.getenv(var_name) or '').strip()
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"⚠️ Invalid {var_name}='{value}', using default {default}")
+        return default
+
+
+# Global rate limiter instance (singleton) - the bot's limits are per process
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_telegram_rate_limiter() -> TelegramRateLimiter:
+    """
+    Get global TelegramRateLimiter instance (singleton pattern).
+
+    Limits are read from TELEGRAM_GLOBAL_RATE_PER_SECOND and
+    TELEGRAM_PER_CHAT_INTERVAL_SECONDS on first use.
+
+    Returns:
+        Process-wide TelegramRateLimiter instance
+    """
+    global _rate_limiter
+
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TelegramRateLimiter(
+                global_rate=_env_float('TELEGRAM_GLOBAL_RATE_PER_SECOND', DEFAULT_GLOBAL_RATE_PER_SECOND),
+                per_chat_interval=_env_float('TELEGRAM_PER_CHAT_INTERVAL_SECONDS', DEFAULT_PER_CHAT_INTERVAL_SECONDS)
+            )
+            logger.info(
+                f"🚦 Telegram rate limiter initialized "
+                f"({_rate_limiter.global_rate} msg/s global, "
+                f"{_rate_limiter.per_chat_interval}s per chat)"
+            )
+        return _rate_limiter
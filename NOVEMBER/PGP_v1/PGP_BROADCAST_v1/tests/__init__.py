@@ -0,0 +1,3 @@
+"""
+Tests for PGP_BROADCAST_v1 application.
+"""
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+Unit tests for buffered broadcast status writes.
+
+Tests verify that BroadcastTracker.buffered() claims the batch in one
+statement, flushes at checkpoints and on exit, keeps results buffered after
+a failed flush, and resets claimed broadcasts without a written result back
+to 'pending' when the batch ends.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from broadcast_tracker import BroadcastTracker
+
+
+class FakeDatabase:
+    """DatabaseManager double recording bulk statements."""
+
+    def __init__(self):
+        self.status_updates = []
+        self.applied = []
+        self.fail_apply = False
+        self.fail_status = False
+        self.matched_rows = None
+
+    def bulk_update_broadcast_status(self, broadcast_ids, status):
+        if self.fail_status:
+            return -1
+        self.status_updates.append((sorted(str(b) for b in broadcast_ids), status))
+        return len(broadcast_ids) if self.matched_rows is None else self.matched_rows
+
+    def apply_broadcast_updates(self, message_ids, successes, failures):
+        if self.fail_apply:
+            return False
+        self.applied.append((list(message_ids), [s[0] for s in successes], list(failures)))
+        return True
+
+
+def make_tracker(db):
+    config = Mock()
+    config.get_broadcast_auto_interval.return_value = 24
+    return BroadcastTracker(db, config)
+
+
+IDS = ['b1', 'b2', 'b3']
+
+
+class TestBufferedTracker(unittest.TestCase):
+    """Test suite for BroadcastTracker.buffered()."""
+
+    def setUp(self):
+        self.db = FakeDatabase()
+        self.tracker = make_tracker(self.db)
+
+    def test_claims_batch_and_flushes_on_exit(self):
+        with self.tracker.buffered(IDS, flush_size=10) as buffer:
+            buffer.update_status('b1', 'in_progress')
+            buffer.update_message_ids('b1', open_message_id=5, closed_message_id=6)
+            buffer.mark_success('b1')
+            buffer.mark_success('b2')
+            buffer.mark_failure('b3', 'Open channel: Bot not admin')
+            self.assertEqual(self.db.applied, [])
+
+        self.assertEqual(self.db.status_updates, [(IDS, 'in_progress')])
+        self.assertEqual(self.db.applied, [
+            ([('b1', 5, 6)], ['b1', 'b2'], [('b3', 'Open channel: Bot not admin')])
+        ])
+
+    def test_checkpoint_flush_at_flush_size(self):
+        with self.tracker.buffered(IDS, flush_size=2) as buffer:
+            buffer.mark_success('b1')
+            buffer.mark_success('b2')
+            self.assertEqual(len(self.db.applied), 1)
+            buffer.mark_success('b3')
+
+        self.assertEqual([applied[1] for applied in self.db.applied], [['b1', 'b2'], ['b3']])
+
+    def test_failed_flush_keeps_results_for_next_flush(self):
+        with self.tracker.buffered(IDS, flush_size=2) as buffer:
+            self.db.fail_apply = True
+            buffer.mark_success('b1')
+            buffer.mark_success('b2')
+            self.assertEqual(self.db.applied, [])
+            self.db.fail_apply = False
+            buffer.mark_success('b3')
+
+        self.assertEqual([applied[1] for applied in self.db.applied], [['b1', 'b2', 'b3']])
+        # Everything was written: nothing reset to pending
+        self.assertEqual(self.db.status_updates, [(IDS, 'in_progress')])
+
+    def test_final_flush_failure_resets_unflushed_to_pending(self):
+        with self.tracker.buffered(IDS, flush_size=1) as buffer:
+            buffer.mark_success('b1')
+            self.db.fail_apply = True
+            buffer.mark_success('b2')
+            buffer.mark_failure('b3', 'timeout')
+
+        self.assertEqual([applied[1] for applied in self.db.applied], [['b1']])
+        self.assertEqual(self.db.status_updates, [(IDS, 'in_progress'), (['b2', 'b3'], 'pending')])
+
+        # Dropped results are not written by a later flush
+        self.db.fail_apply = False
+        self.assertTrue(buffer.flush())
+        self.assertEqual(len(self.db.applied), 1)
+
+    def test_exception_mid_batch_resets_unfinished(self):
+        with self.assertRaises(RuntimeError):
+            with self.tracker.buffered(IDS, flush_size=10) as buffer:
+                buffer.mark_success('b1')
+                raise RuntimeError("event loop crashed")
+
+        self.assertEqual([applied[1] for applied in self.db.applied], [['b1']])
+        self.assertEqual(self.db.status_updates[-1], (['b2', 'b3'], 'pending'))
+
+    def test_failed_reset_is_reported(self):
+        with self.tracker.buffered(IDS, flush_size=10) as buffer:
+            self.db.fail_apply = True
+            self.db.fail_status = True
+            buffer.mark_success('b1')
+
+        self.assertEqual(buffer.release_unfinished(), -1)
+
+    def test_failed_claim_writes_statuses_individually(self):
+        self.db.fail_status = True
+        self.db.update_broadcast_status = Mock(return_value=True)
+
+        with self.tracker.buffered(IDS) as buffer:
+            buffer.update_status('b1', 'in_progress')
+
+        self.db.update_broadcast_status.assert_called_once_with('b1', 'in_progress')
+
+    def test_claim_reports_rows_claimed(self):
+        self.assertTrue(self.tracker.claim_in_progress(IDS))
+
+        self.db.matched_rows = 0
+        self.assertFalse(self.tracker.claim_in_progress(IDS))
+
+        self.db.fail_status = True
+        self.assertFalse(self.tracker.claim_in_progress(IDS))
+
+    def test_claim_matching_no_rows_is_not_released(self):
+        self.db.matched_rows = 0
+        self.db.update_broadcast_status = Mock(return_value=True)
+
+        with self.tracker.buffered(IDS) as buffer:
+            buffer.update_status('b1', 'in_progress')
+
+        self.db.update_broadcast_status.assert_called_once_with('b1', 'in_progress')
+        # Nothing was claimed, so nothing is reset to pending
+        self.assertEqual(self.db.status_updates, [(IDS, 'in_progress')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+"""
+Unit tests for concurrent broadcast execution.
+
+Tests verify TelegramRateLimiter slot spacing and 429 hold-back, the async
+Bot API call's retry_after handling, and that BroadcastExecutor runs a batch
+concurrently (bounded by max_concurrency) while keeping each broadcast's
+call order and the input order of results.
+"""
+import os
+import sys
+import asyncio
+import unittest
+from contextlib import contextmanager
+from unittest.mock import Mock, patch
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import telegram_rate_limiter
+from telegram_rate_limiter import TelegramRateLimiter
+from telegram_client import TelegramClient
+from broadcast_executor import BroadcastExecutor
+
+
+class TestTelegramRateLimiter(unittest.TestCase):
+    """Test suite for TelegramRateLimiter slot reservation."""
+
+    def setUp(self):
+        patcher = patch.object(telegram_rate_limiter.time, 'monotonic', return_value=100.0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_global_slots_are_spaced(self):
+        limiter = TelegramRateLimiter(global_rate=10, per_chat_interval=0)
+
+        waits = [limiter._reserve_global() for _ in range(3)]
+
+        self.assertEqual([round(w, 6) for w in waits], [0.0, 0.1, 0.2])
+
+    def test_chat_slots_are_spaced_per_chat(self):
+        limiter = TelegramRateLimiter(global_rate=0, per_chat_interval=1.0)
+
+        self.assertEqual(limiter._reserve_chat('-100'), 0.0)
+        self.assertEqual(limiter._reserve_chat('-100'), 1.0)
+        self.assertEqual(limiter._reserve_chat('-200'), 0.0)
+
+    def test_penalize_holds_back_chat(self):
+        limiter = TelegramRateLimiter(global_rate=0, per_chat_interval=1.0)
+        limiter._reserve_chat('-100')
+
+        limiter.penalize('-100', 7)
+
+        self.assertEqual(limiter._reserve_chat('-100'), 7.0)
+        self.assertEqual(limiter._reserve_chat('-200'), 0.0)
+
+    def test_disabled_global_limit_never_waits(self):
+        limiter = TelegramRateLimiter(global_rate=0, per_chat_interval=0)
+
+        self.assertEqual([limiter._reserve_global() for _ in range(5)], [0.0] * 5)
+
+
+def make_telegram_client(limiter=None):
+    """TelegramClient without the getMe handshake."""
+    with patch('telegram_client.requests.get') as mock_get:
+        mock_get.return_value.json.return_value = {'ok': True, 'result': {'username': 'test_bot'}}
+        return TelegramClient('123:token', 'test_bot', rate_limiter=limiter or TelegramRateLimiter(0, 0))
+
+
+class TestCallApiAsync(unittest.TestCase):
+    """Test suite for 429 handling in TelegramClient._call_api_async()."""
+
+    def call_with_responses(self, client, responses):
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            status, body = responses[min(len(requests_seen), len(responses)) - 1]
+            return httpx.Response(status, json=body)
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            client._http_clients[loop] = httpx.AsyncClient(
+                base_url=client.api_base, transport=httpx.MockTransport(handler)
+            )
+            try:
+                return await client._call_api_async('sendMessage', {'chat_id': '-100', 'text': 'hi'})
+            finally:
+                await client.aclose()
+
+        return asyncio.run(run()), requests_seen
+
+    def test_retries_after_429(self):
+        limiter = Mock(spec=TelegramRateLimiter)
+        client = make_telegram_client(limiter)
+
+        response, seen = self.call_with_responses(client, [
+            (429, {'ok': False, 'error_code': 429, 'parameters': {'retry_after': 3}}),
+            (200, {'ok': True, 'result': {'message_id': 42}}),
+        ])
+
+        self.assertTrue(response['ok'])
+        self.assertEqual(response['result'], {'message_id': 42})
+        self.assertEqual(len(seen), 2)
+        limiter.penalize.assert_called_once_with('-100', 3)
+
+    def test_gives_up_after_max_retries(self):
+        limiter = Mock(spec=TelegramRateLimiter)
+        client = make_telegram_client(limiter)
+        client.max_retries = 2
+
+        response, seen = self.call_with_responses(client, [
+            (429, {'ok': False, 'description': 'Too Many Requests: retry after 1'}),
+        ])
+
+        self.assertFalse(response['ok'])
+        self.assertEqual(response['status_code'], 429)
+        self.assertEqual(len(seen), 3)
+
+    def test_retry_after_above_cap_is_not_retried(self):
+        limiter = Mock(spec=TelegramRateLimiter)
+        client = make_telegram_client(limiter)
+
+        response, seen = self.call_with_responses(client, [
+            (429, {'ok': False, 'parameters': {'retry_after': client.max_retry_after + 1}}),
+        ])
+
+        self.assertEqual(response['status_code'], 429)
+        self.assertEqual(len(seen), 1)
+
+
+class FakeTelegram:
+    """Async Telegram API double recording call order and concurrency."""
+
+    def __init__(self, fail_chats=()):
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_chats = set(fail_chats)
+        self.message_ids = iter(range(1000, 2000))
+
+    async def _call(self, kind, chat_id):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.calls.append((kind, chat_id))
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if chat_id in self.fail_chats:
+            return {'success': False, 'error': 'Bot not admin or kicked from channel'}
+        return {'success': True, 'error': None, 'message_id': next(self.message_ids), 'deleted': True}
+
+    async def delete_message_async(self, chat_id, message_id):
+        return await self._call('delete', chat_id)
+
+    async def send_subscription_message_async(self, chat_id, **kwargs):
+        return await self._call('subscription', chat_id)
+
+    async def send_donation_message_async(self, chat_id, **kwargs):
+        return await self._call('donation', chat_id)
+
+    async def aclose(self):
+        pass
+
+
+class FakeTracker:
+    """BroadcastTracker double; buffered() yields itself."""
+
+    def __init__(self):
+        self.successes = []
+        self.failures = []
+        self.message_ids = []
+        self.claimed = None
+
+    @contextmanager
+    def buffered(self, broadcast_ids):
+        self.claimed = list(broadcast_ids)
+        yield self
+
+    def update_status(self, broadcast_id, status):
+        return True
+
+    def update_message_ids(self, broadcast_id, open_message_id=None, closed_message_id=None):
+        self.message_ids.append((broadcast_id, open_message_id, closed_message_id))
+        return True
+
+    def mark_success(self, broadcast_id):
+        self.successes.append(broadcast_id)
+        return True
+
+    def mark_failure(self, broadcast_id, error_message):
+        self.failures.append((broadcast_id, error_message))
+        return True
+
+
+def make_entry(n, with_old_messages=True):
+    return {
+        'id': f'broadcast-{n}',
+        'open_channel_id': f'-100{n}',
+        'closed_channel_id': f'-200{n}',
+        'last_open_message_id': 10 + n if with_old_messages else None,
+        'last_closed_message_id': 20 + n if with_old_messages else None,
+        'open_channel_title': 'Open',
+        'closed_channel_title': 'Closed',
+        'sub_1_price': 5,
+        'sub_1_time': 30,
+    }
+
+
+class TestBroadcastExecutorBatch(unittest.TestCase):
+    """Test suite for BroadcastExecutor.execute_batch()."""
+
+    def test_batch_runs_concurrently_within_bound(self):
+        telegram = FakeTelegram()
+        tracker = FakeTracker()
+        executor = BroadcastExecutor(telegram, tracker, max_concurrency=3)
+
+        summary = executor.execute_batch([make_entry(n) for n in range(8)])
+
+        self.assertEqual(summary['successful'], 8)
+        self.assertEqual(tracker.claimed, [f'broadcast-{n}' for n in range(8)])
+        self.assertGreater(telegram.max_in_flight, 1)
+        self.assertLessEqual(telegram.max_in_flight, 3)
+
+    def test_results_keep_input_order(self):
+        executor = BroadcastExecutor(FakeTelegram(fail_chats={'-1002'}), FakeTracker(), max_concurrency=5)
+
+        summary = executor.execute_batch([make_entry(n) for n in range(5)])
+
+        self.assertEqual([r['broadcast_id'] for r in summary['results']], [f'broadcast-{n}' for n in range(5)])
+        self.assertEqual([r['result']['success'] for r in summary['results']], [True, True, False, True, True])
+        self.assertEqual((summary['successful'], summary['failed']), (4, 1))
+
+    def test_each_broadcast_keeps_call_order(self):
+        telegram = FakeTelegram()
+        executor = BroadcastExecutor(telegram, FakeTracker(), max_concurrency=4)
+
+        executor.execute_batch([make_entry(n) for n in range(4)])
+
+        for n in range(4):
+            own_calls = [kind for kind, chat in telegram.calls if chat in (f'-100{n}', f'-200{n}')]
+            self.assertEqual(own_calls, ['delete', 'subscription', 'delete', 'donation'])
+
+    def test_failure_and_message_ids_are_tracked(self):
+        tracker = FakeTracker()
+        executor = BroadcastExecutor(FakeTelegram(fail_chats={'-2001'}), tracker, max_concurrency=2)
+
+        executor.execute_batch([make_entry(0, with_old_messages=False), make_entry(1, with_old_messages=False)])
+
+        self.assertEqual(tracker.successes, ['broadcast-0'])
+        self.assertEqual(len(tracker.failures), 1)
+        self.assertEqual(tracker.failures[0][0], 'broadcast-1')
+        self.assertIn('Closed channel', tracker.failures[0][1])
+        self.assertEqual(len(tracker.message_ids), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,15 +7,25 @@ This package provides common base classes for:
 - Database operations (BaseDatabaseManager)
 - Token management (BaseTokenManager)
 - Logging utilities (setup_logger, get_logger)
+
+Exports are loaded lazily (PEP 562): `import PGP_COMMON` or
+`from PGP_COMMON.logging import setup_logger` does not import Secret Manager,
+Cloud Tasks or the Cloud SQL connector. Each name is imported from its
+submodule on first access.
 """
+import importlib
 
 __version__ = "1.0.0"
 
-from PGP_COMMON.config.base_config import BaseConfigManager
-from PGP_COMMON.cloudtasks.base_client import BaseCloudTasksClient
-from PGP_COMMON.database.db_manager import BaseDatabaseManager
-from PGP_COMMON.tokens.base_token import BaseTokenManager
-from PGP_COMMON.logging import setup_logger, get_logger
+# Public name -> submodule that defines it
+_LAZY_IMPORTS = {
+    "BaseConfigManager": "PGP_COMMON.config.base_config",
+    "BaseCloudTasksClient": "PGP_COMMON.cloudtasks.base_client",
+    "BaseDatabaseManager": "PGP_COMMON.database.db_manager",
+    "BaseTokenManager": "PGP_COMMON.tokens.base_token",
+    "setup_logger": "PGP_COMMON.logging",
+    "get_logger": "PGP_COMMON.logging",
+}
 
 __all__ = [
     "BaseConfigManager",
@@ -25,3 +35,17 @@ __all__ = [
     "setup_logger",
     "get_logger",
 ]
+
+
+def __getattr__(name):
+    module_path = _LAZY_IMPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_path), name)
+    globals()[name] = value  # Cache: later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
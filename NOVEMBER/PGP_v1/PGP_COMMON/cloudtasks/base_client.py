@@ -4,11 +4,22 @@ Base Cloud Tasks Client for PGP_v1 Services.
 Provides common Cloud Tasks operations shared across all PGP_v1 microservices.
 """
 import json
+import hmac
+import time
+import hashlib
+import logging
 import datetime
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Any
+from google.api_core.exceptions import AlreadyExists
 from google.cloud import tasks_v2
 from google.protobuf import timestamp_pb2
 
+# Upper bound on concurrent create_task gRPC calls issued by create_tasks_bulk()
+DEFAULT_BULK_MAX_WORKERS = 10
+
+logger = logging.getLogger(__name__)
+
 
 class BaseCloudTasksClient:
     """
@@ -46,7 +57,8 @@ class BaseCloudTasksClient:
         target_url: str,
         payload: dict,
         schedule_delay_seconds: int = 0,
-        custom_headers: Optional[dict] = None
+        custom_headers: Optional[dict] = None,
+        task_id: Optional[str] = None
     ) -> Optional[str]:
         """
         Create and enqueue a Cloud Task.
@@ -59,65 +71,158 @@ class BaseCloudTasksClient:
             payload: JSON payload to send (will be converted to bytes)
             schedule_delay_seconds: Optional delay before task execution (default 0)
             custom_headers: Optional custom headers to add (e.g., X-Webhook-Signature)
+            task_id: Optional deterministic task ID ([A-Za-z0-9_-]). Cloud Tasks
+                     refuses a second task with the same ID, so a retried
+                     enqueue is deduplicated instead of delivered twice.
+
+        Returns:
+            Task name if successful (or already created), None if failed
+        """
+        # Serialize once: the same string is logged, sent and (for signed tasks) signed
+        return self._create_task_from_body(
+            queue_name=queue_name,
+            target_url=target_url,
+            body=json.dumps(payload),
+            schedule_delay_seconds=schedule_delay_seconds,
+            custom_headers=custom_headers,
+            task_id=task_id
+        )
+
+    def _create_task_from_body(
+        self,
+        queue_name: str,
+        target_url: str,
+        body: str,
+        schedule_delay_seconds: int = 0,
+        custom_headers: Optional[dict] = None,
+        task_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Create and enqueue a Cloud Task from an already serialized JSON body.
 
         Returns:
-            Task name if successful, None if failed
+            Task name if successful (or already created), None if failed
         """
         try:
             # Construct the fully qualified queue name
             parent = self.client.queue_path(self.project_id, self.location, queue_name)
 
-            print(f"🚀 [CLOUD_TASKS] Creating task for queue: {queue_name}")
-            print(f"🎯 [CLOUD_TASKS] Target URL: {target_url}")
-            print(f"📦 [CLOUD_TASKS] Payload size: {len(json.dumps(payload))} bytes")
+            # Per-task details are DEBUG (hot path); args are formatted only if enabled
+            logger.debug("🚀 [CLOUD_TASKS] Creating task for queue: %s", queue_name)
+            logger.debug("🎯 [CLOUD_TASKS] Target URL: %s", target_url)
+            logger.debug("📦 [CLOUD_TASKS] Payload size: %d bytes", len(body))
 
-            # Construct headers
-            headers = {
-                "Content-Type": "application/json"
-            }
-
-            # Add custom headers if provided
             if custom_headers:
-                headers.update(custom_headers)
-                print(f"🔐 [CLOUD_TASKS] Added {len(custom_headers)} custom header(s)")
-
-            # Construct the task
-            task = {
-                "http_request": {
-                    "http_method": tasks_v2.HttpMethod.POST,
-                    "url": target_url,
-                    "headers": headers,
-                    "body": json.dumps(payload).encode()
-                }
-            }
-
-            # Add schedule time if delay is specified
+                logger.debug("🔐 [CLOUD_TASKS] Added %d custom header(s)", len(custom_headers))
             if schedule_delay_seconds > 0:
-                d = datetime.datetime.utcnow() + datetime.timedelta(seconds=schedule_delay_seconds)
-                timestamp = timestamp_pb2.Timestamp()
-                timestamp.FromDatetime(d)
-                task["schedule_time"] = timestamp
-                print(f"⏰ [CLOUD_TASKS] Scheduled delay: {schedule_delay_seconds}s")
+                logger.debug("⏰ [CLOUD_TASKS] Scheduled delay: %ss", schedule_delay_seconds)
+
+            task = self._build_task(target_url, body, schedule_delay_seconds, custom_headers)
+            if task_id:
+                task["name"] = self.client.task_path(self.project_id, self.location, queue_name, task_id)
 
             # Create the task
             response = self.client.create_task(request={"parent": parent, "task": task})
 
             task_name = response.name
-            print(f"✅ [CLOUD_TASKS] Task created successfully")
-            print(f"🆔 [CLOUD_TASKS] Task name: {task_name}")
+            logger.info("✅ [CLOUD_TASKS] Task created on %s: %s", queue_name, task_name)
 
             return task_name
 
+        except AlreadyExists:
+            # Named task was already created by an earlier attempt - nothing to send
+            logger.info("♻️ [CLOUD_TASKS] Task already exists on %s: %s (duplicate suppressed)",
+                        queue_name, task["name"])
+            return task["name"]
+
         except Exception as e:
-            print(f"❌ [CLOUD_TASKS] Error creating task: {e}")
+            logger.error("❌ [CLOUD_TASKS] Error creating task: %s", e)
             return None
 
+    def _build_task(
+        self,
+        target_url: str,
+        body: str,
+        schedule_delay_seconds: int = 0,
+        custom_headers: Optional[dict] = None
+    ) -> dict:
+        """
+        Build a Cloud Tasks HTTP task from an already serialized JSON body.
+
+        Args:
+            target_url: Target service URL (full https:// URL)
+            body: Serialized JSON payload
+            schedule_delay_seconds: Optional delay before task execution (default 0)
+            custom_headers: Optional custom headers to add
+
+        Returns:
+            Task dictionary accepted by CloudTasksClient.create_task()
+        """
+        # Construct headers
+        headers = {
+            "Content-Type": "application/json"
+        }
+
+        # Add custom headers if provided
+        if custom_headers:
+            headers.update(custom_headers)
+
+        # Construct the task
+        task = {
+            "http_request": {
+                "http_method": tasks_v2.HttpMethod.POST,
+                "url": target_url,
+                "headers": headers,
+                "body": body.encode()
+            }
+        }
+
+        # Add schedule time if delay is specified
+        if schedule_delay_seconds > 0:
+            d = datetime.datetime.utcnow() + datetime.timedelta(seconds=schedule_delay_seconds)
+            timestamp = timestamp_pb2.Timestamp()
+            timestamp.FromDatetime(d)
+            task["schedule_time"] = timestamp
+
+        return task
+
+    def _signature_headers(self, body: str, timestamp: Optional[str] = None) -> dict:
+        """
+        Build X-Signature / X-Request-Timestamp headers for a serialized body.
+
+        Signature format: HMAC-SHA256(timestamp:payload)
+
+        Args:
+            body: Serialized JSON payload (exactly the string that will be sent)
+            timestamp: Unix timestamp string (default: now)
+
+        Returns:
+            Dictionary with X-Signature and X-Request-Timestamp headers
+        """
+        if timestamp is None:
+            # Generate Unix timestamp (seconds since epoch)
+            timestamp = str(int(time.time()))
+
+        message = f"{timestamp}:{body}"  # Timestamp prefix prevents reordering attacks
+
+        signature = hmac.new(
+            self.signing_key.encode(),
+            message.encode(),
+            hashlib.sha256
+        ).hexdigest()
+
+        return {
+            "X-Signature": signature,  # Renamed from X-Webhook-Signature for consistency
+            "X-Request-Timestamp": timestamp
+        }
+
     def create_signed_task(
         self,
         queue_name: str,
         target_url: str,
         payload: dict,
-        schedule_delay_seconds: int = 0
+        schedule_delay_seconds: int = 0,
+        task_id: Optional[str] = None
     ) -> Optional[str]:
         """
         Create a Cloud Task with webhook signature and timestamp.
@@ -136,46 +241,99 @@ class BaseCloudTasksClient:
             target_url: Target service URL (full https:// URL)
             payload: JSON payload to send (will be converted to bytes)
             schedule_delay_seconds: Optional delay before task execution (default 0)
+            task_id: Optional deterministic task ID (see create_task())
 
         Returns:
-            Task name if successful, None if failed
+            Task name if successful (or already created), None if failed
         """
-        import hmac
-        import hashlib
-        import time
-
         try:
-            # Generate Unix timestamp (seconds since epoch)
-            timestamp = str(int(time.time()))
-
-            # Create HMAC signature including timestamp
-            payload_json = json.dumps(payload)
-            message = f"{timestamp}:{payload_json}"  # Timestamp prefix prevents reordering attacks
+            # Serialize once and sign exactly the string that will be sent
+            body = json.dumps(payload)
+            custom_headers = self._signature_headers(body)
 
-            signature = hmac.new(
-                self.signing_key.encode(),
-                message.encode(),
-                hashlib.sha256
-            ).hexdigest()
+            logger.debug("🔐 [CLOUD_TASKS] Signed payload (HMAC-SHA256(timestamp:payload), timestamp %s)",
+                         custom_headers['X-Request-Timestamp'])
 
-            # Add signature AND timestamp to custom headers
-            custom_headers = {
-                "X-Signature": signature,  # Renamed from X-Webhook-Signature for consistency
-                "X-Request-Timestamp": timestamp
-            }
-
-            print(f"🔐 [CLOUD_TASKS] Generated signature with timestamp: {timestamp}")
-            print(f"🔐 [CLOUD_TASKS] Signature format: HMAC-SHA256(timestamp:payload)")
-
-            # Use create_task with custom headers
-            return self.create_task(
+            # Use the shared creation path with the signature headers
+            return self._create_task_from_body(
                 queue_name=queue_name,
                 target_url=target_url,
-                payload=payload,
+                body=body,
                 schedule_delay_seconds=schedule_delay_seconds,
-                custom_headers=custom_headers
+                custom_headers=custom_headers,
+                task_id=task_id
             )
 
         except Exception as e:
-            print(f"❌ [CLOUD_TASKS] Error creating signed task: {e}")
+            logger.error("❌ [CLOUD_TASKS] Error creating signed task: %s", e)
             return None
+
+    def create_tasks_bulk(
+        self,
+        tasks: List[Dict[str, Any]],
+        signed: bool = False,
+        max_workers: int = DEFAULT_BULK_MAX_WORKERS
+    ) -> List[Dict[str, Any]]:
+        """
+        Create many Cloud Tasks concurrently over a bounded worker pool.
+
+        Each payload is serialized exactly once; signed tasks are signed over
+        those same bytes (same header format as create_signed_task()).
+        One failing task never affects the others.
+
+        Args:
+            tasks: List of task specs, each a dict with:
+                   - queue_name: Name of the Cloud Tasks queue
+                   - target_url: Target service URL (full https:// URL)
+                   - payload: JSON payload to send
+                   - schedule_delay_seconds: Optional delay (default 0)
+                   - custom_headers: Optional custom headers
+            signed: Add X-Signature / X-Request-Timestamp headers to every task
+            max_workers: Maximum concurrent create_task calls (default 10)
+
+        Returns:
+            List of results in the same order as `tasks`, each a dict with:
+            - index: Position of the task spec in `tasks`
+            - success: True if the task was created
+            - task_name: Task name if successful, None otherwise
+            - error: Error message if failed, None otherwise
+        """
+        if not tasks:
+            return []
+
+        logger.info("🚀 [CLOUD_TASKS] Bulk creating %d task(s) (signed=%s, max_workers=%d)", len(tasks), signed, max_workers)
+
+        # One timestamp for the whole batch keeps signatures consistent within a run
+        timestamp = str(int(time.time())) if signed else None
+
+        def create_one(index: int, spec: Dict[str, Any]) -> Dict[str, Any]:
+            try:
+                body = json.dumps(spec['payload'])
+                headers = dict(spec.get('custom_headers') or {})
+                if signed:
+                    headers.update(self._signature_headers(body, timestamp))
+
+                parent = self.client.queue_path(self.project_id, self.location, spec['queue_name'])
+                task = self._build_task(
+                    spec['target_url'],
+                    body,
+                    spec.get('schedule_delay_seconds', 0),
+                    headers
+                )
+                response = self.client.create_task(request={"parent": parent, "task": task})
+                return {'index': index, 'success': True, 'task_name': response.name, 'error': None}
+
+            except Exception as e:
+                return {'index': index, 'success': False, 'task_name': None, 'error': str(e)}
+
+        workers = max(1, min(max_workers, len(tasks)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cloudtasks-bulk") as executor:
+            results = list(executor.map(create_one, range(len(tasks)), tasks))
+
+        succeeded = sum(1 for r in results if r['success'])
+        logger.info("✅ [CLOUD_TASKS] Bulk create finished: %d/%d task(s) created", succeeded, len(tasks))
+        for r in results:
+            if not r['success']:
+                logger.error("❌ [CLOUD_TASKS] Task #%d failed: %s", r['index'], r['error'])
+
+        return results
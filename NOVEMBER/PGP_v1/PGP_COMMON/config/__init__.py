@@ -1,5 +1,6 @@
 """Configuration management module for PGP_v1 services."""
 
 from PGP_COMMON.config.base_config import BaseConfigManager
+from PGP_COMMON.config.secret_cache import SecretCache, get_secret_cache
 
-__all__ = ["BaseConfigManager"]
+__all__ = ["BaseConfigManager", "SecretCache", "get_secret_cache"]
@@ -5,9 +5,10 @@ Provides common configuration methods shared across all PGP_v1 microservices.
 """
 import os
 from google.cloud import secretmanager
-from typing import Optional, Dict
+from typing import Optional, Dict, Any
 from abc import ABC, abstractmethod
 from flask import g
+from PGP_COMMON.config.secret_cache import get_secret_cache
 
 
 class BaseConfigManager(ABC):
@@ -17,6 +18,7 @@ class BaseConfigManager(ABC):
     This class provides common methods for:
     - Fetching secrets from environment variables (Cloud Run secret injection) - STATIC
     - Fetching secrets from Secret Manager API dynamically - HOT-RELOADABLE
+      (process-level TTL cache with bounded staleness, see secret_cache.py)
     - Fetching environment variables
     - Fetching database configuration
     - Fetching Cloud Tasks configuration
@@ -33,6 +35,7 @@ class BaseConfigManager(ABC):
         """
         self.service_name = service_name
         self.client = secretmanager.SecretManagerServiceClient()
+        self.secret_cache = get_secret_cache()
         print(f"⚙️ [CONFIG] ConfigManager initialized for {service_name}")
 
     def build_secret_path(self, secret_name: str, version: str = "latest") -> str:
@@ -61,6 +64,11 @@ class BaseConfigManager(ABC):
         This method fetches secrets at request time, allowing for zero-downtime secret rotation.
         Use this for: API keys, service URLs, queue names, webhook secrets, config values.
 
+        Values are cached process-wide (SECRET_CACHE_TTL_SECONDS). Between the TTL and
+        SECRET_CACHE_MAX_STALENESS_SECONDS the cached value is served while it is
+        refreshed in the background; a rotated secret is therefore picked up within
+        max staleness at the latest.
+
         NEVER use this for:
         - HOST_WALLET_PRIVATE_KEY (ETH wallet private key)
         - SUCCESS_URL_SIGNING_KEY (JWT signing key)
@@ -96,8 +104,38 @@ class BaseConfigManager(ABC):
                 # Flask context not available (e.g., during init) - skip caching
                 pass
 
+        # Process-level caching: TTL + stale-while-revalidate, bounded by max staleness
+        secret_value = self.secret_cache.get(
+            secret_path,
+            lambda: self._access_secret_version(secret_path, description)
+        )
+        if not secret_value:
+            return None
+
+        # Store in request-level cache if cache_key provided
+        if cache_key:
+            try:
+                if not hasattr(g, 'secret_cache'):
+                    g.secret_cache = {}
+                g.secret_cache[cache_key] = secret_value
+            except RuntimeError:
+                # Flask context not available - skip caching
+                pass
+
+        return secret_value
+
+    def _access_secret_version(self, secret_path: str, description: str = "") -> Optional[str]:
+        """
+        Fetch a secret value from the Secret Manager API (uncached).
+
+        Args:
+            secret_path: Full Secret Manager path
+            description: Human-readable description for logging
+
+        Returns:
+            Secret value or None if empty or on error
+        """
         try:
-            # Fetch from Secret Manager API
             response = self.client.access_secret_version(request={"name": secret_path})
             secret_value = response.payload.data.decode("UTF-8").strip()
 
@@ -106,23 +144,21 @@ class BaseConfigManager(ABC):
                 return None
 
             print(f"✅ [CONFIG] Hot-reloaded {description or secret_path}")
-
-            # Store in request-level cache if cache_key provided
-            if cache_key:
-                try:
-                    if not hasattr(g, 'secret_cache'):
-                        g.secret_cache = {}
-                    g.secret_cache[cache_key] = secret_value
-                except RuntimeError:
-                    # Flask context not available - skip caching
-                    pass
-
             return secret_value
 
         except Exception as e:
             print(f"❌ [CONFIG] Error fetching {description or secret_path}: {e}")
             return None
 
+    def get_secret_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get process-level secret cache counters (hits, stale hits, misses, refreshes).
+
+        Returns:
+            Dictionary with cache statistics
+        """
+        return self.secret_cache.stats()
+
     def fetch_secret(self, secret_name_env: str, description: str = "") -> Optional[str]:
         """
         Fetch a secret value from environment variable (STATIC - loaded at container startup).
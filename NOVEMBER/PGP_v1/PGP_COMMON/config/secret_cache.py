@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+"""
+Process-level Secret Cache for PGP_v1 Services.
+Caches hot-reloadable Secret Manager values with a TTL and stale-while-revalidate refresh.
+
+Freshness windows (per secret):
+    age <= ttl                      → served from cache (hit)
+    ttl < age <= max_staleness      → served from cache (stale hit) + background refresh
+    age > max_staleness (or absent) → fetched synchronously from Secret Manager (miss)
+
+max_staleness bounds how long a rotated secret can keep its old value, which
+preserves the hot-reload guarantee of fetch_secret_dynamic().
+
+Configuration (environment variables):
+    SECRET_CACHE_TTL_SECONDS            Fresh window in seconds (default: 60, 0 disables the cache)
+    SECRET_CACHE_MAX_STALENESS_SECONDS  Hard upper bound on value age (default: 300)
+
+Usage:
+    from PGP_COMMON.config.secret_cache import get_secret_cache
+
+    cache = get_secret_cache()
+    value = cache.get(secret_path, lambda: fetch_from_secret_manager(secret_path))
+    print(cache.stats())
+"""
+import os
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SECRET_CACHE_TTL = 60
+DEFAULT_SECRET_CACHE_MAX_STALENESS = 300
+
+
+class SecretCache:
+    """
+    Thread-safe TTL cache for Secret Manager values with background refresh.
+
+    Attributes:
+        ttl: Seconds a value is considered fresh
+        max_staleness: Seconds after which a value must not be served anymore
+    """
+
+    def __init__(self, ttl: int = DEFAULT_SECRET_CACHE_TTL, max_staleness: int = DEFAULT_SECRET_CACHE_MAX_STALENESS):
+        """
+        Initialize the SecretCache.
+
+        Args:
+            ttl: Fresh window in seconds (0 disables caching)
+            max_staleness: Maximum age in seconds a value may be served (clamped to >= ttl)
+        """
+        self.ttl = max(0, ttl)
+        self.max_staleness = max(self.ttl, max_staleness)
+        self._entries: Dict[str, tuple] = {}  # key -> (value, fetched_at)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="secret-refresh")
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, key: str, fetcher: Callable[[], Optional[str]]) -> Optional[str]:
+        """
+        Get a secret value, fetching it with `fetcher` when missing or too old.
+
+        Args:
+            key: Cache key (the full Secret Manager path)
+            fetcher: Callable returning the current secret value or None on failure
+
+        Returns:
+            Secret value or None if it could not be fetched
+        """
+        if not self.enabled:
+            return fetcher()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, fetched_at = entry
+                age = now - fetched_at
+                if age <= self.ttl:
+                    self.hits += 1
+                    return value
+                if age <= self.max_staleness:
+                    self.stale_hits += 1
+                    self._schedule_refresh(key, fetcher)
+                    return value
+            self.misses += 1
+
+        value = fetcher()
+        if value is not None:
+            self.set(key, value)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store a freshly fetched value."""
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """
+        Drop one cached value (or all values when key is None).
+
+        Args:
+            key: Cache key to drop, or None to clear the whole cache
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _schedule_refresh(self, key: str, fetcher: Callable[[], Optional[str]]) -> None:
+        """Start a background refresh for key unless one is already running (caller holds _lock)."""
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        self._executor.submit(self._refresh, key, fetcher)
+
+    def _refresh(self, key: str, fetcher: Callable[[], Optional[str]]) -> None:
+        try:
+            value = fetcher()
+            if value is not None:
+                self.set(key, value)
+                with self._lock:
+                    self.refreshes += 1
+            else:
+                with self._lock:
+                    self.refresh_failures += 1
+        except Exception as e:
+            logger.warning(f"⚠️ [SECRET_CACHE] Background refresh failed: {e}")
+            with self._lock:
+                self.refresh_failures += 1
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters.
+
+        Returns:
+            Dictionary with hits, stale_hits, misses, refreshes, refresh_failures,
+            cached entry count and configured windows
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'refreshes': self.refreshes,
+                'refresh_failures': self.refresh_failures,
+                'entries': len(self._entries),
+                'ttl_seconds': self.ttl,
+                'max_staleness_seconds': self.max_staleness
+            }
+
+
+def _env_int(var_name: str, default: int) -> int:
+    value = (os.getenv(var_name) or '').strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"⚠️ [SECRET_CACHE] Invalid {var_name}='{value}', using default {default}")
+        return default
+
+
+# Global secret cache instance (singleton)
+_secret_cache: Optional[SecretCache] = None
+_secret_cache_lock = threading.Lock()
+
+
+def get_secret_cache() -> SecretCache:
+    """
+    Get global SecretCache instance (singleton pattern).
+
+    Windows are read from SECRET_CACHE_TTL_SECONDS and
+    SECRET_CACHE_MAX_STALENESS_SECONDS on first use.
+
+    Returns:
+        Process-wide SecretCache instance
+    """
+    global _secret_cache
+
+    with _secret_cache_lock:
+        if _secret_cache is None:
+            _secret_cache = SecretCache(
+                ttl=_env_int('SECRET_CACHE_TTL_SECONDS', DEFAULT_SECRET_CACHE_TTL),
+                max_staleness=_env_int('SECRET_CACHE_MAX_STALENESS_SECONDS', DEFAULT_SECRET_CACHE_MAX_STALENESS)
+            )
+            logger.info(
+                f"🗝️ [SECRET_CACHE] Initialized (ttl={_secret_cache.ttl}s, "
+                f"max_staleness={_secret_cache.max_staleness}s)"
+            )
+        return _secret_cache
@@ -1,5 +1,21 @@
 """Database management module for PGP_v1 services."""
 
-from PGP_COMMON.database.db_manager import BaseDatabaseManager
+from PGP_COMMON.database.db_manager import (
+    BaseDatabaseManager,
+    UnitOfWork,
+    TransactionError,
+)
+from PGP_COMMON.database.connection_pool import (
+    get_shared_engine,
+    get_pool_metrics,
+    dispose_all_engines,
+)
 
-__all__ = ["BaseDatabaseManager"]
+__all__ = [
+    "BaseDatabaseManager",
+    "UnitOfWork",
+    "TransactionError",
+    "get_shared_engine",
+    "get_pool_metrics",
+    "dispose_all_engines",
+]
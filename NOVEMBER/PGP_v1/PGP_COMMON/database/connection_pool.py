@@ -0,0 +1,324 @@
+#!/usr/bin/env python
+"""
+Process-wide Connection Pool for PGP_v1 Services.
+Provides a shared, thread-safe SQLAlchemy QueuePool engine on top of the Cloud SQL Connector.
+
+Every BaseDatabaseManager in a process that points at the same
+(instance, database, user) reuses ONE engine and ONE Cloud SQL Connector,
+so a request no longer pays a connector handshake + pg8000 auth per statement.
+
+Configuration (environment variables, overridable per manager):
+    DB_POOL_SIZE         Persistent connections kept open (default: 5)
+    DB_POOL_MAX_OVERFLOW Extra burst connections above pool size (default: 10)
+    DB_POOL_TIMEOUT      Seconds to wait for a free connection (default: 30)
+    DB_POOL_RECYCLE      Seconds before a connection is recycled (default: 1800)
+    DB_POOL_PRE_PING     Health check connection before use (default: true)
+
+Usage:
+    from PGP_COMMON.database.connection_pool import get_shared_engine
+
+    engine = get_shared_engine(
+        instance_connection_name, db_name, db_user, db_password,
+        service_name="PGP_ORCHESTRATOR_v1"
+    )
+    conn = engine.raw_connection()  # pg8000 DBAPI connection proxied by the pool
+"""
+import os
+import threading
+import logging
+from typing import Optional, Dict, Any, Tuple
+from google.cloud.sql.connector import Connector
+from sqlalchemy import create_engine, event, pool
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Default pool settings (same values as the H-06 fix in PGP_BROADCAST_v1 / PGP_SERVER_v1)
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_TIMEOUT = 30
+DEFAULT_POOL_RECYCLE = 1800
+DEFAULT_POOL_PRE_PING = True
+
+# Process-wide registry: one engine per (instance, database, user)
+_engines: Dict[Tuple[str, str, str], Engine] = {}
+_engine_settings: Dict[Tuple[str, str, str], Dict[str, Any]] = {}  # Settings each engine was created with
+_engine_services: Dict[Tuple[str, str, str], set] = {}  # Services whose metrics listen on each engine
+_metrics: Dict[str, "PoolMetrics"] = {}
+_connector: Optional[Connector] = None
+_registry_lock = threading.Lock()
+
+
+def _env_int(var_name: str, default: int) -> int:
+    """Read an integer pool setting from the environment, falling back to default."""
+    value = (os.getenv(var_name) or '').strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"⚠️ [DB_POOL] Invalid {var_name}='{value}', using default {default}")
+        return default
+
+
+def _env_bool(var_name: str, default: bool) -> bool:
+    """Read a boolean pool setting from the environment, falling back to default."""
+    value = (os.getenv(var_name) or '').strip().lower()
+    if not value:
+        return default
+    return value in ('1', 'true', 'yes', 'on')
+
+
+def resolve_pool_settings(
+    pool_size: Optional[int] = None,
+    max_overflow: Optional[int] = None,
+    pool_timeout: Optional[int] = None,
+    pool_recycle: Optional[int] = None,
+    pool_pre_ping: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Resolve pool settings from explicit arguments, environment variables and defaults.
+
+    Explicit arguments win over environment variables, which win over defaults.
+
+    Returns:
+        Dictionary with pool_size, max_overflow, pool_timeout, pool_recycle, pool_pre_ping
+    """
+    return {
+        'pool_size': pool_size if pool_size is not None else _env_int('DB_POOL_SIZE', DEFAULT_POOL_SIZE),
+        'max_overflow': max_overflow if max_overflow is not None else _env_int('DB_POOL_MAX_OVERFLOW', DEFAULT_MAX_OVERFLOW),
+        'pool_timeout': pool_timeout if pool_timeout is not None else _env_int('DB_POOL_TIMEOUT', DEFAULT_POOL_TIMEOUT),
+        'pool_recycle': pool_recycle if pool_recycle is not None else _env_int('DB_POOL_RECYCLE', DEFAULT_POOL_RECYCLE),
+        'pool_pre_ping': pool_pre_ping if pool_pre_ping is not None else _env_bool('DB_POOL_PRE_PING', DEFAULT_POOL_PRE_PING),
+    }
+
+
+class PoolMetrics:
+    """
+    Thread-safe per-service counters for pool usage.
+
+    Counters:
+    - checkouts: Connections handed out by get_connection()
+    - checkout_failures: get_connection() calls that could not obtain a connection
+    - total_wait_ms / max_wait_ms: Time spent waiting for a connection from the pool
+    - connects: New physical connections opened (Cloud SQL Connector handshakes)
+    - invalidations: Connections discarded by pre-ping or errors
+    """
+
+    def __init__(self, service_name: str):
+        self.service_name = service_name
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.connects = 0
+        self.invalidations = 0
+
+    def record_checkout(self, wait_ms: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            if wait_ms > self.max_wait_ms:
+                self.max_wait_ms = wait_ms
+
+    def record_checkout_failure(self) -> None:
+        with self._lock:
+            self.checkout_failures += 1
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a point-in-time copy of the counters."""
+        with self._lock:
+            avg_wait_ms = self.total_wait_ms / self.checkouts if self.checkouts else 0.0
+            return {
+                'service': self.service_name,
+                'checkouts': self.checkouts,
+                'checkout_failures': self.checkout_failures,
+                'avg_wait_ms': round(avg_wait_ms, 3),
+                'max_wait_ms': round(self.max_wait_ms, 3),
+                'connects': self.connects,
+                'invalidations': self.invalidations
+            }
+
+
+def get_pool_metrics(service_name: str) -> PoolMetrics:
+    """
+    Get (or create) the PoolMetrics instance for a service.
+
+    Args:
+        service_name: Name of the service (e.g., 'PGP_SPLIT1_v1')
+
+    Returns:
+        PoolMetrics shared by every manager of that service in this process
+    """
+    with _registry_lock:
+        metrics = _metrics.get(service_name)
+        if metrics is None:
+            metrics = PoolMetrics(service_name)
+            _metrics[service_name] = metrics
+        return metrics
+
+
+def _get_connector() -> Connector:
+    """Return the process-wide Cloud SQL Connector (caller must hold _registry_lock)."""
+    global _connector
+    if _connector is None:
+        _connector = Connector()
+        logger.info("🔌 [DB_POOL] Cloud SQL Connector initialized (process-wide)")
+    return _connector
+
+
+def get_shared_engine(
+    instance_connection_name: str,
+    db_name: str,
+    db_user: str,
+    db_password: str,
+    service_name: str,
+    **pool_overrides
+) -> Engine:
+    """
+    Get the process-wide pooled engine for a database, creating it on first use.
+
+    Creating the engine does not open any connection; the first physical
+    connection is made lazily on the first checkout.
+
+    The pool settings of the first caller win: a later caller asking for
+    different settings gets the existing engine and a warning.
+
+    Args:
+        instance_connection_name: Cloud SQL instance connection name
+        db_name: Database name
+        db_user: Database user
+        db_password: Database password
+        service_name: Name of the service (for metrics and logging)
+        **pool_overrides: Optional pool_size, max_overflow, pool_timeout,
+                          pool_recycle, pool_pre_ping (see resolve_pool_settings)
+
+    Returns:
+        SQLAlchemy Engine backed by a QueuePool
+    """
+    key = (instance_connection_name, db_name, db_user)
+    settings = resolve_pool_settings(**pool_overrides)
+
+    with _registry_lock:
+        engine = _engines.get(key)
+        created = engine is None
+
+        if created:
+            connector = _get_connector()
+
+            def getconn():
+                return connector.connect(
+                    instance_connection_name,
+                    "pg8000",
+                    user=db_user,
+                    password=db_password,
+                    db=db_name
+                )
+
+            engine = create_engine(
+                "postgresql+pg8000://",
+                creator=getconn,
+                poolclass=pool.QueuePool,
+                pool_size=settings['pool_size'],
+                max_overflow=settings['max_overflow'],
+                pool_timeout=settings['pool_timeout'],
+                pool_recycle=settings['pool_recycle'],
+                pool_pre_ping=settings['pool_pre_ping'],
+                echo=False
+            )
+            _engines[key] = engine
+            _engine_settings[key] = settings
+            _engine_services[key] = set()
+        else:
+            existing_settings = _engine_settings[key]
+            differences = {
+                name: (existing_settings[name], value)
+                for name, value in settings.items() if existing_settings[name] != value
+            }
+            if differences:
+                logger.warning(
+                    f"⚠️ [DB_POOL] {service_name} requested pool settings for {db_name} that differ from "
+                    f"the shared engine - keeping the shared engine's settings (shared, requested): {differences}"
+                )
+
+        # Each service's metrics listen once, also on an engine another service created
+        attach_metrics = service_name not in _engine_services[key]
+        _engine_services[key].add(service_name)
+
+    if attach_metrics:
+        metrics = get_pool_metrics(service_name)
+        event.listen(engine, "connect", lambda dbapi_conn, record: metrics.record_connect())
+        event.listen(engine, "invalidate", lambda dbapi_conn, record, exc: metrics.record_invalidation())
+
+    if not created:
+        return engine
+
+    logger.info(f"✅ [DB_POOL] Shared connection pool created for {service_name}")
+    logger.info(f"   Instance: {instance_connection_name}, Database: {db_name}")
+    logger.info(
+        f"   Pool size: {settings['pool_size']}, max_overflow: {settings['max_overflow']}, "
+        f"timeout: {settings['pool_timeout']}s, recycle: {settings['pool_recycle']}s, "
+        f"pre_ping: {settings['pool_pre_ping']}"
+    )
+
+    return engine
+
+
+def get_pool_status(engine: Engine) -> Dict[str, Any]:
+    """
+    Get current pool occupancy for an engine.
+
+    Args:
+        engine: SQLAlchemy Engine returned by get_shared_engine()
+
+    Returns:
+        Dictionary with pool status information
+    """
+    if engine is None:
+        return {'status': 'not_initialized'}
+
+    pool_obj = engine.pool
+    return {
+        'status': 'healthy',
+        'size': pool_obj.size(),
+        'checked_in': pool_obj.checkedin(),
+        'checked_out': pool_obj.checkedout(),
+        'overflow': pool_obj.overflow()
+    }
+
+
+def dispose_all_engines() -> None:
+    """
+    Dispose every shared engine and close the process-wide Cloud SQL Connector.
+
+    Call this on service shutdown.
+    """
+    global _connector
+
+    with _registry_lock:
+        for engine in _engines.values():
+            try:
+                engine.dispose()
+            except Exception as e:
+                logger.error(f"❌ [DB_POOL] Error disposing engine: {e}")
+        _engines.clear()
+        _engine_settings.clear()
+        _engine_services.clear()
+
+        if _connector is not None:
+            try:
+                _connector.close()
+            except Exception as e:
+                logger.error(f"❌ [DB_POOL] Error closing connector: {e}")
+            _connector = None
+
+    logger.info("🔌 [DB_POOL] All shared connection pools disposed")
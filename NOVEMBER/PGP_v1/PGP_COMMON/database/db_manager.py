@@ -4,9 +4,16 @@ Base Database Manager for PGP_v1 Services.
 Provides common database connection and utility methods shared across all PGP_v1 microservices.
 """
 import logging
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional
-from google.cloud.sql.connector import Connector
+from typing import Optional, Dict, Any
+from PGP_COMMON.database.connection_pool import (
+    get_shared_engine,
+    get_pool_metrics,
+    get_pool_status
+)
 from PGP_COMMON.utils import (
     generate_error_id,
     log_error_with_context,
@@ -16,14 +23,112 @@ from PGP_COMMON.utils import (
 logger = logging.getLogger(__name__)
 
 
+class TransactionError(Exception):
+    """Raised when a unit-of-work transaction cannot be opened or was rolled back."""
+    pass
+
+
+class _TransactionCursor:
+    """
+    Cursor wrapper used inside a unit of work.
+
+    Any failing statement marks the unit of work rollback-only, so a method
+    that swallows the error cannot lead to a silent partial commit.
+    """
+
+    def __init__(self, cursor, uow: "UnitOfWork"):
+        self._cursor = cursor
+        self._uow = uow
+
+    def execute(self, *args, **kwargs):
+        try:
+            return self._cursor.execute(*args, **kwargs)
+        except Exception:
+            self._uow.rollback()
+            raise
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+
+class _TransactionConnection:
+    """
+    Connection proxy handed out by get_connection() inside a unit of work.
+
+    commit() and close() are deferred to the end of the transaction() block;
+    rollback() rolls back the whole unit of work.
+    """
+
+    def __init__(self, uow: "UnitOfWork"):
+        self._uow = uow
+
+    def cursor(self):
+        return _TransactionCursor(self._uow.connection.cursor(), self._uow)
+
+    def commit(self):
+        # Deferred: the unit of work commits once when the transaction() block exits
+        pass
+
+    def rollback(self):
+        self._uow.rollback()
+
+    def close(self):
+        # Deferred: the unit of work returns the connection to the pool on exit
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self._uow.rollback()
+        return None
+
+    def __getattr__(self, name):
+        return getattr(self._uow.connection, name)
+
+
+class UnitOfWork:
+    """
+    A single pooled connection and transaction shared by several manager calls.
+
+    Created by BaseDatabaseManager.transaction(). While the block is active,
+    every get_connection() call on the same manager (and thread) returns a
+    proxy to this connection, so existing methods share one commit.
+
+    Attributes:
+        connection: Pooled DBAPI connection backing the transaction
+        rollback_only: True once any statement failed or a method rolled back
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rollback_only = False
+
+    def cursor(self):
+        """Return a cursor on the shared transaction connection."""
+        return _TransactionCursor(self.connection.cursor(), self)
+
+    def rollback(self):
+        """Roll back the transaction and mark the unit of work as failed."""
+        self.rollback_only = True
+        try:
+            self.connection.rollback()
+        except Exception:
+            pass
+
+
 class BaseDatabaseManager:
     """
     Base class for database operations across all PGP_v1 services.
 
     This class provides common methods for:
-    - Creating database connections using Cloud SQL Connector
+    - Checking out database connections from a process-wide pool (Cloud SQL Connector + QueuePool)
     - Getting current timestamps and datestamps
-    - Connection pooling and management
+    - Connection pooling and management (pool metrics via get_pool_metrics())
     - SQL injection protection via query validation
 
     Service-specific query methods remain in subclasses.
@@ -69,23 +174,58 @@ class BaseDatabaseManager:
         }
     }
 
-    def __init__(self, instance_connection_name: str, db_name: str, db_user: str, db_password: str, service_name: str):
+    def __init__(
+        self,
+        instance_connection_name: str,
+        db_name: str,
+        db_user: str,
+        db_password: str,
+        service_name: str,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        pool_timeout: Optional[int] = None,
+        pool_recycle: Optional[int] = None,
+        pool_pre_ping: Optional[bool] = None
+    ):
         """
         Initialize the BaseDatabaseManager.
 
+        All managers in a process that point at the same instance/database/user
+        share one pooled engine (see PGP_COMMON.database.connection_pool).
+        Pool settings default to the DB_POOL_* environment variables.
+
         Args:
             instance_connection_name: Cloud SQL instance connection name
             db_name: Database name
             db_user: Database user
             db_password: Database password
-            service_name: Name of the service (for logging)
+            service_name: Name of the service (for logging and pool metrics)
+            pool_size: Optional persistent pool size (default: DB_POOL_SIZE or 5)
+            max_overflow: Optional burst connections (default: DB_POOL_MAX_OVERFLOW or 10)
+            pool_timeout: Optional checkout timeout in seconds (default: DB_POOL_TIMEOUT or 30)
+            pool_recycle: Optional recycle age in seconds (default: DB_POOL_RECYCLE or 1800)
+            pool_pre_ping: Optional pre-ping toggle (default: DB_POOL_PRE_PING or True)
         """
         self.instance_connection_name = instance_connection_name
         self.db_name = db_name
         self.db_user = db_user
         self.db_password = db_password
         self.service_name = service_name
-        self.connector = Connector()
+
+        self.engine = get_shared_engine(
+            instance_connection_name,
+            db_name,
+            db_user,
+            db_password,
+            service_name,
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping
+        )
+        self.pool_metrics = get_pool_metrics(service_name)
+        self._transaction_local = threading.local()
 
         print(f"🗄️ [DATABASE] DatabaseManager initialized for {service_name}")
         print(f"📊 [DATABASE] Instance: {instance_connection_name}")
@@ -93,25 +233,39 @@ class BaseDatabaseManager:
 
     def get_connection(self):
         """
-        Create and return a database connection using Cloud SQL Connector.
+        Check out a database connection from the shared connection pool.
+
+        The returned object is the pooled pg8000 DBAPI connection: cursor(),
+        commit() and rollback() behave as before, and close() returns it to the
+        pool (uncommitted work is rolled back) instead of tearing it down.
+        It can be used imperatively or as a context manager:
+
+            conn = self.get_connection()
+            ...
+            conn.close()
+
+            with self.get_connection() as conn:
+                ...
 
-        This method is 100% identical across all PGP_v1 services.
+        Inside a transaction() block, the unit of work's shared connection is
+        returned instead (commit/close are deferred to the end of the block).
 
         Returns:
-            Database connection object or None if failed
+            Pooled database connection object or None if failed
         """
+        uow = self.current_transaction()
+        if uow is not None:
+            return _TransactionConnection(uow)
+
+        start = time.perf_counter()
         try:
-            connection = self.connector.connect(
-                self.instance_connection_name,
-                "pg8000",
-                user=self.db_user,
-                password=self.db_password,
-                db=self.db_name
-            )
-            print(f"🔗 [DATABASE] Connection established successfully")
+            connection = self.engine.raw_connection()
+            self.pool_metrics.record_checkout((time.perf_counter() - start) * 1000)
+            logger.debug("🔗 [DATABASE] Connection checked out from pool")
             return connection
 
         except Exception as e:
+            self.pool_metrics.record_checkout_failure()
             # Log full error details internally (not exposed to user)
             error_id = generate_error_id()
             log_error_with_context(e, error_id, {
@@ -119,9 +273,93 @@ class BaseDatabaseManager:
                 'instance': self.instance_connection_name,
                 'operation': 'get_connection'
             })
-            print(f"❌ [DATABASE] Connection failed (Error ID: {error_id})")
+            logger.error("❌ [DATABASE] Connection failed (Error ID: %s)", error_id)
             return None
 
+    def current_transaction(self) -> Optional[UnitOfWork]:
+        """
+        Get the unit of work active on this thread, if any.
+
+        Returns:
+            Active UnitOfWork or None outside a transaction() block
+        """
+        return getattr(self._transaction_local, 'uow', None)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run several manager calls on ONE connection with ONE commit.
+
+        Every method that uses get_connection() (execute_query,
+        get_payout_strategy, insert_payout_accumulation_pending,
+        IdempotencyManager.check_and_claim_processing, ...) joins the unit of
+        work while the block is active. The transaction commits when the block
+        exits normally and rolls back if it raises. Nested transaction() blocks
+        join the outer unit of work.
+
+        If any statement failed inside the block (even if the method swallowed
+        the error and returned a default), nothing is committed and
+        TransactionError is raised at the end of the block.
+
+        Yields:
+            UnitOfWork for the active transaction
+
+        Raises:
+            TransactionError: If no connection is available or the unit of work was rolled back
+
+        Example:
+            >>> with db_manager.transaction() as uow:
+            ...     strategy, threshold = db_manager.get_payout_strategy(channel_id)
+            ...     subscription_id = db_manager.get_subscription_id(user_id, channel_id)
+            ...     db_manager.insert_payout_accumulation_pending(...)
+        """
+        outer = self.current_transaction()
+        if outer is not None:
+            yield outer
+            return
+
+        conn = self.get_connection()
+        if not conn:
+            raise TransactionError("Could not establish connection for transaction")
+
+        uow = UnitOfWork(conn)
+        self._transaction_local.uow = uow
+        logger.debug("🔄 [DATABASE] Transaction started")
+
+        try:
+            yield uow
+
+            if uow.rollback_only:
+                raise TransactionError("Transaction rolled back: a statement inside the unit of work failed")
+
+            conn.commit()
+            logger.debug("✅ [DATABASE] Transaction committed")
+
+        except Exception:
+            try:
+                conn.rollback()
+                logger.warning("🔄 [DATABASE] Transaction rolled back")
+            except Exception:
+                pass
+            raise
+
+        finally:
+            self._transaction_local.uow = None
+            conn.close()
+            logger.debug("🔌 [DATABASE] Connection returned to pool")
+
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """
+        Get connection pool metrics for this service.
+
+        Returns:
+            Dictionary combining per-service counters (checkouts, wait times,
+            physical connects, invalidations) with current pool occupancy
+        """
+        metrics = self.pool_metrics.snapshot()
+        metrics['pool'] = get_pool_status(self.engine)
+        return metrics
+
     def get_current_timestamp(self) -> str:
         """
         Get current time in PostgreSQL time format.
@@ -171,7 +409,6 @@ class BaseDatabaseManager:
             except ValueError as e:
                 error_id = generate_error_id()
                 logger.error(f"❌ [SECURITY] Query validation failed (Error ID: {error_id}): {e}")
-                print(f"❌ [DATABASE] Query validation failed (Error ID: {error_id})")
                 return None
 
         conn = None
@@ -179,7 +416,7 @@ class BaseDatabaseManager:
         try:
             conn = self.get_connection()
             if not conn:
-                print(f"❌ [DATABASE] Could not establish connection")
+                logger.error("❌ [DATABASE] Could not establish connection")
                 return None
 
             cur = conn.cursor()
@@ -195,14 +432,14 @@ class BaseDatabaseManager:
                 # For INSERT/UPDATE/DELETE operations
                 conn.commit()
                 rows_affected = cur.rowcount
-                print(f"✅ [DATABASE] Query executed, {rows_affected} row(s) affected")
+                logger.debug("✅ [DATABASE] Query executed, %s row(s) affected", rows_affected)
                 return rows_affected
 
         except Exception as e:
             if conn:
                 try:
                     conn.rollback()
-                    print(f"🔄 [DATABASE] Transaction rolled back")
+                    logger.debug("🔄 [DATABASE] Transaction rolled back")
                 except Exception:
                     pass
 
@@ -214,7 +451,7 @@ class BaseDatabaseManager:
                 'fetch_one': fetch_one,
                 'fetch_all': fetch_all
             })
-            print(f"❌ [DATABASE] Query execution failed (Error ID: {error_id})")
+            logger.error("❌ [DATABASE] Query execution failed (Error ID: %s)", error_id)
             return None
 
         finally:
@@ -222,17 +459,18 @@ class BaseDatabaseManager:
                 cur.close()
             if conn:
                 conn.close()
-                print(f"🔌 [DATABASE] Connection closed")
+                logger.debug("🔌 [DATABASE] Connection returned to pool")
 
     def close_connector(self):
         """
-        Close the Cloud SQL Connector.
+        Dispose this manager's connection pool.
 
-        Call this when shutting down the service.
+        Call this when shutting down the service. Pooled connections are closed;
+        the pool reconnects lazily if the manager is used again.
         """
         try:
-            self.connector.close()
-            print(f"🔌 [DATABASE] Connector closed")
+            self.engine.dispose()
+            print(f"🔌 [DATABASE] Connection pool disposed")
         except Exception as e:
             # Log full error details internally
             error_id = generate_error_id()
@@ -240,7 +478,7 @@ class BaseDatabaseManager:
                 'service': self.service_name,
                 'operation': 'close_connector'
             })
-            print(f"❌ [DATABASE] Error closing connector (Error ID: {error_id})")
+            print(f"❌ [DATABASE] Error disposing connection pool (Error ID: {error_id})")
 
     # =========================================================================
     # SQL INJECTION PROTECTION METHODS (C-06)
@@ -952,7 +1190,9 @@ class BaseDatabaseManager:
         """
         Insert a completed host payment transaction into split_payout_hostpay table.
 
-        Shared across HOSTPAY1 and HOSTPAY3 services.
+        Shared across HOSTPAY1 and HOSTPAY3 services. Idempotent per
+        (unique_id, tx_hash) (migration 011), so a retried confirmation
+        doesn't log the payment twice.
 
         Args:
             unique_id: Database linking ID (16 chars)
@@ -969,7 +1209,7 @@ class BaseDatabaseManager:
             actual_eth_amount: ACTUAL ETH from NowPayments (default 0 for backward compat)
 
         Returns:
-            True if successful, False otherwise
+            True if successful (or already logged), False otherwise
         """
         conn = None
         cur = None
@@ -999,6 +1239,7 @@ class BaseDatabaseManager:
                 INSERT INTO split_payout_hostpay
                 (unique_id, cn_api_id, from_currency, from_network, from_amount, payin_address, is_complete, tx_hash, tx_status, gas_used, block_number, actual_eth_amount)
                 VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (unique_id, tx_hash) DO NOTHING
             """
             insert_params = (unique_id, cn_api_id, from_currency.upper(), from_network.upper(), from_amount_rounded, payin_address, is_complete, tx_hash, tx_status, gas_used, block_number, actual_eth_amount)
 
@@ -1019,11 +1260,16 @@ class BaseDatabaseManager:
 
             print(f"🔄 [HOSTPAY_DB] Executing INSERT query")
             cur.execute(insert_query, insert_params)
+            inserted = cur.rowcount > 0
 
             # Commit the transaction
             conn.commit()
             print(f"✅ [HOSTPAY_DB] Transaction committed successfully")
 
+            if not inserted:
+                print(f"ℹ️ [HOSTPAY_DB] {unique_id} / {tx_hash} already logged - skipped")
+                return True
+
             print(f"🎉 [HOSTPAY_DB] Successfully inserted record for unique_id: {unique_id}")
             print(f"   🆔 CN API ID: {cn_api_id}")
             print(f"   💰 Currency: {from_currency.upper()}")
@@ -1069,7 +1315,8 @@ class BaseDatabaseManager:
         error_code: str,
         error_message: str,
         error_details: dict,
-        attempt_count: int = 3
+        attempt_count: int = 3,
+        status: str = 'failed_pending_review'
     ) -> bool:
         """
         Insert a failed transaction into failed_transactions table.
@@ -1088,6 +1335,7 @@ class BaseDatabaseManager:
             error_message: Human-readable error message
             error_details: Additional error details (dict, will be converted to JSON)
             attempt_count: Number of attempts made
+            status: Initial status ('failed_retryable' lets the HOSTPAY3 recovery worker pick it up)
 
         Returns:
             True if insert successful, False otherwise
@@ -1129,7 +1377,7 @@ class BaseDatabaseManager:
                     created_at,
                     updated_at
                 ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s, NOW(), 'failed_pending_review', NOW(), NOW()
+                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s, NOW(), %s, NOW(), NOW()
                 )
             """
 
@@ -1144,7 +1392,8 @@ class BaseDatabaseManager:
                 error_code,
                 error_message,
                 error_details_json,
-                attempt_count
+                attempt_count,
+                status
             ))
 
             conn.commit()
@@ -11,10 +11,30 @@ Usage:
     # In library modules (just get logger)
     from PGP_COMMON.logging import get_logger
     logger = get_logger(__name__)
+
+    # Non-blocking pipeline (or LOG_ASYNC=true with setup_logger)
+    from PGP_COMMON.logging import setup_async_logging
+    setup_async_logging(level='INFO', json_format=True, capture_print=True)
 """
 from .base_logger import setup_logger, get_logger
+from .async_logging import (
+    setup_async_logging,
+    shutdown_async_logging,
+    install_print_shim,
+    uninstall_print_shim,
+    JsonFormatter,
+    SamplingFilter,
+    DeferredQueueHandler,
+)
 
 __all__ = [
     'setup_logger',
-    'get_logger'
+    'get_logger',
+    'setup_async_logging',
+    'shutdown_async_logging',
+    'install_print_shim',
+    'uninstall_print_shim',
+    'JsonFormatter',
+    'SamplingFilter',
+    'DeferredQueueHandler'
 ]
@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+"""
+Non-blocking Logging Pipeline for PGP_v1 Services.
+
+Request threads only put LogRecords on a bounded in-memory queue. Message
+formatting (including %-style args), JSON encoding and the stdout write
+happen on one background listener thread.
+
+Pieces:
+- DeferredQueueHandler: enqueues records unformatted, drops (and counts) when the queue is full
+- JsonFormatter: one JSON object per line (Cloud Logging reads 'severity' and 'message')
+- SamplingFilter: keeps 1-in-N high-volume debug records per [CATEGORY]
+- install_print_shim(): routes existing print() banners through logging
+
+Usage:
+    # Usually enabled through setup_logger() with LOG_ASYNC=true
+    from PGP_COMMON.logging import setup_async_logging
+    setup_async_logging(level='INFO', json_format=True, sample_rates={'DATABASE': 0.1})
+
+    logger.debug("🔍 [DATABASE] Fetched %d rows", count)  # Formatted off-thread, only if DEBUG is enabled
+
+Records are formatted after they are queued, so args should not be mutated
+after the logging call (pass immutable values or copies).
+"""
+import os
+import re
+import sys
+import json
+import queue
+import atexit
+import logging
+import builtins
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+DEFAULT_QUEUE_SIZE = 10000
+
+# First [CATEGORY] tag in a message, e.g. "🔍 [DATABASE] ..." -> DATABASE
+_CATEGORY_PATTERN = re.compile(r'\[([A-Za-z0-9_\-]+)\]')
+
+# Leading emoji of a print() banner -> log level (everything else is INFO)
+_PRINT_LEVELS = (
+    (('❌', '🚨', '💥'), logging.ERROR),
+    (('⚠️', '⚠'), logging.WARNING),
+    (('🔍', '🐛'), logging.DEBUG),
+)
+
+_original_print = builtins.print
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional["DeferredQueueHandler"] = None
+_setup_lock = threading.Lock()
+
+
+def get_category(record: logging.LogRecord) -> Optional[str]:
+    """
+    Category of a record: extra={'category': ...} or the first [TAG] in the message.
+
+    Only the first 80 characters of the message template are searched, so
+    this stays cheap on the calling thread.
+    """
+    category = getattr(record, 'category', None)
+    if category:
+        return category
+    match = _CATEGORY_PATTERN.search(str(record.msg)[:80])
+    return match.group(1).upper() if match else None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that defers all formatting to the listener thread."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # In-process queue: hand the record over as-is (no getMessage() on the caller)
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Never block a request on logging; the count is reported at shutdown
+            self.dropped += 1
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON for Cloud Logging."""
+
+    def __init__(self, service_name: Optional[str] = None):
+        super().__init__()
+        self.service_name = service_name or (os.getenv('K_SERVICE') or '').strip() or None
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'severity': record.levelname,
+            'message': record.getMessage(),
+            'time': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'logger': record.name,
+            'thread': record.threadName,
+        }
+        category = get_category(record)
+        if category:
+            entry['category'] = category
+        if self.service_name:
+            entry['service'] = self.service_name
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry['stack'] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fixed fraction of low-level records per category.
+
+    Sampling is deterministic (rate 0.1 keeps every 10th record of a
+    category). Records above max_level are never sampled.
+    """
+
+    def __init__(self, rates: Dict[str, float], max_level: int = logging.DEBUG):
+        """
+        Args:
+            rates: Category -> fraction to keep (0.0-1.0); '*' applies to all other categories
+            max_level: Highest level that is sampled (default: DEBUG only)
+        """
+        super().__init__()
+        self.rates = {key.upper(): value for key, value in rates.items()}
+        self.max_level = max_level
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level:
+            return True
+
+        category = get_category(record) or '*'
+        rate = self.rates.get(category, self.rates.get('*'))
+        if rate is None or rate >= 1:
+            return True
+        if rate <= 0:
+            return False
+
+        with self._lock:
+            count = self._counts.get(category, 0) + 1
+            self._counts[category] = count
+        # Keep the record whenever count * rate crosses an integer
+        return int(count * rate) != int((count - 1) * rate)
+
+
+def parse_sample_rates(value: Optional[str]) -> Dict[str, float]:
+    """
+    Parse LOG_SAMPLE_RATES, e.g. "DATABASE=0.1,CLOUD_TASKS=0.01,*=0.5".
+
+    Invalid entries are ignored.
+    """
+    rates = {}
+    for part in (value or '').split(','):
+        category, _, rate = part.partition('=')
+        if not category.strip() or not rate.strip():
+            continue
+        try:
+            rates[category.strip().upper()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            _original_print(f"⚠️  [LOGGING] Ignoring invalid LOG_SAMPLE_RATES entry '{part}'")
+    return rates
+
+
+class _PrintMessage:
+    """print() arguments joined lazily (on the listener thread)."""
+
+    __slots__ = ('args', 'sep')
+
+    def __init__(self, args: tuple, sep: str):
+        self.args = args
+        self.sep = sep
+
+    def __str__(self) -> str:
+        return self.sep.join(str(arg) for arg in self.args)
+
+
+def _print_level(args: tuple) -> int:
+    if args and isinstance(args[0], str):
+        text = args[0].lstrip()
+        for prefixes, level in _PRINT_LEVELS:
+            if text.startswith(prefixes):
+                return level
+    return logging.INFO
+
+
+def install_print_shim(logger_name: str = 'print') -> None:
+    """
+    Route print() calls that target stdout through logging.
+
+    The level is taken from the banner emoji (❌ ERROR, ⚠️ WARNING, 🔍 DEBUG,
+    otherwise INFO), so disabled levels are dropped before any string is
+    built. print(..., file=...) to anything but stdout is left untouched.
+    """
+    logger = logging.getLogger(logger_name)
+
+    def logging_print(*args, sep=' ', end='\n', file=None, flush=False):
+        if file is not None and file is not sys.stdout:
+            return _original_print(*args, sep=sep, end=end, file=file, flush=flush)
+
+        level = _print_level(args)
+        if logger.isEnabledFor(level):
+            match = _CATEGORY_PATTERN.search(args[0][:80]) if args and isinstance(args[0], str) else None
+            logger.log(
+                level, '%s', _PrintMessage(args, sep if sep is not None else ' '),
+                extra={'category': match.group(1).upper()} if match else None
+            )
+
+    builtins.print = logging_print
+
+
+def uninstall_print_shim() -> None:
+    """Restore the built-in print()."""
+    builtins.print = _original_print
+
+
+def setup_async_logging(
+    level: str = 'INFO',
+    json_format: bool = False,
+    sample_rates: Optional[Dict[str, float]] = None,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    capture_print: bool = False,
+    format_string: Optional[str] = None
+) -> QueueListener:
+    """
+    Install the queue-based pipeline on the root logger (idempotent).
+
+    Args:
+        level: Root log level name
+        json_format: Emit JSON lines (otherwise format_string text lines)
+        sample_rates: Category -> fraction of DEBUG records to keep
+        queue_size: Records buffered before new ones are dropped
+        capture_print: Route print() through logging (install_print_shim)
+        format_string: Text format when json_format is False
+
+    Returns:
+        The running QueueListener
+    """
+    global _listener, _queue_handler
+
+    with _setup_lock:
+        root = logging.getLogger()
+        root.setLevel(getattr(logging, level.upper(), logging.INFO))
+
+        if _listener is None:
+            if json_format:
+                formatter = JsonFormatter()
+            else:
+                formatter = logging.Formatter(format_string or '%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+            stream_handler = logging.StreamHandler(sys.stdout)  # Cloud Run captures stdout
+            stream_handler.setFormatter(formatter)
+
+            _queue_handler = DeferredQueueHandler(queue.Queue(maxsize=queue_size))
+            _listener = QueueListener(_queue_handler.queue, stream_handler, respect_handler_level=True)
+            _listener.start()
+            atexit.register(shutdown_async_logging)
+
+        # Replace whatever basicConfig()/earlier setup installed
+        for handler in list(root.handlers):
+            if handler is not _queue_handler:
+                root.removeHandler(handler)
+        if _queue_handler not in root.handlers:
+            root.addHandler(_queue_handler)
+
+        _queue_handler.filters.clear()
+        if sample_rates:
+            _queue_handler.addFilter(SamplingFilter(sample_rates))
+
+        if capture_print:
+            install_print_shim()
+
+        return _listener
+
+
+def shutdown_async_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener, _queue_handler
+
+    with _setup_lock:
+        if _listener is None:
+            return
+
+        uninstall_print_shim()
+        try:
+            _listener.stop()  # Drains the queue before returning
+        except queue.Full:
+            pass  # No room for the stop sentinel; the daemon thread ends with the process
+
+        root = logging.getLogger()
+        root.removeHandler(_queue_handler)
+        if _queue_handler.dropped:
+            _original_print(f"⚠️  [LOGGING] {_queue_handler.dropped} log record(s) dropped (queue full)")
+
+        _listener = None
+        _queue_handler = None
@@ -9,12 +9,21 @@ Usage:
     logger = setup_logger(__name__)
     logger.info("🚀 [APP] Service started")
     logger.debug("🔍 [DEBUG] Detailed debugging info")  # Only visible when LOG_LEVEL=DEBUG
+
+Set LOG_ASYNC=true to write through the non-blocking pipeline in
+async_logging.py instead of directly to stdout.
 """
 import os
 import logging
 import sys
 from typing import Optional
 
+from .async_logging import setup_async_logging, parse_sample_rates, DEFAULT_QUEUE_SIZE
+
+
+def _env_flag(name: str) -> bool:
+    return (os.getenv(name) or '').strip().lower() in ('1', 'true', 'yes', 'on')
+
 
 def setup_logger(
     name: str,
@@ -37,6 +46,13 @@ def setup_logger(
     Environment Variables:
         LOG_LEVEL: Production log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
                   Default: INFO (hides debug logs in production)
+        LOG_ASYNC: 'true' to format and write logs on a background thread
+                   (queue-based, never blocks the request thread). Default: false
+        LOG_FORMAT: 'json' for one JSON object per line (LOG_ASYNC only). Default: text
+        LOG_SAMPLE_RATES: Fraction of DEBUG records kept per [CATEGORY], e.g.
+                          'DATABASE=0.1,CLOUD_TASKS=0.01,*=0.5' (LOG_ASYNC only)
+        LOG_QUEUE_SIZE: Records buffered before new ones are dropped. Default: 10000
+        LOG_CAPTURE_PRINT: 'true' to route print() banners through logging (LOG_ASYNC only)
 
     Examples:
         # Production (LOG_LEVEL=INFO)
@@ -61,13 +77,24 @@ def setup_logger(
         # Structured format for Cloud Logging (consistent with existing services)
         format_string = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 
-    # Setup root logger (affects all loggers)
-    logging.basicConfig(
-        level=getattr(logging, log_level),
-        format=format_string,
-        stream=sys.stdout,  # Cloud Run captures stdout
-        force=True  # Override any previous configuration
-    )
+    if _env_flag('LOG_ASYNC'):
+        # Queue-based pipeline: formatting and stdout writes happen off the request thread
+        setup_async_logging(
+            level=log_level,
+            json_format=(os.getenv('LOG_FORMAT') or '').strip().lower() == 'json',
+            sample_rates=parse_sample_rates(os.getenv('LOG_SAMPLE_RATES')),
+            queue_size=int((os.getenv('LOG_QUEUE_SIZE') or '').strip() or DEFAULT_QUEUE_SIZE),
+            capture_print=_env_flag('LOG_CAPTURE_PRINT'),
+            format_string=format_string
+        )
+    else:
+        # Setup root logger (affects all loggers)
+        logging.basicConfig(
+            level=getattr(logging, log_level),
+            format=format_string,
+            stream=sys.stdout,  # Cloud Run captures stdout
+            force=True  # Override any previous configuration
+        )
 
     # Suppress verbose library logs (consistent with PGP_SERVER_v1 pattern)
     if suppress_libraries:
@@ -16,6 +16,8 @@ setup(
         "google-cloud-tasks>=2.13.0",
         "cloud-sql-python-connector[pg8000]>=1.4.0",
         "pg8000>=1.29.0",
+        "sqlalchemy>=2.0.0",
+        "httpx>=0.25.0",
     ],
     classifiers=[
         "Development Status :: 4 - Beta",
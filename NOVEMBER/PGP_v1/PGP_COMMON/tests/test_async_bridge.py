@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""
+Unit tests for the PGP_COMMON async bridge.
+
+Test Coverage:
+- Coroutines from many threads run on one persistent loop
+- Results and exceptions propagate to the caller
+- Timeouts cancel the coroutine
+- Calling run() from the loop thread is rejected instead of deadlocking
+- The bridge restarts after stop()
+"""
+import asyncio
+import threading
+import concurrent.futures
+
+import pytest
+
+from PGP_COMMON.utils.async_bridge import AsyncBridge, get_async_bridge, run_async
+
+
+@pytest.fixture
+def bridge():
+    bridge = AsyncBridge(name='test-async-bridge')
+    yield bridge
+    bridge.stop()
+
+
+async def current_loop():
+    return asyncio.get_running_loop()
+
+
+class TestAsyncBridge:
+    """Test suite for AsyncBridge."""
+
+    def test_runs_on_one_persistent_loop(self, bridge):
+        loops = set()
+
+        def worker():
+            loops.add(bridge.run(current_loop()))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert loops == {bridge.loop}
+        assert bridge.loop.is_running()
+
+    def test_loop_bound_resources_are_reused(self, bridge):
+        async def make_queue():
+            return asyncio.Queue()
+
+        async def use_queue(queue):
+            await queue.put('item')
+            return await queue.get()
+
+        # A loop-bound object created in one call keeps working in later calls
+        queue = bridge.run(make_queue())
+        assert bridge.run(use_queue(queue)) == 'item'
+        assert bridge.run(use_queue(queue)) == 'item'
+
+    def test_exception_propagates(self, bridge):
+        async def fail():
+            raise ValueError("telegram unavailable")
+
+        with pytest.raises(ValueError, match="telegram unavailable"):
+            bridge.run(fail())
+
+    def test_timeout_cancels_coroutine(self, bridge):
+        cancelled = threading.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        with pytest.raises(concurrent.futures.TimeoutError):
+            bridge.run(slow(), timeout=0.05)
+        assert cancelled.wait(1)
+
+    def test_run_from_loop_thread_raises(self, bridge):
+        async def nested():
+            bridge.run(current_loop())
+
+        with pytest.raises(RuntimeError):
+            bridge.run(nested())
+
+    def test_restart_after_stop(self, bridge):
+        first_loop = bridge.run(current_loop())
+        bridge.stop()
+
+        assert not bridge.is_running()
+        assert bridge.run(current_loop()) is not first_loop
+
+    def test_module_helpers_share_singleton(self):
+        assert get_async_bridge() is get_async_bridge()
+        assert run_async(current_loop()) is get_async_bridge().loop
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+Unit tests for the PGP_COMMON non-blocking logging pipeline.
+
+Test Coverage:
+- Records are formatted on the listener thread, not the caller
+- JSON lines carry severity, message and [CATEGORY]
+- Per-category sampling of DEBUG records
+- A full queue drops records instead of blocking
+- The print() shim routes stdout banners through logging by emoji level
+"""
+import io
+import json
+import queue
+import logging
+import logging.handlers
+import threading
+
+import pytest
+
+from PGP_COMMON.logging.async_logging import (
+    DeferredQueueHandler,
+    JsonFormatter,
+    SamplingFilter,
+    install_print_shim,
+    uninstall_print_shim,
+    parse_sample_rates,
+)
+
+
+class RecordingFormatter(JsonFormatter):
+    """JsonFormatter that records which thread formatted each record."""
+
+    def __init__(self):
+        super().__init__(service_name='pgp-test')
+        self.threads = []
+
+    def format(self, record):
+        self.threads.append(threading.current_thread())
+        return super().format(record)
+
+
+@pytest.fixture
+def pipeline():
+    """Logger wired to DeferredQueueHandler -> QueueListener -> in-memory stream."""
+    stream = io.StringIO()
+    formatter = RecordingFormatter()
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(formatter)
+
+    handler = DeferredQueueHandler(queue.Queue())
+    listener = logging.handlers.QueueListener(handler.queue, stream_handler)
+
+    logger = logging.getLogger('pgp-test-async-logging')
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(handler)
+    listener.start()
+
+    def lines():
+        listener.stop()
+        return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    yield logger, handler, formatter, lines
+
+    logger.removeHandler(handler)
+    if listener._thread is not None:
+        listener.stop()
+
+
+class TestAsyncLogging:
+    """Test suite for the queue-based pipeline."""
+
+    def test_formatting_happens_on_listener_thread(self, pipeline):
+        logger, _, formatter, lines = pipeline
+
+        logger.info("✅ [DATABASE] Inserted %d row(s)", 3)
+        entries = lines()
+
+        assert entries[0]['message'] == "✅ [DATABASE] Inserted 3 row(s)"
+        assert formatter.threads and threading.current_thread() not in formatter.threads
+
+    def test_json_entry_fields(self, pipeline):
+        logger, _, _, lines = pipeline
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("❌ [CLOUD_TASKS] Error creating task")
+        entry = lines()[0]
+
+        assert entry['severity'] == 'ERROR'
+        assert entry['category'] == 'CLOUD_TASKS'
+        assert entry['service'] == 'pgp-test'
+        assert 'ValueError: boom' in entry['exception']
+
+    def test_sampling_keeps_fraction_of_debug_per_category(self, pipeline):
+        logger, handler, _, lines = pipeline
+        handler.addFilter(SamplingFilter({'DATABASE': 0.25}))
+
+        for i in range(8):
+            logger.debug("🔍 [DATABASE] Query %d", i)
+            logger.debug("🔍 [CLOUD_TASKS] Task %d", i)
+        logger.info("✅ [DATABASE] Not sampled")
+        messages = [entry['message'] for entry in lines()]
+
+        assert sum('[DATABASE] Query' in m for m in messages) == 2
+        assert sum('[CLOUD_TASKS]' in m for m in messages) == 8
+        assert "✅ [DATABASE] Not sampled" in messages
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        handler = DeferredQueueHandler(queue.Queue(maxsize=1))
+        record = logging.LogRecord('x', logging.INFO, __file__, 1, "msg", None, None)
+
+        handler.handle(record)
+        handler.handle(record)
+
+        assert handler.dropped == 1
+
+    def test_parse_sample_rates(self):
+        assert parse_sample_rates("database=0.1, CLOUD_TASKS=2,*=0,bad=x,=1") == {
+            'DATABASE': 0.1, 'CLOUD_TASKS': 1.0, '*': 0.0
+        }
+        assert parse_sample_rates(None) == {}
+
+    def test_print_shim_routes_by_emoji_level(self, pipeline):
+        logger, _, _, lines = pipeline
+        install_print_shim(logger_name='pgp-test-async-logging')
+        logger.setLevel(logging.INFO)
+        try:
+            print("❌ [DATABASE] Connection failed")
+            print("⚠️ [AUTH] Slow", "login")
+            print("🔍 [DATABASE] Hidden debug banner")
+            print("✅ plain banner")
+        finally:
+            uninstall_print_shim()
+        entries = lines()
+
+        assert [(e['severity'], e['message']) for e in entries] == [
+            ('ERROR', "❌ [DATABASE] Connection failed"),
+            ('WARNING', "⚠️ [AUTH] Slow login"),
+            ('INFO', "✅ plain banner"),
+        ]
+        assert entries[0]['category'] == 'DATABASE'
+
+    def test_print_to_other_files_is_untouched(self):
+        buffer = io.StringIO()
+        install_print_shim(logger_name='pgp-test-async-logging-unused')
+        try:
+            print("❌ [DATABASE] to a file", file=buffer)
+        finally:
+            uninstall_print_shim()
+
+        assert buffer.getvalue() == "❌ [DATABASE] to a file\n"
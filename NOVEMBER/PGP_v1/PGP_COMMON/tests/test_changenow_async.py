@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+Unit tests for the asyncio ChangeNow client.
+
+Test Coverage:
+- 429 responses are retried without blocking (asyncio.sleep) and succeed
+- max_attempts hands the retry back with a computed delay (ChangeNowRetryLater)
+- The sync ChangeNowClient hands the retry back after 3 attempts by default
+- Client errors on status checks are not retried
+- Backoff delays stay within the jittered exponential window
+- Token bucket reservations space out requests once the burst is used
+"""
+import pytest
+import httpx
+from unittest.mock import Mock, AsyncMock, patch
+from PGP_COMMON.utils import changenow_async, ChangeNowClient
+from PGP_COMMON.utils.changenow_async import (
+    AsyncChangeNowClient,
+    ChangeNowRateLimiter,
+    ChangeNowRetryLater,
+    compute_backoff_delay
+)
+
+
+def make_client(responses, **kwargs):
+    """Build a client whose HTTP calls return `responses` in order."""
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        return responses[len(calls) - 1]
+
+    real_async_client = httpx.AsyncClient
+
+    def client_factory(**client_kwargs):
+        return real_async_client(transport=httpx.MockTransport(handler), **client_kwargs)
+
+    config_manager = Mock()
+    config_manager.get_changenow_api_key.return_value = "test-api-key"
+
+    client = AsyncChangeNowClient(
+        config_manager=config_manager,
+        rate_limiter=ChangeNowRateLimiter(rate=0),
+        **kwargs
+    )
+    return client, calls, client_factory
+
+
+class TestAsyncChangeNowClient:
+    """Test suite for retry and hand-back behaviour."""
+
+    def test_rate_limited_then_success(self):
+        client, calls, factory = make_client([
+            httpx.Response(429, headers={'Retry-After': '2'}),
+            httpx.Response(200, json={"status": "finished", "amountTo": "12.5"})
+        ])
+
+        with patch.object(changenow_async.httpx, 'AsyncClient', factory), \
+                patch.object(changenow_async.asyncio, 'sleep', new=AsyncMock()) as mock_sleep:
+            result = client.run_sync(client.get_transaction("cn-123"))
+
+        assert result['status'] == "finished"
+        assert str(result['amountTo']) == "12.5"
+        assert len(calls) == 2
+        assert calls[0].headers['x-changenow-api-key'] == "test-api-key"
+        # Retry-After is honoured as a lower bound on the backoff
+        assert mock_sleep.await_args.args[0] >= 2
+
+    def test_max_attempts_hands_retry_back(self):
+        client, calls, factory = make_client(
+            [httpx.Response(503), httpx.Response(503)],
+            max_attempts=2
+        )
+
+        with patch.object(changenow_async.httpx, 'AsyncClient', factory), \
+                patch.object(changenow_async.asyncio, 'sleep', new=AsyncMock()):
+            with pytest.raises(ChangeNowRetryLater) as exc_info:
+                client.run_sync(client.get_transaction_status("cn-123", prior_attempts=4))
+
+        assert len(calls) == 2
+        assert exc_info.value.attempts == 6
+        assert exc_info.value.delay_seconds >= 1
+        assert "server error (503)" in exc_info.value.reason
+
+    def test_client_error_is_not_retried(self):
+        client, calls, factory = make_client([
+            httpx.Response(404, json={"message": "Transaction not found"})
+        ])
+
+        with patch.object(changenow_async.httpx, 'AsyncClient', factory):
+            assert client.run_sync(client.get_transaction_status("bad-id")) is None
+
+        assert len(calls) == 1
+
+    def test_sync_client_hands_retry_back_by_default(self):
+        _, calls, factory = make_client([httpx.Response(503)] * 4)
+        config_manager = Mock()
+        config_manager.get_changenow_api_key.return_value = "test-api-key"
+        client = ChangeNowClient(config_manager)
+
+        with patch.object(changenow_async.httpx, 'AsyncClient', factory), \
+                patch.object(changenow_async.asyncio, 'sleep', new=AsyncMock()):
+            with pytest.raises(ChangeNowRetryLater) as exc_info:
+                client.get_estimated_amount_v2_with_retry("usdt", "eth", "eth", "eth", "100")
+
+        assert len(calls) == 3
+        assert exc_info.value.attempts == 3
+
+
+class TestBackoffAndRateLimit:
+    """Test suite for backoff computation and the token bucket."""
+
+    def test_backoff_window_grows_and_is_capped(self):
+        for attempt in range(1, 12):
+            delay = compute_backoff_delay(attempt, base_delay=1.0, max_delay=60.0)
+            assert 0 <= delay <= min(60.0, 2 ** (attempt - 1))
+
+    def test_retry_after_is_lower_bound(self):
+        assert compute_backoff_delay(1, base_delay=1.0, max_delay=60.0, retry_after=30) >= 30
+
+    def test_token_bucket_spaces_requests_after_burst(self):
+        limiter = ChangeNowRateLimiter(rate=2.0, capacity=2)
+
+        assert limiter._reserve() == 0.0
+        assert limiter._reserve() == 0.0
+        assert limiter._reserve() == pytest.approx(0.5, abs=0.05)
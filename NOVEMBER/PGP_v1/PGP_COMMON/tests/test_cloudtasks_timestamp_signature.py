@@ -17,6 +17,7 @@ import hmac
 import hashlib
 import json
 from unittest.mock import Mock, patch, MagicMock
+from google.api_core.exceptions import AlreadyExists
 from PGP_COMMON.cloudtasks import BaseCloudTasksClient
 
 
@@ -339,5 +340,112 @@ class TestEndToEndCloudTasksToServer:
         assert is_valid is False
 
 
+class TestCreateTasksBulk:
+    """Test suite for create_tasks_bulk() fan-out."""
+
+    def setup_method(self):
+        """Set up client with a mocked Cloud Tasks API."""
+        self.signing_key = "bulk_signing_key"
+        with patch('PGP_COMMON.cloudtasks.base_client.tasks_v2.CloudTasksClient'):
+            self.client = BaseCloudTasksClient(
+                project_id="test-project",
+                location="us-central1",
+                signing_key=self.signing_key,
+                service_name="TEST_SERVICE"
+            )
+        self.client.client = MagicMock()
+
+    def make_specs(self, count):
+        return [
+            {
+                'queue_name': "test-queue",
+                'target_url': "https://test-service.com/batch-payout",
+                'payload': {"token": f"token-{i}", "batch_mode": True}
+            }
+            for i in range(count)
+        ]
+
+    def test_results_preserve_order_and_isolate_failures(self):
+        """Each spec gets its own result; one failure does not affect the others."""
+        def create_task(request):
+            body = json.loads(request['task']['http_request']['body'])
+            if body['token'] == "token-1":
+                raise Exception("Cloud Tasks API error")
+            response = Mock()
+            response.name = f"tasks/{body['token']}"
+            return response
+
+        self.client.client.create_task.side_effect = create_task
+
+        results = self.client.create_tasks_bulk(self.make_specs(3), max_workers=2)
+
+        assert [r['index'] for r in results] == [0, 1, 2]
+        assert [r['success'] for r in results] == [True, False, True]
+        assert results[0]['task_name'] == "tasks/token-0"
+        assert results[1]['task_name'] is None
+        assert "Cloud Tasks API error" in results[1]['error']
+        assert self.client.client.create_task.call_count == 3
+
+    def test_signed_bulk_tasks_sign_the_sent_body(self):
+        """Signed bulk tasks carry a signature over exactly the body that is sent."""
+        self.client.client.create_task.return_value = Mock(name="task")
+
+        self.client.create_tasks_bulk(self.make_specs(2), signed=True)
+
+        for call in self.client.client.create_task.call_args_list:
+            http_request = call.kwargs['request']['task']['http_request']
+            headers = http_request['headers']
+            message = f"{headers['X-Request-Timestamp']}:{http_request['body'].decode()}"
+            expected = hmac.new(self.signing_key.encode(), message.encode(), hashlib.sha256).hexdigest()
+            assert headers['X-Signature'] == expected
+
+    def test_empty_bulk_makes_no_calls(self):
+        assert self.client.create_tasks_bulk([]) == []
+        self.client.client.create_task.assert_not_called()
+
+
+class TestNamedTasks:
+    """Test suite for deterministic task IDs (task_id)."""
+
+    def setup_method(self):
+        """Set up client with a mocked Cloud Tasks API."""
+        with patch('PGP_COMMON.cloudtasks.base_client.tasks_v2.CloudTasksClient'):
+            self.client = BaseCloudTasksClient(
+                project_id="test-project",
+                location="us-central1",
+                signing_key="named_signing_key",
+                service_name="TEST_SERVICE"
+            )
+        self.client.client = MagicMock()
+        self.client.client.task_path.side_effect = (
+            lambda project, location, queue, task: f"projects/{project}/locations/{location}/queues/{queue}/tasks/{task}"
+        )
+        self.task_path = "projects/test-project/locations/us-central1/queues/test-queue/tasks/split1-123"
+
+    def test_task_id_names_the_task(self):
+        self.client.client.create_task.return_value = Mock()
+        self.client.client.create_task.return_value.name = self.task_path
+
+        task_name = self.client.create_signed_task("test-queue", "https://test-service.com/", {"a": 1}, task_id="split1-123")
+
+        assert task_name == self.task_path
+        assert self.client.client.create_task.call_args.kwargs['request']['task']['name'] == self.task_path
+
+    def test_duplicate_task_id_is_treated_as_created(self):
+        """A retried enqueue with the same task_id is a no-op, not a failure."""
+        self.client.client.create_task.side_effect = AlreadyExists("task exists")
+
+        task_name = self.client.create_signed_task("test-queue", "https://test-service.com/", {"a": 1}, task_id="split1-123")
+
+        assert task_name == self.task_path
+
+    def test_unnamed_task_has_no_name(self):
+        self.client.client.create_task.return_value = Mock()
+
+        self.client.create_task("test-queue", "https://test-service.com/", {"a": 1})
+
+        assert 'name' not in self.client.client.create_task.call_args.kwargs['request']['task']
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""
+Unit tests for CryptoPricingClient price caching.
+
+Test Coverage:
+- Repeated lookups within the TTL are served from cache
+- get_prices() resolves many symbols with one multi-id request
+- Concurrent lookups for the same coin share one request (single-flight)
+- Failed lookups are not cached
+"""
+import threading
+import time
+from unittest.mock import Mock
+from PGP_COMMON.utils.crypto_pricing import CryptoPricingClient, PriceCache
+
+
+def coingecko_response(prices):
+    response = Mock()
+    response.status_code = 200
+    response.json.return_value = {crypto_id: {'usd': price} for crypto_id, price in prices.items()}
+    return response
+
+
+def make_client(ttl=60):
+    client = CryptoPricingClient(cache=PriceCache(ttl=ttl))
+    client.session = Mock()
+    return client
+
+
+class TestPriceCache:
+    """Test suite for cached and batched price lookups."""
+
+    def test_repeated_lookup_is_cached(self):
+        client = make_client()
+        client.session.get.return_value = coingecko_response({'ethereum': 2450.5})
+
+        assert client.get_crypto_usd_price('ETH') == 2450.5
+        assert client.get_crypto_usd_price('eth') == 2450.5
+
+        assert client.session.get.call_count == 1
+        assert client.cache.stats()['hits'] == 1
+
+    def test_get_prices_uses_one_multi_id_request(self):
+        client = make_client()
+        client.session.get.return_value = coingecko_response({'ethereum': 2450.5, 'bitcoin': 67000})
+
+        prices = client.get_prices(['ETH', 'btc', 'UNKNOWN'])
+
+        assert prices == {'ETH': 2450.5, 'btc': 67000.0, 'UNKNOWN': None}
+        assert client.session.get.call_count == 1
+        ids = client.session.get.call_args.kwargs['params']['ids'].split(',')
+        assert sorted(ids) == ['bitcoin', 'ethereum']
+
+    def test_concurrent_lookups_share_one_request(self):
+        client = make_client()
+        release = threading.Event()
+
+        def slow_get(*args, **kwargs):
+            release.wait(timeout=5)
+            return coingecko_response({'ethereum': 2450.5})
+
+        client.session.get.side_effect = slow_get
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(client.get_crypto_usd_price('ETH'))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert results == [2450.5] * 5
+        assert client.session.get.call_count == 1
+
+    def test_failed_lookup_is_not_cached(self):
+        client = make_client()
+        error_response = Mock(status_code=429)
+        client.session.get.side_effect = [error_response, coingecko_response({'ethereum': 2450.5})]
+
+        assert client.get_crypto_usd_price('ETH') is None
+        assert client.get_crypto_usd_price('ETH') == 2450.5
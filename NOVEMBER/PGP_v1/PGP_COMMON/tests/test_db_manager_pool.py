@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+"""
+Unit tests for the process-wide connection pool used by BaseDatabaseManager.
+
+Test Coverage:
+- One shared engine/connector per (instance, database, user)
+- Differing pool settings for a shared engine are logged; metrics attach per service
+- get_connection() checks out from the pool and records metrics
+- get_connection() returns None on checkout failure
+- Pool settings resolution (explicit > environment > defaults)
+- transaction() unit of work: one connection, one commit, all-or-nothing
+"""
+import pytest
+from unittest.mock import Mock, patch
+from PGP_COMMON.database import connection_pool
+from PGP_COMMON.database import BaseDatabaseManager, TransactionError
+
+
+@pytest.fixture(autouse=True)
+def reset_pool_registry():
+    """Clear the process-wide registry so each test starts without engines."""
+    connection_pool._engines.clear()
+    connection_pool._engine_settings.clear()
+    connection_pool._engine_services.clear()
+    connection_pool._metrics.clear()
+    connection_pool._connector = None
+    yield
+    connection_pool._engines.clear()
+    connection_pool._engine_settings.clear()
+    connection_pool._engine_services.clear()
+    connection_pool._metrics.clear()
+    connection_pool._connector = None
+
+
+def make_manager(service_name="TEST_SERVICE", **kwargs):
+    return BaseDatabaseManager(
+        instance_connection_name="test-project:us-central1:test-instance",
+        db_name="testdb",
+        db_user="postgres",
+        db_password="secret",
+        service_name=service_name,
+        **kwargs
+    )
+
+
+class TestSharedEngine:
+    """Test suite for engine sharing across managers."""
+
+    @patch('PGP_COMMON.database.connection_pool.event')
+    @patch('PGP_COMMON.database.connection_pool.create_engine')
+    @patch('PGP_COMMON.database.connection_pool.Connector')
+    def test_managers_share_engine_and_connector(self, mock_connector, mock_create_engine, mock_event):
+        """Managers for the same database reuse one engine and one connector."""
+        first = make_manager("SERVICE_A")
+        second = make_manager("SERVICE_B")
+
+        assert first.engine is second.engine
+        assert mock_connector.call_count == 1
+        assert mock_create_engine.call_count == 1
+
+    @patch('PGP_COMMON.database.connection_pool.event')
+    @patch('PGP_COMMON.database.connection_pool.create_engine')
+    @patch('PGP_COMMON.database.connection_pool.Connector')
+    def test_pool_settings_passed_to_engine(self, mock_connector, mock_create_engine, mock_event):
+        """Explicit pool settings reach create_engine with pre-ping and recycle."""
+        make_manager(pool_size=3, max_overflow=2)
+
+        kwargs = mock_create_engine.call_args.kwargs
+        assert kwargs['pool_size'] == 3
+        assert kwargs['max_overflow'] == 2
+        assert kwargs['pool_pre_ping'] is True
+        assert kwargs['pool_recycle'] == connection_pool.DEFAULT_POOL_RECYCLE
+
+    @patch('PGP_COMMON.database.connection_pool.event')
+    @patch('PGP_COMMON.database.connection_pool.create_engine')
+    @patch('PGP_COMMON.database.connection_pool.Connector')
+    def test_differing_pool_settings_warn(self, mock_connector, mock_create_engine, mock_event, caplog):
+        """A later caller with other pool settings gets the shared engine and a warning."""
+        first = make_manager("SERVICE_A", pool_size=3)
+        with caplog.at_level('WARNING', logger='PGP_COMMON.database.connection_pool'):
+            second = make_manager("SERVICE_B", pool_size=8)
+            third = make_manager("SERVICE_C", pool_size=3)
+
+        assert first.engine is second.engine is third.engine
+        warnings = [r.getMessage() for r in caplog.records if r.levelname == 'WARNING']
+        assert len(warnings) == 1
+        assert 'SERVICE_B' in warnings[0] and "'pool_size': (3, 8)" in warnings[0]
+
+    @patch('PGP_COMMON.database.connection_pool.event')
+    @patch('PGP_COMMON.database.connection_pool.create_engine')
+    @patch('PGP_COMMON.database.connection_pool.Connector')
+    def test_metrics_attached_once_per_service(self, mock_connector, mock_create_engine, mock_event):
+        """Each service sharing an engine gets its own connect/invalidate listeners, once."""
+        make_manager("SERVICE_A")
+        make_manager("SERVICE_B")
+        make_manager("SERVICE_B")
+
+        # connect + invalidate listener per distinct service
+        assert mock_event.listen.call_count == 4
+
+
+class TestGetConnection:
+    """Test suite for pooled get_connection()."""
+
+    @patch('PGP_COMMON.database.connection_pool.event')
+    @patch('PGP_COMMON.database.connection_pool.create_engine')
+    @patch('PGP_COMMON.database.connection_pool.Connector')
+    def test_get_connection_checks_out_from_pool(self, mock_connector, mock_create_engine, mock_event):
+        """get_connection() returns the pooled connection and counts the checkout."""
+        pooled_conn = Mock()
+        mock_create_engine.return_value.raw_connection.return_value = pooled_conn
+
+        manager = make_manager()
+        conn = manager.get_connection()
+
+        assert conn is pooled_conn
+        assert manager.pool_metrics.snapshot()['checkouts'] == 1
+        mock_connector.return_value.connect.assert_not_called()
+
+    @patch('PGP_COMMON.database.connection_pool.event')
+    @patch('PGP_COMMON.database.connection_pool.create_engine')
+    @patch('PGP_COMMON.database.connection_pool.Connector')
+    def test_get_connection_failure_returns_none(self, mock_connector, mock_create_engine, mock_event):
+        """A pool checkout error returns None and counts the failure."""
+        mock_create_engine.return_value.raw_connection.side_effect = TimeoutError("pool exhausted")
+
+        manager = make_manager()
+
+        assert manager.get_connection() is None
+        assert manager.pool_metrics.snapshot()['checkout_failures'] == 1
+
+
+class TestPoolSettings:
+    """Test suite for pool settings resolution."""
+
+    def test_environment_overrides_defaults(self, monkeypatch):
+        monkeypatch.setenv('DB_POOL_SIZE', '12')
+        monkeypatch.setenv('DB_POOL_PRE_PING', 'false')
+
+        settings = connection_pool.resolve_pool_settings()
+
+        assert settings['pool_size'] == 12
+        assert settings['pool_pre_ping'] is False
+        assert settings['max_overflow'] == connection_pool.DEFAULT_MAX_OVERFLOW
+
+    def test_explicit_overrides_environment(self, monkeypatch):
+        monkeypatch.setenv('DB_POOL_SIZE', '12')
+
+        settings = connection_pool.resolve_pool_settings(pool_size=2)
+
+        assert settings['pool_size'] == 2
+
+    def test_invalid_environment_value_uses_default(self, monkeypatch):
+        monkeypatch.setenv('DB_POOL_TIMEOUT', 'not-a-number')
+
+        settings = connection_pool.resolve_pool_settings()
+
+        assert settings['pool_timeout'] == connection_pool.DEFAULT_POOL_TIMEOUT
+
+
+class TestTransaction:
+    """Test suite for the transaction() unit of work."""
+
+    @patch('PGP_COMMON.database.connection_pool.event')
+    @patch('PGP_COMMON.database.connection_pool.create_engine')
+    @patch('PGP_COMMON.database.connection_pool.Connector')
+    def test_methods_share_one_connection_and_commit(self, mock_connector, mock_create_engine, mock_event):
+        """Calls inside transaction() use one checkout and commit once."""
+        pooled_conn = Mock()
+        pooled_conn.cursor.return_value.fetchone.side_effect = [('threshold', 100), (42,)]
+        mock_create_engine.return_value.raw_connection.return_value = pooled_conn
+
+        manager = make_manager()
+        with manager.transaction():
+            strategy = manager.get_payout_strategy(-1001234567890)
+            subscription_id = manager.get_subscription_id(123456789, -1001234567890)
+
+        assert strategy == ('threshold', 100.0)
+        assert subscription_id == 42
+        assert mock_create_engine.return_value.raw_connection.call_count == 1
+        assert pooled_conn.commit.call_count == 1
+        assert pooled_conn.close.call_count == 1
+        assert manager.current_transaction() is None
+
+    @patch('PGP_COMMON.database.connection_pool.event')
+    @patch('PGP_COMMON.database.connection_pool.create_engine')
+    @patch('PGP_COMMON.database.connection_pool.Connector')
+    def test_swallowed_statement_failure_rolls_back_everything(self, mock_connector, mock_create_engine, mock_event):
+        """A method that swallows a DB error still prevents the final commit."""
+        pooled_conn = Mock()
+        pooled_conn.cursor.return_value.execute.side_effect = RuntimeError("deadlock detected")
+        mock_create_engine.return_value.raw_connection.return_value = pooled_conn
+
+        manager = make_manager()
+        with pytest.raises(TransactionError):
+            with manager.transaction():
+                # get_payout_strategy catches the error and returns the default
+                assert manager.get_payout_strategy(-1001234567890) == ('instant', 0)
+
+        pooled_conn.commit.assert_not_called()
+        assert pooled_conn.rollback.called
+        assert pooled_conn.close.call_count == 1
+
+    @patch('PGP_COMMON.database.connection_pool.event')
+    @patch('PGP_COMMON.database.connection_pool.create_engine')
+    @patch('PGP_COMMON.database.connection_pool.Connector')
+    def test_nested_transaction_joins_outer(self, mock_connector, mock_create_engine, mock_event):
+        """A nested transaction() block reuses the outer unit of work."""
+        manager = make_manager()
+
+        with manager.transaction() as outer:
+            with manager.transaction() as inner:
+                assert inner is outer
+
+        assert mock_create_engine.return_value.raw_connection.call_count == 1
+        assert mock_create_engine.return_value.raw_connection.return_value.commit.call_count == 1
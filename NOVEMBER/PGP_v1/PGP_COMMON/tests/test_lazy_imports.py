@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+"""
+Unit tests for the lazy (PEP 562) exports of PGP_COMMON and PGP_COMMON.utils.
+
+Test Coverage:
+- Importing the packages does not import GCP clients or heavy dependencies
+- Importing one utility only loads its own submodule
+- Every name in __all__ resolves to the submodule attribute
+- Unknown names raise AttributeError
+"""
+import os
+import sys
+import json
+import subprocess
+
+import pytest
+
+import PGP_COMMON
+import PGP_COMMON.utils
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HEAVY_MODULES = [
+    'google.cloud.sql.connector',
+    'google.cloud.secretmanager',
+    'google.cloud.tasks_v2',
+    'sqlalchemy',
+    'redis',
+    'requests',
+    'httpx',
+]
+
+
+def loaded_modules(code: str) -> dict:
+    """Run code in a fresh interpreter and report which HEAVY_MODULES got imported."""
+    script = (
+        f"import sys, json\n{code}\n"
+        f"print(json.dumps({{m: m in sys.modules for m in {HEAVY_MODULES!r}}}))"
+    )
+    output = subprocess.check_output([sys.executable, '-c', script], cwd=REPO_ROOT, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+class TestLazyImports:
+    """Test suite for lazy package exports."""
+
+    def test_package_import_is_lightweight(self):
+        loaded = loaded_modules("import PGP_COMMON, PGP_COMMON.utils")
+        assert not any(loaded.values()), loaded
+
+    def test_logging_import_does_not_load_gcp_clients(self):
+        loaded = loaded_modules("from PGP_COMMON.logging import setup_logger")
+        assert not any(loaded.values()), loaded
+
+    def test_utility_import_loads_only_its_submodule(self):
+        loaded = loaded_modules("from PGP_COMMON.utils import verify_sha256_signature")
+        assert not any(loaded.values()), loaded
+
+    @pytest.mark.parametrize('package', [PGP_COMMON, PGP_COMMON.utils])
+    def test_all_exports_resolve(self, package):
+        assert set(package.__all__) == set(package._LAZY_IMPORTS)
+        for name in package.__all__:
+            module = sys.modules.get(package._LAZY_IMPORTS[name]) or __import__(
+                package._LAZY_IMPORTS[name], fromlist=[name]
+            )
+            assert getattr(package, name) is getattr(module, name)
+            assert name in dir(package)
+
+    def test_unknown_name_raises_attribute_error(self):
+        with pytest.raises(AttributeError):
+            PGP_COMMON.utils.does_not_exist
@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+"""
+Unit tests for the process-level SecretCache used by BaseConfigManager.
+
+Test Coverage:
+- Fresh values are served from cache (hit)
+- Stale values are served while a background refresh runs
+- Values older than max staleness are re-fetched synchronously
+- TTL of 0 disables caching
+- Failed fetches are not cached
+"""
+from unittest.mock import Mock, patch
+from PGP_COMMON.config.secret_cache import SecretCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSecretCache:
+    """Test suite for SecretCache freshness windows."""
+
+    def setup_method(self):
+        self.clock = FakeClock()
+        self.patcher = patch('PGP_COMMON.config.secret_cache.time.monotonic', self.clock)
+        self.patcher.start()
+        self.cache = SecretCache(ttl=60, max_staleness=300)
+
+    def teardown_method(self):
+        self.patcher.stop()
+        self.cache._executor.shutdown(wait=True)
+
+    def test_fresh_value_is_cache_hit(self):
+        fetcher = Mock(return_value="queue-name")
+
+        assert self.cache.get("projects/p/secrets/Q/versions/latest", fetcher) == "queue-name"
+        self.clock.now += 30
+        assert self.cache.get("projects/p/secrets/Q/versions/latest", fetcher) == "queue-name"
+
+        assert fetcher.call_count == 1
+        stats = self.cache.stats()
+        assert stats['misses'] == 1
+        assert stats['hits'] == 1
+
+    def test_stale_value_served_and_refreshed_in_background(self):
+        fetcher = Mock(side_effect=["old-key", "new-key"])
+        key = "projects/p/secrets/API_KEY/versions/latest"
+
+        self.cache.get(key, fetcher)
+        self.clock.now += 120
+
+        # Stale but within max staleness: old value returned immediately
+        assert self.cache.get(key, fetcher) == "old-key"
+        self.cache._executor.shutdown(wait=True)
+
+        assert fetcher.call_count == 2
+        assert self.cache.get(key, fetcher) == "new-key"
+        stats = self.cache.stats()
+        assert stats['stale_hits'] == 1
+        assert stats['refreshes'] == 1
+
+    def test_value_older_than_max_staleness_is_refetched(self):
+        fetcher = Mock(side_effect=["old-url", "new-url"])
+        key = "projects/p/secrets/URL/versions/latest"
+
+        self.cache.get(key, fetcher)
+        self.clock.now += 301
+
+        assert self.cache.get(key, fetcher) == "new-url"
+        assert self.cache.stats()['misses'] == 2
+
+    def test_failed_fetch_is_not_cached(self):
+        fetcher = Mock(side_effect=[None, "recovered"])
+        key = "projects/p/secrets/URL/versions/latest"
+
+        assert self.cache.get(key, fetcher) is None
+        assert self.cache.get(key, fetcher) == "recovered"
+
+    def test_zero_ttl_disables_cache(self):
+        cache = SecretCache(ttl=0, max_staleness=0)
+        fetcher = Mock(return_value="value")
+
+        cache.get("key", fetcher)
+        cache.get("key", fetcher)
+
+        assert fetcher.call_count == 2
+        cache._executor.shutdown(wait=True)
@@ -1,72 +1,117 @@
 """
 Utility modules for PGP_v1 services.
+
+Exports are loaded lazily (PEP 562): a name is imported from its submodule
+on first access, so a service only pays for the utilities (and third-party
+dependencies such as web3, redis or httpx) it actually uses.
 """
-from PGP_COMMON.utils.crypto_pricing import CryptoPricingClient
-from PGP_COMMON.utils.changenow_client import ChangeNowClient
-from PGP_COMMON.utils.webhook_auth import (
-    verify_hmac_hex_signature,
-    verify_sha256_signature,
-    verify_sha512_signature
-)
-from PGP_COMMON.utils.ip_extraction import (
-    get_real_client_ip,
-    get_all_forwarded_ips,
-    validate_ip_format,
-    is_private_ip
-)
-from PGP_COMMON.utils.error_sanitizer import (
-    generate_error_id,
-    sanitize_error_for_user,
-    sanitize_telegram_error,
-    sanitize_database_error,
-    sanitize_sql_error,
-    sanitize_authentication_error,
-    sanitize_validation_error,
-    log_error_with_context,
-    get_environment,
-    should_show_stack_trace
-)
-from PGP_COMMON.utils.error_responses import (
-    create_error_response,
-    create_validation_error_response,
-    create_authentication_error_response,
-    create_authorization_error_response,
-    create_not_found_error_response,
-    create_rate_limit_error_response,
-    create_database_error_response,
-    handle_flask_exception,
-    create_success_response
-)
-from PGP_COMMON.utils.wallet_validation import (
-    validate_wallet_address,
-    validate_ethereum_address,
-    validate_bitcoin_address,
-    get_checksum_address,
-    WalletValidationError
-)
-from PGP_COMMON.utils.redis_client import (
-    NonceTracker,
-    NonceTrackerError,
-    get_nonce_tracker
-)
-from PGP_COMMON.utils.idempotency import (
-    IdempotencyManager
-)
-from PGP_COMMON.utils.validation import (
-    ValidationError,
-    validate_telegram_user_id,
-    validate_telegram_channel_id,
-    validate_payment_id,
-    validate_order_id_format,
-    validate_crypto_amount,
-    validate_payment_status,
-    validate_crypto_address,
-    validate_crypto_symbol
-)
+import importlib
+
+# Submodule -> public names it defines
+_LAZY_MODULES = {
+    'PGP_COMMON.utils.crypto_pricing': (
+        'CryptoPricingClient',
+        'PriceCache',
+        'get_price_cache',
+    ),
+    'PGP_COMMON.utils.changenow_client': (
+        'ChangeNowClient',
+    ),
+    'PGP_COMMON.utils.changenow_async': (
+        'AsyncChangeNowClient',
+        'ChangeNowRetryLater',
+        'ChangeNowRequestError',
+        'ChangeNowRateLimiter',
+        'compute_backoff_delay',
+        'get_changenow_rate_limiter',
+    ),
+    'PGP_COMMON.utils.async_bridge': (
+        'AsyncBridge',
+        'get_async_bridge',
+        'run_async',
+    ),
+    'PGP_COMMON.utils.webhook_auth': (
+        'verify_hmac_hex_signature',
+        'verify_sha256_signature',
+        'verify_sha512_signature',
+    ),
+    'PGP_COMMON.utils.ip_extraction': (
+        'get_real_client_ip',
+        'get_all_forwarded_ips',
+        'validate_ip_format',
+        'is_private_ip',
+    ),
+    'PGP_COMMON.utils.error_sanitizer': (
+        'generate_error_id',
+        'sanitize_error_for_user',
+        'sanitize_telegram_error',
+        'sanitize_database_error',
+        'sanitize_sql_error',
+        'sanitize_authentication_error',
+        'sanitize_validation_error',
+        'log_error_with_context',
+        'get_environment',
+        'should_show_stack_trace',
+    ),
+    'PGP_COMMON.utils.error_responses': (
+        'create_error_response',
+        'create_validation_error_response',
+        'create_authentication_error_response',
+        'create_authorization_error_response',
+        'create_not_found_error_response',
+        'create_rate_limit_error_response',
+        'create_database_error_response',
+        'handle_flask_exception',
+        'create_success_response',
+    ),
+    'PGP_COMMON.utils.wallet_validation': (
+        'validate_wallet_address',
+        'validate_ethereum_address',
+        'validate_bitcoin_address',
+        'get_checksum_address',
+        'WalletValidationError',
+    ),
+    'PGP_COMMON.utils.redis_client': (
+        'NonceTracker',
+        'NonceTrackerError',
+        'get_nonce_tracker',
+    ),
+    'PGP_COMMON.utils.idempotency': (
+        'IdempotencyManager',
+    ),
+    'PGP_COMMON.utils.validation': (
+        'ValidationError',
+        'validate_telegram_user_id',
+        'validate_telegram_channel_id',
+        'validate_payment_id',
+        'validate_order_id_format',
+        'validate_crypto_amount',
+        'validate_payment_status',
+        'validate_crypto_address',
+        'validate_crypto_symbol',
+    ),
+}
+
+_LAZY_IMPORTS = {
+    name: module_path
+    for module_path, names in _LAZY_MODULES.items()
+    for name in names
+}
 
 __all__ = [
     'CryptoPricingClient',
+    'PriceCache',
+    'get_price_cache',
     'ChangeNowClient',
+    'AsyncChangeNowClient',
+    'ChangeNowRetryLater',
+    'ChangeNowRequestError',
+    'ChangeNowRateLimiter',
+    'compute_backoff_delay',
+    'get_changenow_rate_limiter',
+    'AsyncBridge',
+    'get_async_bridge',
+    'run_async',
     'verify_hmac_hex_signature',
     'verify_sha256_signature',
     'verify_sha512_signature',
@@ -112,3 +157,17 @@ __all__ = [
     'validate_crypto_address',
     'validate_crypto_symbol'
 ]
+
+
+def __getattr__(name):
+    module_path = _LAZY_IMPORTS.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_path), name)
+    globals()[name] = value  # Cache: later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
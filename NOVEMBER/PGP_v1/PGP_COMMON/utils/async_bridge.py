@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+"""
+Async bridge for synchronous (Flask) services.
+
+One long-lived event loop runs on a daemon thread per process. Sync code
+submits coroutines to it with run_async() instead of creating a new event
+loop per request, so loop-bound resources (python-telegram-bot's httpx
+connection pool, httpx.AsyncClient instances) are created once and reused
+across requests.
+
+Usage:
+    from PGP_COMMON.utils import run_async
+
+    bot = Bot(token)
+    run_async(bot.send_message(chat_id=chat_id, text="Hello"), timeout=30)
+
+Objects bound to the bridge loop (Bots, HTTP clients) must only be awaited
+through the bridge.
+"""
+import os
+import atexit
+import asyncio
+import threading
+import concurrent.futures
+from typing import Any, Awaitable, Optional
+
+DEFAULT_SHUTDOWN_TIMEOUT = 5.0
+
+
+class AsyncBridge:
+    """
+    Persistent event loop on a background thread with a run_coroutine_threadsafe API.
+
+    The loop starts lazily on first use and is restarted automatically in a
+    forked child process (the parent's loop thread does not survive fork).
+    """
+
+    def __init__(self, name: str = 'pgp-async-bridge'):
+        """
+        Initialize the bridge (the loop thread starts on first use).
+
+        Args:
+            name: Name of the loop thread
+        """
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """The bridge's event loop (started if needed)."""
+        self.start()
+        return self._loop
+
+    def is_running(self) -> bool:
+        return (
+            self._loop is not None
+            and self._pid == os.getpid()
+            and self._thread is not None
+            and self._thread.is_alive()
+        )
+
+    def start(self) -> None:
+        """Start the loop thread if it is not running in this process."""
+        if self.is_running():
+            return
+
+        with self._lock:
+            if self.is_running():
+                return
+
+            loop = asyncio.new_event_loop()
+            started = threading.Event()
+
+            def run_loop():
+                asyncio.set_event_loop(loop)
+                loop.call_soon(started.set)
+                loop.run_forever()
+
+            thread = threading.Thread(target=run_loop, name=self.name, daemon=True)
+            thread.start()
+            started.wait()
+
+            self._loop = loop
+            self._thread = thread
+            self._pid = os.getpid()
+            print(f"🔁 [ASYNC_BRIDGE] Event loop thread '{self.name}' started (pid {self._pid})")
+
+    def submit(self, coro: Awaitable[Any]) -> concurrent.futures.Future:
+        """
+        Schedule a coroutine on the bridge loop without waiting for it.
+
+        Args:
+            coro: Coroutine to run
+
+        Returns:
+            concurrent.futures.Future with the coroutine's result
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+        """
+        Run a coroutine on the bridge loop and wait for its result.
+
+        Args:
+            coro: Coroutine to run
+            timeout: Seconds to wait (None = no limit). On timeout the coroutine
+                     is cancelled and concurrent.futures.TimeoutError is raised.
+
+        Returns:
+            The coroutine's result (exceptions propagate)
+
+        Raises:
+            RuntimeError: If called from the bridge loop thread (would deadlock)
+        """
+        if self._thread is threading.current_thread():
+            coro.close()
+            raise RuntimeError("AsyncBridge.run() called from the bridge loop thread - await the coroutine instead")
+
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def stop(self, timeout: float = DEFAULT_SHUTDOWN_TIMEOUT) -> None:
+        """
+        Stop the loop thread and close the loop.
+
+        Args:
+            timeout: Seconds to wait for the loop thread to exit
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            if loop is None or self._pid != os.getpid():
+                return
+
+            if thread is not None and thread.is_alive():
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join(timeout)
+            if not loop.is_running():
+                loop.close()
+
+            self._loop = None
+            self._thread = None
+            print(f"🔒 [ASYNC_BRIDGE] Event loop thread '{self.name}' stopped")
+
+
+# Global bridge instance (singleton) - one loop thread per process
+_async_bridge: Optional[AsyncBridge] = None
+_async_bridge_lock = threading.Lock()
+
+
+def get_async_bridge() -> AsyncBridge:
+    """
+    Get global AsyncBridge instance (singleton pattern).
+
+    Returns:
+        Process-wide AsyncBridge (loop thread started on first use)
+    """
+    global _async_bridge
+
+    with _async_bridge_lock:
+        if _async_bridge is None:
+            _async_bridge = AsyncBridge()
+            atexit.register(_async_bridge.stop)
+        return _async_bridge
+
+
+def run_async(coro: Awaitable[Any], timeout: Optional[float] = None) -> Any:
+    """
+    Run a coroutine on the process-wide bridge loop from synchronous code.
+
+    Args:
+        coro: Coroutine to run
+        timeout: Seconds to wait (None = no limit)
+
+    Returns:
+        The coroutine's result (exceptions propagate)
+    """
+    return get_async_bridge().run(coro, timeout)
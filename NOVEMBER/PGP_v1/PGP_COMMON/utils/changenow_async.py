@@ -0,0 +1,592 @@
+#!/usr/bin/env python
+"""
+Async ChangeNow API Client for PGP_v1 Services.
+Non-blocking retry for ChangeNow API v2 calls (asyncio + httpx).
+
+Resilience:
+- Exponential backoff with full jitter between attempts:
+      delay = uniform(0, min(max_delay, base_delay * 2^(attempt - 1)))
+  A Retry-After header from ChangeNow (HTTP 429) is used as a lower bound.
+- Process-wide token bucket shared by every client, so a retry storm from one
+  request cannot push the whole instance further into ChangeNow's rate limit.
+- Process-wide bound on in-flight ChangeNow requests.
+- Optional hand-back to Cloud Tasks: with max_attempts set, the client raises
+  ChangeNowRetryLater (carrying schedule_delay_seconds) once the in-process
+  attempts are used up, instead of sleeping in the request thread.
+
+Configuration (environment variables):
+    CHANGENOW_RATE_LIMIT_PER_SECOND  Token bucket refill rate (default: 5, 0 disables)
+    CHANGENOW_RATE_LIMIT_BURST       Token bucket capacity (default: 10)
+    CHANGENOW_MAX_IN_FLIGHT          Concurrent ChangeNow requests per process (default: 10)
+
+Usage:
+    from PGP_COMMON.utils import AsyncChangeNowClient, ChangeNowRetryLater
+
+    client = AsyncChangeNowClient(config_manager, max_attempts=3)
+    try:
+        status = client.run_sync(client.get_transaction_status(cn_api_id))
+    except ChangeNowRetryLater as retry:
+        cloudtasks_client.create_task(
+            queue_name, target_url, payload,
+            schedule_delay_seconds=retry.delay_seconds
+        )
+
+Dependencies:
+- httpx: Async HTTP client
+"""
+import os
+import math
+import time
+import random
+import asyncio
+import logging
+import threading
+import weakref
+from decimal import Decimal
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Try to import httpx
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    logger.warning("⚠️ [CHANGENOW_ASYNC] httpx not installed - AsyncChangeNowClient unavailable")
+
+CHANGENOW_BASE_URL_V2 = "https://api.changenow.io/v2"
+
+# In-process attempts made by the sync ChangeNowClient before ChangeNowRetryLater
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 60.0
+DEFAULT_REQUEST_TIMEOUT = 30
+DEFAULT_RATE_LIMIT_PER_SECOND = 5.0
+DEFAULT_RATE_LIMIT_BURST = 10
+DEFAULT_MAX_IN_FLIGHT = 10
+
+
+class ChangeNowRetryLater(Exception):
+    """
+    Raised when in-process attempts are exhausted and the retry should be
+    handed back to Cloud Tasks.
+
+    Attributes:
+        delay_seconds: Suggested schedule_delay_seconds for the re-enqueued task
+        attempts: Total attempts made so far (including prior deliveries)
+        reason: Last failure reason
+    """
+
+    def __init__(self, delay_seconds: int, attempts: int, reason: str):
+        self.delay_seconds = delay_seconds
+        self.attempts = attempts
+        self.reason = reason
+        super().__init__(f"ChangeNow retry deferred by {delay_seconds}s after {attempts} attempt(s): {reason}")
+
+
+class ChangeNowRequestError(Exception):
+    """Raised for non-retryable ChangeNow API errors (HTTP 4xx except 429)."""
+
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        self.message = message
+        super().__init__(f"ChangeNow API error {status_code}: {message}")
+
+
+def compute_backoff_delay(
+    attempt: int,
+    base_delay: float = DEFAULT_BASE_DELAY,
+    max_delay: float = DEFAULT_MAX_DELAY,
+    retry_after: Optional[float] = None
+) -> float:
+    """
+    Compute an exponential backoff delay with full jitter.
+
+    Args:
+        attempt: 1-based attempt number that just failed
+        base_delay: Delay ceiling for the first retry (seconds)
+        max_delay: Upper bound for any delay (seconds)
+        retry_after: Optional server-provided Retry-After (seconds), used as a lower bound
+
+    Returns:
+        Delay in seconds
+    """
+    exponent = min(max(attempt - 1, 0), 30)
+    ceiling = min(max_delay, base_delay * (2 ** exponent))
+    delay = random.uniform(0, ceiling)
+    if retry_after:
+        delay = max(delay, min(retry_after, max_delay))
+    return delay
+
+
+class ChangeNowRateLimiter:
+    """
+    Thread-safe token bucket usable from any event loop.
+
+    Tokens are reserved under a threading lock and the caller sleeps with
+    asyncio.sleep() for its reservation, so waiting never blocks a thread.
+
+    Attributes:
+        rate: Tokens added per second (<= 0 disables limiting)
+        capacity: Maximum burst size
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE_LIMIT_PER_SECOND, capacity: int = DEFAULT_RATE_LIMIT_BURST):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait for it."""
+        if self.rate <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    async def acquire(self) -> None:
+        """Wait (without blocking the event loop) until a request may be sent."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class _InFlightLimiter:
+    """Process-wide bound on concurrent requests, usable from any event loop."""
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._semaphore = threading.BoundedSemaphore(self.limit)
+
+    async def __aenter__(self):
+        delay = 0.005
+        while not self._semaphore.acquire(blocking=False):
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 0.1)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+        return False
+
+
+def _env_number(var_name: str, default, cast):
+    value = (os.getenv(var_name) or '').strip()
+    if not value:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        logger.warning(f"⚠️ [CHANGENOW_ASYNC] Invalid {var_name}='{value}', using default {default}")
+        return default
+
+
+# Process-wide limiters (singletons) shared by every client in the process
+_rate_limiter: Optional[ChangeNowRateLimiter] = None
+_in_flight_limiter: Optional[_InFlightLimiter] = None
+_limiters_lock = threading.Lock()
+
+
+def get_changenow_rate_limiter() -> ChangeNowRateLimiter:
+    """
+    Get the process-wide ChangeNow token bucket (singleton pattern).
+
+    Returns:
+        ChangeNowRateLimiter configured from CHANGENOW_RATE_LIMIT_* variables
+    """
+    global _rate_limiter
+
+    with _limiters_lock:
+        if _rate_limiter is None:
+            _rate_limiter = ChangeNowRateLimiter(
+                rate=_env_number('CHANGENOW_RATE_LIMIT_PER_SECOND', DEFAULT_RATE_LIMIT_PER_SECOND, float),
+                capacity=_env_number('CHANGENOW_RATE_LIMIT_BURST', DEFAULT_RATE_LIMIT_BURST, int)
+            )
+            logger.info(
+                f"🪣 [CHANGENOW_ASYNC] Rate limiter initialized "
+                f"({_rate_limiter.rate}/s, burst {_rate_limiter.capacity})"
+            )
+        return _rate_limiter
+
+
+def _get_in_flight_limiter() -> _InFlightLimiter:
+    global _in_flight_limiter
+
+    with _limiters_lock:
+        if _in_flight_limiter is None:
+            _in_flight_limiter = _InFlightLimiter(
+                _env_number('CHANGENOW_MAX_IN_FLIGHT', DEFAULT_MAX_IN_FLIGHT, int)
+            )
+        return _in_flight_limiter
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds (HTTP-date values are ignored)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def _error_message(response) -> str:
+    try:
+        return response.json().get('message', 'Unknown error')
+    except ValueError:
+        return response.text
+
+
+class AsyncChangeNowClient:
+    """
+    Asyncio client for ChangeNow API v2 with non-blocking backoff.
+
+    HOT-RELOAD ENABLED: when built with a config_manager, the API key is fetched
+    through get_changenow_api_key() on every attempt.
+
+    Retry behaviour:
+    - max_attempts=None: retry indefinitely (up to the Cloud Tasks 24-hour limit)
+    - max_attempts=N: after N attempts raise ChangeNowRetryLater with a computed delay
+    """
+
+    def __init__(
+        self,
+        config_manager=None,
+        api_key: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        base_delay: float = DEFAULT_BASE_DELAY,
+        max_delay: float = DEFAULT_MAX_DELAY,
+        timeout: float = DEFAULT_REQUEST_TIMEOUT,
+        rate_limiter: Optional[ChangeNowRateLimiter] = None
+    ):
+        """
+        Initialize the async ChangeNow client.
+
+        Args:
+            config_manager: ConfigManager with get_changenow_api_key() (hot-reload)
+            api_key: Static API key (used when no config_manager is given)
+            max_attempts: In-process attempts before handing back to Cloud Tasks (None = infinite)
+            base_delay: Backoff ceiling for the first retry (seconds)
+            max_delay: Upper bound for any backoff delay (seconds)
+            timeout: Per-request timeout (seconds)
+            rate_limiter: Token bucket (default: process-wide limiter)
+        """
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx is required for AsyncChangeNowClient")
+        if config_manager is None and not api_key:
+            raise ValueError("config_manager or api_key is required")
+
+        self.config_manager = config_manager
+        self.api_key = api_key
+        self.base_url_v2 = CHANGENOW_BASE_URL_V2
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter or get_changenow_rate_limiter()
+        self.in_flight = _get_in_flight_limiter()
+
+        # One httpx.AsyncClient per event loop (connection pools are loop-bound)
+        self._http_clients = weakref.WeakKeyDictionary()
+        self._http_clients_lock = threading.Lock()
+
+        logger.debug("🔗 [CHANGENOW_ASYNC] Initialized (max_attempts=%s, max_in_flight=%d)", max_attempts, self.in_flight.limit)
+
+    # ========== SESSION MANAGEMENT ==========
+
+    def _get_http_client(self) -> "httpx.AsyncClient":
+        loop = asyncio.get_running_loop()
+        with self._http_clients_lock:
+            client = self._http_clients.get(loop)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    base_url=self.base_url_v2,
+                    timeout=self.timeout,
+                    headers={'Content-Type': 'application/json'}
+                )
+                self._http_clients[loop] = client
+            return client
+
+    async def aclose(self) -> None:
+        """Close the HTTP connection pool bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._http_clients_lock:
+            client = self._http_clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    def run_sync(self, coro):
+        """
+        Run a client coroutine from synchronous (Flask) code.
+
+        Args:
+            coro: Coroutine returned by one of the client's async methods
+
+        Returns:
+            The coroutine's result (exceptions propagate)
+        """
+        async def runner():
+            try:
+                return await coro
+            finally:
+                await self.aclose()
+
+        return asyncio.run(runner())
+
+    def _fetch_api_key(self) -> Optional[str]:
+        """Fetch the API key (hot-reloaded through config_manager when available)."""
+        if self.config_manager is None:
+            return self.api_key
+        try:
+            api_key = self.config_manager.get_changenow_api_key()
+            if not api_key:
+                logger.error("❌ [CHANGENOW_ASYNC] API key not available from Secret Manager")
+            return api_key
+        except Exception as e:
+            logger.error("❌ [CHANGENOW_ASYNC] Failed to fetch API key: %s", e)
+            return None
+
+    # ========== RETRY CORE ==========
+
+    async def _request_with_retry(
+        self,
+        method: str,
+        path: str,
+        operation: str,
+        params: Optional[Dict[str, Any]] = None,
+        json_body: Optional[Dict[str, Any]] = None,
+        retry_client_errors: bool = True,
+        prior_attempts: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Send a ChangeNow request, retrying retryable failures with backoff.
+
+        Args:
+            method: HTTP method
+            path: API path relative to the v2 base URL
+            operation: Operation name (for logging)
+            params: Query parameters
+            json_body: JSON body
+            retry_client_errors: Retry HTTP 4xx (except 429) instead of raising ChangeNowRequestError
+            prior_attempts: Attempts already made by earlier Cloud Tasks deliveries
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            ChangeNowRetryLater: max_attempts reached (retry should be re-enqueued)
+            ChangeNowRequestError: Non-retryable client error (retry_client_errors=False)
+        """
+        attempt = 0
+
+        while True:
+            attempt += 1
+            total_attempts = prior_attempts + attempt
+            retry_after = None
+            logger.debug("🔄 [CHANGENOW_RETRY] %s attempt #%d", operation, total_attempts)
+
+            try:
+                api_key = self._fetch_api_key()
+                if not api_key:
+                    reason = "API key not available"
+                else:
+                    await self.rate_limiter.acquire()
+                    async with self.in_flight:
+                        response = await self._get_http_client().request(
+                            method,
+                            path,
+                            params=params,
+                            json=json_body,
+                            headers={'x-changenow-api-key': api_key}
+                        )
+
+                    status_code = response.status_code
+                    logger.debug("📊 [CHANGENOW_RETRY] %s response status: %d", operation, status_code)
+
+                    if status_code == 200:
+                        try:
+                            result = response.json()
+                            logger.debug("✅ [CHANGENOW_RETRY] %s succeeded after %d attempt(s)", operation, total_attempts)
+                            return result
+                        except ValueError as json_error:
+                            reason = f"JSON decode error: {json_error}"
+                    elif status_code == 429:
+                        retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+                        reason = "rate limited (429)"
+                    elif 500 <= status_code < 600:
+                        reason = f"server error ({status_code})"
+                    else:
+                        message = _error_message(response)
+                        if not retry_client_errors:
+                            raise ChangeNowRequestError(status_code, message)
+                        reason = f"API error {status_code}: {message}"
+
+            except ChangeNowRequestError:
+                raise
+            except httpx.TimeoutException:
+                reason = "request timeout"
+            except httpx.TransportError as e:
+                reason = f"connection error: {e}"
+            except Exception as e:
+                reason = f"unexpected error: {e}"
+
+            delay = compute_backoff_delay(total_attempts, self.base_delay, self.max_delay, retry_after)
+
+            if self.max_attempts is not None and attempt >= self.max_attempts:
+                delay_seconds = max(1, math.ceil(delay))
+                logger.warning("📤 [CHANGENOW_RETRY] %s: %s - handing retry back to Cloud Tasks in %ds",
+                               operation, reason, delay_seconds)
+                raise ChangeNowRetryLater(delay_seconds=delay_seconds, attempts=total_attempts, reason=reason)
+
+            logger.warning("⏳ [CHANGENOW_RETRY] %s: %s - retrying in %.1fs", operation, reason, delay)
+            await asyncio.sleep(delay)
+
+    # ========== API OPERATIONS ==========
+
+    async def get_estimated_amount(
+        self,
+        from_currency: str,
+        to_currency: str,
+        from_network: str,
+        to_network: str,
+        from_amount: str,
+        flow: str = "standard",
+        type_: str = "direct",
+        prior_attempts: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Get estimated exchange amount (GET /exchange/estimated-amount).
+
+        Returns:
+            Estimate response with toAmount, depositFee, withdrawalFee as Decimal objects
+        """
+        params = {
+            "fromCurrency": from_currency.lower(),
+            "toCurrency": to_currency.lower(),
+            "fromNetwork": from_network.lower(),
+            "toNetwork": to_network.lower(),
+            "fromAmount": from_amount,
+            "toAmount": "",  # Empty for fromAmount-based estimates
+            "flow": flow,
+            "type": type_
+        }
+
+        logger.debug("📈 [CHANGENOW_ESTIMATE_V2] Getting estimate: %s %s → %s",
+                     from_amount, from_currency.upper(), to_currency.upper())
+
+        result = await self._request_with_retry(
+            "GET", "/exchange/estimated-amount", "ESTIMATE",
+            params=params, prior_attempts=prior_attempts
+        )
+
+        # ✅ Parse amounts as Decimal to preserve precision
+        for field in ('toAmount', 'depositFee', 'withdrawalFee'):
+            result[field] = Decimal(str(result.get(field, 0) or 0))
+
+        logger.debug("💰 [CHANGENOW_ESTIMATE_V2] Estimated receive: %s %s", result['toAmount'], to_currency.upper())
+        return result
+
+    async def create_fixed_rate_transaction(
+        self,
+        from_currency: str,
+        to_currency: str,
+        from_amount: float,
+        address: str,
+        from_network: str = None,
+        to_network: str = None,
+        user_id: str = None,
+        rate_id: str = None,
+        prior_attempts: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Create a fixed-rate transaction (POST /exchange).
+
+        Returns:
+            Transaction data (id, payinAddress, toAmount, ...)
+        """
+        # Use provided networks or fall back to currency defaults
+        actual_from_network = from_network.lower() if from_network else from_currency.lower()
+        actual_to_network = to_network.lower() if to_network else to_currency.lower()
+
+        transaction_data = {
+            "fromCurrency": from_currency.lower(),
+            "toCurrency": to_currency.lower(),
+            "fromNetwork": actual_from_network,
+            "toNetwork": actual_to_network,
+            "fromAmount": str(from_amount),
+            "toAmount": "",
+            "address": address,
+            "extraId": "",
+            "refundAddress": "",
+            "refundExtraId": "",
+            "userId": user_id if user_id else "",
+            "payload": "",
+            "contactEmail": "",
+            "source": "",
+            "flow": "standard",
+            "type": "direct",
+            "rateId": rate_id if rate_id else ""
+        }
+
+        logger.debug("🚀 [CHANGENOW_TRANSACTION] Creating: %s %s (%s) → %s (%s)",
+                     from_amount, from_currency.upper(), actual_from_network,
+                     to_currency.upper(), actual_to_network)
+
+        result = await self._request_with_retry(
+            "POST", "/exchange", "TRANSACTION",
+            json_body=transaction_data, prior_attempts=prior_attempts
+        )
+
+        logger.info("🆔 [CHANGENOW_TRANSACTION] Transaction ID: %s, deposit address: %s",
+                    result.get('id', 'Unknown'), result.get('payinAddress', 'Unknown'))
+        return result
+
+    async def get_transaction(self, cn_api_id: str, prior_attempts: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Get transaction details (GET /exchange/by-id).
+
+        Client errors (e.g. unknown transaction ID) are not retried.
+
+        Returns:
+            Transaction data with amountFrom/amountTo as Decimal, or None on client error
+        """
+        try:
+            result = await self._request_with_retry(
+                "GET", "/exchange/by-id", "STATUS",
+                params={"id": cn_api_id},
+                retry_client_errors=False,
+                prior_attempts=prior_attempts
+            )
+        except ChangeNowRequestError as e:
+            logger.warning("❌ [CHANGENOW_RETRY] %s - not retrying (transaction ID likely invalid)", e)
+            return None
+
+        for field in ('amountFrom', 'amountTo'):
+            if result.get(field) is not None:
+                result[field] = Decimal(str(result[field]))
+        return result
+
+    async def get_transaction_status(self, cn_api_id: str, prior_attempts: int = 0) -> Optional[str]:
+        """
+        Get the status string of a transaction.
+
+        Returns:
+            Status ("waiting", "confirming", "exchanging", "sending", "finished",
+            "failed", "refunded", "expired") or None on client error
+        """
+        result = await self.get_transaction(cn_api_id, prior_attempts=prior_attempts)
+        if result is None:
+            return None
+        status = result.get("status", "")
+        logger.debug("📊 [CHANGENOW_RETRY] Status: %s", status)
+        return status
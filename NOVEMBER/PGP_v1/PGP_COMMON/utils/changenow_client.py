@@ -2,63 +2,50 @@
 """
 Shared ChangeNow API Client for PGP_v1 Services.
 Supports both estimate and transaction creation with hot-reload capability.
+
+Synchronous facade over AsyncChangeNowClient: retries use exponential backoff
+with jitter, a process-wide rate limit and a bounded number of in-flight
+requests instead of a fixed 60-second time.sleep(). After a few in-process
+attempts the retry is handed back to Cloud Tasks (ChangeNowRetryLater).
 """
-import requests
-import time
-from decimal import Decimal
 from typing import Dict, Any, Optional
 
+from PGP_COMMON.utils.changenow_async import AsyncChangeNowClient, ChangeNowRetryLater, DEFAULT_MAX_ATTEMPTS
+
 
 class ChangeNowClient:
     """
     Unified client for interacting with ChangeNow API v2 with built-in retry logic.
-    Retries infinitely (up to Cloud Tasks 24-hour limit) on rate limiting or errors.
+    Retries rate limiting and errors max_attempts times in-process (default 3),
+    then raises ChangeNowRetryLater so the caller hands the retry back to Cloud
+    Tasks (re-enqueue with schedule_delay_seconds, or a non-2xx response so the
+    queue redelivers) instead of blocking the request thread.
 
     HOT-RELOAD ENABLED: API key is fetched dynamically from ConfigManager on each request.
     This allows updating the API key in Secret Manager without redeploying services.
 
-    Supports two main operations:
-    1. Get estimated exchange amounts (used by SPLIT2)
-    2. Create fixed-rate transactions (used by SPLIT3)
+    Supports three main operations:
+    1. Get estimated exchange amounts (used by SPLIT2, MICROBATCHPROCESSOR)
+    2. Create fixed-rate transactions (used by SPLIT3, MICROBATCHPROCESSOR)
+    3. Get transaction status (used by HOSTPAY1)
     """
 
-    def __init__(self, config_manager):
+    def __init__(self, config_manager, max_attempts: Optional[int] = DEFAULT_MAX_ATTEMPTS):
         """
         Initialize ChangeNow client with hot-reload capability.
 
         Args:
             config_manager: ConfigManager instance for dynamic secret fetching
                            Must have get_changenow_api_key() method
+            max_attempts: In-process attempts before raising ChangeNowRetryLater
+                          (default 3; None retries indefinitely in-process)
         """
         self.config_manager = config_manager
-        self.base_url_v2 = "https://api.changenow.io/v2"
-        self.session = requests.Session()
-
-        # Set default headers (API key will be updated per-request)
-        self.session.headers.update({
-            'Content-Type': 'application/json'
-        })
+        self.async_client = AsyncChangeNowClient(config_manager=config_manager, max_attempts=max_attempts)
+        self.base_url_v2 = self.async_client.base_url_v2
 
         print(f"🔗 [CHANGENOW_CLIENT] Initialized with hot-reloadable API key")
 
-    def _fetch_api_key(self) -> Optional[str]:
-        """
-        Fetch API key dynamically from Secret Manager (HOT-RELOAD).
-
-        Returns:
-            API key string, or None if not available
-        """
-        try:
-            api_key = self.config_manager.get_changenow_api_key()
-            if api_key:
-                return api_key
-            else:
-                print(f"❌ [CHANGENOW_CLIENT] API key not available from Secret Manager")
-                return None
-        except Exception as e:
-            print(f"❌ [CHANGENOW_CLIENT] Failed to fetch API key: {e}")
-            return None
-
     def get_estimated_amount_v2_with_retry(
         self,
         from_currency: str,
@@ -67,19 +54,19 @@ class ChangeNowClient:
         to_network: str,
         from_amount: str,
         flow: str = "standard",
-        type_: str = "direct"
+        type_: str = "direct",
+        prior_attempts: int = 0
     ) -> Optional[Dict[str, Any]]:
         """
-        Get estimated exchange amount using ChangeNow API v2 with INFINITE RETRY.
+        Get estimated exchange amount using ChangeNow API v2 with retry.
 
-        This method will retry indefinitely (up to Cloud Tasks timeout of 24 hours)
-        on ANY error condition including:
-        - HTTP 429 (Rate Limit)
+        Retries on ANY error condition including:
+        - HTTP 429 (Rate Limit, Retry-After honoured)
         - HTTP 5xx (Server Error)
         - Timeout
         - Connection Error
 
-        Backoff: Fixed 60 seconds between retries (no exponential backoff)
+        Backoff: Exponential with full jitter (capped at 60 seconds)
 
         Args:
             from_currency: Source currency (e.g., "usdt")
@@ -89,118 +76,27 @@ class ChangeNowClient:
             from_amount: Amount to exchange as string
             flow: Exchange flow type (default "standard")
             type_: Exchange type (default "direct")
+            prior_attempts: Attempts made by earlier Cloud Tasks deliveries
 
         Returns:
-            Estimate response data (will eventually succeed or timeout after 24h)
+            Estimate response data
             Contains toAmount, depositFee, withdrawalFee as Decimal objects
-        """
-        attempt = 0
-
-        while True:  # Infinite retry loop
-            attempt += 1
-            print(f"🔄 [CHANGENOW_RETRY] Attempt #{attempt}")
-            print(f"📈 [CHANGENOW_ESTIMATE_V2] Getting estimate: {from_amount} {from_currency.upper()} → {to_currency.upper()}")
-
-            try:
-                # Build request parameters
-                params = {
-                    "fromCurrency": from_currency.lower(),
-                    "toCurrency": to_currency.lower(),
-                    "fromNetwork": from_network.lower(),
-                    "toNetwork": to_network.lower(),
-                    "fromAmount": from_amount,
-                    "toAmount": "",  # Empty for fromAmount-based estimates
-                    "flow": flow,
-                    "type": type_
-                }
-
-                print(f"📦 [CHANGENOW_ESTIMATE_V2] Request params: {params}")
-
-                # Fetch API key dynamically (HOT-RELOAD)
-                api_key = self._fetch_api_key()
-                if not api_key:
-                    print(f"❌ [CHANGENOW_RETRY] API key not available, waiting 60 seconds...")
-                    time.sleep(60)
-                    continue  # Retry
-
-                # Update session header with dynamically fetched API key
-                self.session.headers.update({'x-changenow-api-key': api_key})
-
-                # Make API request
-                url = f"{self.base_url_v2}/exchange/estimated-amount"
-                response = self.session.get(url, params=params, timeout=30)
-
-                print(f"📊 [CHANGENOW_ESTIMATE_V2] Response status: {response.status_code}")
-
-                # Handle rate limiting (429) - retry after 60s
-                if response.status_code == 429:
-                    print(f"⏰ [CHANGENOW_RETRY] Rate limited (429), waiting 60 seconds...")
-                    time.sleep(60)
-                    continue  # Retry
-
-                # Handle server errors (5xx) - retry after 60s
-                if 500 <= response.status_code < 600:
-                    print(f"❌ [CHANGENOW_RETRY] Server error ({response.status_code}), waiting 60 seconds...")
-                    time.sleep(60)
-                    continue  # Retry
-
-                # Handle successful response (200)
-                if response.status_code == 200:
-                    try:
-                        result = response.json()
-
-                        # ✅ Parse amounts as Decimal to preserve precision
-                        to_amount = Decimal(str(result.get('toAmount', 0)))
-                        deposit_fee = Decimal(str(result.get('depositFee', 0)))
-                        withdrawal_fee = Decimal(str(result.get('withdrawalFee', 0)))
-
-                        print(f"✅ [CHANGENOW_ESTIMATE_V2] Success after {attempt} attempt(s)")
-                        print(f"💰 [CHANGENOW_ESTIMATE_V2] Estimated receive: {to_amount} {to_currency.upper()}")
-                        print(f"📊 [CHANGENOW_ESTIMATE_V2] Deposit fee: {deposit_fee}")
-                        print(f"📊 [CHANGENOW_ESTIMATE_V2] Withdrawal fee: {withdrawal_fee}")
-
-                        # Store Decimal values back in result dict
-                        result['toAmount'] = to_amount
-                        result['depositFee'] = deposit_fee
-                        result['withdrawalFee'] = withdrawal_fee
-
-                        return result
-
-                    except ValueError as json_error:
-                        print(f"❌ [CHANGENOW_RETRY] JSON decode error: {json_error}, waiting 60 seconds...")
-                        time.sleep(60)
-                        continue  # Retry
-
-                # Handle other HTTP errors (4xx except 429) - retry after 60s
-                else:
-                    try:
-                        error_data = response.json()
-                        error_message = error_data.get('message', 'Unknown error')
-                        print(f"❌ [CHANGENOW_RETRY] API error {response.status_code}: {error_message}")
-                    except ValueError:
-                        print(f"❌ [CHANGENOW_RETRY] HTTP error {response.status_code}: {response.text}")
-
-                    print(f"⏰ [CHANGENOW_RETRY] Waiting 60 seconds before retry...")
-                    time.sleep(60)
-                    continue  # Retry
 
-            except requests.exceptions.Timeout:
-                print(f"❌ [CHANGENOW_RETRY] Request timeout, waiting 60 seconds...")
-                time.sleep(60)
-                continue  # Retry
-
-            except requests.exceptions.ConnectionError:
-                print(f"❌ [CHANGENOW_RETRY] Connection error, waiting 60 seconds...")
-                time.sleep(60)
-                continue  # Retry
-
-            except Exception as e:
-                print(f"❌ [CHANGENOW_RETRY] Unexpected error: {e}, waiting 60 seconds...")
-                time.sleep(60)
-                continue  # Retry
-
-        # This line should never be reached due to infinite loop
-        # Cloud Tasks will terminate the task after 24 hours (max-retry-duration)
+        Raises:
+            ChangeNowRetryLater: max_attempts reached - hand the retry back to Cloud Tasks
+        """
+        return self.async_client.run_sync(
+            self.async_client.get_estimated_amount(
+                from_currency=from_currency,
+                to_currency=to_currency,
+                from_network=from_network,
+                to_network=to_network,
+                from_amount=from_amount,
+                flow=flow,
+                type_=type_,
+                prior_attempts=prior_attempts
+            )
+        )
 
     def create_fixed_rate_transaction_with_retry(
         self,
@@ -211,19 +107,19 @@ class ChangeNowClient:
         from_network: str = None,
         to_network: str = None,
         user_id: str = None,
-        rate_id: str = None
+        rate_id: str = None,
+        prior_attempts: int = 0
     ) -> Optional[Dict[str, Any]]:
         """
-        Create a fixed-rate transaction with ChangeNow API v2 with INFINITE RETRY.
+        Create a fixed-rate transaction with ChangeNow API v2 with retry.
 
-        This method will retry indefinitely (up to Cloud Tasks timeout of 24 hours)
-        on ANY error condition including:
-        - HTTP 429 (Rate Limit)
+        Retries on ANY error condition including:
+        - HTTP 429 (Rate Limit, Retry-After honoured)
         - HTTP 5xx (Server Error)
         - Timeout
         - Connection Error
 
-        Backoff: Fixed 60 seconds between retries (no exponential backoff)
+        Backoff: Exponential with full jitter (capped at 60 seconds)
 
         Args:
             from_currency: Source currency (e.g., "eth")
@@ -234,125 +130,46 @@ class ChangeNowClient:
             to_network: Target network (defaults to to_currency if not provided)
             user_id: Optional user ID for tracking
             rate_id: Optional rate ID for guaranteed pricing
+            prior_attempts: Attempts made by earlier Cloud Tasks deliveries
 
         Returns:
-            Transaction data (will eventually succeed or timeout after 24h)
-        """
-        attempt = 0
-
-        while True:  # Infinite retry loop
-            attempt += 1
-            print(f"🔄 [CHANGENOW_RETRY] Attempt #{attempt}")
-            print(f"🚀 [CHANGENOW_TRANSACTION] Creating: {from_amount} {from_currency.upper()} → {to_currency.upper()}")
-
-            try:
-                # Use provided networks or fall back to currency defaults
-                actual_from_network = from_network.lower() if from_network else from_currency.lower()
-                actual_to_network = to_network.lower() if to_network else to_currency.lower()
-
-                print(f"🌐 [CHANGENOW_TRANSACTION] Networks: {actual_from_network} → {actual_to_network}")
-
-                # Build transaction data
-                transaction_data = {
-                    "fromCurrency": from_currency.lower(),
-                    "toCurrency": to_currency.lower(),
-                    "fromNetwork": actual_from_network,
-                    "toNetwork": actual_to_network,
-                    "fromAmount": str(from_amount),
-                    "toAmount": "",
-                    "address": address,
-                    "extraId": "",
-                    "refundAddress": "",
-                    "refundExtraId": "",
-                    "userId": user_id if user_id else "",
-                    "payload": "",
-                    "contactEmail": "",
-                    "source": "",
-                    "flow": "standard",
-                    "type": "direct",
-                    "rateId": rate_id if rate_id else ""
-                }
-
-                print(f"📦 [CHANGENOW_TRANSACTION] Payload: {transaction_data}")
-
-                # Fetch API key dynamically (HOT-RELOAD)
-                api_key = self._fetch_api_key()
-                if not api_key:
-                    print(f"❌ [CHANGENOW_RETRY] API key not available, waiting 60 seconds...")
-                    time.sleep(60)
-                    continue  # Retry
-
-                # Update session header with dynamically fetched API key
-                self.session.headers.update({'x-changenow-api-key': api_key})
-
-                # Make API request
-                url = f"{self.base_url_v2}/exchange"
-                response = self.session.post(url, json=transaction_data, timeout=30)
+            Transaction data
 
-                print(f"📊 [CHANGENOW_TRANSACTION] Response status: {response.status_code}")
-
-                # Handle rate limiting (429) - retry after 60s
-                if response.status_code == 429:
-                    print(f"⏰ [CHANGENOW_RETRY] Rate limited (429), waiting 60 seconds...")
-                    time.sleep(60)
-                    continue  # Retry
-
-                # Handle server errors (5xx) - retry after 60s
-                if 500 <= response.status_code < 600:
-                    print(f"❌ [CHANGENOW_RETRY] Server error ({response.status_code}), waiting 60 seconds...")
-                    time.sleep(60)
-                    continue  # Retry
-
-                # Handle successful response (200)
-                if response.status_code == 200:
-                    try:
-                        result = response.json()
-
-                        transaction_id = result.get('id', 'Unknown')
-                        payin_address = result.get('payinAddress', 'Unknown')
-                        to_amount = result.get('toAmount', 'Unknown')
-                        from_curr = result.get('fromCurrency', from_currency).upper()
-                        to_curr = result.get('toCurrency', to_currency).upper()
-
-                        print(f"✅ [CHANGENOW_TRANSACTION] Success after {attempt} attempt(s)")
-                        print(f"🆔 [CHANGENOW_TRANSACTION] Transaction ID: {transaction_id}")
-                        print(f"🏦 [CHANGENOW_TRANSACTION] Deposit address: {payin_address}")
-                        print(f"💰 [CHANGENOW_TRANSACTION] Will receive: {to_amount} {to_curr}")
-
-                        return result
-
-                    except ValueError as json_error:
-                        print(f"❌ [CHANGENOW_RETRY] JSON decode error: {json_error}, waiting 60 seconds...")
-                        time.sleep(60)
-                        continue  # Retry
-
-                # Handle other HTTP errors (4xx except 429) - retry after 60s
-                else:
-                    try:
-                        error_data = response.json()
-                        error_message = error_data.get('message', 'Unknown error')
-                        print(f"❌ [CHANGENOW_RETRY] API error {response.status_code}: {error_message}")
-                    except ValueError:
-                        print(f"❌ [CHANGENOW_RETRY] HTTP error {response.status_code}: {response.text}")
+        Raises:
+            ChangeNowRetryLater: max_attempts reached - hand the retry back to Cloud Tasks
+        """
+        return self.async_client.run_sync(
+            self.async_client.create_fixed_rate_transaction(
+                from_currency=from_currency,
+                to_currency=to_currency,
+                from_amount=from_amount,
+                address=address,
+                from_network=from_network,
+                to_network=to_network,
+                user_id=user_id,
+                rate_id=rate_id,
+                prior_attempts=prior_attempts
+            )
+        )
+
+    def get_transaction_status(self, cn_api_id: str, prior_attempts: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Get ChangeNow transaction details (status, amountFrom, amountTo).
 
-                    print(f"⏰ [CHANGENOW_RETRY] Waiting 60 seconds before retry...")
-                    time.sleep(60)
-                    continue  # Retry
+        Args:
+            cn_api_id: ChangeNow transaction ID
+            prior_attempts: Attempts made by earlier Cloud Tasks deliveries
 
-            except requests.exceptions.Timeout:
-                print(f"❌ [CHANGENOW_RETRY] Request timeout, waiting 60 seconds...")
-                time.sleep(60)
-                continue  # Retry
+        Returns:
+            Transaction data with amountFrom/amountTo as Decimal,
+            or None if ChangeNow rejected the ID
 
-            except requests.exceptions.ConnectionError:
-                print(f"❌ [CHANGENOW_RETRY] Connection error, waiting 60 seconds...")
-                time.sleep(60)
-                continue  # Retry
+        Raises:
+            ChangeNowRetryLater: max_attempts reached - hand the retry back to Cloud Tasks
+        """
+        return self.async_client.run_sync(
+            self.async_client.get_transaction(cn_api_id, prior_attempts=prior_attempts)
+        )
 
-            except Exception as e:
-                print(f"❌ [CHANGENOW_RETRY] Unexpected error: {e}, waiting 60 seconds...")
-                time.sleep(60)
-                continue  # Retry
 
-        # This line should never be reached due to infinite loop
-        # Cloud Tasks will terminate the task after 24 hours (max-retry-duration)
+__all__ = ['ChangeNowClient', 'ChangeNowRetryLater']
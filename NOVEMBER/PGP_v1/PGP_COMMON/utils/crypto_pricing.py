@@ -4,9 +4,145 @@ Crypto Pricing Client for PGP_v1 Services.
 
 Fetches cryptocurrency prices from CoinGecko API.
 Consolidates duplicate logic from PGP_NP_IPN_v1 and PGP_INVITE_v1.
+
+Prices are cached process-wide per CoinGecko ID (TTL), concurrent lookups for
+the same ID share one request (single-flight), and get_prices() fetches many
+symbols with one multi-id `simple/price` call.
+
+Configuration (environment variables):
+    CRYPTO_PRICE_CACHE_TTL_SECONDS         Cache TTL in seconds (default: 60, 0 disables the cache)
+    CRYPTO_PRICE_REFRESH_INTERVAL_SECONDS  Background refresh of all symbol_map prices
+                                           (default: 0 = disabled)
 """
+import os
+import time
+import logging
+import threading
 import requests
-from typing import Optional
+from concurrent.futures import Future
+from typing import Optional, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PRICE_CACHE_TTL = 60
+COINGECKO_TIMEOUT = 10
+
+
+class PriceCache:
+    """
+    Thread-safe TTL cache of USD prices keyed by CoinGecko ID, with single-flight fetches.
+
+    Attributes:
+        ttl: Seconds a price is considered fresh (0 disables caching)
+    """
+
+    def __init__(self, ttl: int = DEFAULT_PRICE_CACHE_TTL):
+        self.ttl = max(0, ttl)
+        self._prices: Dict[str, tuple] = {}  # coingecko_id -> (usd_price, fetched_at)
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.shared_waits = 0
+        self.api_calls = 0
+
+    def claim(self, ids: Iterable[str]):
+        """
+        Split ids into cached prices, ids being fetched by another thread, and ids to fetch.
+
+        Ids returned in `to_fetch` are registered as in-flight; the caller MUST
+        call resolve() for them.
+
+        Returns:
+            Tuple of (cached: {id: price}, waiting: {id: Future}, to_fetch: [id])
+        """
+        cached, waiting, to_fetch = {}, {}, []
+        now = time.monotonic()
+
+        with self._lock:
+            for crypto_id in ids:
+                entry = self._prices.get(crypto_id)
+                if entry is not None and self.ttl > 0 and now - entry[1] <= self.ttl:
+                    self.hits += 1
+                    cached[crypto_id] = entry[0]
+                elif crypto_id in self._inflight:
+                    self.shared_waits += 1
+                    waiting[crypto_id] = self._inflight[crypto_id]
+                else:
+                    self.misses += 1
+                    self._inflight[crypto_id] = Future()
+                    to_fetch.append(crypto_id)
+
+        return cached, waiting, to_fetch
+
+    def resolve(self, prices: Dict[str, Optional[float]]) -> None:
+        """Store fetched prices (None = failed, not cached) and release waiters."""
+        now = time.monotonic()
+        with self._lock:
+            self.api_calls += 1
+            futures = []
+            for crypto_id, price in prices.items():
+                if price is not None and self.ttl > 0:
+                    self._prices[crypto_id] = (price, now)
+                future = self._inflight.pop(crypto_id, None)
+                if future is not None:
+                    futures.append((future, price))
+
+        for future, price in futures:
+            future.set_result(price)
+
+    def invalidate(self, crypto_id: Optional[str] = None) -> None:
+        """Drop one cached price (or all prices when crypto_id is None)."""
+        with self._lock:
+            if crypto_id is None:
+                self._prices.clear()
+            else:
+                self._prices.pop(crypto_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache counters."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'shared_waits': self.shared_waits,
+                'api_calls': self.api_calls,
+                'entries': len(self._prices),
+                'ttl_seconds': self.ttl
+            }
+
+
+def _env_int(var_name: str, default: int) -> int:
+    value = (os.getenv(var_name) or '').strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"⚠️ [PRICE] Invalid {var_name}='{value}', using default {default}")
+        return default
+
+
+# Global price cache instance (singleton)
+_price_cache: Optional[PriceCache] = None
+_price_cache_lock = threading.Lock()
+
+
+def get_price_cache() -> PriceCache:
+    """
+    Get global PriceCache instance (singleton pattern).
+
+    Returns:
+        Process-wide PriceCache shared by every CryptoPricingClient
+    """
+    global _price_cache
+
+    with _price_cache_lock:
+        if _price_cache is None:
+            _price_cache = PriceCache(ttl=_env_int('CRYPTO_PRICE_CACHE_TTL_SECONDS', DEFAULT_PRICE_CACHE_TTL))
+            logger.info(f"💾 [PRICE] Price cache initialized (ttl={_price_cache.ttl}s)")
+        return _price_cache
 
 
 class CryptoPricingClient:
@@ -21,14 +157,20 @@ class CryptoPricingClient:
     - Handles stablecoins (USDT, USDC, etc.) as $1.00
     - Error handling for API failures
     - No authentication required (uses CoinGecko Free API)
+    - Process-wide TTL price cache with single-flight fetches
+    - Batched multi-symbol lookups (get_prices)
+    - Optional background refresh of every symbol in symbol_map
     """
 
-    def __init__(self):
+    def __init__(self, cache: Optional[PriceCache] = None):
         """
         Initialize CryptoPricingClient with symbol mapping.
 
         Combines symbol maps from both NP_IPN (uppercase) and INVITE (lowercase)
         to support both naming conventions.
+
+        Args:
+            cache: PriceCache to use (default: process-wide cache)
         """
         # Comprehensive symbol map (merged from INVITE + NP_IPN)
         self.symbol_map = {
@@ -68,9 +210,149 @@ class CryptoPricingClient:
         # Stablecoin list (case-insensitive)
         self.stablecoins = {'usd', 'usdt', 'usdc', 'busd', 'dai'}
 
+        self.cache = cache or get_price_cache()
+        self.session = requests.Session()
+
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_stop = threading.Event()
+
+        refresh_interval = _env_int('CRYPTO_PRICE_REFRESH_INTERVAL_SECONDS', 0)
+        if refresh_interval > 0:
+            self.start_background_refresh(refresh_interval)
+
+    def _fetch_from_coingecko(self, crypto_ids: List[str]) -> Dict[str, Optional[float]]:
+        """
+        Fetch USD prices for many CoinGecko IDs with one multi-id request.
+
+        Args:
+            crypto_ids: CoinGecko IDs (e.g., ['ethereum', 'bitcoin'])
+
+        Returns:
+            Dictionary of id -> USD price (None for ids that could not be priced)
+        """
+        prices = {crypto_id: None for crypto_id in crypto_ids}
+
+        try:
+            response = self.session.get(
+                self.coingecko_api,
+                params={'ids': ','.join(crypto_ids), 'vs_currencies': 'usd'},
+                timeout=COINGECKO_TIMEOUT
+            )
+
+            if response.status_code == 200:
+                data = response.json()
+                for crypto_id in crypto_ids:
+                    usd_price = data.get(crypto_id, {}).get('usd')
+                    if usd_price:
+                        prices[crypto_id] = float(usd_price)
+                    else:
+                        print(f"❌ [PRICE] USD price for {crypto_id} not found in response")
+            else:
+                print(f"❌ [PRICE] CoinGecko API error: {response.status_code}")
+
+        except requests.exceptions.Timeout:
+            print(f"❌ [PRICE] CoinGecko API timeout after {COINGECKO_TIMEOUT} seconds")
+        except requests.exceptions.RequestException as e:
+            print(f"❌ [PRICE] Failed to fetch price from CoinGecko: {e}")
+        except Exception as e:
+            print(f"❌ [PRICE] Unexpected error fetching crypto price: {e}")
+
+        return prices
+
+    def _get_prices_by_id(self, crypto_ids: Iterable[str]) -> Dict[str, Optional[float]]:
+        """
+        Resolve USD prices for CoinGecko IDs through the cache.
+
+        Cached prices are returned directly, ids already being fetched by another
+        thread are awaited, and the remaining ids are fetched in one request.
+        """
+        cached, waiting, to_fetch = self.cache.claim(dict.fromkeys(crypto_ids))
+        prices: Dict[str, Optional[float]] = dict(cached)
+
+        if to_fetch:
+            fetched = {crypto_id: None for crypto_id in to_fetch}
+            try:
+                fetched = self._fetch_from_coingecko(to_fetch)
+            finally:
+                # Always release in-flight claims, even on unexpected errors
+                self.cache.resolve(fetched)
+            prices.update(fetched)
+
+        for crypto_id, future in waiting.items():
+            try:
+                prices[crypto_id] = future.result(timeout=COINGECKO_TIMEOUT + 5)
+            except Exception as e:
+                print(f"❌ [PRICE] Waiting for shared {crypto_id} price failed: {e}")
+                prices[crypto_id] = None
+
+        return prices
+
+    def get_prices(self, crypto_symbols: Iterable[str]) -> Dict[str, Optional[float]]:
+        """
+        Fetch current USD prices for many symbols with at most one CoinGecko request.
+
+        Args:
+            crypto_symbols: Crypto symbols (e.g., ['ETH', 'btc', 'SOL'])
+
+        Returns:
+            Dictionary of symbol (as given) -> USD price, None for unknown symbols
+            or failed lookups
+
+        Examples:
+            >>> client = CryptoPricingClient()
+            >>> client.get_prices(['ETH', 'btc'])
+            {'ETH': 2450.5, 'btc': 67000.0}
+        """
+        symbols = list(crypto_symbols)
+        symbol_ids = {}
+        for symbol in symbols:
+            crypto_id = self.symbol_map.get(symbol)
+            if crypto_id:
+                symbol_ids[symbol] = crypto_id
+            else:
+                print(f"❌ [PRICE] Unknown crypto symbol: {symbol}")
+
+        prices_by_id = self._get_prices_by_id(symbol_ids.values()) if symbol_ids else {}
+        return {symbol: prices_by_id.get(symbol_ids.get(symbol)) for symbol in symbols}
+
+    def start_background_refresh(self, interval_seconds: Optional[int] = None) -> None:
+        """
+        Start a daemon thread that refreshes every symbol_map price periodically.
+
+        Keeps the cache warm so request paths never wait on CoinGecko.
+
+        Args:
+            interval_seconds: Refresh interval (default: 80% of the cache TTL, at least 5s)
+        """
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+
+        interval = interval_seconds or max(5, int(self.cache.ttl * 0.8))
+        crypto_ids = sorted(set(self.symbol_map.values()))
+        self._refresh_stop.clear()
+
+        def refresh_loop():
+            while not self._refresh_stop.is_set():
+                try:
+                    self.cache.resolve(self._fetch_from_coingecko(crypto_ids))
+                except Exception as e:
+                    logger.warning(f"⚠️ [PRICE] Background refresh failed: {e}")
+                self._refresh_stop.wait(interval)
+
+        self._refresh_thread = threading.Thread(target=refresh_loop, name="price-refresh", daemon=True)
+        self._refresh_thread.start()
+        print(f"🔄 [PRICE] Background refresh started ({len(crypto_ids)} coins every {interval}s)")
+
+    def stop_background_refresh(self) -> None:
+        """Stop the background refresh thread (if running)."""
+        self._refresh_stop.set()
+        if self._refresh_thread:
+            self._refresh_thread.join(timeout=COINGECKO_TIMEOUT + 5)
+            self._refresh_thread = None
+
     def get_crypto_usd_price(self, crypto_symbol: str) -> Optional[float]:
         """
-        Fetch current USD price from CoinGecko API.
+        Fetch current USD price from CoinGecko API (served from cache when fresh).
 
         Handles both uppercase (NP_IPN) and lowercase (INVITE) symbols.
 
@@ -87,45 +369,20 @@ class CryptoPricingClient:
             >>> client.get_crypto_usd_price('eth')
             2450.50
         """
-        try:
-            # Get CoinGecko ID from symbol map (supports both cases)
-            crypto_id = self.symbol_map.get(crypto_symbol)
-            if not crypto_id:
-                print(f"❌ [PRICE] Unknown crypto symbol: {crypto_symbol}")
-                print(f"💡 [PRICE] Supported symbols: {', '.join(sorted(set(self.symbol_map.keys())))}")
-                return None
-
-            # Build API request
-            url = f"{self.coingecko_api}?ids={crypto_id}&vs_currencies=usd"
-
-            print(f"🔍 [PRICE] Fetching {crypto_symbol.upper()} price from CoinGecko...")
+        # Get CoinGecko ID from symbol map (supports both cases)
+        crypto_id = self.symbol_map.get(crypto_symbol)
+        if not crypto_id:
+            print(f"❌ [PRICE] Unknown crypto symbol: {crypto_symbol}")
+            print(f"💡 [PRICE] Supported symbols: {', '.join(sorted(set(self.symbol_map.keys())))}")
+            return None
 
-            # Make request with timeout
-            response = requests.get(url, timeout=10)
+        usd_price = self._get_prices_by_id([crypto_id]).get(crypto_id)
 
-            if response.status_code == 200:
-                data = response.json()
-                usd_price = data.get(crypto_id, {}).get('usd')
+        if usd_price:
+            print(f"💰 [PRICE] {crypto_symbol.upper()}/USD = ${usd_price:,.2f}")
+            return usd_price
 
-                if usd_price:
-                    print(f"💰 [PRICE] {crypto_symbol.upper()}/USD = ${usd_price:,.2f}")
-                    return float(usd_price)
-                else:
-                    print(f"❌ [PRICE] USD price not found in response")
-                    return None
-            else:
-                print(f"❌ [PRICE] CoinGecko API error: {response.status_code}")
-                return None
-
-        except requests.exceptions.Timeout:
-            print(f"❌ [PRICE] CoinGecko API timeout after 10 seconds")
-            return None
-        except requests.exceptions.RequestException as e:
-            print(f"❌ [PRICE] Failed to fetch price from CoinGecko: {e}")
-            return None
-        except Exception as e:
-            print(f"❌ [PRICE] Unexpected error fetching crypto price: {e}")
-            return None
+        return None
 
     def convert_crypto_to_usd(self, amount: float, crypto_symbol: str) -> Optional[float]:
         """
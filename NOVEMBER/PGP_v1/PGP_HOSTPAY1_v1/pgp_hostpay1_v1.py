@@ -18,7 +18,7 @@ from config_manager import ConfigManager
 from token_manager import TokenManager
 from database_manager import DatabaseManager
 from cloudtasks_client import CloudTasksClient
-from PGP_COMMON.utils import ChangeNowClient
+from PGP_COMMON.utils import ChangeNowClient, ChangeNowRetryLater
 
 from PGP_COMMON.logging import setup_logger
 logger = setup_logger(__name__)
@@ -728,6 +728,19 @@ def payment_completed():
                     else:
                         logger.error(f"❌ [ENDPOINT_3] ChangeNow query returned no data")
 
+                except ChangeNowRetryLater as retry:
+                    # Don't block the payment response - check again through Cloud Tasks
+                    logger.warning(f"⏳ [ENDPOINT_3] ChangeNow unavailable after {retry.attempts} attempts ({retry.reason})")
+                    logger.info(f"🔄 [ENDPOINT_3] Enqueueing delayed callback check in {retry.delay_seconds}s")
+                    _enqueue_delayed_callback_check(
+                        unique_id=unique_id,
+                        cn_api_id=cn_api_id,
+                        tx_hash=tx_hash,
+                        context=context,
+                        retry_count=0,  # First retry
+                        retry_after_seconds=retry.delay_seconds
+                    )
+
                 except Exception as e:
                     logger.error(f"❌ [ENDPOINT_3] ChangeNow query error: {e}", exc_info=True)
                     import traceback
@@ -910,6 +923,20 @@ def retry_callback_check():
                         "changenow_status": status
                     }), 500
 
+        except ChangeNowRetryLater as retry:
+            # Same retry token is redelivered by the queue (valid for 24 hours)
+            logger.warning(f"⏳ [ENDPOINT_4] ChangeNow unavailable after {retry.attempts} attempts ({retry.reason}) - "
+                           f"returning 503, Cloud Tasks will redeliver")
+            response = jsonify({
+                "status": "retry_later",
+                "message": "ChangeNow unavailable, retry scheduled by Cloud Tasks",
+                "unique_id": unique_id,
+                "cn_api_id": cn_api_id,
+                "retry_after_seconds": retry.delay_seconds
+            })
+            response.headers['Retry-After'] = str(retry.delay_seconds)
+            return response, 503
+
         except Exception as e:
             logger.error(f"❌ [ENDPOINT_4] ChangeNow query error: {e}", exc_info=True)
             import traceback
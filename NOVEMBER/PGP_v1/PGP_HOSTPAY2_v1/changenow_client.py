@@ -1,7 +1,7 @@
 #!/usr/bin/env python
 """
 ChangeNow API Client for PGP_HOSTPAY2_v1 (ChangeNow Status Checker Service).
-Handles ChangeNow API status check requests with infinite retry logic.
+Handles ChangeNow API status check requests with non-blocking retry logic.
 
 Implements resilience against:
 - Rate limiting (HTTP 429)
@@ -9,134 +9,56 @@ Implements resilience against:
 - Network timeouts
 - Connection errors
 
-Retry Strategy:
-- Fixed 60-second backoff between retries
-- Infinite retries (-1 max_attempts)
+Retry Strategy (via PGP_COMMON AsyncChangeNowClient):
+- Exponential backoff with jitter, shared process-wide rate limit
+- A few in-process attempts, then ChangeNowRetryLater is raised so the
+  endpoint re-enqueues the check with schedule_delay_seconds
 - 24-hour max retry duration (handled by Cloud Tasks)
 """
-import time
-import requests
 from typing import Optional
-from requests.exceptions import Timeout, ConnectionError
+
+from PGP_COMMON.utils import AsyncChangeNowClient, ChangeNowRetryLater
 
 
 class ChangeNowClient:
     """
-    ChangeNow API client with infinite retry logic for status checks.
+    ChangeNow API client with Cloud Tasks hand-back for status checks.
     """
 
-    def __init__(self, api_key: str):
+    def __init__(self, config_manager, max_attempts: Optional[int] = 3):
         """
         Initialize ChangeNow client.
 
         Args:
-            api_key: ChangeNow API key
+            config_manager: ConfigManager with get_changenow_api_key() (HOT-RELOAD)
+            max_attempts: In-process attempts before raising ChangeNowRetryLater
+                          (None = retry indefinitely in-process)
         """
-        self.api_key = api_key
-        self.base_url = "https://api.changenow.io/v2"
-        self.session = requests.Session()
-        self.session.headers.update({"x-changenow-api-key": self.api_key})
+        self.async_client = AsyncChangeNowClient(config_manager=config_manager, max_attempts=max_attempts)
         print(f"✅ [CHANGENOW] ChangeNow client initialized")
 
-    def check_transaction_status_with_retry(self, cn_api_id: str) -> Optional[str]:
+    def check_transaction_status_with_retry(self, cn_api_id: str, prior_attempts: int = 0) -> Optional[str]:
         """
-        Check ChangeNow transaction status with infinite retry.
-
-        Implements infinite retry with 60-second fixed backoff.
-        Cloud Tasks will enforce 24-hour max retry duration.
+        Check ChangeNow transaction status with non-blocking retry.
 
         Args:
             cn_api_id: ChangeNow transaction ID
+            prior_attempts: Attempts already made by earlier Cloud Tasks deliveries
 
         Returns:
             Status string ("waiting", "confirming", "exchanging", "sending", "finished",
-                          "failed", "refunded", "expired") or None after 24h timeout
-        """
-        attempt = 0
-        start_time = time.time()
+                          "failed", "refunded", "expired") or None on client error
 
-        print(f"🔍 [CHANGENOW] Starting status check with infinite retry")
+        Raises:
+            ChangeNowRetryLater: In-process attempts exhausted - re-enqueue with
+                                 schedule_delay_seconds=e.delay_seconds
+        """
+        print(f"🔍 [CHANGENOW] Starting status check")
         print(f"🆔 [CHANGENOW] CN API ID: {cn_api_id}")
 
-        while True:
-            attempt += 1
-            elapsed_time = int(time.time() - start_time)
-
-            print(f"🔄 [CHANGENOW_RETRY] Attempt #{attempt} (elapsed: {elapsed_time}s)")
-
-            try:
-                # Build API request
-                url = f"{self.base_url}/exchange/by-id"
-                params = {"id": cn_api_id}
-
-                print(f"🌐 [CHANGENOW_RETRY] GET {url}?id={cn_api_id}")
-
-                # Send GET request with 30s timeout
-                response = self.session.get(url, params=params, timeout=30)
-
-                # Handle rate limiting (HTTP 429)
-                if response.status_code == 429:
-                    print(f"⏰ [CHANGENOW_RETRY] Rate limited (HTTP 429)")
-                    print(f"⏳ [CHANGENOW_RETRY] Waiting 60s before retry...")
-                    time.sleep(60)
-                    continue
-
-                # Handle server errors (5xx)
-                elif 500 <= response.status_code < 600:
-                    print(f"❌ [CHANGENOW_RETRY] Server error (HTTP {response.status_code})")
-                    print(f"⏳ [CHANGENOW_RETRY] Waiting 60s before retry...")
-                    time.sleep(60)
-                    continue
-
-                # Handle client errors (4xx) - likely invalid transaction ID
-                elif 400 <= response.status_code < 500:
-                    print(f"❌ [CHANGENOW_RETRY] Client error (HTTP {response.status_code})")
-                    print(f"📄 [CHANGENOW_RETRY] Response: {response.text}")
-                    # Don't retry on client errors - transaction ID likely invalid
-                    return None
-
-                # Handle success (HTTP 200)
-                elif response.status_code == 200:
-                    data = response.json()
-                    status = data.get("status", "")
-
-                    print(f"✅ [CHANGENOW_RETRY] Status check successful!")
-                    print(f"📊 [CHANGENOW_RETRY] Status: {status}")
-                    print(f"🕒 [CHANGENOW_RETRY] Total attempts: {attempt}")
-                    print(f"⏱️  [CHANGENOW_RETRY] Total time: {elapsed_time}s")
-
-                    return status
-
-                # Handle unexpected status codes
-                else:
-                    print(f"⚠️ [CHANGENOW_RETRY] Unexpected status code: {response.status_code}")
-                    print(f"⏳ [CHANGENOW_RETRY] Waiting 60s before retry...")
-                    time.sleep(60)
-                    continue
-
-            except Timeout:
-                print(f"⏰ [CHANGENOW_RETRY] Request timeout (30s)")
-                print(f"⏳ [CHANGENOW_RETRY] Waiting 60s before retry...")
-                time.sleep(60)
-                continue
-
-            except ConnectionError as ce:
-                print(f"❌ [CHANGENOW_RETRY] Connection error: {ce}")
-                print(f"⏳ [CHANGENOW_RETRY] Waiting 60s before retry...")
-                time.sleep(60)
-                continue
-
-            except requests.exceptions.RequestException as re:
-                print(f"❌ [CHANGENOW_RETRY] Request exception: {re}")
-                print(f"⏳ [CHANGENOW_RETRY] Waiting 60s before retry...")
-                time.sleep(60)
-                continue
-
-            except Exception as e:
-                print(f"❌ [CHANGENOW_RETRY] Unexpected error: {e}")
-                print(f"⏳ [CHANGENOW_RETRY] Waiting 60s before retry...")
-                time.sleep(60)
-                continue
+        return self.async_client.run_sync(
+            self.async_client.get_transaction_status(cn_api_id, prior_attempts=prior_attempts)
+        )
 
     def check_transaction_status_single_attempt(self, cn_api_id: str) -> Optional[str]:
         """
@@ -149,28 +71,12 @@ class ChangeNowClient:
         Returns:
             Status string or None if request failed
         """
+        single_attempt_client = AsyncChangeNowClient(
+            config_manager=self.async_client.config_manager,
+            max_attempts=1
+        )
         try:
-            url = f"{self.base_url}/exchange/by-id"
-            params = {"id": cn_api_id}
-
-            print(f"🔍 [CHANGENOW] Checking status for transaction: {cn_api_id}")
-            print(f"🌐 [CHANGENOW] Request URL: {url}?id={cn_api_id}")
-
-            response = self.session.get(url, params=params, timeout=30)
-
-            if response.status_code == 200:
-                data = response.json()
-                status = data.get("status", "")
-
-                print(f"✅ [CHANGENOW] API response received")
-                print(f"📊 [CHANGENOW] Transaction status: {status}")
-
-                return status
-            else:
-                print(f"❌ [CHANGENOW] API request failed with status {response.status_code}")
-                print(f"📄 [CHANGENOW] Response: {response.text}")
-                return None
-
-        except Exception as e:
-            print(f"❌ [CHANGENOW] Error checking status: {e}")
+            return single_attempt_client.run_sync(single_attempt_client.get_transaction_status(cn_api_id))
+        except ChangeNowRetryLater as e:
+            print(f"❌ [CHANGENOW] Error checking status: {e.reason}")
             return None
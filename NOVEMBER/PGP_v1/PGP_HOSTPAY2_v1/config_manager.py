@@ -45,6 +45,24 @@ class ConfigManager(BaseConfigManager):
             cache_key="pgp_hostpay1_url"
         )
 
+    def get_hostpay2_status_queue(self) -> str:
+        """Get PGP HostPay2 status queue name (HOT-RELOADABLE, used to re-enqueue deferred checks)."""
+        secret_path = self.build_secret_path("PGP_HOSTPAY2_STATUS_QUEUE")
+        return self.fetch_secret_dynamic(
+            secret_path,
+            "PGP HostPay2 status queue",
+            cache_key="pgp_hostpay2_queue"
+        )
+
+    def get_hostpay2_url(self) -> str:
+        """Get PGP HostPay2 service URL (HOT-RELOADABLE, used to re-enqueue deferred checks)."""
+        secret_path = self.build_secret_path("PGP_HOSTPAY2_URL")
+        return self.fetch_secret_dynamic(
+            secret_path,
+            "PGP HostPay2 URL",
+            cache_key="pgp_hostpay2_url"
+        )
+
     # ========== INITIALIZATION ==========
 
     def initialize_config(self) -> dict:
@@ -86,6 +104,6 @@ class ConfigManager(BaseConfigManager):
         print(f"   SUCCESS_URL_SIGNING_KEY (static): {'✅' if config['success_url_signing_key'] else '❌'}")
         print(f"   Cloud Tasks Project: {'✅' if config['cloud_tasks_project_id'] else '❌'}")
         print(f"   Cloud Tasks Location: {'✅' if config['cloud_tasks_location'] else '❌'}")
-        print(f"   Hot-reloadable secrets: CHANGENOW_API_KEY, PGP_HOSTPAY1_RESPONSE_QUEUE, PGP_HOSTPAY1_URL")
+        print(f"   Hot-reloadable secrets: CHANGENOW_API_KEY, PGP_HOSTPAY1_RESPONSE_QUEUE, PGP_HOSTPAY1_URL, PGP_HOSTPAY2_STATUS_QUEUE, PGP_HOSTPAY2_URL")
 
         return config
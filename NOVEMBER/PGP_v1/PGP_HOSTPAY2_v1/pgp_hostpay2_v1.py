@@ -2,10 +2,15 @@
 """
 PGP_HOSTPAY2_v1: ChangeNow Status Checker Service
 Receives status check requests from PGP_HOSTPAY1_v1, checks ChangeNow API status
-with INFINITE RETRY logic, and returns response back to PGP_HOSTPAY1_v1.
+with retry logic, and returns response back to PGP_HOSTPAY1_v1.
 
-Implements infinite retry via Cloud Tasks (60s fixed backoff, 24h max duration).
+Retries a few times in-process (exponential backoff with jitter), then hands the
+retry back to Cloud Tasks by re-enqueueing the check to itself with a computed
+delay. Deferrals carry a fresh service-internal token (the PGP_HOSTPAY1_v1 token
+expires after 300s) and stop after CHANGENOW_DEFER_MAX_ATTEMPTS attempts or
+CHANGENOW_DEFER_MAX_SECONDS since the first deferral.
 """
+import os
 import time
 from flask import Flask, request, abort, jsonify
 
@@ -15,11 +20,32 @@ from token_manager import TokenManager
 from cloudtasks_client import CloudTasksClient
 from changenow_client import ChangeNowClient
 
+from PGP_COMMON.utils import ChangeNowRetryLater
+
 from PGP_COMMON.logging import setup_logger
 logger = setup_logger(__name__)
 
 app = Flask(__name__)
 
+
+def _env_int(var_name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back to default."""
+    value = (os.getenv(var_name) or '').strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning(f"⚠️ [APP] Invalid {var_name}='{value}', using default {default}")
+        return default
+
+
+# Total ChangeNow attempts (across deferrals) before the status check is abandoned
+CHANGENOW_DEFER_MAX_ATTEMPTS = _env_int('CHANGENOW_DEFER_MAX_ATTEMPTS', 50)
+
+# Seconds after the first deferral before the status check is abandoned (Cloud Tasks' own bound)
+CHANGENOW_DEFER_MAX_SECONDS = _env_int('CHANGENOW_DEFER_MAX_SECONDS', 24 * 60 * 60)
+
 # Initialize managers
 logger.info(f"🚀 [APP] Initializing PGP_HOSTPAY2_v1 ChangeNow Status Checker Service")
 config_manager = ConfigManager()
@@ -28,25 +54,21 @@ config = config_manager.initialize_config()
 # Initialize token manager
 try:
     # Note: PGP_HOSTPAY2_v1 only needs internal signing key
-    tps_hostpay_key = config.get('success_url_signing_key')  # Use same key for both
     internal_key = config.get('success_url_signing_key')
 
     if not internal_key:
         raise ValueError("SUCCESS_URL_SIGNING_KEY not available")
 
-    token_manager = TokenManager(tps_hostpay_key, internal_key)
+    token_manager = TokenManager(internal_key)
     logger.info(f"✅ [APP] Token manager initialized")
 except Exception as e:
     logger.error(f"❌ [APP] Failed to initialize token manager: {e}", exc_info=True)
     token_manager = None
 
-# Initialize ChangeNow client
+# Initialize ChangeNow client (API key is hot-reloaded through config_manager)
 try:
-    changenow_api_key = config.get('changenow_api_key')
-    if not changenow_api_key:
-        raise ValueError("CHANGENOW_API_KEY not available")
-
-    changenow_client = ChangeNowClient(changenow_api_key)
+    changenow_max_attempts = _env_int('CHANGENOW_MAX_ATTEMPTS', 3)
+    changenow_client = ChangeNowClient(config_manager, max_attempts=changenow_max_attempts)
     logger.info(f"✅ [APP] ChangeNow client initialized")
 except Exception as e:
     logger.error(f"❌ [APP] Failed to initialize ChangeNow client: {e}", exc_info=True)
@@ -74,18 +96,21 @@ except Exception as e:
 @app.route("/", methods=["POST"])
 def check_changenow_status():
     """
-    Main endpoint for checking ChangeNow status with infinite retry.
+    Main endpoint for checking ChangeNow status with retry.
 
     Flow:
-    1. Decrypt token from PGP_HOSTPAY1_v1
+    1. Decrypt token from PGP_HOSTPAY1_v1 ("token") or a deferred check
+       re-enqueued by this service ("deferred_token")
     2. Extract unique_id and cn_api_id
-    3. Call ChangeNow API with INFINITE RETRY (60s backoff, 24h max)
+    3. Call ChangeNow API (CHANGENOW_MAX_ATTEMPTS in-process attempts, default 3)
+       - Still failing: re-enqueue this check with schedule_delay_seconds and return 202
+       - Deferral limits reached: log the abandoned check and return 200 (no retry)
     4. Extract status field
     5. Encrypt response token
     6. Enqueue back to PGP_HOSTPAY1_v1 /status-verified
 
     Returns:
-        JSON response with status (or 500 to trigger Cloud Tasks retry)
+        JSON response with status, 202 if deferred (or 500 to trigger Cloud Tasks retry)
     """
     try:
         logger.info(f"🎯 [ENDPOINT] Status check request received (from PGP_HOSTPAY1_v1)")
@@ -100,7 +125,8 @@ def check_changenow_status():
             abort(400, "Malformed JSON payload")
 
         token = request_data.get('token')
-        if not token:
+        deferred_token = request_data.get('deferred_token')
+        if not token and not deferred_token:
             logger.error(f"❌ [ENDPOINT] Missing token", exc_info=True)
             abort(400, "Missing token")
 
@@ -110,7 +136,10 @@ def check_changenow_status():
             abort(500, "Service configuration error")
 
         try:
-            decrypted_data = token_manager.decrypt_pgp_hostpay1_to_pgp_hostpay2_token(token)
+            if deferred_token:
+                decrypted_data = token_manager.decrypt_pgp_hostpay2_deferred_check_token(deferred_token)
+            else:
+                decrypted_data = token_manager.decrypt_pgp_hostpay1_to_pgp_hostpay2_token(token)
             if not decrypted_data:
                 logger.error(f"❌ [ENDPOINT] Failed to decrypt token")
                 abort(401, "Invalid token")
@@ -131,19 +160,21 @@ def check_changenow_status():
             logger.error(f"❌ [ENDPOINT] Token validation error: {e}", exc_info=True)
             abort(400, f"Token error: {e}")
 
-        # Check ChangeNow status with INFINITE RETRY
+        # Check ChangeNow status (bounded in-process retry, then hand back to Cloud Tasks)
         if not changenow_client:
             logger.error(f"❌ [ENDPOINT] ChangeNow client not available", exc_info=True)
             abort(500, "ChangeNow client unavailable")
 
-        logger.info(f"🌐 [ENDPOINT] Checking ChangeNow status with infinite retry")
+        prior_attempts = decrypted_data.get('attempts', 0)
+        logger.info(f"🌐 [ENDPOINT] Checking ChangeNow status (prior attempts: {prior_attempts})")
 
-        status = changenow_client.check_transaction_status_with_retry(cn_api_id)
+        try:
+            status = changenow_client.check_transaction_status_with_retry(cn_api_id, prior_attempts=prior_attempts)
+        except ChangeNowRetryLater as retry:
+            return _defer_status_check(decrypted_data, retry)
 
-        # Note: status will always return (or timeout after 24h) due to infinite retry
         if not status:
-            # This should never happen due to infinite retry, but handle it anyway
-            logger.error(f"❌ [ENDPOINT] ChangeNow API returned None (should not happen)")
+            logger.error(f"❌ [ENDPOINT] ChangeNow rejected status check for {cn_api_id}")
             abort(500, "ChangeNow API failure")
 
         logger.info(f"✅ [ENDPOINT] ChangeNow status retrieved: {status}")
@@ -168,8 +199,8 @@ def check_changenow_status():
             logger.error(f"❌ [ENDPOINT] Cloud Tasks client not available")
             abort(500, "Cloud Tasks unavailable")
 
-        pgp_hostpay1_response_queue = config.get('pgp_hostpay1_response_queue')
-        pgp_hostpay1_url = config.get('pgp_hostpay1_url')
+        pgp_hostpay1_response_queue = config_manager.get_hostpay1_response_queue()
+        pgp_hostpay1_url = config_manager.get_hostpay1_url()
 
         if not pgp_hostpay1_response_queue or not pgp_hostpay1_url:
             logger.error(f"❌ [ENDPOINT] PGP_HOSTPAY1_v1 configuration missing")
@@ -208,6 +239,88 @@ def check_changenow_status():
         }), 500
 
 
+def _defer_status_check(payment: dict, retry: ChangeNowRetryLater):
+    """
+    Re-enqueue a status check to this service instead of sleeping in-process.
+
+    The re-enqueued task carries a fresh deferred check token (attempt count
+    and first deferral time are signed into it), so deferrals outlive the
+    300s PGP_HOSTPAY1_v1 token and can't be extended by replaying old payloads.
+
+    Args:
+        payment: Verified payment details from the decrypted token
+        retry: ChangeNowRetryLater with the computed delay and attempt count
+
+    Returns:
+        Flask response (202 if re-enqueued, 200 if abandoned, 500 to fall back to
+        Cloud Tasks queue retry)
+    """
+    cn_api_id = payment['cn_api_id']
+    logger.warning(f"⏳ [ENDPOINT] ChangeNow unavailable for {cn_api_id}: {retry.reason}")
+
+    now = int(time.time())
+    first_deferred_at = payment.get('first_deferred_at') or now
+    deferred_for = now - first_deferred_at
+
+    if retry.attempts >= CHANGENOW_DEFER_MAX_ATTEMPTS or deferred_for + retry.delay_seconds > CHANGENOW_DEFER_MAX_SECONDS:
+        # Failure record: payment details for manual follow-up (no further retries)
+        logger.error(
+            f"❌ [ENDPOINT] Status check abandoned after {retry.attempts} attempts over {deferred_for}s - "
+            f"unique_id: {payment['unique_id']}, cn_api_id: {cn_api_id}, "
+            f"amount: {payment['from_amount']} {payment['from_currency'].upper()}, "
+            f"payin_address: {payment['payin_address']}, last error: {retry.reason}"
+        )
+        return jsonify({
+            "status": "failed",
+            "message": "ChangeNow status check abandoned - deferral limit reached",
+            "unique_id": payment['unique_id'],
+            "cn_api_id": cn_api_id,
+            "attempts": retry.attempts,
+            "deferred_seconds": deferred_for
+        }), 200
+
+    queue_name = config_manager.get_hostpay2_status_queue()
+    target_url = config_manager.get_hostpay2_url()
+
+    deferred_token = token_manager.encrypt_pgp_hostpay2_deferred_check_token(
+        unique_id=payment['unique_id'],
+        cn_api_id=cn_api_id,
+        from_currency=payment['from_currency'],
+        from_network=payment['from_network'],
+        from_amount=payment['from_amount'],
+        payin_address=payment['payin_address'],
+        attempts=retry.attempts,
+        first_deferred_at=first_deferred_at,
+        scheduled_at=now + retry.delay_seconds
+    )
+
+    task_name = None
+    if deferred_token and cloudtasks_client and queue_name and target_url:
+        task_name = cloudtasks_client.create_task(
+            queue_name=queue_name,
+            target_url=target_url,
+            payload={"deferred_token": deferred_token},
+            schedule_delay_seconds=retry.delay_seconds
+        )
+
+    if not task_name:
+        logger.error(f"❌ [ENDPOINT] Failed to re-enqueue deferred status check - relying on queue retry")
+        return jsonify({
+            "status": "error",
+            "message": "ChangeNow unavailable and re-enqueue failed"
+        }), 500
+
+    logger.info(f"📤 [ENDPOINT] Status check re-enqueued in {retry.delay_seconds}s (attempts so far: {retry.attempts})")
+    return jsonify({
+        "status": "deferred",
+        "message": "ChangeNow unavailable, status check re-enqueued",
+        "cn_api_id": cn_api_id,
+        "retry_in_seconds": retry.delay_seconds,
+        "attempts": retry.attempts,
+        "task_id": task_name
+    }), 202
+
+
 # ============================================================================
 # HEALTH CHECK ENDPOINT
 # ============================================================================
@@ -0,0 +1,3 @@
+"""
+Tests for PGP_HOSTPAY2_v1 application.
+"""
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""
+Unit tests for deferred ChangeNow status checks.
+
+Tests verify that the deferred check token round-trips every payment field
+and rejects tampered, early and expired deliveries, that a status check whose
+in-process ChangeNow attempts are used up is re-enqueued to this service with
+the computed delay and a fresh token, that the redelivered check carries the
+attempt count forward and completes, and that a check past the deferral
+limits is abandoned instead of re-enqueued.
+"""
+import os
+import sys
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import token_manager as token_manager_module
+from token_manager import TokenManager
+from PGP_COMMON.utils import ChangeNowRetryLater
+
+# Module-level initialization talks to Secret Manager and Cloud Tasks
+with patch('google.cloud.secretmanager.SecretManagerServiceClient'), \
+        patch('google.cloud.tasks_v2.CloudTasksClient'):
+    import pgp_hostpay2_v1
+
+SIGNING_KEY = "test_signing_key"
+
+PAYMENT = {
+    'unique_id': 'UID_123',
+    'cn_api_id': 'cn_456',
+    'from_currency': 'eth',
+    'from_network': 'eth',
+    'from_amount': 0.125,
+    'payin_address': '0xpayin'
+}
+
+
+def deferred_token(tokens, attempts=3, first_deferred_at=None, scheduled_at=None):
+    now = int(time.time())
+    return tokens.encrypt_pgp_hostpay2_deferred_check_token(
+        **PAYMENT,
+        attempts=attempts,
+        first_deferred_at=first_deferred_at or now,
+        scheduled_at=scheduled_at or now
+    )
+
+
+class TestDeferredCheckToken(unittest.TestCase):
+    """Test suite for the PGP_HOSTPAY2_v1 → PGP_HOSTPAY2_v1 deferred check token."""
+
+    def setUp(self):
+        self.tokens = TokenManager(SIGNING_KEY)
+
+    def test_round_trip_preserves_fields(self):
+        now = int(time.time())
+        token = deferred_token(self.tokens, attempts=7, first_deferred_at=now - 600, scheduled_at=now)
+
+        decrypted = self.tokens.decrypt_pgp_hostpay2_deferred_check_token(token)
+
+        self.assertEqual({key: decrypted[key] for key in PAYMENT}, PAYMENT)
+        self.assertEqual(decrypted['attempts'], 7)
+        self.assertEqual(decrypted['first_deferred_at'], now - 600)
+        self.assertEqual(decrypted['scheduled_at'], now)
+
+    def test_tampered_token_is_rejected(self):
+        raw = bytearray(self.tokens.decode_base64_urlsafe(deferred_token(self.tokens)))
+        raw[2] ^= 0x01
+
+        with self.assertRaises(ValueError):
+            self.tokens.decrypt_pgp_hostpay2_deferred_check_token(self.tokens.encode_base64_urlsafe(bytes(raw)))
+
+    def test_token_from_other_key_is_rejected(self):
+        token = deferred_token(TokenManager("other_key"))
+
+        with self.assertRaises(ValueError):
+            self.tokens.decrypt_pgp_hostpay2_deferred_check_token(token)
+
+    def test_early_and_expired_deliveries_are_rejected(self):
+        now = int(time.time())
+        early = deferred_token(self.tokens, scheduled_at=now + 120)
+        expired = deferred_token(self.tokens, scheduled_at=now - 600)
+
+        for token in (early, expired):
+            with self.assertRaises(ValueError):
+                self.tokens.decrypt_pgp_hostpay2_deferred_check_token(token)
+
+
+class TestStatusCheckDeferral(unittest.TestCase):
+    """Test suite for POST / when ChangeNow stays unavailable."""
+
+    def setUp(self):
+        self.tokens = TokenManager(SIGNING_KEY)
+        self.changenow = Mock()
+        self.cloudtasks = Mock()
+        self.cloudtasks.create_task.return_value = "deferred-task"
+        self.cloudtasks.enqueue_pgp_hostpay1_status_response.return_value = "response-task"
+        self.config = Mock()
+        self.config.get_hostpay2_status_queue.return_value = "hostpay2-queue"
+        self.config.get_hostpay2_url.return_value = "https://hostpay2"
+        self.config.get_hostpay1_response_queue.return_value = "hostpay1-queue"
+        self.config.get_hostpay1_url.return_value = "https://hostpay1"
+
+        for name, value in (('token_manager', self.tokens), ('changenow_client', self.changenow),
+                            ('cloudtasks_client', self.cloudtasks), ('config_manager', self.config)):
+            patcher = patch.object(pgp_hostpay2_v1, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.client = pgp_hostpay2_v1.app.test_client()
+
+    def post_first_check(self):
+        """Deliver the PGP_HOSTPAY1_v1 request (its token format is covered elsewhere)."""
+        with patch.object(self.tokens, 'decrypt_pgp_hostpay1_to_pgp_hostpay2_token', return_value=dict(PAYMENT)):
+            return self.client.post("/", json={"token": "hostpay1-token"})
+
+    def test_unavailable_changenow_defers_with_fresh_token(self):
+        self.changenow.check_transaction_status_with_retry.side_effect = ChangeNowRetryLater(
+            delay_seconds=5, attempts=3, reason="server error (503)"
+        )
+
+        response = self.post_first_check()
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.get_json()['status'], "deferred")
+        task = self.cloudtasks.create_task.call_args.kwargs
+        self.assertEqual(task['queue_name'], "hostpay2-queue")
+        self.assertEqual(task['schedule_delay_seconds'], 5)
+        deferred = self.tokens.decrypt_pgp_hostpay2_deferred_check_token(task['payload']['deferred_token'])
+        self.assertEqual(deferred['attempts'], 3)
+        self.assertEqual(deferred['cn_api_id'], PAYMENT['cn_api_id'])
+        self.cloudtasks.enqueue_pgp_hostpay1_status_response.assert_not_called()
+
+    def test_redelivered_check_carries_attempts_and_completes(self):
+        self.changenow.check_transaction_status_with_retry.side_effect = [
+            ChangeNowRetryLater(delay_seconds=5, attempts=3, reason="rate limited (429)"),
+            "finished"
+        ]
+        self.post_first_check()
+        token = self.cloudtasks.create_task.call_args.kwargs['payload']['deferred_token']
+
+        response = self.client.post("/", json={"deferred_token": token})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['changenow_status'], "finished")
+        self.assertEqual(self.changenow.check_transaction_status_with_retry.call_args.kwargs['prior_attempts'], 3)
+        self.cloudtasks.enqueue_pgp_hostpay1_status_response.assert_called_once()
+
+    def test_deferral_limit_abandons_check(self):
+        self.changenow.check_transaction_status_with_retry.side_effect = ChangeNowRetryLater(
+            delay_seconds=5, attempts=pgp_hostpay2_v1.CHANGENOW_DEFER_MAX_ATTEMPTS, reason="server error (503)"
+        )
+
+        response = self.client.post("/", json={"deferred_token": deferred_token(self.tokens, attempts=47)})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['status'], "failed")
+        self.cloudtasks.create_task.assert_not_called()
+
+    def test_failed_re_enqueue_falls_back_to_queue_retry(self):
+        self.changenow.check_transaction_status_with_retry.side_effect = ChangeNowRetryLater(
+            delay_seconds=5, attempts=3, reason="request timeout"
+        )
+        self.cloudtasks.create_task.return_value = None
+
+        response = self.post_first_check()
+
+        self.assertEqual(response.status_code, 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
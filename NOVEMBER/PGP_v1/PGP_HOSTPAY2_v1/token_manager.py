@@ -3,9 +3,17 @@
 Token Manager for PGP_HOSTPAY2_v1.
 Handles encryption and decryption of tokens for secure inter-service communication via Cloud Tasks.
 """
+import base64
+import hashlib
+import hmac
+import struct
+import time
 from typing import Dict, Any, Optional, Tuple
 from PGP_COMMON.tokens import BaseTokenManager
 
+# Deferred check tokens may arrive this many seconds before their scheduled time (clock skew)
+DEFERRED_TOKEN_EARLY_SECONDS = 30
+
 
 class TokenManager(BaseTokenManager):
     """
@@ -21,6 +29,8 @@ class TokenManager(BaseTokenManager):
             signing_key: SUCCESS_URL_SIGNING_KEY for HMAC signing
         """
         super().__init__(signing_key, service_name="PGP_HOSTPAY2_v1")
+        self.internal_key = signing_key
+
     def decrypt_pgp_hostpay1_to_pgp_hostpay2_token(self, token: str) -> Optional[Dict[str, Any]]:
         """
         Decrypt token from PGP_HOSTPAY1_v1 → PGP_HOSTPAY2_v1.
@@ -172,3 +182,132 @@ class TokenManager(BaseTokenManager):
         except Exception as e:
             print(f"❌ [TOKEN_ENC] Encryption error: {e}")
             return None
+
+    # ========================================================================
+    # TOKEN 4: PGP_HOSTPAY2_v1 → PGP_HOSTPAY2_v1 (Deferred status check)
+    # ========================================================================
+
+    def encrypt_pgp_hostpay2_deferred_check_token(
+        self,
+        unique_id: str,
+        cn_api_id: str,
+        from_currency: str,
+        from_network: str,
+        from_amount: float,
+        payin_address: str,
+        attempts: int,
+        first_deferred_at: int,
+        scheduled_at: int
+    ) -> Optional[str]:
+        """
+        Encrypt a deferred status check that this service re-enqueues to itself.
+
+        The original PGP_HOSTPAY1_v1 token expires after 300 seconds, so a
+        deferral carries the verified payment details in a fresh token whose
+        validity window starts at its scheduled delivery time.
+
+        Token Structure:
+        - 1 byte: unique_id length + variable bytes
+        - 1 byte: cn_api_id length + variable bytes
+        - 1 byte: from_currency length + variable bytes
+        - 1 byte: from_network length + variable bytes
+        - 8 bytes: from_amount (double)
+        - 1 byte: payin_address length + variable bytes
+        - 2 bytes: attempts (ChangeNow attempts made so far)
+        - 4 bytes: first_deferred_at (unix timestamp of the first deferral)
+        - 4 bytes: scheduled_at (unix timestamp of the scheduled delivery)
+        - 16 bytes: HMAC signature
+
+        Args:
+            unique_id: Database linking ID
+            cn_api_id: ChangeNow transaction ID
+            from_currency: Source currency (e.g., "eth")
+            from_network: Source network (e.g., "eth")
+            from_amount: Amount to send
+            payin_address: ChangeNow payin address
+            attempts: ChangeNow attempts made so far
+            first_deferred_at: Unix timestamp of the first deferral
+            scheduled_at: Unix timestamp the task is scheduled for
+
+        Returns:
+            Base64 URL-safe encoded token or None if failed
+        """
+        try:
+            print(f"🔐 [TOKEN_ENC] PGP_HOSTPAY2_v1→PGP_HOSTPAY2_v1: Encrypting deferred status check")
+
+            packed_data = bytearray()
+            packed_data.extend(self.pack_string(unique_id))
+            packed_data.extend(self.pack_string(cn_api_id))
+            packed_data.extend(self.pack_string(from_currency.lower()))
+            packed_data.extend(self.pack_string(from_network.lower()))
+            packed_data.extend(struct.pack(">d", from_amount))
+            packed_data.extend(self.pack_string(payin_address))
+            packed_data.extend(struct.pack(">H", min(attempts, 0xFFFF)))
+            packed_data.extend(struct.pack(">I", first_deferred_at))
+            packed_data.extend(struct.pack(">I", scheduled_at))
+
+            signature = self.generate_hmac_signature(bytes(packed_data))
+            token = self.encode_base64_urlsafe(bytes(packed_data) + signature)
+
+            print(f"✅ [TOKEN_ENC] Deferred status check token encrypted ({len(token)} chars)")
+            return token
+
+        except Exception as e:
+            print(f"❌ [TOKEN_ENC] Encryption error: {e}")
+            return None
+
+    def decrypt_pgp_hostpay2_deferred_check_token(self, token: str) -> Dict[str, Any]:
+        """
+        Decrypt a deferred status check token (PGP_HOSTPAY2_v1 → PGP_HOSTPAY2_v1).
+        Token valid for 300 seconds after its scheduled delivery time.
+
+        Returns:
+            Dictionary with {unique_id, cn_api_id, from_currency, from_network, from_amount,
+                             payin_address, attempts, first_deferred_at, scheduled_at}
+
+        Raises:
+            ValueError: Malformed, tampered or expired token
+        """
+        raw = self.decode_base64_urlsafe(token)
+
+        offset = 0
+        unique_id, offset = self.unpack_string(raw, offset)
+        cn_api_id, offset = self.unpack_string(raw, offset)
+        from_currency, offset = self.unpack_string(raw, offset)
+        from_network, offset = self.unpack_string(raw, offset)
+
+        if offset + 8 > len(raw):
+            raise ValueError("Invalid token: incomplete from_amount")
+        from_amount = struct.unpack(">d", raw[offset:offset+8])[0]
+        offset += 8
+
+        payin_address, offset = self.unpack_string(raw, offset)
+
+        if offset + 10 > len(raw):
+            raise ValueError("Invalid token: incomplete deferral fields")
+        attempts = struct.unpack(">H", raw[offset:offset+2])[0]
+        first_deferred_at, scheduled_at = struct.unpack(">II", raw[offset+2:offset+10])
+        offset += 10
+
+        if len(raw) - offset != 16:
+            raise ValueError("Invalid token: wrong signature size")
+        if not self.verify_hmac_signature(raw[:offset], raw[offset:]):
+            raise ValueError("Signature mismatch")
+
+        current_time = int(time.time())
+        if not (current_time - 300 <= scheduled_at <= current_time + DEFERRED_TOKEN_EARLY_SECONDS):
+            raise ValueError("Token expired")
+
+        print(f"🔓 [TOKEN_DEC] PGP_HOSTPAY2_v1→PGP_HOSTPAY2_v1: Deferred token validated")
+
+        return {
+            "unique_id": unique_id,
+            "cn_api_id": cn_api_id,
+            "from_currency": from_currency,
+            "from_network": from_network,
+            "from_amount": from_amount,
+            "payin_address": payin_address,
+            "attempts": attempts,
+            "first_deferred_at": first_deferred_at,
+            "scheduled_at": scheduled_at
+        }
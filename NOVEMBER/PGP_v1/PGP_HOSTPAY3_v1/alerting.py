@@ -128,6 +128,63 @@ gcloud run services logs read pgp-hostpay3-v1 --region=us-central1 --filter="jso
 
         return True  # Cloud Logging always succeeds
 
+    def send_stuck_transaction_alert(
+        self,
+        unique_id: str,
+        cn_api_id: str,
+        tx_hash: str,
+        age_seconds: int,
+        context: str
+    ) -> bool:
+        """
+        Alert on a broadcast payment that is still unmined but known to the node.
+
+        The transaction stays tracked; it must not be resent while it can
+        still be mined (replace it with a higher fee, same nonce, if needed).
+
+        Args:
+            unique_id: Unique payment identifier
+            cn_api_id: ChangeNow transaction ID
+            tx_hash: Stuck transaction hash
+            age_seconds: Seconds since broadcast
+            context: Payment context (instant/threshold)
+
+        Returns:
+            True if alert sent successfully, False otherwise
+        """
+        if not self.enabled:
+            print(f"⚠️ [ALERT] Alerting disabled - skipping")
+            return False
+
+        alert_title = f"⏳ ETH Payment Unconfirmed After {age_seconds // 60} Minutes"
+        alert_body = f"""
+**Transaction Details:**
+- Unique ID: `{unique_id}`
+- ChangeNow ID: `{cn_api_id}`
+- Context: `{context}`
+- TX Hash: `{tx_hash}`
+
+The node still has the transaction, so it was not resent. Check its fee
+against the current base fee and replace it (same nonce) if it is underpriced.
+        """
+
+        print(json.dumps({
+            'severity': 'ERROR',
+            'event_type': 'eth_payment_stuck',
+            'unique_id': unique_id,
+            'cn_api_id': cn_api_id,
+            'tx_hash': tx_hash,
+            'age_seconds': age_seconds,
+            'context': context,
+            'timestamp': int(time.time())
+        }))
+        print(f"🚨 [ALERT] {alert_title}")
+
+        if self.slack_webhook_url:
+            return self._send_slack_alert(alert_title, alert_body)
+
+        return True
+
     def _log_structured_alert(
         self,
         unique_id: str,
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+"""
+Confirmation Tracker for PGP_HOSTPAY3_v1 (ETH Payment Executor Service).
+Resolves broadcast payouts without holding a request open per payment.
+
+Flow:
+1. POST / broadcasts the payment and records it in hostpay_pending_transactions
+2. POST /confirm-pending (Cloud Scheduler) calls ConfirmationTracker.poll()
+3. poll() fetches receipts for all pending hashes (and their replacements)
+   in one JSON-RPC batch
+4. Mined with status 1 (and CONFIRMATION_BLOCKS deep) -> on_confirmed
+   (database log + PGP_HOSTPAY1_v1 /payment-completed callback)
+5. Mined with status 0 -> on_reverted (failed_transactions + alert)
+6. No receipt after CONFIRMATION_STALE_SECONDS -> checked by nonce:
+   confirmed transaction count past the nonce and still no receipt ->
+   'dropped', on_dropped (failed_transactions + alert); nonce still open ->
+   on_stuck once (alert) and a same-nonce replacement with higher fees (at
+   most CONFIRMATION_MAX_REPLACEMENTS, one per stale interval), tracking
+   continues. A node not returning the transaction proves nothing: another
+   node may still mine it.
+
+Rows are keyed by (tx_hash, unique_id): a Disperse transaction pays several
+payments and each one gets its own callback.
+
+Each row is resolved with a status = 'pending' guard, so overlapping
+polls never send a callback twice. If a callback fails the transaction goes
+back to 'pending' and is retried on the next poll (callbacks must be
+idempotent up to the point they failed).
+"""
+import os
+from typing import Any, Callable, Dict, List, Optional, Set
+
+# Pending transactions checked per poll (one batch request)
+CONFIRMATION_BATCH_SIZE = int((os.getenv('CONFIRMATION_BATCH_SIZE') or '').strip() or 100)
+
+# Blocks a receipt must be buried under before the payout counts as confirmed
+CONFIRMATION_BLOCKS = int((os.getenv('CONFIRMATION_BLOCKS') or '').strip() or 1)
+
+# Pending longer than this is checked by nonce: dropped, or escalated and replaced
+CONFIRMATION_STALE_SECONDS = int((os.getenv('CONFIRMATION_STALE_SECONDS') or '').strip() or 1800)
+
+# Same-nonce replacements (higher fees) per stuck transaction
+CONFIRMATION_MAX_REPLACEMENTS = int((os.getenv('CONFIRMATION_MAX_REPLACEMENTS') or '').strip() or 3)
+
+
+class ConfirmationTracker:
+    """
+    Batch-polls receipts for pending payouts and fires their callbacks.
+    """
+
+    def __init__(
+        self,
+        wallet_manager,
+        db_manager,
+        on_confirmed: Callable[[Dict[str, Any], Dict[str, Any]], bool],
+        on_reverted: Callable[[Dict[str, Any], Dict[str, Any]], None],
+        on_dropped: Callable[[Dict[str, Any]], None],
+        on_stuck: Optional[Callable[[Dict[str, Any]], None]] = None,
+        batch_size: int = CONFIRMATION_BATCH_SIZE,
+        confirmations: int = CONFIRMATION_BLOCKS,
+        stale_seconds: int = CONFIRMATION_STALE_SECONDS,
+        max_replacements: int = CONFIRMATION_MAX_REPLACEMENTS
+    ):
+        """
+        Initialize ConfirmationTracker.
+
+        Args:
+            wallet_manager: WalletManager (receipts, nonces, replacements and block number)
+            db_manager: DatabaseManager with the pending transaction methods
+            on_confirmed: Callable(pending, tx_result) -> True if the payment was logged
+                          and its callback enqueued
+            on_reverted: Callable(pending, tx_result) for transactions that reverted on-chain
+            on_dropped: Callable(pending) for transactions whose nonce was used by another
+            on_stuck: Callable(pending), once per stale transaction whose nonce is still open
+            batch_size: Pending transactions checked per poll
+            confirmations: Required confirmation depth (1 = mined)
+            stale_seconds: Age after which a pending transaction is checked by nonce
+                           (and the minimum interval between replacements)
+            max_replacements: Same-nonce replacements per transaction
+        """
+        self.wallet_manager = wallet_manager
+        self.db_manager = db_manager
+        self.on_confirmed = on_confirmed
+        self.on_reverted = on_reverted
+        self.on_dropped = on_dropped
+        self.on_stuck = on_stuck
+        self.batch_size = batch_size
+        self.confirmations = max(1, confirmations)
+        self.stale_seconds = stale_seconds
+        self.max_replacements = max_replacements
+
+        print(f"⏳ [TRACKER] ConfirmationTracker initialized (batch: {batch_size}, confirmations: {self.confirmations})")
+
+    def poll(self) -> Dict[str, int]:
+        """
+        Check every pending transaction once.
+
+        Returns:
+            Summary counts: checked, confirmed, reverted, dropped, pending, stale,
+            escalated, replaced, errors
+        """
+        summary = {
+            "checked": 0, "confirmed": 0, "reverted": 0, "dropped": 0,
+            "pending": 0, "stale": 0, "escalated": 0, "replaced": 0, "errors": 0
+        }
+
+        pending = self.db_manager.get_pending_transactions(limit=self.batch_size)
+        if not pending:
+            return summary
+
+        summary["checked"] = len(pending)
+        # One receipt per hash (Disperse rows share theirs, replacements are checked too)
+        receipts = self.wallet_manager.get_transaction_receipts(
+            list(dict.fromkeys(tx_hash for tx in pending for tx_hash in self._tx_hashes(tx)))
+        )
+        latest_block = self.wallet_manager.get_block_number() if self.confirmations > 1 else None
+        replaced = set()  # Disperse rows share one replacement per poll
+
+        for tx in pending:
+            mined_hash = next((tx_hash for tx_hash in self._tx_hashes(tx) if receipts.get(tx_hash)), None)
+            receipt = receipts.get(mined_hash)
+
+            deep_enough = receipt and (
+                latest_block is None or latest_block - receipt['block_number'] + 1 >= self.confirmations
+            )
+            if not deep_enough:
+                if not receipt and tx['age_seconds'] >= self.stale_seconds:
+                    self._check_stale(tx, summary, replaced)
+                else:
+                    summary["pending"] += 1
+                continue
+
+            reverted = receipt['status'] != 1
+            tx_result = {
+                "tx_hash": mined_hash,
+                "status": "failed" if reverted else "success",
+                "gas_used": receipt['gas_used'],
+                "block_number": receipt['block_number']
+            }
+
+            # Claim first: only one poller sends the callback
+            if not self.db_manager.resolve_pending_transaction(
+                tx['tx_hash'],
+                tx['unique_id'],
+                'reverted' if reverted else 'confirmed',
+                block_number=receipt['block_number'],
+                gas_used=receipt['gas_used']
+            ):
+                continue
+
+            try:
+                if reverted:
+                    print(f"❌ [TRACKER] {mined_hash[:16]}... ({tx['unique_id']}) reverted on-chain")
+                    self.on_reverted(tx, tx_result)
+                    summary["reverted"] += 1
+                elif self.on_confirmed(tx, tx_result):
+                    print(f"🎉 [TRACKER] {mined_hash[:16]}... ({tx['unique_id']}) confirmed in block {receipt['block_number']}")
+                    summary["confirmed"] += 1
+                else:
+                    raise Exception("Completion callback was not enqueued")
+
+            except Exception as e:
+                print(f"❌ [TRACKER] Failed to finish {tx['tx_hash'][:16]}... ({tx['unique_id']}): {e} - will retry")
+                self.db_manager.reopen_pending_transaction(tx['tx_hash'], tx['unique_id'])
+                summary["errors"] += 1
+
+        print(f"📊 [TRACKER] Poll complete: {summary}")
+        return summary
+
+    @staticmethod
+    def _tx_hashes(tx: Dict[str, Any]) -> List[str]:
+        """The original hash and every same-nonce replacement of a pending transaction."""
+        return [tx['tx_hash']] + list(tx.get('replacement_tx_hashes') or [])
+
+    def _check_stale(self, tx: Dict[str, Any], summary: Dict[str, int], replaced: Set[str]) -> None:
+        """
+        Check a transaction that has had no receipt for stale_seconds by its nonce.
+
+        Dropped only once the wallet's confirmed transaction count is past the
+        nonce and none of its hashes has a receipt; while the nonce is open it
+        is escalated (once) and replaced with higher fees.
+        """
+        summary["stale"] += 1
+        print(f"⚠️ [TRACKER] {tx['tx_hash'][:16]}... ({tx['unique_id']}) pending for {tx['age_seconds']}s - checking nonce")
+
+        signed = self.wallet_manager.get_signed_transaction(tx['tx_hash'])
+        if not signed:
+            # Nonce unknown: a drop can't be told from a pending transaction
+            print(f"⚠️ [TRACKER] {tx['tx_hash'][:16]}... nonce unknown - not resending")
+            summary["pending"] += 1
+            self._escalate(tx, summary)
+            return
+
+        nonce = signed['nonce']
+        confirmed_count = self.wallet_manager.get_confirmed_transaction_count()
+        if confirmed_count is None:
+            # Lookup failed: checked again next poll
+            summary["pending"] += 1
+            return
+
+        if confirmed_count <= nonce:
+            # Nonce still open: ours (or a replacement) is the only transaction that can use it
+            summary["pending"] += 1
+            self._escalate(tx, summary)
+            if tx['tx_hash'] not in replaced:
+                replaced.add(tx['tx_hash'])
+                self._replace(tx, summary)
+            return
+
+        # Nonce used: unless one of our hashes was mined since the receipt batch, it was another transaction
+        mined = self.wallet_manager.any_receipt(self._tx_hashes(tx))
+        if mined is not False:
+            # Mined just now (resolved next poll) or lookup failed
+            summary["pending"] += 1
+            return
+
+        if not self.db_manager.resolve_pending_transaction(tx['tx_hash'], tx['unique_id'], 'dropped'):
+            return
+
+        try:
+            print(f"🕳️ [TRACKER] {tx['tx_hash'][:16]}... ({tx['unique_id']}) dropped - nonce {nonce} used by another transaction")
+            self.on_dropped(dict(tx, nonce=nonce))
+            summary["dropped"] += 1
+        except Exception as e:
+            print(f"❌ [TRACKER] Failed to record dropped {tx['tx_hash'][:16]}... ({tx['unique_id']}): {e} - will retry")
+            self.db_manager.reopen_pending_transaction(tx['tx_hash'], tx['unique_id'])
+            summary["errors"] += 1
+
+    def _escalate(self, tx: Dict[str, Any], summary: Dict[str, int]) -> None:
+        """Alert once per stuck transaction."""
+        if self.on_stuck and self.db_manager.mark_pending_transaction_escalated(tx['tx_hash'], tx['unique_id']):
+            print(f"🚨 [TRACKER] {tx['tx_hash'][:16]}... ({tx['unique_id']}) still unmined - escalating")
+            try:
+                self.on_stuck(tx)
+                summary["escalated"] += 1
+            except Exception as e:
+                print(f"❌ [TRACKER] Failed to escalate {tx['tx_hash'][:16]}...: {e}")
+                summary["errors"] += 1
+
+    def _replace(self, tx: Dict[str, Any], summary: Dict[str, int]) -> None:
+        """Rebroadcast a stuck transaction at the same nonce with higher fees (throttled)."""
+        replacements = self._tx_hashes(tx)[1:]
+        if len(replacements) >= self.max_replacements:
+            return
+        if tx.get('replaced_seconds_ago') is not None and tx['replaced_seconds_ago'] < self.stale_seconds:
+            return
+
+        def on_signed(replacement_tx_hash: str) -> None:
+            # Claimed and persisted before broadcast: overlapping polls never bump twice
+            if not self.db_manager.record_pending_transaction_replacement(
+                tx['tx_hash'], replacement_tx_hash, self.max_replacements, self.stale_seconds
+            ):
+                raise Exception("Replacement already claimed or not recorded")
+
+        try:
+            replacement = self.wallet_manager.replace_transaction(
+                replacements[-1] if replacements else tx['tx_hash'],
+                on_signed=on_signed
+            )
+            print(f"⛽ [TRACKER] {tx['tx_hash'][:16]}... replaced by {replacement[:16]}... "
+                  f"({len(replacements) + 1}/{self.max_replacements})")
+            summary["replaced"] += 1
+        except Exception as e:
+            print(f"❌ [TRACKER] Failed to replace {tx['tx_hash'][:16]}...: {e}")
+            summary["errors"] += 1
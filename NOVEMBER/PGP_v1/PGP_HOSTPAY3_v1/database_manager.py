@@ -3,7 +3,7 @@
 Database Manager for PGP_HOSTPAY3_v1 Host Wallet Payment Service.
 Handles database operations for the split_payout_hostpay table.
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import json
 import time
 from PGP_COMMON.database import BaseDatabaseManager
@@ -332,7 +332,8 @@ class DatabaseManager(BaseDatabaseManager):
         self,
         unique_id: str,
         status: str,
-        admin_notes: Optional[str] = None
+        admin_notes: Optional[str] = None,
+        transaction_id: Optional[int] = None
     ) -> bool:
         """
         Update status of a failed transaction.
@@ -341,6 +342,8 @@ class DatabaseManager(BaseDatabaseManager):
             unique_id: Unique payment identifier
             status: New status value
             admin_notes: Optional admin notes
+            transaction_id: Only update this row (failed_transactions.id) instead of
+                            every row for unique_id
 
         Returns:
             True if successful, False otherwise
@@ -358,20 +361,23 @@ class DatabaseManager(BaseDatabaseManager):
 
             cur = conn.cursor()
 
+            where_clause = "unique_id = %s" if transaction_id is None else "unique_id = %s AND id = %s"
+            where_params = (unique_id,) if transaction_id is None else (unique_id, transaction_id)
+
             if admin_notes:
-                query = """
+                query = f"""
                     UPDATE failed_transactions
                     SET status = %s, admin_notes = %s, updated_at = NOW()
-                    WHERE unique_id = %s
+                    WHERE {where_clause}
                 """
-                cur.execute(query, (status, admin_notes, unique_id))
+                cur.execute(query, (status, admin_notes) + where_params)
             else:
-                query = """
+                query = f"""
                     UPDATE failed_transactions
                     SET status = %s, updated_at = NOW()
-                    WHERE unique_id = %s
+                    WHERE {where_clause}
                 """
-                cur.execute(query, (status, unique_id))
+                cur.execute(query, (status,) + where_params)
 
             conn.commit()
             print(f"✅ [FAILED_TX] Status updated successfully")
@@ -461,11 +467,215 @@ class DatabaseManager(BaseDatabaseManager):
             if conn:
                 conn.close()
 
+    def claim_retryable_failed_transactions(
+        self,
+        limit: int = 20,
+        max_retries: int = 5,
+        retry_backoff_seconds: int = 300,
+        lease_seconds: int = 1800
+    ) -> List[Dict[str, Any]]:
+        """
+        Claim retryable failed transactions for the recovery worker.
+
+        Candidates are locked with FOR UPDATE SKIP LOCKED, so parallel workers
+        (any number of instances) never claim the same row. Each claim takes
+        pg_try_advisory_xact_lock(hashtext(unique_id)) and re-checks, in a new
+        statement, that no other row of the payment is recovering or
+        recovered: two rows of one payment are never claimed at once.
+
+        A claim is a lease (claimed_at, migration 013): rows left 'recovering'
+        by a worker that died are claimed again once it is older than
+        lease_seconds.
+
+        Args:
+            limit: Maximum number of rows to claim
+            max_retries: Rows with this many recovery attempts are skipped
+            retry_backoff_seconds: Minimum time since the last recovery attempt
+            lease_seconds: Age after which a 'recovering' row is claimed again
+
+        Returns:
+            List of claimed rows (retry_count already incremented), with
+            claimed_at (the lease, see record_failed_transaction_attempt()) and
+            attempt_tx_hashes (every signed hash of any row of the payment)
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [FAILED_TX] Database connection failed")
+                return []
+
+            cur = conn.cursor()
+
+            cur.execute("""
+                SELECT id, unique_id
+                FROM failed_transactions
+                WHERE (status = 'failed_retryable'
+                       AND retry_count < %s
+                       AND (last_retry_attempt IS NULL
+                            OR last_retry_attempt < NOW() - make_interval(secs => %s)))
+                   OR (status = 'recovering'
+                       AND claimed_at < NOW() - make_interval(secs => %s))
+                ORDER BY created_at ASC
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            """, (max_retries, retry_backoff_seconds, lease_seconds, limit))
+            candidates = cur.fetchall()
+
+            # One row per payment; a payment another worker is claiming is skipped
+            candidate_ids = []
+            locked_unique_ids = set()
+            for row_id, unique_id in candidates:
+                if unique_id in locked_unique_ids:
+                    continue
+                cur.execute("SELECT pg_try_advisory_xact_lock(hashtext(%s))", (unique_id,))
+                if cur.fetchone()[0]:
+                    locked_unique_ids.add(unique_id)
+                    candidate_ids.append(row_id)
+
+            rows = []
+            if candidate_ids:
+                cur.execute("""
+                    UPDATE failed_transactions
+                    SET
+                        status = 'recovering',
+                        claimed_at = NOW(),
+                        retry_count = retry_count + 1,
+                        last_retry_attempt = NOW(),
+                        updated_at = NOW()
+                    WHERE id = ANY(%s)
+                      AND NOT EXISTS (
+                          SELECT 1 FROM failed_transactions other
+                          WHERE other.unique_id = failed_transactions.unique_id
+                            AND other.id <> failed_transactions.id
+                            AND (other.status = 'recovered'
+                                 OR (other.status = 'recovering'
+                                     AND other.claimed_at >= NOW() - make_interval(secs => %s)))
+                      )
+                    RETURNING
+                        id,
+                        unique_id,
+                        cn_api_id,
+                        from_currency,
+                        from_network,
+                        from_amount,
+                        payin_address,
+                        context,
+                        error_code,
+                        error_message,
+                        last_error_details,
+                        retry_count,
+                        claimed_at,
+                        ARRAY(
+                            SELECT DISTINCT attempt.tx_hash
+                            FROM failed_transactions payment_row,
+                                 unnest(payment_row.attempt_tx_hashes) AS attempt(tx_hash)
+                            WHERE payment_row.unique_id = failed_transactions.unique_id
+                        )
+                """, (candidate_ids, lease_seconds))
+                rows = cur.fetchall()
+
+            conn.commit()
+
+            results = []
+            for row in rows:
+                error_details = row[10]
+                if isinstance(error_details, str):
+                    error_details = json.loads(error_details)
+
+                results.append({
+                    'id': row[0],
+                    'unique_id': row[1],
+                    'cn_api_id': row[2],
+                    'from_currency': row[3],
+                    'from_network': row[4],
+                    'from_amount': float(row[5]),
+                    'payin_address': row[6],
+                    'context': row[7],
+                    'error_code': row[8],
+                    'error_message': row[9],
+                    'last_error_details': error_details or {},
+                    'retry_count': row[11],
+                    'claimed_at': row[12],
+                    'attempt_tx_hashes': list(row[13] or [])
+                })
+
+            if results:
+                print(f"🔒 [FAILED_TX] Claimed {len(results)} retryable transaction(s) for recovery")
+            return results
+
+        except Exception as e:
+            print(f"❌ [FAILED_TX] Database error claiming failed transactions: {e}")
+            if conn:
+                conn.rollback()
+            return []
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def record_failed_transaction_attempt(self, transaction_id: int, claimed_at, tx_hash: str) -> bool:
+        """
+        Record the signed hash of a recovery attempt before it is broadcast (migration 013).
+
+        Only succeeds while the claim is still held (same claimed_at), so a
+        worker whose lease expired and was re-claimed never broadcasts.
+
+        Args:
+            transaction_id: failed_transactions.id
+            claimed_at: Lease returned by claim_retryable_failed_transactions()
+            tx_hash: Signed transaction hash
+
+        Returns:
+            True if recorded, False if the lease was lost (or on error)
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [FAILED_TX] Database connection failed")
+                return False
+
+            cur = conn.cursor()
+
+            query = """
+                UPDATE failed_transactions
+                SET attempt_tx_hashes = array_append(attempt_tx_hashes, %s), updated_at = NOW()
+                WHERE id = %s AND status = 'recovering' AND claimed_at = %s
+            """
+
+            cur.execute(query, (tx_hash, transaction_id, claimed_at))
+            recorded = cur.rowcount > 0
+            conn.commit()
+
+            if not recorded:
+                print(f"⚠️ [FAILED_TX] Claim on #{transaction_id} lost - attempt {tx_hash[:16]}... not recorded")
+            return recorded
+
+        except Exception as e:
+            print(f"❌ [FAILED_TX] Database error recording recovery attempt: {e}")
+            if conn:
+                conn.rollback()
+            return False
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
     def mark_failed_transaction_recovered(
         self,
         unique_id: str,
         recovery_tx_hash: str,
-        recovered_by: str = "manual"
+        recovered_by: str = "manual",
+        transaction_id: Optional[int] = None
     ) -> bool:
         """
         Mark a failed transaction as recovered after successful retry.
@@ -474,6 +684,7 @@ class DatabaseManager(BaseDatabaseManager):
             unique_id: Unique payment identifier
             recovery_tx_hash: Ethereum transaction hash of successful retry
             recovered_by: Who/what recovered it (default: "manual")
+            transaction_id: Only mark this row (failed_transactions.id)
 
         Returns:
             True if successful, False otherwise
@@ -502,8 +713,13 @@ class DatabaseManager(BaseDatabaseManager):
                     updated_at = NOW()
                 WHERE unique_id = %s
             """
+            params = (recovery_tx_hash, recovered_by, unique_id)
+
+            if transaction_id is not None:
+                query += " AND id = %s"
+                params += (transaction_id,)
 
-            cur.execute(query, (recovery_tx_hash, recovered_by, unique_id))
+            cur.execute(query, params)
             conn.commit()
             print(f"✅ [FAILED_TX] Transaction marked as recovered")
             return True
@@ -519,3 +735,866 @@ class DatabaseManager(BaseDatabaseManager):
                 cur.close()
             if conn:
                 conn.close()
+
+    # ========================================================================
+    # WALLET NONCE COUNTER (shared across instances, see nonce_allocator.py)
+    # ========================================================================
+
+    def wallet_nonces_available(self) -> bool:
+        """
+        Check that the wallet_nonces (migration 008) and wallet_nonce_reservations
+        (migration 010) tables exist.
+
+        Returns:
+            True if the shared nonce counter can be used, False otherwise
+        """
+        result = self.execute_query(
+            "SELECT to_regclass('wallet_nonces') IS NOT NULL AND to_regclass('wallet_nonce_reservations') IS NOT NULL",
+            (),
+            fetch_one=True
+        )
+        return bool(result and result[0])
+
+    def reserve_wallet_nonce(self, wallet_address: str, chain_id: int) -> Optional[int]:
+        """
+        Atomically reserve the next nonce for a wallet.
+
+        Args:
+            wallet_address: Sending wallet address
+            chain_id: Chain ID
+
+        Returns:
+            Reserved nonce, or None if the wallet has no counter yet (or on error)
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [NONCE_DB] Database connection failed")
+                return None
+
+            cur = conn.cursor()
+
+            # Row lock serializes concurrent reservations across instances
+            query = """
+                UPDATE wallet_nonces
+                SET next_nonce = next_nonce + 1, reserved_at = NOW(), updated_at = NOW()
+                WHERE wallet_address = %s AND chain_id = %s
+                RETURNING next_nonce - 1
+            """
+
+            cur.execute(query, (wallet_address.lower(), chain_id))
+            row = cur.fetchone()
+            conn.commit()
+
+            return int(row[0]) if row else None
+
+        except Exception as e:
+            print(f"❌ [NONCE_DB] Database error reserving nonce: {e}")
+            if conn:
+                conn.rollback()
+            return None
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def seed_wallet_nonce(self, wallet_address: str, chain_id: int, next_nonce: int) -> bool:
+        """
+        Create the nonce counter for a wallet (no-op if it already exists).
+
+        Args:
+            wallet_address: Sending wallet address
+            chain_id: Chain ID
+            next_nonce: Chain 'pending' transaction count
+
+        Returns:
+            True if successful, False otherwise
+        """
+        conn = None
+        cur = None
+
+        try:
+            print(f"🌱 [NONCE_DB] Seeding nonce counter at {next_nonce}")
+
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [NONCE_DB] Database connection failed")
+                return False
+
+            cur = conn.cursor()
+
+            query = """
+                INSERT INTO wallet_nonces (wallet_address, chain_id, next_nonce, reserved_at, updated_at)
+                VALUES (%s, %s, %s, NOW(), NOW())
+                ON CONFLICT (wallet_address, chain_id) DO NOTHING
+            """
+
+            cur.execute(query, (wallet_address.lower(), chain_id, next_nonce))
+            conn.commit()
+            return True
+
+        except Exception as e:
+            print(f"❌ [NONCE_DB] Database error seeding nonce: {e}")
+            if conn:
+                conn.rollback()
+            return False
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def release_wallet_nonce(self, wallet_address: str, chain_id: int, nonce: int) -> bool:
+        """
+        Hand back a nonce that was never broadcast, if it is still the latest reservation.
+
+        Args:
+            wallet_address: Sending wallet address
+            chain_id: Chain ID
+            nonce: Reserved nonce
+
+        Returns:
+            True if the counter was moved back, False otherwise
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [NONCE_DB] Database connection failed")
+                return False
+
+            cur = conn.cursor()
+
+            query = """
+                UPDATE wallet_nonces
+                SET next_nonce = %s, updated_at = NOW()
+                WHERE wallet_address = %s AND chain_id = %s AND next_nonce = %s
+            """
+
+            cur.execute(query, (nonce, wallet_address.lower(), chain_id, nonce + 1))
+            released = cur.rowcount == 1
+            conn.commit()
+            return released
+
+        except Exception as e:
+            print(f"❌ [NONCE_DB] Database error releasing nonce: {e}")
+            if conn:
+                conn.rollback()
+            return False
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def record_wallet_nonce_transaction(self, wallet_address: str, chain_id: int, nonce: int, tx_hash: str) -> bool:
+        """
+        Record the signed transaction for a reserved nonce (before broadcast).
+
+        Args:
+            wallet_address: Sending wallet address
+            chain_id: Chain ID
+            nonce: Reserved nonce
+            tx_hash: Signed transaction hash
+
+        Returns:
+            True if successful, False otherwise
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [NONCE_DB] Database connection failed")
+                return False
+
+            cur = conn.cursor()
+
+            query = """
+                INSERT INTO wallet_nonce_reservations (wallet_address, chain_id, nonce, tx_hash, signed_at)
+                VALUES (%s, %s, %s, %s, NOW())
+                ON CONFLICT (wallet_address, chain_id, nonce)
+                DO UPDATE SET tx_hash = EXCLUDED.tx_hash, signed_at = NOW()
+            """
+
+            cur.execute(query, (wallet_address.lower(), chain_id, nonce, tx_hash))
+            conn.commit()
+            return True
+
+        except Exception as e:
+            print(f"❌ [NONCE_DB] Database error recording nonce transaction: {e}")
+            if conn:
+                conn.rollback()
+            return False
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def get_wallet_nonce_transactions(self, wallet_address: str, chain_id: int, from_nonce: int) -> Optional[Dict[int, str]]:
+        """
+        Signed transactions recorded for nonces at or above from_nonce.
+
+        Args:
+            wallet_address: Sending wallet address
+            chain_id: Chain ID
+            from_nonce: Lowest nonce to return (chain pending count)
+
+        Returns:
+            nonce -> tx_hash, or None on error
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [NONCE_DB] Database connection failed")
+                return None
+
+            cur = conn.cursor()
+
+            query = """
+                SELECT nonce, tx_hash
+                FROM wallet_nonce_reservations
+                WHERE wallet_address = %s AND chain_id = %s AND nonce >= %s
+            """
+
+            cur.execute(query, (wallet_address.lower(), chain_id, from_nonce))
+            return {int(row[0]): row[1] for row in cur.fetchall()}
+
+        except Exception as e:
+            print(f"❌ [NONCE_DB] Database error fetching nonce transactions: {e}")
+            return None
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def sync_wallet_nonce(self, wallet_address: str, chain_id: int, pending_count: int) -> Optional[Tuple[int, float]]:
+        """
+        Move the nonce counter forward if the chain is ahead of it.
+
+        Records below pending_count are pruned (those nonces are used). Gaps
+        (counter ahead of the chain) are left to reclaim_wallet_nonce_gap().
+
+        Args:
+            wallet_address: Sending wallet address
+            chain_id: Chain ID
+            pending_count: Chain 'pending' transaction count
+
+        Returns:
+            (next nonce, seconds since the last reservation), or None on error
+            (or if the counter doesn't exist yet)
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [NONCE_DB] Database connection failed")
+                return None
+
+            cur = conn.cursor()
+            wallet = wallet_address.lower()
+
+            query = """
+                UPDATE wallet_nonces
+                SET next_nonce = GREATEST(next_nonce, %s),
+                    updated_at = CASE WHEN next_nonce < %s THEN NOW() ELSE updated_at END
+                WHERE wallet_address = %s AND chain_id = %s
+                RETURNING next_nonce, EXTRACT(EPOCH FROM NOW() - reserved_at)
+            """
+
+            cur.execute(query, (pending_count, pending_count, wallet, chain_id))
+            row = cur.fetchone()
+
+            cur.execute(
+                "DELETE FROM wallet_nonce_reservations WHERE wallet_address = %s AND chain_id = %s AND nonce < %s",
+                (wallet, chain_id, pending_count)
+            )
+            conn.commit()
+
+            return (int(row[0]), float(row[1] or 0)) if row else None
+
+        except Exception as e:
+            print(f"❌ [NONCE_DB] Database error syncing nonce: {e}")
+            if conn:
+                conn.rollback()
+            return None
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def reclaim_wallet_nonce_gap(
+        self,
+        wallet_address: str,
+        chain_id: int,
+        pending_count: int,
+        expected_next_nonce: int,
+        gap_grace_seconds: int
+    ) -> bool:
+        """
+        Move the counter back to the chain's pending count (verified gap).
+
+        Only applies if the counter is still at expected_next_nonce and nothing
+        was reserved for gap_grace_seconds, so a reservation made after the
+        caller checked the gap is never handed out twice.
+
+        Args:
+            wallet_address: Sending wallet address
+            chain_id: Chain ID
+            pending_count: Chain 'pending' transaction count
+            expected_next_nonce: Counter value the gap was checked against
+            gap_grace_seconds: Minimum age of the last reservation
+
+        Returns:
+            True if the counter was moved back, False otherwise
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [NONCE_DB] Database connection failed")
+                return False
+
+            cur = conn.cursor()
+            wallet = wallet_address.lower()
+
+            query = """
+                UPDATE wallet_nonces
+                SET next_nonce = %s, updated_at = NOW()
+                WHERE wallet_address = %s AND chain_id = %s
+                  AND next_nonce = %s
+                  AND reserved_at < NOW() - make_interval(secs => %s)
+            """
+
+            cur.execute(query, (pending_count, wallet, chain_id, expected_next_nonce, gap_grace_seconds))
+            reclaimed = cur.rowcount == 1
+
+            if reclaimed:
+                cur.execute(
+                    "DELETE FROM wallet_nonce_reservations WHERE wallet_address = %s AND chain_id = %s AND nonce >= %s",
+                    (wallet, chain_id, pending_count)
+                )
+                print(f"🕳️ [NONCE_DB] Nonce counter moved back to chain pending count {pending_count}")
+
+            conn.commit()
+            return reclaimed
+
+        except Exception as e:
+            print(f"❌ [NONCE_DB] Database error reclaiming nonce gap: {e}")
+            if conn:
+                conn.rollback()
+            return False
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    # ========================================================================
+    # SIGNED TRANSACTIONS (drop checks and same-nonce replacements)
+    # ========================================================================
+
+    def signed_transactions_available(self) -> bool:
+        """
+        Check that the wallet_signed_transactions table (migration 014) exists.
+
+        Returns:
+            True if signed transactions can be recorded, False otherwise
+        """
+        result = self.execute_query(
+            "SELECT to_regclass('wallet_signed_transactions') IS NOT NULL",
+            (),
+            fetch_one=True
+        )
+        return bool(result and result[0])
+
+    def record_wallet_signed_transaction(
+        self,
+        wallet_address: str,
+        chain_id: int,
+        nonce: int,
+        tx_hash: str,
+        transaction: Dict[str, Any]
+    ) -> bool:
+        """
+        Record a signed transaction's nonce and fields (before broadcast).
+
+        Args:
+            wallet_address: Sending wallet address
+            chain_id: Chain ID
+            nonce: Transaction nonce
+            tx_hash: Signed transaction hash
+            transaction: Unsigned transaction fields (to, value, data, gas, fees)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [SIGNED_DB] Database connection failed")
+                return False
+
+            cur = conn.cursor()
+
+            query = """
+                INSERT INTO wallet_signed_transactions (tx_hash, wallet_address, chain_id, nonce, transaction, signed_at)
+                VALUES (%s, %s, %s, %s, %s, NOW())
+                ON CONFLICT (tx_hash) DO NOTHING
+            """
+
+            cur.execute(query, (tx_hash, wallet_address.lower(), chain_id, nonce, json.dumps(transaction)))
+            conn.commit()
+            return True
+
+        except Exception as e:
+            print(f"❌ [SIGNED_DB] Database error recording signed transaction: {e}")
+            if conn:
+                conn.rollback()
+            return False
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def get_wallet_signed_transaction(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Nonce and fields of a signed transaction.
+
+        Args:
+            tx_hash: Signed transaction hash
+
+        Returns:
+            {"nonce": int, "transaction": dict}, or None if not recorded (or on error)
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [SIGNED_DB] Database connection failed")
+                return None
+
+            cur = conn.cursor()
+            cur.execute(
+                "SELECT nonce, transaction FROM wallet_signed_transactions WHERE tx_hash = %s",
+                (tx_hash,)
+            )
+            row = cur.fetchone()
+            if not row:
+                return None
+
+            transaction = json.loads(row[1]) if isinstance(row[1], str) else row[1]
+            return {"nonce": int(row[0]), "transaction": transaction}
+
+        except Exception as e:
+            print(f"❌ [SIGNED_DB] Database error fetching signed transaction: {e}")
+            return None
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    # ========================================================================
+    # PENDING TRANSACTION CONFIRMATIONS (see confirmation_tracker.py)
+    # ========================================================================
+
+    def pending_transactions_available(self) -> bool:
+        """
+        Check that the hostpay_pending_transactions table (migration 009) and
+        the signed transaction records it is checked against (migration 014) exist.
+
+        Returns:
+            True if confirmations can be tracked asynchronously, False otherwise
+        """
+        result = self.execute_query(
+            "SELECT to_regclass('hostpay_pending_transactions') IS NOT NULL "
+            "AND to_regclass('wallet_signed_transactions') IS NOT NULL",
+            (),
+            fetch_one=True
+        )
+        return bool(result and result[0])
+
+    def insert_pending_transaction(
+        self,
+        tx_hash: str,
+        unique_id: str,
+        cn_api_id: str,
+        from_currency: str,
+        from_network: str,
+        from_amount: float,
+        actual_eth_amount: float,
+        payin_address: str,
+        context: str
+    ) -> bool:
+        """
+        Record a broadcast transaction whose receipt hasn't been seen yet.
+
+        One row per (tx_hash, unique_id): a Disperse transaction pays several
+        payments (migration 012).
+
+        Args:
+            tx_hash: Broadcast transaction hash
+            unique_id: Database linking ID
+            cn_api_id: ChangeNow transaction ID
+            from_currency: Currency sent
+            from_network: Network
+            from_amount: Amount from the request token (legacy field)
+            actual_eth_amount: ACTUAL ETH from NowPayments
+            payin_address: Destination address
+            context: Response routing ('instant' or 'threshold')
+
+        Returns:
+            True if successful, False otherwise
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [PENDING_DB] Database connection failed")
+                return False
+
+            cur = conn.cursor()
+
+            query = """
+                INSERT INTO hostpay_pending_transactions (
+                    tx_hash, unique_id, cn_api_id, from_currency, from_network,
+                    from_amount, actual_eth_amount, payin_address, context
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (tx_hash, unique_id) DO NOTHING
+            """
+
+            cur.execute(query, (
+                tx_hash, unique_id, cn_api_id, from_currency, from_network,
+                from_amount, actual_eth_amount, payin_address, context
+            ))
+            conn.commit()
+
+            print(f"✅ [PENDING_DB] Tracking tx {tx_hash[:16]}... for {unique_id}")
+            return True
+
+        except Exception as e:
+            print(f"❌ [PENDING_DB] Database error inserting pending transaction: {e}")
+            if conn:
+                conn.rollback()
+            return False
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def get_pending_transactions(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Get broadcast transactions still waiting for a receipt (oldest first).
+
+        Args:
+            limit: Maximum number of transactions to return
+
+        Returns:
+            List of pending transaction dicts (with age_seconds, replacement_tx_hashes
+            and replaced_seconds_ago)
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [PENDING_DB] Database connection failed")
+                return []
+
+            cur = conn.cursor()
+
+            query = """
+                SELECT tx_hash, unique_id, cn_api_id, from_currency, from_network,
+                       from_amount, actual_eth_amount, payin_address, context,
+                       EXTRACT(EPOCH FROM NOW() - submitted_at),
+                       replacement_tx_hashes,
+                       EXTRACT(EPOCH FROM NOW() - replaced_at)
+                FROM hostpay_pending_transactions
+                WHERE status = 'pending'
+                ORDER BY submitted_at ASC
+                LIMIT %s
+            """
+
+            cur.execute(query, (limit,))
+            rows = cur.fetchall()
+
+            return [
+                {
+                    'tx_hash': row[0],
+                    'unique_id': row[1],
+                    'cn_api_id': row[2],
+                    'from_currency': row[3],
+                    'from_network': row[4],
+                    'from_amount': float(row[5]) if row[5] is not None else 0.0,
+                    'actual_eth_amount': float(row[6]) if row[6] is not None else 0.0,
+                    'payin_address': row[7],
+                    'context': row[8],
+                    'age_seconds': int(row[9] or 0),
+                    'replacement_tx_hashes': list(row[10] or []),
+                    'replaced_seconds_ago': int(row[11]) if row[11] is not None else None
+                }
+                for row in rows
+            ]
+
+        except Exception as e:
+            print(f"❌ [PENDING_DB] Database error fetching pending transactions: {e}")
+            return []
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def resolve_pending_transaction(
+        self,
+        tx_hash: str,
+        unique_id: str,
+        status: str,
+        block_number: int = None,
+        gas_used: int = None
+    ) -> bool:
+        """
+        Move a pending transaction to its final status.
+
+        Only one caller can resolve a transaction (status = 'pending' guard),
+        so concurrent tracker runs never send the completion callback twice.
+
+        Args:
+            tx_hash: Transaction hash
+            unique_id: Payment paid by the transaction
+            status: 'confirmed', 'reverted' or 'dropped' (unknown to the node)
+            block_number: Block the transaction was mined in
+            gas_used: Gas used by the transaction
+
+        Returns:
+            True if this call resolved it, False if already resolved (or on error)
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [PENDING_DB] Database connection failed")
+                return False
+
+            cur = conn.cursor()
+
+            query = """
+                UPDATE hostpay_pending_transactions
+                SET status = %s, block_number = %s, gas_used = %s,
+                    resolved_at = NOW(), updated_at = NOW()
+                WHERE tx_hash = %s AND unique_id = %s AND status = 'pending'
+            """
+
+            cur.execute(query, (status, block_number, gas_used, tx_hash, unique_id))
+            resolved = cur.rowcount > 0
+            conn.commit()
+
+            return resolved
+
+        except Exception as e:
+            print(f"❌ [PENDING_DB] Database error resolving pending transaction: {e}")
+            if conn:
+                conn.rollback()
+            return False
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def record_pending_transaction_replacement(
+        self,
+        tx_hash: str,
+        replacement_tx_hash: str,
+        max_replacements: int,
+        min_interval_seconds: int
+    ) -> bool:
+        """
+        Claim a replacement of a pending transaction and record its hash (before broadcast).
+
+        Applies to every payment of the transaction (Disperse rows share it).
+        Only one caller per min_interval_seconds gets True, and at most
+        max_replacements are recorded, so overlapping polls never bump fees twice.
+
+        Args:
+            tx_hash: Original transaction hash
+            replacement_tx_hash: Signed replacement hash
+            max_replacements: Replacements allowed per transaction
+            min_interval_seconds: Seconds since the last replacement
+
+        Returns:
+            True if this call claimed the replacement, False otherwise (or on error)
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [PENDING_DB] Database connection failed")
+                return False
+
+            cur = conn.cursor()
+
+            query = """
+                UPDATE hostpay_pending_transactions
+                SET replacement_tx_hashes = array_append(replacement_tx_hashes, %s),
+                    replaced_at = NOW(), updated_at = NOW()
+                WHERE tx_hash = %s AND status = 'pending'
+                  AND cardinality(replacement_tx_hashes) < %s
+                  AND (replaced_at IS NULL OR replaced_at <= NOW() - make_interval(secs => %s))
+            """
+
+            cur.execute(query, (replacement_tx_hash, tx_hash, max_replacements, min_interval_seconds))
+            claimed = cur.rowcount > 0
+            conn.commit()
+
+            return claimed
+
+        except Exception as e:
+            print(f"❌ [PENDING_DB] Database error recording replacement: {e}")
+            if conn:
+                conn.rollback()
+            return False
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def mark_pending_transaction_escalated(self, tx_hash: str, unique_id: str) -> bool:
+        """
+        Flag a stuck pending transaction as escalated (migration 011).
+
+        Only the first caller gets True, so a stuck transaction is alerted once.
+
+        Args:
+            tx_hash: Transaction hash
+            unique_id: Payment paid by the transaction
+
+        Returns:
+            True if this call escalated it, False if already escalated (or on error)
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [PENDING_DB] Database connection failed")
+                return False
+
+            cur = conn.cursor()
+
+            query = """
+                UPDATE hostpay_pending_transactions
+                SET escalated_at = NOW(), updated_at = NOW()
+                WHERE tx_hash = %s AND unique_id = %s AND status = 'pending' AND escalated_at IS NULL
+            """
+
+            cur.execute(query, (tx_hash, unique_id))
+            escalated = cur.rowcount > 0
+            conn.commit()
+
+            return escalated
+
+        except Exception as e:
+            print(f"❌ [PENDING_DB] Database error escalating pending transaction: {e}")
+            if conn:
+                conn.rollback()
+            return False
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
+
+    def reopen_pending_transaction(self, tx_hash: str, unique_id: str) -> bool:
+        """
+        Put a resolved transaction back to 'pending' (its callback could not be sent).
+
+        Args:
+            tx_hash: Transaction hash
+            unique_id: Payment paid by the transaction
+
+        Returns:
+            True if successful, False otherwise
+        """
+        conn = None
+        cur = None
+
+        try:
+            conn = self.get_database_connection()
+            if not conn:
+                print(f"❌ [PENDING_DB] Database connection failed")
+                return False
+
+            cur = conn.cursor()
+
+            query = """
+                UPDATE hostpay_pending_transactions
+                SET status = 'pending', resolved_at = NULL, updated_at = NOW()
+                WHERE tx_hash = %s AND unique_id = %s
+            """
+
+            cur.execute(query, (tx_hash, unique_id))
+            conn.commit()
+
+            return cur.rowcount > 0
+
+        except Exception as e:
+            print(f"❌ [PENDING_DB] Database error reopening pending transaction: {e}")
+            if conn:
+                conn.rollback()
+            return False
+
+        finally:
+            if cur:
+                cur.close()
+            if conn:
+                conn.close()
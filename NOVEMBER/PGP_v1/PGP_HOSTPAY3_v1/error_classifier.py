@@ -81,6 +81,14 @@ class ErrorClassifier:
             ],
             'retryable': True
         },
+        'TRANSACTION_DROPPED': {
+            'description': 'Broadcast transaction unknown to the node after the stale timeout (dropped from mempool)',
+            'patterns': [
+                r'dropped.*mempool',
+                r'unknown to the node'
+            ],
+            'retryable': True
+        },
         'RATE_LIMIT_EXCEEDED': {
             'description': 'Alchemy 429 rate limit hit (too many requests)',
             'patterns': [
@@ -100,6 +108,13 @@ class ErrorClassifier:
             ],
             'retryable': True
         },
+        'GAS_PRICE_UNAVAILABLE': {
+            'description': 'No recent fee data and eth_gasPrice failed (RPC degraded)',
+            'patterns': [
+                r'gas.*price.*unavailable'
+            ],
+            'retryable': True
+        },
         'GAS_PRICE_SPIKE': {
             'description': 'Gas price exceeds safety threshold (network congestion)',
             'patterns': [
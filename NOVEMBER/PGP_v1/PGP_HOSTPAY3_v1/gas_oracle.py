@@ -0,0 +1,319 @@
+#!/usr/bin/env python
+"""
+Gas Oracle for PGP_HOSTPAY3_v1 (ETH Payment Executor Service).
+Caches EIP-1559 fee data per block so payouts in the same block share one
+fee_history call instead of each paying for their own.
+
+- Fee data is fetched once per new block (eth_feeHistory over the last
+  GAS_ORACLE_HISTORY_BLOCKS blocks at several reward percentiles)
+- A background thread polls eth_blockNumber every GAS_ORACLE_POLL_SECONDS
+  and refreshes on new blocks; without it (or if it stalls) the first
+  caller after GAS_ORACLE_POLL_SECONDS refreshes inline
+- Strategies pick the priority fee percentile (GAS_PRICE_STRATEGY)
+- If a refresh fails, cached fees are reused only while they are at most
+  GAS_ORACLE_MAX_STALE_BLOCKS blocks and GAS_ORACLE_MAX_STALE_SECONDS old;
+  after that eth_gasPrice is used, and if that fails too get_gas_price()
+  raises (the payment is retried instead of sent with a guessed fee)
+
+BlockCache memoizes other per-block reads (wallet balances) on the same
+block number.
+"""
+import os
+import time
+import statistics
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Priority fee percentile per strategy
+GAS_STRATEGIES = {
+    'slow': 25,
+    'standard': 50,
+    'fast': 75,
+    'urgent': 90
+}
+
+# Strategy used when callers don't pass one
+GAS_PRICE_STRATEGY = (os.getenv('GAS_PRICE_STRATEGY') or '').strip().lower() or 'standard'
+
+# Seconds between block number checks (Ethereum block time is 12s)
+GAS_ORACLE_POLL_SECONDS = float((os.getenv('GAS_ORACLE_POLL_SECONDS') or '').strip() or 12)
+
+# Blocks of history the priority fee percentiles are taken over
+GAS_ORACLE_HISTORY_BLOCKS = int((os.getenv('GAS_ORACLE_HISTORY_BLOCKS') or '').strip() or 5)
+
+# Cached fees older than this (blocks or seconds) are not reused after a failed refresh
+GAS_ORACLE_MAX_STALE_BLOCKS = int((os.getenv('GAS_ORACLE_MAX_STALE_BLOCKS') or '').strip() or 3)
+GAS_ORACLE_MAX_STALE_SECONDS = float((os.getenv('GAS_ORACLE_MAX_STALE_SECONDS') or '').strip() or 60)
+
+# Refresh on new blocks from a background thread
+GAS_ORACLE_BACKGROUND = (os.getenv('GAS_ORACLE_BACKGROUND') or 'true').strip().lower() == 'true'
+
+GWEI = 10 ** 9
+DEFAULT_PRIORITY_FEE = 2 * GWEI
+
+
+class GasOracle:
+    """
+    Block-memoized EIP-1559 fee oracle.
+    """
+
+    def __init__(
+        self,
+        get_web3: Callable,
+        eip1559: bool = True,
+        strategy: str = GAS_PRICE_STRATEGY,
+        poll_seconds: float = GAS_ORACLE_POLL_SECONDS,
+        history_blocks: int = GAS_ORACLE_HISTORY_BLOCKS,
+        max_stale_blocks: int = GAS_ORACLE_MAX_STALE_BLOCKS,
+        max_stale_seconds: float = GAS_ORACLE_MAX_STALE_SECONDS
+    ):
+        """
+        Initialize GasOracle.
+
+        Args:
+            get_web3: Returns the current Web3 instance (survives reconnects)
+            eip1559: Use fee_history (False: eth_gasPrice only)
+            strategy: Default strategy name (see GAS_STRATEGIES)
+            poll_seconds: Seconds between block number checks
+            history_blocks: Blocks of fee history to sample
+            max_stale_blocks: Blocks cached fees may lag the latest block
+            max_stale_seconds: Seconds cached fees may be reused after they were fetched
+        """
+        if strategy not in GAS_STRATEGIES:
+            print(f"⚠️ [GAS] Unknown strategy '{strategy}' - using 'standard'")
+            strategy = 'standard'
+
+        self.get_web3 = get_web3
+        self.eip1559 = eip1559
+        self.strategy = strategy
+        self.poll_seconds = poll_seconds
+        self.history_blocks = max(1, history_blocks)
+        self.max_stale_blocks = max(0, max_stale_blocks)
+        self.max_stale_seconds = max_stale_seconds
+
+        self._lock = threading.Lock()
+        self._block_number: Optional[int] = None
+        self._block_checked_at = 0.0
+        self._fees_block: Optional[int] = None
+        self._fees: Optional[Dict] = None
+        self._fees_fetched_at = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        print(f"⛽ [GAS] GasOracle initialized (strategy: {strategy}, poll: {poll_seconds}s)")
+
+    # ------------------------------------------------------------------
+    # Block tracking
+    # ------------------------------------------------------------------
+
+    def current_block(self) -> Optional[int]:
+        """
+        Latest block number, checked at most once per poll interval.
+
+        Returns:
+            Block number, or None if the node can't be reached
+        """
+        if time.monotonic() - self._block_checked_at < self.poll_seconds and self._block_number is not None:
+            return self._block_number
+
+        try:
+            block_number = self.get_web3().eth.block_number
+        except Exception as e:
+            print(f"⚠️ [GAS] Could not read block number: {e}")
+            return self._block_number
+
+        self._block_number = block_number
+        self._block_checked_at = time.monotonic()
+        return block_number
+
+    # ------------------------------------------------------------------
+    # Fee data
+    # ------------------------------------------------------------------
+
+    def _fetch_fees(self) -> Optional[Dict]:
+        """One fee_history call: next base fee and priority fee per strategy."""
+        w3 = self.get_web3()
+        percentiles = sorted(GAS_STRATEGIES.values())
+        fee_data = w3.eth.fee_history(self.history_blocks, 'latest', percentiles)
+
+        if not fee_data or 'baseFeePerGas' not in fee_data or len(fee_data['baseFeePerGas']) < 2:
+            return None
+
+        # Last entry is the base fee of the next (pending) block
+        base_fee = fee_data['baseFeePerGas'][-1]
+
+        priority_fees = {}
+        rewards = fee_data.get('reward') or []
+        for name, percentile in GAS_STRATEGIES.items():
+            samples = [int(block_rewards[percentiles.index(percentile)]) for block_rewards in rewards if block_rewards]
+            samples = [sample for sample in samples if sample > 0]  # Empty blocks report 0
+            priority_fees[name] = int(statistics.median(samples)) if samples else DEFAULT_PRIORITY_FEE
+
+        return {"base_fee": base_fee, "priority_fees": priority_fees}
+
+    def refresh(self, block_number: Optional[int] = None) -> bool:
+        """
+        Fetch fee data for block_number (latest if None) unless it's already cached.
+
+        Returns:
+            True if fee data for the block is cached
+        """
+        if block_number is None:
+            block_number = self.current_block()
+
+        with self._lock:
+            if self._fees is not None and block_number is not None and self._fees_block == block_number:
+                return True
+
+            try:
+                fees = self._fetch_fees()
+            except Exception as e:
+                print(f"⚠️ [GAS] fee_history failed: {e}")
+                fees = None
+
+            if fees is None:
+                return False
+
+            self._fees = fees
+            self._fees_block = block_number
+            self._fees_fetched_at = time.monotonic()
+            print(f"⛽ [GAS] Fees cached for block {block_number}: base {fees['base_fee'] / GWEI:.2f} Gwei, "
+                  f"priority {', '.join(f'{name} {fee / GWEI:.2f}' for name, fee in fees['priority_fees'].items())} Gwei")
+            return True
+
+    def _usable_fees(self, block_number: Optional[int]) -> Tuple[Optional[Dict], Optional[int]]:
+        """
+        Cached fees if they are recent enough to price a transaction.
+
+        Returns:
+            (fees, block they were fetched for), or (None, None) if too stale
+        """
+        with self._lock:
+            fees, fees_block, fetched_at = self._fees, self._fees_block, self._fees_fetched_at
+
+        if fees is None or time.monotonic() - fetched_at > self.max_stale_seconds:
+            return None, None
+        if block_number is not None and fees_block is not None and block_number - fees_block > self.max_stale_blocks:
+            return None, None
+        return fees, fees_block
+
+    def get_gas_price(self, strategy: Optional[str] = None) -> Dict[str, int]:
+        """
+        Gas prices for a transaction.
+
+        Args:
+            strategy: 'slow', 'standard', 'fast' or 'urgent' (default: configured strategy)
+
+        Returns:
+            Dictionary with gas prices (maxFeePerGas, maxPriorityFeePerGas, gasPrice)
+
+        Raises:
+            Exception: If there is no recent fee data and eth_gasPrice fails
+        """
+        strategy = strategy if strategy in GAS_STRATEGIES else self.strategy
+
+        if self.eip1559:
+            block_number = self.current_block()
+            if self._fees_block != block_number or self._fees is None:
+                self.refresh(block_number)
+
+            fees, fees_block = self._usable_fees(block_number)
+            if fees is not None:
+                if fees_block != block_number:
+                    print(f"⚠️ [GAS] Reusing fees from block {fees_block} (latest: {block_number})")
+                base_fee = fees['base_fee']
+                priority_fee = fees['priority_fees'][strategy]
+                return {
+                    "maxFeePerGas": (base_fee * 2) + priority_fee,
+                    "maxPriorityFeePerGas": priority_fee,
+                    "gasPrice": base_fee + priority_fee
+                }
+
+            print(f"⚠️ [GAS] No fee data within {self.max_stale_blocks} blocks / {self.max_stale_seconds:.0f}s")
+
+        # Fallback to standard gas price
+        print(f"⛽ [GAS] Using standard Web3 gas price")
+        try:
+            gas_price = self.get_web3().eth.gas_price
+        except Exception as e:
+            print(f"❌ [GAS] Error getting gas price: {e}")
+            raise Exception(f"Gas price unavailable: no recent fee data and eth_gasPrice failed ({e})")
+
+        return {
+            "maxFeePerGas": gas_price,
+            # The tip can't exceed the fee cap (invalid transaction)
+            "maxPriorityFeePerGas": min(DEFAULT_PRIORITY_FEE, gas_price),
+            "gasPrice": gas_price
+        }
+
+    # ------------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Refresh fee data on new blocks from a daemon thread (idempotent)."""
+        if self._thread is not None or not self.eip1559:
+            return
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='gas-oracle', daemon=True)
+        self._thread.start()
+        print(f"🔄 [GAS] Background fee refresh started")
+
+    def stop(self) -> None:
+        """Stop the background thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_seconds + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self._block_checked_at = 0.0  # Force a block number check
+                self.refresh(self.current_block())
+            except Exception as e:
+                print(f"⚠️ [GAS] Background refresh error: {e}")
+
+
+class BlockCache:
+    """
+    Values memoized per block number (e.g. balances, which only change when
+    a block is mined). clear() after a broadcast: our own spend isn't
+    reflected until the next block.
+    """
+
+    def __init__(self, current_block: Callable[[], Optional[int]]):
+        """
+        Initialize BlockCache.
+
+        Args:
+            current_block: Returns the latest block number (None if unknown)
+        """
+        self.current_block = current_block
+        self._values: Dict[str, Tuple[int, Any]] = {}
+
+    def get(self, key: str, load: Callable[[Any], Any]) -> Any:
+        """
+        Value for key at the latest block.
+
+        Args:
+            key: Cache key ('eth' or token contract address)
+            load: Callable(block_identifier) -> value
+
+        Returns:
+            Cached value for the latest block, or a freshly loaded one
+        """
+        block_number = self.current_block()
+        cached = self._values.get(key)
+        if block_number is not None and cached and cached[0] == block_number:
+            return cached[1]
+
+        value = load(block_number if block_number is not None else 'latest')
+        if block_number is not None:
+            self._values[key] = (block_number, value)
+        return value
+
+    def clear(self) -> None:
+        """Drop every cached value."""
+        self._values.clear()
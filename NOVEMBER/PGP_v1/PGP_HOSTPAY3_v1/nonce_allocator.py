@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+"""
+Nonce Allocator for PGP_HOSTPAY3_v1 (ETH Payment Executor Service).
+Reserves transaction nonces for the host wallet so concurrent payouts don't
+race on eth_getTransactionCount.
+
+Nonces are handed out from a shared counter:
+- Database (wallet_nonces table, migration 008) when a DatabaseManager is
+  attached: one atomic UPDATE ... RETURNING per reservation, safe across
+  instances.
+- In-process counter (lock-protected) otherwise.
+
+The signed transaction hash of every nonce is recorded before broadcast
+(wallet_nonce_reservations, migration 010, or in-process).
+
+The counter is seeded from the wallet's 'pending' transaction count and
+re-synced with the chain:
+- Periodically (NONCE_RESYNC_INTERVAL_SECONDS) and after nonce errors
+- Chain ahead of the counter (transactions sent outside this service) ->
+  counter moves forward
+- Counter ahead of the chain for longer than NONCE_GAP_GRACE_SECONDS ->
+  the gap is only reclaimed (counter moves back) if none of its nonces was
+  signed, or the node reports every signed hash in it as unknown (dropped).
+  A hash the node still knows, or can't be checked, means the transaction
+  may yet be mined: the counter is left alone and an alert is logged.
+"""
+import os
+import json
+import time
+import threading
+from typing import Callable, Dict, List, Optional
+
+# Seconds between routine re-syncs with the chain's pending count
+NONCE_RESYNC_INTERVAL_SECONDS = int((os.getenv('NONCE_RESYNC_INTERVAL_SECONDS') or '').strip() or 60)
+
+# How long reserved-but-unseen nonces may stay ahead of the chain before they count as a gap
+NONCE_GAP_GRACE_SECONDS = int((os.getenv('NONCE_GAP_GRACE_SECONDS') or '').strip() or 120)
+
+# Broadcast errors that mean our nonce view is out of date
+NONCE_ERROR_MARKERS = ('nonce too low', 'replacement transaction underpriced', 'nonce too high')
+
+# Broadcast errors that mean the node already holds this exact signed transaction
+ALREADY_KNOWN_MARKERS = ('already known', 'known transaction')
+
+
+def is_nonce_error(error: Exception) -> bool:
+    """True if a broadcast error was caused by a stale or conflicting nonce."""
+    message = str(error).lower()
+    return any(marker in message for marker in NONCE_ERROR_MARKERS)
+
+
+def is_already_known(error: Exception) -> bool:
+    """True if the node rejected a broadcast because it already has the transaction."""
+    message = str(error).lower()
+    return any(marker in message for marker in ALREADY_KNOWN_MARKERS)
+
+
+class NonceAllocator:
+    """
+    Hands out sequential nonces for one wallet.
+    """
+
+    def __init__(
+        self,
+        wallet_address: str,
+        get_pending_count: Callable[[], int],
+        chain_id: int = 1,
+        db_manager=None,
+        resync_interval: int = NONCE_RESYNC_INTERVAL_SECONDS,
+        gap_grace_seconds: int = NONCE_GAP_GRACE_SECONDS,
+        is_transaction_known: Optional[Callable[[str], Optional[bool]]] = None
+    ):
+        """
+        Initialize NonceAllocator.
+
+        Args:
+            wallet_address: Checksum address of the sending wallet
+            get_pending_count: Returns eth_getTransactionCount(wallet, 'pending')
+            chain_id: Chain ID (counters are kept per wallet and chain)
+            db_manager: DatabaseManager for the shared counter (None = in-process only)
+            resync_interval: Seconds between routine re-syncs
+            gap_grace_seconds: Age after which an unfilled gap is reclaimed
+            is_transaction_known: Callable(tx_hash) -> True if the node knows the
+                                  transaction, False if not, None if it couldn't
+                                  be checked (None = signed gaps are never reclaimed)
+        """
+        self.wallet_address = wallet_address
+        self.get_pending_count = get_pending_count
+        self.chain_id = chain_id
+        self.db_manager = db_manager
+        self.resync_interval = resync_interval
+        self.gap_grace_seconds = gap_grace_seconds
+        self.is_transaction_known = is_transaction_known
+
+        self._lock = threading.Lock()
+        self._next_nonce: Optional[int] = None  # In-process counter
+        self._signed: Dict[int, str] = {}  # In-process nonce -> signed tx hash
+        self._last_reserved_at = 0.0
+        self._last_sync = 0.0
+
+        backend = "database" if db_manager else "in-process"
+        print(f"🔢 [NONCE] NonceAllocator initialized for {wallet_address} ({backend} counter)")
+
+    def reserve(self) -> int:
+        """
+        Reserve the next nonce.
+
+        Returns:
+            Nonce to use for the next transaction
+
+        Raises:
+            Exception: If the counter can't be read or seeded (RPC/database
+                       unavailable). There is deliberately no fallback to a
+                       local counter, which could hand out nonces other
+                       instances already hold; the payment is retried instead.
+        """
+        if time.monotonic() - self._last_sync >= self.resync_interval:
+            self.resync()
+
+        if self.db_manager:
+            nonce = self.db_manager.reserve_wallet_nonce(self.wallet_address, self.chain_id)
+            if nonce is None:
+                # First use for this wallet: seed from the chain, then reserve
+                self.db_manager.seed_wallet_nonce(self.wallet_address, self.chain_id, self.get_pending_count())
+                nonce = self.db_manager.reserve_wallet_nonce(self.wallet_address, self.chain_id)
+            if nonce is None:
+                raise Exception("Failed to reserve nonce from shared wallet_nonces counter")
+        else:
+            with self._lock:
+                if self._next_nonce is None:
+                    self._next_nonce = self.get_pending_count()
+                nonce = self._next_nonce
+                self._next_nonce += 1
+                self._last_reserved_at = time.monotonic()
+
+        print(f"🔢 [NONCE] Reserved nonce {nonce}")
+        return nonce
+
+    def record_transaction(self, nonce: int, tx_hash: str) -> None:
+        """
+        Record the signed transaction for a reserved nonce (call before broadcast).
+
+        Raises:
+            Exception: If the shared record can't be written. The transaction
+                       must not be broadcast then, or a later re-sync could
+                       hand its nonce out again.
+        """
+        if self.db_manager:
+            if not self.db_manager.record_wallet_nonce_transaction(self.wallet_address, self.chain_id, nonce, tx_hash):
+                raise Exception(f"Failed to record signed transaction for nonce {nonce}")
+        else:
+            with self._lock:
+                self._signed[nonce] = tx_hash
+
+    def release(self, nonce: int) -> bool:
+        """
+        Return a nonce that was never broadcast.
+
+        Only the most recent reservation can be handed back directly; older
+        ones are left as a gap and reclaimed by resync().
+
+        Returns:
+            True if the nonce will be reused by the next reservation
+        """
+        if self.db_manager:
+            released = self.db_manager.release_wallet_nonce(self.wallet_address, self.chain_id, nonce)
+        else:
+            with self._lock:
+                released = self._next_nonce == nonce + 1
+                if released:
+                    self._next_nonce = nonce
+
+        if released:
+            print(f"↩️ [NONCE] Released unused nonce {nonce}")
+        else:
+            print(f"⚠️ [NONCE] Nonce {nonce} not released (later nonces reserved) - gap left for re-sync")
+        return released
+
+    def resync(self) -> Optional[int]:
+        """
+        Re-sync the counter with the chain's pending transaction count.
+
+        Returns:
+            Next nonce after the re-sync, or None if the chain or database couldn't be read
+        """
+        try:
+            pending_count = self.get_pending_count()
+        except Exception as e:
+            print(f"⚠️ [NONCE] Re-sync skipped, could not read pending count: {e}")
+            return None
+
+        self._last_sync = time.monotonic()
+
+        if self.db_manager:
+            state = self.db_manager.sync_wallet_nonce(self.wallet_address, self.chain_id, pending_count)
+            if state is None:
+                return None
+            next_nonce, idle_seconds = state
+
+        else:
+            with self._lock:
+                if self._next_nonce is None or self._next_nonce < pending_count:
+                    self._next_nonce = pending_count
+                for nonce in [nonce for nonce in self._signed if nonce < pending_count]:
+                    del self._signed[nonce]  # Mined or in the mempool
+                next_nonce = self._next_nonce
+                idle_seconds = time.monotonic() - self._last_reserved_at
+
+        if next_nonce > pending_count and idle_seconds >= self.gap_grace_seconds:
+            next_nonce = self._reclaim_gap(pending_count, next_nonce)
+
+        print(f"🔄 [NONCE] Re-synced (chain pending: {pending_count}, next: {next_nonce})")
+        return next_nonce
+
+    def _reclaim_gap(self, pending_count: int, next_nonce: int) -> int:
+        """
+        Move the counter back over nonces pending_count..next_nonce-1 if none
+        of them can still be mined.
+
+        Returns:
+            Next nonce after the attempt
+        """
+        if self.db_manager:
+            signed = self.db_manager.get_wallet_nonce_transactions(self.wallet_address, self.chain_id, pending_count)
+        else:
+            with self._lock:
+                signed = {nonce: tx_hash for nonce, tx_hash in self._signed.items() if nonce >= pending_count}
+
+        if signed is None:
+            print(f"⚠️ [NONCE] Gap {pending_count}-{next_nonce - 1} not reclaimed: signed transactions unavailable")
+            return next_nonce
+
+        live = [tx_hash for nonce, tx_hash in sorted(signed.items()) if nonce < next_nonce and not self._is_dropped(tx_hash)]
+        if live:
+            self._alert_unresolved_gap(pending_count, next_nonce, live)
+            return next_nonce
+
+        if self.db_manager:
+            reclaimed = self.db_manager.reclaim_wallet_nonce_gap(
+                self.wallet_address, self.chain_id, pending_count, next_nonce, self.gap_grace_seconds
+            )
+        else:
+            with self._lock:
+                # A reservation since the check moved the counter: leave it for the next re-sync
+                reclaimed = self._next_nonce == next_nonce
+                if reclaimed:
+                    self._next_nonce = pending_count
+                    for nonce in [nonce for nonce in self._signed if nonce >= pending_count]:
+                        del self._signed[nonce]
+
+        if not reclaimed:
+            return next_nonce
+
+        print(f"🕳️ [NONCE] Gap reclaimed: nonces {pending_count}-{next_nonce - 1} never reached the chain "
+              f"({len(signed)} signed transaction(s) unknown to the node)")
+        return pending_count
+
+    def _is_dropped(self, tx_hash: str) -> bool:
+        """True only if the node reports the transaction as unknown."""
+        if self.is_transaction_known is None:
+            return False
+        try:
+            return self.is_transaction_known(tx_hash) is False
+        except Exception as e:
+            print(f"⚠️ [NONCE] Could not look up {tx_hash}: {e}")
+            return False
+
+    def _alert_unresolved_gap(self, pending_count: int, next_nonce: int, live_hashes: List[str]) -> None:
+        """Structured log entry for Cloud Logging alert policies (gap needs an operator)."""
+        print(f"🚨 [NONCE] Gap {pending_count}-{next_nonce - 1} left in place: "
+              f"{len(live_hashes)} signed transaction(s) still known to the node or unverifiable")
+        print(json.dumps({
+            'severity': 'ERROR',
+            'event_type': 'nonce_gap_unresolved',
+            'wallet_address': self.wallet_address,
+            'chain_id': self.chain_id,
+            'chain_pending_count': pending_count,
+            'next_nonce': next_nonce,
+            'tx_hashes': live_hashes,
+            'timestamp': int(time.time())
+        }))
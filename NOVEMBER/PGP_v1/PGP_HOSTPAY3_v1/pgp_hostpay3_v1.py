@@ -7,18 +7,26 @@ with 3-ATTEMPT RETRY logic, and returns response back to PGP_HOSTPAY1_v1.
 NEW: Implements 3-attempt retry limit with error classification and failed transaction storage.
 - Attempt 1-2: Retry with 60s delay via Cloud Tasks
 - Attempt 3: Store in failed_transactions table and send alert
+
+Confirmations are asynchronous when migration 009 is applied: POST / returns
+right after broadcast and POST /confirm-pending (Cloud Scheduler) sends the
+response once the transaction is mined (see confirmation_tracker.py).
 """
+import os
 import time
 from flask import Flask, request, abort, jsonify
+from werkzeug.exceptions import HTTPException
 
 # Import service modules
 from config_manager import ConfigManager
 from token_manager import TokenManager
 from database_manager import DatabaseManager
 from cloudtasks_client import CloudTasksClient
-from wallet_manager import WalletManager, TOKEN_CONFIGS
+from wallet_manager import WalletManager, SignedTransactionError, TransactionRevertedError, TOKEN_CONFIGS
 from error_classifier import ErrorClassifier
 from alerting import AlertingService
+from confirmation_tracker import ConfirmationTracker
+from recovery_worker import RecoveryWorker
 
 from PGP_COMMON.logging import setup_logger
 logger = setup_logger(__name__)
@@ -26,6 +34,13 @@ logger = setup_logger(__name__)
 
 app = Flask(__name__)
 
+# Batch payouts (POST /batch)
+BATCH_PAYOUT_MAX_ITEMS = int((os.getenv('BATCH_PAYOUT_MAX_ITEMS') or '').strip() or 50)
+BATCH_REQUEUE_DELAY_SECONDS = int((os.getenv('BATCH_REQUEUE_DELAY_SECONDS') or '').strip() or 60)
+
+# Optional Disperse contract: pay a whole ETH batch in one transaction
+DISPERSE_CONTRACT_ADDRESS = (os.getenv('DISPERSE_CONTRACT_ADDRESS') or '').strip() or None
+
 # Initialize managers
 logger.info(f"🚀 [APP] Initializing PGP_HOSTPAY3_v1 ETH Payment Executor Service")
 config_manager = ConfigManager()
@@ -78,6 +93,14 @@ except Exception as e:
     logger.error(f"❌ [APP] Failed to initialize database manager: {e}", exc_info=True)
     db_manager = None
 
+# Share the wallet nonce counter across instances (concurrent payouts)
+if wallet_manager and db_manager:
+    try:
+        wallet_manager.attach_nonce_store(db_manager)
+        wallet_manager.attach_transaction_store(db_manager)
+    except Exception as e:
+        logger.error(f"❌ [APP] Failed to attach shared nonce counter: {e}", exc_info=True)
+
 # Initialize Cloud Tasks client
 try:
     project_id = config.get('cloud_tasks_project_id')
@@ -108,6 +131,293 @@ except Exception as e:
     alerting_service = None
 
 
+# ============================================================================
+# PAYMENT RESPONSE HELPERS (shared by POST /, POST /batch and the confirmation tracker)
+# ============================================================================
+
+def resolve_payment_amount(decrypted_data: dict) -> float:
+    """
+    Amount to send: ACTUAL ETH from NowPayments, else the ChangeNow estimate,
+    else the legacy from_amount.
+
+    Returns:
+        Payment amount, or 0.0 if the token has no valid amount
+    """
+    actual_eth_amount = decrypted_data.get('actual_eth_amount', 0.0)
+    estimated_eth_amount = decrypted_data.get('estimated_eth_amount', 0.0)
+    from_amount = decrypted_data.get('from_amount', 0.0)
+
+    if actual_eth_amount > 0:
+        logger.info(f"✅ [ENDPOINT] Using ACTUAL ETH from NowPayments: {actual_eth_amount}")
+        return actual_eth_amount
+    if estimated_eth_amount > 0:
+        logger.warning(f"⚠️ [ENDPOINT] Using ESTIMATED ETH (actual not available): {estimated_eth_amount}")
+        return estimated_eth_amount
+    if from_amount > 0:
+        logger.warning(f"⚠️ [ENDPOINT] Using legacy from_amount (backward compat): {from_amount}")
+        return from_amount
+    return 0.0
+
+
+def log_successful_payment(payment: dict, tx_result: dict) -> bool:
+    """
+    Log a confirmed payment to split_payout_hostpay (idempotent per tx_hash).
+
+    Args:
+        payment: unique_id, cn_api_id, from_currency, from_network, from_amount,
+                 payin_address, actual_eth_amount
+        tx_result: tx_hash, status, gas_used, block_number
+
+    Returns:
+        True if logged (or already logged), False otherwise
+    """
+    if not db_manager:
+        logger.warning(f"⚠️ [ENDPOINT] Database manager not available - skipping database log")
+        return False
+
+    try:
+        db_success = db_manager.insert_hostpay_transaction(
+            unique_id=payment['unique_id'],
+            cn_api_id=payment['cn_api_id'],
+            from_currency=payment['from_currency'],
+            from_network=payment['from_network'],
+            from_amount=payment['from_amount'],
+            payin_address=payment['payin_address'],
+            is_complete=True,
+            tx_hash=tx_result['tx_hash'],
+            tx_status=tx_result['status'],
+            gas_used=tx_result['gas_used'],
+            block_number=tx_result['block_number'],
+            actual_eth_amount=payment['actual_eth_amount']  # ✅ NEW: Pass ACTUAL ETH from NowPayments
+        )
+
+        if db_success:
+            logger.info(f"✅ [ENDPOINT] Database: Successfully logged payment")
+        else:
+            logger.warning(f"⚠️ [ENDPOINT] Database: Failed to log payment")
+        return db_success
+
+    except Exception as e:
+        logger.error(f"❌ [ENDPOINT] Database error: {e}", exc_info=True)
+        return False
+
+
+def enqueue_payment_response(unique_id: str, cn_api_id: str, context: str, tx_result: dict):
+    """
+    Encrypt the payment result and enqueue it to PGP_HOSTPAY1_v1 (instant)
+    or PGP_ACCUMULATOR (threshold).
+
+    Returns:
+        Task name if successful, None if failed
+    """
+    # Encrypt response token
+    encrypted_response_token = token_manager.encrypt_pgp_hostpay3_to_pgp_hostpay1_token(
+        unique_id=unique_id,
+        cn_api_id=cn_api_id,
+        tx_hash=tx_result['tx_hash'],
+        tx_status=tx_result['status'],
+        gas_used=tx_result['gas_used'],
+        block_number=tx_result['block_number']
+    )
+
+    if not encrypted_response_token:
+        logger.error(f"❌ [ENDPOINT] Failed to encrypt response token")
+        return None
+
+    # Enqueue response based on context (NEW: Conditional routing)
+    if not cloudtasks_client:
+        logger.error(f"❌ [ENDPOINT] Cloud Tasks client not available")
+        return None
+
+    # Determine routing based on context
+    if context == 'threshold':
+        # Route to PGP_ACCUMULATOR for threshold payouts
+        logger.info(f"🎯 [ENDPOINT] Context: threshold → Routing to PGP_ACCUMULATOR")
+
+        pgp_accumulator_response_queue = config.get('pgp_accumulator_response_queue')
+        pgp_accumulator_url = config.get('pgp_accumulator_url')
+
+        if not pgp_accumulator_response_queue or not pgp_accumulator_url:
+            logger.error(f"❌ [ENDPOINT] PGP_ACCUMULATOR configuration missing")
+            return None
+
+        # Target the /swap-executed endpoint
+        target_url = f"{pgp_accumulator_url}/swap-executed"
+        queue_name = pgp_accumulator_response_queue
+
+    else:
+        # Route to PGP_HOSTPAY1_v1 for instant payouts (existing behavior)
+        logger.info(f"🎯 [ENDPOINT] Context: instant → Routing to PGP_HOSTPAY1_v1")
+
+        pgp_hostpay1_response_queue = config_manager.get_pgp_hostpay1_response_queue()
+        pgp_hostpay1_url = config_manager.get_pgp_hostpay1_url()
+
+        if not pgp_hostpay1_response_queue or not pgp_hostpay1_url:
+            logger.error(f"❌ [ENDPOINT] PGP_HOSTPAY1_v1 configuration missing")
+            return None
+
+        # Target the /payment-completed endpoint
+        target_url = f"{pgp_hostpay1_url}/payment-completed"
+        queue_name = pgp_hostpay1_response_queue
+
+    logger.info(f"📤 [ENDPOINT] Routing to: {target_url}")
+
+    # Enqueue response to appropriate service
+    task_name = cloudtasks_client.enqueue_pgp_hostpay1_payment_response(
+        queue_name=queue_name,
+        target_url=target_url,
+        encrypted_token=encrypted_response_token
+    )
+
+    if not task_name:
+        logger.error(f"❌ [ENDPOINT] Failed to create Cloud Task")
+        return None
+
+    logger.info(f"✅ [ENDPOINT] Successfully enqueued response")
+    logger.debug(f"🆔 [ENDPOINT] Task: {task_name}")
+    return task_name
+
+
+def handle_confirmed_payment(pending: dict, tx_result: dict) -> bool:
+    """
+    Confirmation tracker callback: log the payment and send the response.
+
+    Returns False (retried next poll) if either step fails. The log is
+    idempotent, and the response is only enqueued once the log succeeded.
+    """
+    if not log_successful_payment(pending, tx_result):
+        return False
+    return enqueue_payment_response(pending['unique_id'], pending['cn_api_id'], pending['context'], tx_result) is not None
+
+
+def handle_reverted_payment(pending: dict, tx_result: dict) -> None:
+    """Confirmation tracker callback: store the reverted payment and alert."""
+    error_code = 'TRANSACTION_REVERTED_PERMANENT'
+    error_message = f"Transaction reverted on-chain: {tx_result['tx_hash']}"
+
+    if db_manager:
+        db_manager.insert_failed_transaction(
+            unique_id=pending['unique_id'],
+            cn_api_id=pending['cn_api_id'],
+            from_currency=pending['from_currency'],
+            from_network=pending['from_network'],
+            from_amount=pending['from_amount'],
+            payin_address=pending['payin_address'],
+            context=pending['context'],
+            error_code=error_code,
+            error_message=error_message,
+            error_details={
+                'tx_hash': tx_result['tx_hash'],
+                'block_number': tx_result['block_number'],
+                'gas_used': tx_result['gas_used'],
+                'detected_by': 'confirmation_tracker'
+            },
+            attempt_count=1
+        )
+
+    if alerting_service:
+        alerting_service.send_payment_failure_alert(
+            unique_id=pending['unique_id'],
+            cn_api_id=pending['cn_api_id'],
+            error_code=error_code,
+            error_message=error_message,
+            context=pending['context'],
+            amount=pending['from_amount'],
+            from_currency=pending['from_currency'],
+            payin_address=pending['payin_address'],
+            attempt_count=1
+        )
+
+
+def handle_dropped_payment(pending: dict) -> None:
+    """
+    Confirmation tracker callback: the transaction's nonce was used by another
+    transaction and none of its hashes was mined.
+
+    Stored as failed_retryable (nothing was paid) for the recovery worker and
+    alerted. Raises if it couldn't be stored, so the tracker retries.
+    """
+    error_code = 'TRANSACTION_DROPPED'
+    error_message = (f"Transaction dropped: nonce {pending['nonce']} used by another transaction, "
+                     f"{pending['tx_hash']} not mined after {pending['age_seconds']}s")
+
+    if not db_manager or not db_manager.insert_failed_transaction(
+        unique_id=pending['unique_id'],
+        cn_api_id=pending['cn_api_id'],
+        from_currency=pending['from_currency'],
+        from_network=pending['from_network'],
+        from_amount=pending['from_amount'],
+        payin_address=pending['payin_address'],
+        context=pending['context'],
+        error_code=error_code,
+        error_message=error_message,
+        error_details={
+            'tx_hash': pending['tx_hash'],
+            'replacement_tx_hashes': pending.get('replacement_tx_hashes') or [],
+            'nonce': pending['nonce'],
+            'age_seconds': pending['age_seconds'],
+            'payment_amount': pending['actual_eth_amount'] or None,
+            'actual_eth_amount': pending['actual_eth_amount'],
+            'detected_by': 'confirmation_tracker'
+        },
+        attempt_count=1,
+        status='failed_retryable'
+    ):
+        raise Exception("Failed to store dropped transaction")
+
+    if alerting_service:
+        alerting_service.send_payment_failure_alert(
+            unique_id=pending['unique_id'],
+            cn_api_id=pending['cn_api_id'],
+            error_code=error_code,
+            error_message=error_message,
+            context=pending['context'],
+            amount=pending['from_amount'],
+            from_currency=pending['from_currency'],
+            payin_address=pending['payin_address'],
+            attempt_count=1
+        )
+
+
+def handle_stuck_payment(pending: dict) -> None:
+    """Confirmation tracker callback: a stale transaction whose nonce is still open (being replaced)."""
+    if alerting_service:
+        alerting_service.send_stuck_transaction_alert(
+            unique_id=pending['unique_id'],
+            cn_api_id=pending['cn_api_id'],
+            tx_hash=pending['tx_hash'],
+            age_seconds=pending['age_seconds'],
+            context=pending['context']
+        )
+
+
+# Initialize confirmation tracker (needs migrations 009, 011, 012 and 014). It also
+# resolves signed transactions whose broadcast or receipt wait failed, so it
+# runs even when ASYNC_CONFIRMATIONS is off.
+confirmation_tracker = None
+async_confirmations_enabled = (os.getenv('ASYNC_CONFIRMATIONS') or 'true').strip().lower() == 'true'
+if wallet_manager and db_manager:
+    try:
+        if db_manager.pending_transactions_available():
+            confirmation_tracker = ConfirmationTracker(
+                wallet_manager,
+                db_manager,
+                on_confirmed=handle_confirmed_payment,
+                on_reverted=handle_reverted_payment,
+                on_dropped=handle_dropped_payment,
+                on_stuck=handle_stuck_payment
+            )
+            logger.info(f"✅ [APP] Confirmation tracker initialized (async confirmations: {async_confirmations_enabled})")
+        else:
+            logger.warning(f"⚠️ [APP] hostpay_pending_transactions or wallet_signed_transactions unavailable - waiting for receipts in-request")
+    except Exception as e:
+        logger.error(f"❌ [APP] Failed to initialize confirmation tracker: {e}", exc_info=True)
+        confirmation_tracker = None
+
+# Return right after broadcast (POST /confirm-pending sends the response)
+async_confirmations = async_confirmations_enabled and confirmation_tracker is not None
+
+
 # ============================================================================
 # MAIN ENDPOINT: POST / - Receives request from PGP_HOSTPAY1_v1
 # ============================================================================
@@ -123,10 +433,13 @@ def execute_eth_payment():
     3. Check attempt limit (>3 = skip duplicate Cloud Tasks retry)
     4. Execute ETH payment (SINGLE ATTEMPT - no infinite retry)
     5. On success: Log to database, encrypt response, send to PGP_HOSTPAY1_v1
+       (async confirmations: record as pending and return after broadcast)
     6. On failure:
-       a. Classify error (retryable vs permanent)
-       b. If attempt < 3: Re-encrypt with incremented count, enqueue self-retry
-       c. If attempt >= 3: Store in failed_transactions, send alert, stop
+       a. Failed after signing (broadcast, receipt wait, log or response):
+          hand to the confirmation tracker - never retried
+       b. Classify error (retryable vs permanent)
+       c. If attempt < 3: Re-encrypt with incremented count, enqueue self-retry
+       d. If attempt >= 3: Store in failed_transactions, send alert, stop
 
     Returns:
         JSON response with status (always 200 to prevent Cloud Tasks auto-retry)
@@ -175,16 +488,8 @@ def execute_eth_payment():
             last_error_code = decrypted_data.get('last_error_code')
 
             # ✅ CRITICAL: Determine payment amount (ACTUAL or fallback to estimate)
-            if actual_eth_amount > 0:
-                payment_amount = actual_eth_amount
-                logger.info(f"✅ [ENDPOINT] Using ACTUAL ETH from NowPayments: {payment_amount}")
-            elif estimated_eth_amount > 0:
-                payment_amount = estimated_eth_amount
-                logger.warning(f"⚠️ [ENDPOINT] Using ESTIMATED ETH (actual not available): {payment_amount}")
-            elif from_amount > 0:
-                payment_amount = from_amount
-                logger.warning(f"⚠️ [ENDPOINT] Using legacy from_amount (backward compat): {payment_amount}")
-            else:
+            payment_amount = resolve_payment_amount(decrypted_data)
+            if payment_amount <= 0:
                 logger.error(f"❌ [ENDPOINT] No valid amount found in token!")
                 abort(400, "Invalid payment amount")
 
@@ -273,6 +578,21 @@ def execute_eth_payment():
         logger.info(f"💰 [ENDPOINT] Executing {balance_label} payment (attempt {attempt_count}/3)")
         logger.info(f"💎 [ENDPOINT] Amount to send: {payment_amount} {balance_label}")
 
+        payment = {
+            'unique_id': unique_id,
+            'cn_api_id': cn_api_id,
+            'from_currency': from_currency,
+            'from_network': from_network,
+            'from_amount': from_amount,
+            'payin_address': payin_address,
+            'actual_eth_amount': actual_eth_amount,
+            'context': context,
+            'amount': payment_amount
+        }
+
+        # Set once broadcast: from then on failures are never retried
+        broadcast_tx_hash = None
+
         # NEW: Wrap payment execution in try/except to catch failures
         try:
             if currency_type == 'native':
@@ -281,7 +601,8 @@ def execute_eth_payment():
                 tx_result = wallet_manager.send_eth_payment_with_infinite_retry(
                     to_address=payin_address,
                     amount=payment_amount,
-                    unique_id=unique_id
+                    unique_id=unique_id,
+                    wait_for_receipt=False
                 )
 
             elif currency_type == 'erc20':
@@ -292,12 +613,34 @@ def execute_eth_payment():
                     to_address=payin_address,
                     amount=payment_amount,
                     token_decimals=token_config['decimals'],
-                    unique_id=unique_id
+                    unique_id=unique_id,
+                    wait_for_receipt=False
                 )
 
             else:
                 raise Exception(f"Unknown currency type: {currency_type}")
 
+            broadcast_tx_hash = tx_result['tx_hash']
+
+            # Async confirmations: hand off to the confirmation tracker
+            if async_confirmations:
+                logger.info(f"📤 [ENDPOINT] Broadcast: {broadcast_tx_hash} - tracking confirmation asynchronously")
+
+                if record_pending_payment(payment, broadcast_tx_hash):
+                    return jsonify({
+                        "status": "submitted",
+                        "message": "Payment broadcast - response is sent once confirmed",
+                        "unique_id": unique_id,
+                        "cn_api_id": cn_api_id,
+                        "tx_hash": broadcast_tx_hash,
+                        "attempt": attempt_count
+                    }), 200
+
+                # Not tracked: wait here so the response isn't lost
+                logger.warning(f"⚠️ [ENDPOINT] Could not record pending transaction - waiting for receipt")
+
+            tx_result = wallet_manager.wait_for_confirmation(broadcast_tx_hash, "ENDPOINT")
+
             # Validate result
             if not tx_result or tx_result.get('status') != 'success':
                 raise Exception(f"Payment returned invalid result: {tx_result}")
@@ -312,101 +655,14 @@ def execute_eth_payment():
             logger.info(f"📦 [ENDPOINT] Block Number: {tx_result['block_number']}")
 
             # Log to database (ONLY after successful payment)
-            if not db_manager:
-                logger.warning(f"⚠️ [ENDPOINT] Database manager not available - skipping database log")
-            else:
-                try:
-                    db_success = db_manager.insert_hostpay_transaction(
-                        unique_id=unique_id,
-                        cn_api_id=cn_api_id,
-                        from_currency=from_currency,
-                        from_network=from_network,
-                        from_amount=from_amount,
-                        payin_address=payin_address,
-                        is_complete=True,
-                        tx_hash=tx_result['tx_hash'],
-                        tx_status=tx_result['status'],
-                        gas_used=tx_result['gas_used'],
-                        block_number=tx_result['block_number'],
-                        actual_eth_amount=actual_eth_amount  # ✅ NEW: Pass ACTUAL ETH from NowPayments
-                    )
-
-                    if db_success:
-                        logger.info(f"✅ [ENDPOINT] Database: Successfully logged payment")
-                    else:
-                        logger.warning(f"⚠️ [ENDPOINT] Database: Failed to log payment (non-fatal)")
-
-                except Exception as e:
-                    logger.error(f"❌ [ENDPOINT] Database error: {e} (non-fatal)", exc_info=True)
-
-            # Encrypt response token
-            encrypted_response_token = token_manager.encrypt_pgp_hostpay3_to_pgp_hostpay1_token(
-                unique_id=unique_id,
-                cn_api_id=cn_api_id,
-                tx_hash=tx_result['tx_hash'],
-                tx_status=tx_result['status'],
-                gas_used=tx_result['gas_used'],
-                block_number=tx_result['block_number']
-            )
-
-            if not encrypted_response_token:
-                logger.error(f"❌ [ENDPOINT] Failed to encrypt response token")
-                abort(500, "Token encryption failed")
-
-            # Enqueue response based on context (NEW: Conditional routing)
-            if not cloudtasks_client:
-                logger.error(f"❌ [ENDPOINT] Cloud Tasks client not available")
-                abort(500, "Cloud Tasks unavailable")
-
-            # Determine routing based on context
-            if context == 'threshold':
-                # Route to PGP_ACCUMULATOR for threshold payouts
-                logger.info(f"🎯 [ENDPOINT] Context: threshold → Routing to PGP_ACCUMULATOR")
-
-                pgp_accumulator_response_queue = config.get('pgp_accumulator_response_queue')
-                pgp_accumulator_url = config.get('pgp_accumulator_url')
-
-                if not pgp_accumulator_response_queue or not pgp_accumulator_url:
-                    logger.error(f"❌ [ENDPOINT] PGP_ACCUMULATOR configuration missing")
-                    abort(500, "Service configuration error")
-
-                # Target the /swap-executed endpoint
-                target_url = f"{pgp_accumulator_url}/swap-executed"
-                queue_name = pgp_accumulator_response_queue
-
-                logger.info(f"📤 [ENDPOINT] Routing to: {target_url}")
-
-            else:
-                # Route to PGP_HOSTPAY1_v1 for instant payouts (existing behavior)
-                logger.info(f"🎯 [ENDPOINT] Context: instant → Routing to PGP_HOSTPAY1_v1")
-
-                pgp_hostpay1_response_queue = config_manager.get_pgp_hostpay1_response_queue()
-                pgp_hostpay1_url = config_manager.get_pgp_hostpay1_url()
-
-                if not pgp_hostpay1_response_queue or not pgp_hostpay1_url:
-                    logger.error(f"❌ [ENDPOINT] PGP_HOSTPAY1_v1 configuration missing")
-                    abort(500, "Service configuration error")
+            log_successful_payment(payment, tx_result)
 
-                # Target the /payment-completed endpoint
-                target_url = f"{pgp_hostpay1_url}/payment-completed"
-                queue_name = pgp_hostpay1_response_queue
-
-                logger.info(f"📤 [ENDPOINT] Routing to: {target_url}")
-
-            # Enqueue response to appropriate service
-            task_name = cloudtasks_client.enqueue_pgp_hostpay1_payment_response(
-                queue_name=queue_name,
-                target_url=target_url,
-                encrypted_token=encrypted_response_token
-            )
+            # Encrypt and enqueue response (routed by context)
+            task_name = enqueue_payment_response(unique_id, cn_api_id, context, tx_result)
 
             if not task_name:
-                logger.error(f"❌ [ENDPOINT] Failed to create Cloud Task")
                 abort(500, "Failed to enqueue task")
 
-            logger.info(f"✅ [ENDPOINT] Successfully enqueued response")
-            logger.debug(f"🆔 [ENDPOINT] Task: {task_name}")
-
             return jsonify({
                 "status": "success",
                 "message": "Payment executed and response enqueued",
@@ -426,6 +682,19 @@ def execute_eth_payment():
             # ========================================================================
             logger.error(f"❌ [ENDPOINT] Payment execution failed: {payment_error}", exc_info=True)
 
+            if isinstance(payment_error, SignedTransactionError):
+                broadcast_tx_hash = payment_error.tx_hash
+
+            if broadcast_tx_hash:
+                # Signed and possibly on-chain: a retry could pay twice. The
+                # tracker confirms it and sends the response (or stores it).
+                result = track_unconfirmed_payment(payment, broadcast_tx_hash, payment_error)
+                return jsonify({
+                    **result,
+                    "cn_api_id": cn_api_id,
+                    "attempt": attempt_count
+                }), 200
+
             # Classify error
             error_code, is_retryable = ErrorClassifier.classify_error(payment_error)
             error_message = str(payment_error)
@@ -517,7 +786,9 @@ def execute_eth_payment():
                     'first_attempt_at': first_attempt_at,
                     'last_attempt_at': int(time.time()),
                     'is_retryable': is_retryable,
-                    'error_classification': error_code
+                    'error_classification': error_code,
+                    'payment_amount': payment_amount,  # Used by the recovery worker
+                    'actual_eth_amount': actual_eth_amount
                 }
 
                 # Store in failed_transactions table
@@ -534,7 +805,9 @@ def execute_eth_payment():
                             error_code=error_code,
                             error_message=error_message,
                             error_details=error_details,
-                            attempt_count=3
+                            attempt_count=3,
+                            # Retryable errors are drained by POST /recover-failed
+                            status='failed_retryable' if is_retryable else 'failed_pending_review'
                         )
 
                         if db_success:
@@ -595,6 +868,438 @@ def execute_eth_payment():
         }), 500
 
 
+# ============================================================================
+# BATCH ENDPOINT: POST /batch - Many payouts in one request
+# ============================================================================
+
+def requeue_single_payment(token: str):
+    """
+    Hand a batch item that wasn't sent back to POST / (single-payment path,
+    with its 3-attempt retry and failure storage).
+
+    Returns:
+        Task name if successful, None if failed
+    """
+    pgp_hostpay3_retry_queue = config_manager.get_pgp_hostpay3_retry_queue()
+    pgp_hostpay3_url = config_manager.get_pgp_hostpay3_url()
+
+    if not cloudtasks_client or not pgp_hostpay3_retry_queue or not pgp_hostpay3_url:
+        logger.error(f"❌ [BATCH] PGP_HOSTPAY3_v1 retry configuration missing")
+        return None
+
+    return cloudtasks_client.enqueue_pgp_hostpay3_retry(
+        queue_name=pgp_hostpay3_retry_queue,
+        target_url=f"{pgp_hostpay3_url}/",
+        encrypted_token=token,
+        retry_delay_seconds=BATCH_REQUEUE_DELAY_SECONDS
+    )
+
+
+def record_pending_payment(payment: dict, tx_hash: str) -> bool:
+    """
+    Hand a signed payment to the confirmation tracker (hostpay_pending_transactions).
+
+    Returns:
+        True if recorded, False if the tracker isn't available or the insert failed
+    """
+    return bool(confirmation_tracker) and db_manager.insert_pending_transaction(
+        tx_hash=tx_hash,
+        unique_id=payment['unique_id'],
+        cn_api_id=payment['cn_api_id'],
+        from_currency=payment['from_currency'],
+        from_network=payment['from_network'],
+        from_amount=payment['from_amount'],
+        actual_eth_amount=payment['actual_eth_amount'],
+        payin_address=payment['payin_address'],
+        context=payment['context']
+    )
+
+
+def track_unconfirmed_payment(payment: dict, tx_hash: str, error: Exception) -> dict:
+    """
+    Handle a signed payment whose outcome is unknown (broadcast error or no
+    receipt in time). It is never resent here: the confirmation tracker
+    resolves it (confirmed, reverted, or dropped -> failed_retryable).
+
+    If it can't be tracked it is stored as failed_pending_review with its
+    tx hash, and alerted.
+
+    Returns:
+        Per-item result ("unconfirmed" if tracked, "needs_review" otherwise)
+    """
+    logger.error(f"❌ [UNCONFIRMED] {payment['unique_id']} signed as {tx_hash} but not confirmed: {error}")
+
+    if record_pending_payment(payment, tx_hash):
+        return {"unique_id": payment['unique_id'], "status": "unconfirmed", "tx_hash": tx_hash, "error": str(error)}
+
+    error_code, _ = ErrorClassifier.classify_error(error)
+    error_message = f"Signed transaction {tx_hash} not confirmed and not tracked: {error}"
+    logger.error(f"❌ [UNCONFIRMED] {payment['unique_id']} could not be tracked - storing for manual review")
+
+    if db_manager:
+        db_manager.insert_failed_transaction(
+            unique_id=payment['unique_id'],
+            cn_api_id=payment['cn_api_id'],
+            from_currency=payment['from_currency'],
+            from_network=payment['from_network'],
+            from_amount=payment['from_amount'],
+            payin_address=payment['payin_address'],
+            context=payment['context'],
+            error_code=error_code,
+            error_message=error_message,
+            error_details={
+                'tx_hash': tx_hash,
+                'exception_message': str(error),
+                'payment_amount': payment.get('amount'),
+                'actual_eth_amount': payment['actual_eth_amount']
+            },
+            attempt_count=1,
+            status='failed_pending_review'
+        )
+
+    if alerting_service:
+        alerting_service.send_payment_failure_alert(
+            unique_id=payment['unique_id'],
+            cn_api_id=payment['cn_api_id'],
+            error_code=error_code,
+            error_message=error_message,
+            context=payment['context'],
+            amount=payment['from_amount'],
+            from_currency=payment['from_currency'],
+            payin_address=payment['payin_address'],
+            attempt_count=1
+        )
+
+    return {"unique_id": payment['unique_id'], "status": "needs_review", "tx_hash": tx_hash, "error": str(error)}
+
+
+def finish_broadcast_payment(payment: dict, tx_hash: str, tx_result: dict = None) -> dict:
+    """
+    Track (async) or confirm (sync) one broadcast payment (batch item,
+    Disperse item or recovery) and send its response.
+
+    Args:
+        payment: Payment fields (see log_successful_payment) plus context
+        tx_hash: Broadcast transaction hash
+        tx_result: Receipt result if already waited for (Disperse)
+
+    Returns:
+        Per-item result
+    """
+    if async_confirmations and record_pending_payment(payment, tx_hash):
+        return {"unique_id": payment['unique_id'], "status": "submitted", "tx_hash": tx_hash}
+
+    if tx_result is None:
+        try:
+            tx_result = wallet_manager.wait_for_confirmation(tx_hash, "BATCH")
+        except Exception as e:
+            # Already broadcast: never resend
+            return track_unconfirmed_payment(payment, tx_hash, e)
+
+    log_successful_payment(payment, tx_result)
+    task_name = enqueue_payment_response(payment['unique_id'], payment['cn_api_id'], payment['context'], tx_result)
+    return {
+        "unique_id": payment['unique_id'],
+        "status": "confirmed" if task_name else "response_failed",
+        "tx_hash": tx_hash,
+        "block_number": tx_result['block_number']
+    }
+
+
+@app.route("/batch", methods=["POST"])
+def execute_batch_payments():
+    """
+    Execute many payouts in one request (batch settlement windows).
+
+    Body: {"tokens": [<PGP_HOSTPAY1_v1 → PGP_HOSTPAY3_v1 token>, ...]}
+
+    FLOW:
+    1. Decrypt every token (same token format as POST /)
+    2. Group by currency and check each group's total against the balance once
+    3. Broadcast the group back-to-back with sequential nonces and one gas quote
+       (or one Disperse transaction for ETH when DISPERSE_CONTRACT_ADDRESS is set)
+    4. Per item: record for the confirmation tracker, or wait for the receipt
+       and send the PGP_HOSTPAY1_v1 response
+    5. Items that weren't signed are requeued to POST / individually. Items
+       signed but not confirmed (broadcast error, receipt timeout) are handed
+       to the confirmation tracker, or stored for manual review - never resent
+
+    A unique_id that appears more than once is only paid once (later copies
+    are rejected as "duplicate").
+
+    Returns:
+        JSON with one result per item (always 200 unless the request is malformed)
+    """
+    try:
+        request_data = request.get_json(silent=True) or {}
+        tokens = request_data.get('tokens')
+
+        if not isinstance(tokens, list) or not tokens:
+            abort(400, "Missing tokens")
+        if len(tokens) > BATCH_PAYOUT_MAX_ITEMS:
+            abort(400, f"Too many items (max {BATCH_PAYOUT_MAX_ITEMS})")
+        if not token_manager or not wallet_manager:
+            logger.error(f"❌ [BATCH] Required managers not available")
+            abort(500, "Service configuration error")
+
+        logger.info(f"📦 [BATCH] Batch payout request received: {len(tokens)} item(s)")
+
+        results = []
+        groups = {}
+        seen_unique_ids = set()
+
+        # Decrypt and group by currency
+        for token in tokens:
+            decrypted_data = token_manager.decrypt_pgp_hostpay1_to_pgp_hostpay3_token(token) if isinstance(token, str) else None
+            if not decrypted_data:
+                results.append({"unique_id": None, "status": "invalid", "error": "Invalid token"})
+                continue
+
+            payment = {
+                'token': token,
+                'unique_id': decrypted_data['unique_id'],
+                'cn_api_id': decrypted_data['cn_api_id'],
+                'from_currency': decrypted_data['from_currency'],
+                'from_network': decrypted_data['from_network'],
+                'from_amount': decrypted_data.get('from_amount', 0.0),
+                'actual_eth_amount': decrypted_data.get('actual_eth_amount', 0.0),
+                'payin_address': decrypted_data['payin_address'],
+                'to_address': decrypted_data['payin_address'],
+                'context': decrypted_data.get('context', 'instant'),
+                'amount': resolve_payment_amount(decrypted_data)
+            }
+            currency = payment['from_currency'].lower()
+
+            if payment['unique_id'] in seen_unique_ids:
+                logger.warning(f"⚠️ [BATCH] Duplicate unique_id {payment['unique_id']} in batch - rejected")
+                results.append({"unique_id": payment['unique_id'], "status": "duplicate", "error": "Duplicate unique_id in batch"})
+                continue
+            seen_unique_ids.add(payment['unique_id'])
+
+            if payment['amount'] <= 0 or (currency != 'eth' and currency not in TOKEN_CONFIGS):
+                results.append({"unique_id": payment['unique_id'], "status": "invalid", "error": "Invalid amount or currency"})
+                continue
+
+            groups.setdefault(currency, []).append(payment)
+
+        for currency, payments in groups.items():
+            token_config = TOKEN_CONFIGS.get(currency)
+            requeue = []
+
+            # One balance check for the whole group
+            if token_config:
+                wallet_balance = wallet_manager.get_erc20_balance(token_config['address'], token_config['decimals'])
+            else:
+                wallet_balance = wallet_manager.get_wallet_balance()
+            total = sum(payment['amount'] for payment in payments)
+
+            if wallet_balance < total:
+                logger.error(f"❌ [BATCH] Insufficient {currency.upper()} for batch: need {total}, have {wallet_balance}")
+                requeue = payments
+                payments = []
+
+            # Optional: one Disperse transaction for the whole ETH group
+            if payments and not token_config and DISPERSE_CONTRACT_ADDRESS and len(payments) > 1:
+                try:
+                    tx_hash = wallet_manager.send_disperse_eth(DISPERSE_CONTRACT_ADDRESS, payments)
+                except SignedTransactionError as e:
+                    results.extend(track_unconfirmed_payment(payment, e.tx_hash, e) for payment in payments)
+                    continue
+                except Exception as e:
+                    tx_hash = None
+                    logger.warning(f"⚠️ [BATCH] Disperse not sent ({e}) - sending individually")
+
+                if tx_hash:
+                    tx_result = None
+                    if not async_confirmations:
+                        try:
+                            tx_result = wallet_manager.wait_for_confirmation(tx_hash, "DISPERSE")
+                        except TransactionRevertedError:
+                            # Reverted: nobody was paid
+                            logger.warning(f"⚠️ [BATCH] Disperse transaction {tx_hash} reverted - sending individually")
+                            tx_hash = None
+                        except Exception as e:
+                            results.extend(track_unconfirmed_payment(payment, tx_hash, e) for payment in payments)
+                            continue
+
+                    if tx_hash:
+                        results.extend(finish_broadcast_payment(payment, tx_hash, tx_result) for payment in payments)
+                        continue
+
+            # Pipelined broadcast: sequential nonces, no waits in between
+            if payments:
+                broadcast_results = wallet_manager.send_batch_payments(payments, token_config)
+
+                for payment, broadcast in zip(payments, broadcast_results):
+                    if broadcast['status'] == 'pending':
+                        results.append(finish_broadcast_payment(payment, broadcast['tx_hash']))
+                    elif broadcast['status'] == 'unconfirmed':
+                        # Signed: may be on-chain, never requeue
+                        results.append(track_unconfirmed_payment(payment, broadcast['tx_hash'], Exception(broadcast['error'])))
+                    else:
+                        requeue.append(payment)
+
+            for payment in requeue:
+                task_name = requeue_single_payment(payment['token'])
+                results.append({
+                    "unique_id": payment['unique_id'],
+                    "status": "requeued" if task_name else "error",
+                    "tx_hash": None
+                })
+
+        summary = {}
+        for result in results:
+            summary[result['status']] = summary.get(result['status'], 0) + 1
+
+        logger.info(f"📊 [BATCH] Batch complete: {summary}")
+
+        return jsonify({
+            "status": "success",
+            "items": results,
+            "summary": summary
+        }), 200
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        logger.error(f"❌ [BATCH] Unexpected error: {e}", exc_info=True)
+        return jsonify({
+            "status": "error",
+            "message": f"Processing error: {str(e)}"
+        }), 500
+
+
+# ============================================================================
+# CONFIRMATION TRACKER ENDPOINT: POST /confirm-pending - Cloud Scheduler
+# ============================================================================
+
+@app.route("/confirm-pending", methods=["POST"])
+def confirm_pending_payments():
+    """
+    Resolve broadcast payouts (triggered by Cloud Scheduler every minute).
+
+    Batch-polls receipts for all pending transactions and sends the
+    PGP_HOSTPAY1_v1 / PGP_ACCUMULATOR response for each confirmed one.
+
+    Returns:
+        JSON summary of the poll
+    """
+    try:
+        if not confirmation_tracker:
+            return jsonify({
+                "status": "disabled",
+                "message": "Confirmation tracker not available"
+            }), 200
+
+        summary = confirmation_tracker.poll()
+
+        return jsonify({
+            "status": "success",
+            **summary
+        }), 200
+
+    except Exception as e:
+        logger.error(f"❌ [TRACKER] Confirmation poll failed: {e}", exc_info=True)
+        return jsonify({
+            "status": "error",
+            "message": f"Processing error: {str(e)}"
+        }), 500
+
+
+# ============================================================================
+# RECOVERY ENDPOINT: POST /recover-failed - Cloud Scheduler
+# ============================================================================
+
+def recover_failed_payment(row: dict, amount: float, on_signed=None) -> dict:
+    """
+    Re-execute one claimed failed_transactions row (recovery worker callback).
+
+    on_signed(tx_hash) records the signed hash on the row before broadcast.
+    Raises only if nothing was broadcast or the broadcast itself failed;
+    errors after broadcast are handed to the confirmation tracker (or
+    manual review) and never make the worker resend.
+
+    Returns:
+        Per-item result from finish_broadcast_payment() / track_unconfirmed_payment()
+    """
+    currency = row['from_currency'].lower()
+    token_config = TOKEN_CONFIGS.get(currency)
+
+    if token_config:
+        tx_result = wallet_manager.send_erc20_token(
+            token_contract_address=token_config['address'],
+            to_address=row['payin_address'],
+            amount=amount,
+            token_decimals=token_config['decimals'],
+            unique_id=row['unique_id'],
+            wait_for_receipt=False,
+            on_signed=on_signed
+        )
+    elif currency == 'eth':
+        tx_result = wallet_manager.send_eth_payment_with_infinite_retry(
+            to_address=row['payin_address'],
+            amount=amount,
+            unique_id=row['unique_id'],
+            wait_for_receipt=False,
+            on_signed=on_signed
+        )
+    else:
+        raise ValueError(f"Unsupported currency: {row['from_currency']}")
+
+    payment = dict(row, actual_eth_amount=row['last_error_details'].get('actual_eth_amount', 0.0), amount=amount)
+    try:
+        return finish_broadcast_payment(payment, tx_result['tx_hash'])
+    except Exception as e:
+        # Broadcast: never resend
+        return track_unconfirmed_payment(payment, tx_result['tx_hash'], e)
+
+
+# Initialize recovery worker
+recovery_worker = None
+if wallet_manager and db_manager:
+    try:
+        recovery_worker = RecoveryWorker(db_manager, wallet_manager, execute_payment=recover_failed_payment)
+    except Exception as e:
+        logger.error(f"❌ [APP] Failed to initialize recovery worker: {e}", exc_info=True)
+        recovery_worker = None
+
+
+@app.route("/recover-failed", methods=["POST"])
+def recover_failed_payments():
+    """
+    Drain retryable failed transactions (triggered by Cloud Scheduler).
+
+    Claims up to RECOVERY_BATCH_SIZE rows with FOR UPDATE SKIP LOCKED and
+    re-executes them RECOVERY_CONCURRENCY at a time. Safe to run on many
+    instances in parallel; trigger repeatedly to drain a backlog.
+
+    Returns:
+        JSON summary of the run
+    """
+    try:
+        if not recovery_worker:
+            logger.error(f"❌ [RECOVERY] Recovery worker not available")
+            abort(500, "Service not properly initialized")
+
+        summary = recovery_worker.run()
+
+        return jsonify({
+            "status": "success",
+            **summary
+        }), 200
+
+    except HTTPException:
+        raise
+
+    except Exception as e:
+        logger.error(f"❌ [RECOVERY] Recovery run failed: {e}", exc_info=True)
+        return jsonify({
+            "status": "error",
+            "message": f"Processing error: {str(e)}"
+        }), 500
+
+
 # ============================================================================
 # HEALTH CHECK ENDPOINT
 # ============================================================================
@@ -611,7 +1316,10 @@ def health_check():
                 "token_manager": "healthy" if token_manager else "unhealthy",
                 "wallet": "healthy" if wallet_manager else "unhealthy",
                 "database": "healthy" if db_manager else "unhealthy",
-                "cloudtasks": "healthy" if cloudtasks_client else "unhealthy"
+                "cloudtasks": "healthy" if cloudtasks_client else "unhealthy",
+                "confirmation_tracker": "enabled" if confirmation_tracker else "disabled",
+                "async_confirmations": async_confirmations,
+                "recovery_worker": "healthy" if recovery_worker else "unhealthy"
             }
         }), 200
 
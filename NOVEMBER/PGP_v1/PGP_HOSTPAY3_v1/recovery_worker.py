@@ -0,0 +1,292 @@
+#!/usr/bin/env python
+"""
+Recovery Worker for PGP_HOSTPAY3_v1 (ETH Payment Executor Service).
+Drains failed_transactions rows with status 'failed_retryable'.
+
+Flow (POST /recover-failed, Cloud Scheduler):
+1. Claim a batch with FOR UPDATE SKIP LOCKED and an advisory lock per
+   unique_id (status -> 'recovering', claimed_at lease), safe with any
+   number of instances running in parallel
+2. Check every earlier signed hash of the payment: mined -> recovered;
+   not mined -> only dropped once the wallet's confirmed transaction count
+   is past its nonce, otherwise checked again later ('failed_retryable')
+   or, with no retries left or an unknown nonce, 'failed_pending_review'
+3. Re-execute the claimed payments on a bounded thread pool. The signed
+   hash is recorded on the row before broadcast (only while the lease is
+   held)
+4. Success -> mark_failed_transaction_recovered(recovery tx hash)
+5. Failure before signing -> back to 'failed_retryable' (retryable error,
+   retries left) or 'failed_pending_review'
+6. Failure after signing -> 'failed_pending_review', unless the node reports
+   the hash as unknown (then 'failed_retryable'; step 2 checks its nonce
+   before anything is resent)
+
+Errors after broadcast (logging, response) are handled by execute_payment
+and never reach the resend path.
+
+Status lifecycle:
+failed_retryable -> recovering -> recovered | failed_retryable | failed_pending_review
+recovering (lease expired: worker died) -> recovering
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from error_classifier import ErrorClassifier
+
+# Rows claimed per run
+RECOVERY_BATCH_SIZE = int((os.getenv('RECOVERY_BATCH_SIZE') or '').strip() or 20)
+
+# Payments re-executed concurrently (nonces come from the shared allocator)
+RECOVERY_CONCURRENCY = int((os.getenv('RECOVERY_CONCURRENCY') or '').strip() or 4)
+
+# Recovery attempts per row before it goes to manual review
+RECOVERY_MAX_RETRIES = int((os.getenv('RECOVERY_MAX_RETRIES') or '').strip() or 5)
+
+# Minimum seconds between recovery attempts of the same row
+RECOVERY_RETRY_BACKOFF_SECONDS = int((os.getenv('RECOVERY_RETRY_BACKOFF_SECONDS') or '').strip() or 300)
+
+# Seconds a claim is held before a 'recovering' row is claimed again (worker died)
+RECOVERY_LEASE_SECONDS = int((os.getenv('RECOVERY_LEASE_SECONDS') or '').strip() or 1800)
+
+# finish_broadcast_payment() statuses that mean the payment went out
+_SENT_STATUSES = ('submitted', 'confirmed', 'response_failed')
+
+
+class RecoveryClaimLost(Exception):
+    """The row was claimed again after our lease expired: nothing may be sent."""
+
+
+class RecoveryWorker:
+    """
+    Claims retryable failed transactions and re-executes them.
+    """
+
+    def __init__(
+        self,
+        db_manager,
+        wallet_manager,
+        execute_payment: Callable[[Dict[str, Any], float, Callable[[str], None]], Dict[str, Any]],
+        batch_size: int = RECOVERY_BATCH_SIZE,
+        concurrency: int = RECOVERY_CONCURRENCY,
+        max_retries: int = RECOVERY_MAX_RETRIES,
+        retry_backoff_seconds: int = RECOVERY_RETRY_BACKOFF_SECONDS,
+        lease_seconds: int = RECOVERY_LEASE_SECONDS
+    ):
+        """
+        Initialize RecoveryWorker.
+
+        Args:
+            db_manager: DatabaseManager
+            wallet_manager: WalletManager (receipts, nonces and lookups of earlier attempts)
+            execute_payment: Callable(row, amount, on_signed) -> per-item result
+                             ({"status", "tx_hash", ...}); on_signed(tx_hash) must run
+                             before broadcast. Raises only if the payment wasn't
+                             broadcast or its broadcast failed.
+            batch_size: Rows claimed per run
+            concurrency: Payments re-executed concurrently
+            max_retries: Recovery attempts per row
+            retry_backoff_seconds: Minimum seconds between attempts of a row
+            lease_seconds: Seconds before an unfinished claim is claimed again
+                           (must exceed the time one run takes)
+        """
+        self.db_manager = db_manager
+        self.wallet_manager = wallet_manager
+        self.execute_payment = execute_payment
+        self.batch_size = batch_size
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.lease_seconds = lease_seconds
+
+        print(f"🛠️ [RECOVERY] RecoveryWorker initialized (batch: {batch_size}, concurrency: {self.concurrency})")
+
+    def run(self) -> Dict[str, int]:
+        """
+        Claim one batch and recover it.
+
+        Returns:
+            Count per outcome (recovered, retry_later, needs_review, claim_lost)
+        """
+        rows = self.db_manager.claim_retryable_failed_transactions(
+            limit=self.batch_size,
+            max_retries=self.max_retries,
+            retry_backoff_seconds=self.retry_backoff_seconds,
+            lease_seconds=self.lease_seconds
+        )
+
+        summary = {"claimed": len(rows), "recovered": 0, "retry_later": 0, "needs_review": 0, "claim_lost": 0}
+        if not rows:
+            return summary
+
+        # One payment per unique_id (duplicate failure rows must not pay twice)
+        unique_rows = {}
+        for row in rows:
+            if row['unique_id'] in unique_rows:
+                self._set_status(row, 'failed_pending_review', f"Duplicate of failed transaction #{unique_rows[row['unique_id']]['id']}")
+                summary["needs_review"] += 1
+            else:
+                unique_rows[row['unique_id']] = row
+
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(unique_rows)), thread_name_prefix='recovery') as executor:
+            for outcome in executor.map(self._recover_safely, unique_rows.values()):
+                summary[outcome] += 1
+
+        print(f"📊 [RECOVERY] Run complete: {summary}")
+        return summary
+
+    def _recover_safely(self, row: Dict[str, Any]) -> str:
+        try:
+            return self._recover(row)
+        except Exception as e:
+            # Unknown state: don't risk a second payment
+            print(f"❌ [RECOVERY] {row['unique_id']}: unexpected error {e}")
+            self._set_status(row, 'failed_pending_review', f"Recovery error: {e}")
+            return "needs_review"
+
+    def _recover(self, row: Dict[str, Any]) -> str:
+        unique_id = row['unique_id']
+        details = row['last_error_details']
+        print(f"🛠️ [RECOVERY] {unique_id}: attempt {row['retry_count']}/{self.max_retries} ({row['error_code']})")
+
+        if row['retry_count'] > self.max_retries:
+            # Claimed again after the last attempt's lease expired
+            self._set_status(row, 'failed_pending_review', "Recovery lease expired on the last attempt")
+            return "needs_review"
+
+        # Earlier attempts may have been broadcast (every signed hash is recorded)
+        outcome = self._check_previous_attempts(row)
+        if outcome:
+            return outcome
+
+        amount = details.get('payment_amount') or row['from_amount']
+        if not amount or amount <= 0:
+            self._set_status(row, 'failed_pending_review', "No payment amount recorded")
+            return "needs_review"
+
+        signed = []
+
+        def on_signed(tx_hash: str) -> None:
+            # Persisted before broadcast: the next attempt checks it on-chain
+            if not self.db_manager.record_failed_transaction_attempt(row['id'], row['claimed_at'], tx_hash):
+                raise RecoveryClaimLost(f"Claim on failed transaction #{row['id']} lost")
+            signed.append(tx_hash)
+
+        try:
+            result = self.execute_payment(row, amount, on_signed)
+        except RecoveryClaimLost as e:
+            # Another worker owns the row now: leave it alone
+            print(f"⚠️ [RECOVERY] {unique_id}: {e} - nothing sent")
+            return "claim_lost"
+        except Exception as e:
+            error_code, is_retryable = ErrorClassifier.classify_error(e)
+
+            if signed:
+                return self._handle_signed_failure(row, signed[-1], error_code, is_retryable, e)
+
+            # Nothing was signed: safe to retry later
+            if is_retryable and row['retry_count'] < self.max_retries:
+                print(f"🔄 [RECOVERY] {unique_id}: {error_code} - will retry")
+                self._set_status(row, 'failed_retryable', f"Recovery attempt {row['retry_count']} failed: {error_code}: {e}")
+                return "retry_later"
+
+            print(f"❌ [RECOVERY] {unique_id}: {error_code} - moving to manual review")
+            self._set_status(row, 'failed_pending_review', f"Recovery failed: {error_code}: {e}")
+            return "needs_review"
+
+        if result.get('status') in _SENT_STATUSES:
+            self._mark_recovered(row, result['tx_hash'])
+            print(f"🎉 [RECOVERY] {unique_id}: recovered ({result['tx_hash']})")
+            return "recovered"
+
+        self._set_status(row, 'failed_pending_review', f"Recovery transaction {result.get('tx_hash')} not confirmed: {result.get('error')}")
+        return "needs_review"
+
+    def _handle_signed_failure(
+        self,
+        row: Dict[str, Any],
+        tx_hash: str,
+        error_code: str,
+        is_retryable: bool,
+        error: Exception
+    ) -> str:
+        """An attempt failed after signing: only retried if the node never saw it."""
+        if self.wallet_manager.is_transaction_known(tx_hash) is False and is_retryable \
+                and row['retry_count'] < self.max_retries:
+            # The hash is recorded and checked again before the next attempt
+            print(f"🔄 [RECOVERY] {row['unique_id']}: {error_code} after signing, {tx_hash} unknown to the node - will retry")
+            self._set_status(row, 'failed_retryable', f"Recovery attempt {row['retry_count']} failed: {error_code}: {error} ({tx_hash} unknown to the node)")
+            return "retry_later"
+
+        print(f"❌ [RECOVERY] {row['unique_id']}: {error_code} after signing {tx_hash} - moving to manual review")
+        self._set_status(row, 'failed_pending_review', f"Recovery transaction {tx_hash} may have been broadcast: {error_code}: {error}")
+        return "needs_review"
+
+    def _check_previous_attempts(self, row: Dict[str, Any]) -> Optional[str]:
+        """
+        Check every earlier signed hash of the payment on-chain.
+
+        A hash without a receipt only counts as dropped once the wallet's
+        confirmed transaction count is past its nonce (read before the
+        receipts, so a transaction mined in between still has one). A node
+        not returning the transaction proves nothing.
+
+        Returns:
+            "recovered" if one was mined, "retry_later" / "needs_review" if one
+            may still be mined, None if none was paid (safe to send)
+        """
+        previous_hashes = self._previous_tx_hashes(row)
+        if not previous_hashes:
+            return None
+
+        confirmed_count = self.wallet_manager.get_confirmed_transaction_count()
+        receipts = self.wallet_manager.get_transaction_receipts(previous_hashes)
+
+        for tx_hash in previous_hashes:
+            receipt = receipts.get(tx_hash)
+            if receipt and receipt['status'] == 1:
+                print(f"✅ [RECOVERY] {row['unique_id']}: earlier transaction {tx_hash} was mined - not resending")
+                self._mark_recovered(row, tx_hash)
+                return "recovered"
+
+        unmined = [tx_hash for tx_hash in previous_hashes if receipts.get(tx_hash) is None]
+        if unmined and self.wallet_manager.any_receipt(unmined) is not False:
+            # Batch lookup missed a receipt, or a lookup failed: decide next run
+            return self._wait_for_previous(row, unmined[0], "receipt lookup inconclusive")
+
+        for tx_hash in unmined:
+            signed = self.wallet_manager.get_signed_transaction(tx_hash)
+            if not signed or confirmed_count is None:
+                self._set_status(row, 'failed_pending_review', f"Earlier transaction {tx_hash} not mined and its nonce can't be checked - check before resending")
+                return "needs_review"
+            if confirmed_count <= signed['nonce']:
+                return self._wait_for_previous(row, tx_hash, f"nonce {signed['nonce']} still open")
+
+        return None
+
+    def _wait_for_previous(self, row: Dict[str, Any], tx_hash: str, reason: str) -> str:
+        """An earlier attempt may still be mined: check again later, or review once out of retries."""
+        if row['retry_count'] < self.max_retries:
+            print(f"⏳ [RECOVERY] {row['unique_id']}: earlier transaction {tx_hash} not mined, {reason} - checking again later")
+            self._set_status(row, 'failed_retryable', f"Earlier transaction {tx_hash} not mined yet ({reason})")
+            return "retry_later"
+
+        self._set_status(row, 'failed_pending_review', f"Earlier transaction {tx_hash} not mined yet ({reason}) - check before resending")
+        return "needs_review"
+
+    def _previous_tx_hashes(self, row: Dict[str, Any]) -> List[str]:
+        """Signed hashes of every earlier attempt of the payment (migration 013) and their replacements."""
+        details = row['last_error_details']
+        hashes = set(row.get('attempt_tx_hashes') or [])
+        hashes.update(details.get('replacement_tx_hashes') or [])
+        if details.get('tx_hash'):
+            hashes.add(details['tx_hash'])
+        return sorted(hashes)
+
+    def _set_status(self, row: Dict[str, Any], status: str, note: str) -> None:
+        self.db_manager.update_failed_transaction_status(row['unique_id'], status, admin_notes=note, transaction_id=row['id'])
+
+    def _mark_recovered(self, row: Dict[str, Any], tx_hash: str) -> None:
+        self.db_manager.mark_failed_transaction_recovered(
+            row['unique_id'], tx_hash, recovered_by="recovery_worker", transaction_id=row['id']
+        )
@@ -0,0 +1,3 @@
+"""
+Tests for PGP_HOSTPAY3_v1 application.
+"""
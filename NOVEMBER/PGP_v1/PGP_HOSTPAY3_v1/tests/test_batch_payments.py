@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Integration tests for WalletManager.send_batch_payments() on an in-memory
+chain (eth-tester).
+
+Tests verify that a batch is broadcast with sequential nonces, that items
+rejected before signing are reported as "error" without using a nonce, that
+a broadcast failure after signing is reported as "unconfirmed" with the
+signed hash and stops the batch (later items are not signed), that a nonce
+rejection stays requeue-able, that an "already known" rejection counts as
+broadcast with the signed hash, and that duplicate unique_ids are refused.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from eth_account import Account
+    from web3 import Web3, EthereumTesterProvider
+    from wallet_manager import WalletManager
+except ImportError:  # web3 / eth-tester not installed
+    EthereumTesterProvider = None
+
+RECIPIENTS = ['0x' + f"{index:040x}" for index in range(0x1001, 0x1005)]
+
+
+@unittest.skipIf(EthereumTesterProvider is None, "eth-tester not installed")
+class TestSendBatchPayments(unittest.TestCase):
+    """Test suite for send_batch_payments() against eth-tester."""
+
+    def setUp(self):
+        w3 = Web3(EthereumTesterProvider())
+        account = Account.create()
+        w3.eth.send_transaction({
+            'from': w3.eth.accounts[0],
+            'to': account.address,
+            'value': w3.to_wei(10, 'ether')
+        })
+
+        with patch.object(WalletManager, '_connect_to_web3', return_value=False):
+            self.wallet = WalletManager(account.address, account.key.hex(), 'http://127.0.0.1:1')
+        self.wallet.w3 = w3
+        self.wallet.chain_id = w3.eth.chain_id
+        self.wallet.nonce_allocator.chain_id = w3.eth.chain_id
+        self.w3 = w3
+
+    def payments(self, count):
+        return [
+            {'unique_id': f"UID_{index}", 'to_address': RECIPIENTS[index], 'amount': 0.01 * (index + 1)}
+            for index in range(count)
+        ]
+
+    def nonce_of(self, tx_hash):
+        return self.w3.eth.get_transaction(tx_hash)['nonce']
+
+    def test_batch_uses_sequential_nonces(self):
+        results = self.wallet.send_batch_payments(self.payments(3))
+
+        self.assertEqual([result['status'] for result in results], ['pending'] * 3)
+        self.assertEqual([self.nonce_of(result['tx_hash']) for result in results], [0, 1, 2])
+        self.assertEqual(self.w3.eth.get_balance(Web3.to_checksum_address(RECIPIENTS[2])), self.w3.to_wei(0.03, 'ether'))
+
+    def test_invalid_item_is_not_signed(self):
+        payments = self.payments(3)
+        payments[1]['to_address'] = '0xnot-an-address'
+
+        results = self.wallet.send_batch_payments(payments)
+
+        self.assertEqual([result['status'] for result in results], ['pending', 'error', 'pending'])
+        self.assertIsNone(results[1]['tx_hash'])
+        self.assertEqual(self.nonce_of(results[2]['tx_hash']), 1)
+
+    def test_broadcast_failure_after_signing_stops_batch(self):
+        sent = []
+        send_raw_transaction = self.w3.eth.send_raw_transaction
+
+        def flaky_send(raw_transaction):
+            sent.append(raw_transaction)
+            if len(sent) == 2:
+                raise Exception("Read timed out")
+            return send_raw_transaction(raw_transaction)
+
+        with patch.object(self.w3.eth, 'send_raw_transaction', side_effect=flaky_send):
+            results = self.wallet.send_batch_payments(self.payments(4))
+
+        self.assertEqual([result['status'] for result in results], ['pending', 'unconfirmed', 'error', 'error'])
+        self.assertEqual(results[1]['tx_hash'], self.w3.to_hex(Web3.keccak(sent[1])))
+        self.assertEqual(len(sent), 2)
+        self.assertFalse(self.wallet.is_transaction_known(results[1]['tx_hash']))
+
+    def test_nonce_rejection_is_requeueable(self):
+        send_raw_transaction = self.w3.eth.send_raw_transaction
+        calls = []
+
+        def reject_first(raw_transaction):
+            calls.append(raw_transaction)
+            if len(calls) == 1:
+                # Another sender took nonce 0 first
+                external = self.w3.eth.account.sign_transaction({
+                    'nonce': 0, 'to': RECIPIENTS[3], 'value': 1, 'gas': 21000,
+                    'gasPrice': self.w3.eth.gas_price, 'chainId': self.wallet.chain_id
+                }, self.wallet.private_key)
+                send_raw_transaction(external.rawTransaction)
+                raise ValueError("nonce too low")
+            return send_raw_transaction(raw_transaction)
+
+        with patch.object(self.w3.eth, 'send_raw_transaction', side_effect=reject_first):
+            results = self.wallet.send_batch_payments(self.payments(2))
+
+        self.assertEqual([result['status'] for result in results], ['error', 'pending'])
+        self.assertIsNone(results[0]['tx_hash'])
+        self.assertEqual(self.nonce_of(results[1]['tx_hash']), 1)
+
+    def test_already_known_counts_as_broadcast(self):
+        send_raw_transaction = self.w3.eth.send_raw_transaction
+        sent = []
+
+        def resend(raw_transaction):
+            # The first broadcast reached the node but its response was lost
+            sent.append(raw_transaction)
+            send_raw_transaction(raw_transaction)
+            if len(sent) == 1:
+                raise ValueError({'code': -32000, 'message': 'already known'})
+            return Web3.keccak(raw_transaction)
+
+        with patch.object(self.w3.eth, 'send_raw_transaction', side_effect=resend):
+            results = self.wallet.send_batch_payments(self.payments(2))
+
+        self.assertEqual([result['status'] for result in results], ['pending', 'pending'])
+        self.assertEqual(results[0]['tx_hash'], self.w3.to_hex(Web3.keccak(sent[0])))
+        # Not treated as a nonce rejection: the counter carries on
+        self.assertEqual([self.nonce_of(result['tx_hash']) for result in results], [0, 1])
+
+    def test_duplicate_unique_id_is_refused(self):
+        payments = self.payments(2)
+        payments[1]['unique_id'] = payments[0]['unique_id']
+
+        with self.assertRaises(ValueError):
+            self.wallet.send_batch_payments(payments)
+
+        self.assertEqual(self.w3.eth.get_transaction_count(self.wallet.wallet_address), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python
+"""
+Unit tests for the asynchronous confirmation tracker.
+
+Tests verify that poll() resolves mined transactions once (confirmed or
+reverted), retries a confirmation whose callback failed, resolves each
+payment of a shared (Disperse) transaction with one receipt lookup, and
+checks stale transactions by nonce: dropped only once the confirmed
+transaction count is past the nonce with no receipt on any hash; never
+dropped because the node doesn't return the transaction; escalated once and
+replaced at the same nonce (throttled and capped) while the nonce is open;
+confirmed by whichever replacement is mined.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from confirmation_tracker import ConfirmationTracker
+
+TX_A = '0x' + 'aa' * 32
+TX_B = '0x' + 'bb' * 32
+TX_C = '0x' + 'cc' * 32
+
+
+class FakeWallet:
+    """WalletManager double: receipts, signed nonces and the confirmed transaction count."""
+
+    def __init__(self):
+        self.receipts = {}
+        self.nonces = {}
+        self.confirmed_count = 0
+        self.block_number = 100
+        self.receipt_lookups = []
+        self.replacements = []
+
+    def get_transaction_receipts(self, tx_hashes):
+        self.receipt_lookups.append(list(tx_hashes))
+        return {tx_hash: self.receipts.get(tx_hash) for tx_hash in tx_hashes}
+
+    def any_receipt(self, tx_hashes):
+        return any(self.receipts.get(tx_hash) for tx_hash in tx_hashes)
+
+    def get_signed_transaction(self, tx_hash):
+        if tx_hash not in self.nonces:
+            return None  # Not recorded and not returned by the node
+        return {"nonce": self.nonces[tx_hash], "transaction": {}}
+
+    def get_confirmed_transaction_count(self):
+        return self.confirmed_count
+
+    def replace_transaction(self, tx_hash, on_signed=None):
+        replacement = '0x' + f"{len(self.replacements) + 1:064x}"
+        self.nonces[replacement] = self.nonces[tx_hash]
+        on_signed(replacement)
+        self.replacements.append((tx_hash, replacement))
+        return replacement
+
+    def get_block_number(self):
+        return self.block_number
+
+
+class FakeDatabase:
+    """DatabaseManager double for hostpay_pending_transactions."""
+
+    def __init__(self):
+        self.rows = {}
+
+    def add(self, tx_hash, age_seconds=10, unique_id=None):
+        unique_id = unique_id or f"UID_{tx_hash[2:6]}"
+        self.rows[(tx_hash, unique_id)] = {
+            'tx_hash': tx_hash, 'unique_id': unique_id, 'cn_api_id': 'cn_1',
+            'from_currency': 'eth', 'from_network': 'eth', 'from_amount': 0.1,
+            'actual_eth_amount': 0.1, 'payin_address': '0xpayin', 'context': 'instant',
+            'age_seconds': age_seconds, 'status': 'pending', 'escalated': False,
+            'replacement_tx_hashes': [], 'replaced_seconds_ago': None
+        }
+
+    def status(self, tx_hash, unique_id=None):
+        return self.rows[(tx_hash, unique_id or f"UID_{tx_hash[2:6]}")]['status']
+
+    def get_pending_transactions(self, limit=100):
+        return [dict(row) for row in self.rows.values() if row['status'] == 'pending'][:limit]
+
+    def resolve_pending_transaction(self, tx_hash, unique_id, status, block_number=None, gas_used=None):
+        row = self.rows[(tx_hash, unique_id)]
+        if row['status'] != 'pending':
+            return False
+        row['status'] = status
+        return True
+
+    def reopen_pending_transaction(self, tx_hash, unique_id):
+        self.rows[(tx_hash, unique_id)]['status'] = 'pending'
+        return True
+
+    def record_pending_transaction_replacement(self, tx_hash, replacement_tx_hash, max_replacements, min_interval_seconds):
+        rows = [row for row in self.rows.values() if row['tx_hash'] == tx_hash and row['status'] == 'pending']
+        if not rows or len(rows[0]['replacement_tx_hashes']) >= max_replacements:
+            return False
+        if rows[0]['replaced_seconds_ago'] is not None and rows[0]['replaced_seconds_ago'] < min_interval_seconds:
+            return False
+        for row in rows:
+            row['replacement_tx_hashes'].append(replacement_tx_hash)
+            row['replaced_seconds_ago'] = 0
+        return True
+
+    def mark_pending_transaction_escalated(self, tx_hash, unique_id):
+        row = self.rows[(tx_hash, unique_id)]
+        if row['escalated']:
+            return False
+        row['escalated'] = True
+        return True
+
+
+def receipt(status=1, block_number=99):
+    return {"status": status, "block_number": block_number, "gas_used": 21000}
+
+
+class TestConfirmationTracker(unittest.TestCase):
+    """Test suite for ConfirmationTracker.poll()."""
+
+    def setUp(self):
+        self.wallet = FakeWallet()
+        self.db = FakeDatabase()
+        self.on_confirmed = Mock(return_value=True)
+        self.on_reverted = Mock()
+        self.on_dropped = Mock()
+        self.on_stuck = Mock()
+        self.tracker = ConfirmationTracker(
+            self.wallet, self.db,
+            on_confirmed=self.on_confirmed,
+            on_reverted=self.on_reverted,
+            on_dropped=self.on_dropped,
+            on_stuck=self.on_stuck,
+            stale_seconds=1800,
+            max_replacements=2
+        )
+
+    def add_stale(self, tx_hash=TX_A, nonce=5, **kwargs):
+        self.db.add(tx_hash, age_seconds=3600, **kwargs)
+        self.wallet.nonces[tx_hash] = nonce
+
+    def test_mined_transactions_resolve_once(self):
+        self.db.add(TX_A)
+        self.db.add(TX_B)
+        self.wallet.receipts[TX_A] = receipt()
+        self.wallet.receipts[TX_B] = receipt(status=0)
+
+        summary = self.tracker.poll()
+        self.tracker.poll()
+
+        self.assertEqual((summary['confirmed'], summary['reverted']), (1, 1))
+        self.assertEqual(self.db.status(TX_A), 'confirmed')
+        self.assertEqual(self.db.status(TX_B), 'reverted')
+        self.on_confirmed.assert_called_once()
+        self.on_reverted.assert_called_once()
+
+    def test_shared_transaction_resolves_each_payment(self):
+        self.db.add(TX_A, unique_id='UID_1')
+        self.db.add(TX_A, unique_id='UID_2')
+        self.wallet.receipts[TX_A] = receipt()
+
+        summary = self.tracker.poll()
+
+        self.assertEqual(summary['confirmed'], 2)
+        self.assertEqual(self.wallet.receipt_lookups, [[TX_A]])
+        self.assertEqual(
+            sorted(call.args[0]['unique_id'] for call in self.on_confirmed.call_args_list),
+            ['UID_1', 'UID_2']
+        )
+        self.assertEqual((self.db.status(TX_A, 'UID_1'), self.db.status(TX_A, 'UID_2')), ('confirmed', 'confirmed'))
+
+    def test_failed_callback_is_retried(self):
+        self.db.add(TX_A)
+        self.wallet.receipts[TX_A] = receipt()
+        self.on_confirmed.side_effect = [False, True]
+
+        first = self.tracker.poll()
+        second = self.tracker.poll()
+
+        self.assertEqual(first['errors'], 1)
+        self.assertEqual(second['confirmed'], 1)
+        self.assertEqual(self.on_confirmed.call_count, 2)
+
+    def test_fresh_transaction_without_receipt_stays_pending(self):
+        self.db.add(TX_A, age_seconds=60)
+
+        summary = self.tracker.poll()
+
+        self.assertEqual((summary['pending'], summary['stale']), (1, 0))
+        self.on_dropped.assert_not_called()
+
+    def test_nonce_used_by_another_transaction_is_dropped(self):
+        self.add_stale(nonce=5)
+        self.wallet.confirmed_count = 6
+
+        summary = self.tracker.poll()
+
+        self.assertEqual(summary['dropped'], 1)
+        self.assertEqual(self.db.status(TX_A), 'dropped')
+        self.on_dropped.assert_called_once()
+        self.assertEqual(self.on_dropped.call_args.args[0]['tx_hash'], TX_A)
+        self.assertEqual(self.on_dropped.call_args.args[0]['nonce'], 5)
+
+    def test_unknown_to_node_with_open_nonce_is_not_dropped(self):
+        # One node returning null for the hash proves nothing
+        self.add_stale(nonce=5)
+        self.wallet.confirmed_count = 5
+
+        summary = self.tracker.poll()
+
+        self.assertEqual((summary['dropped'], summary['pending'], summary['replaced']), (0, 1, 1))
+        self.assertEqual(self.db.status(TX_A), 'pending')
+        self.on_dropped.assert_not_called()
+
+    def test_unrecorded_nonce_is_escalated_never_dropped(self):
+        self.db.add(TX_A, age_seconds=3600)
+        self.wallet.confirmed_count = 100
+
+        summary = self.tracker.poll()
+
+        self.assertEqual((summary['dropped'], summary['escalated'], summary['replaced']), (0, 1, 0))
+        self.assertEqual(self.db.status(TX_A), 'pending')
+        self.on_dropped.assert_not_called()
+
+    def test_receipt_found_after_nonce_check_is_not_dropped(self):
+        self.add_stale(nonce=5)
+        self.wallet.confirmed_count = 6
+        original_lookup = self.wallet.get_transaction_receipts
+
+        def mined_after_batch(tx_hashes):
+            receipts = original_lookup(tx_hashes)
+            self.wallet.receipts[TX_A] = receipt()  # Mined between the batch and the nonce check
+            return receipts
+        self.wallet.get_transaction_receipts = mined_after_batch
+
+        summary = self.tracker.poll()
+
+        self.assertEqual((summary['dropped'], summary['pending']), (0, 1))
+        self.on_dropped.assert_not_called()
+
+    def test_failed_drop_record_is_retried(self):
+        self.add_stale(nonce=5)
+        self.wallet.confirmed_count = 6
+        self.on_dropped.side_effect = [Exception("db down"), None]
+
+        first = self.tracker.poll()
+        second = self.tracker.poll()
+
+        self.assertEqual((first['errors'], second['dropped']), (1, 1))
+        self.assertEqual(self.db.status(TX_A), 'dropped')
+
+    def test_open_nonce_is_escalated_once_and_replaced_per_interval(self):
+        self.add_stale(nonce=5)
+        self.wallet.confirmed_count = 5
+
+        first = self.tracker.poll()
+        second = self.tracker.poll()
+
+        self.assertEqual((first['escalated'], second['escalated']), (1, 0))
+        self.assertEqual((first['replaced'], second['replaced']), (1, 0))
+        self.assertEqual(self.wallet.replacements[0][0], TX_A)
+        self.assertEqual(self.db.status(TX_A), 'pending')
+        self.on_stuck.assert_called_once()
+        self.on_dropped.assert_not_called()
+
+    def test_replacements_bump_the_latest_and_stop_at_the_cap(self):
+        self.add_stale(nonce=5)
+        self.wallet.confirmed_count = 5
+
+        for _ in range(3):
+            self.tracker.poll()
+            self.db.rows[(TX_A, 'UID_aaaa')]['replaced_seconds_ago'] = 3600
+
+        first, second = self.wallet.replacements
+        self.assertEqual(second[0], first[1])
+        self.assertEqual(self.db.rows[(TX_A, 'UID_aaaa')]['replacement_tx_hashes'], [first[1], second[1]])
+
+    def test_mined_replacement_confirms_payment(self):
+        self.add_stale(nonce=5)
+        self.wallet.confirmed_count = 5
+        self.tracker.poll()
+        replacement = self.wallet.replacements[0][1]
+        self.wallet.receipts[replacement] = receipt()
+
+        summary = self.tracker.poll()
+
+        self.assertEqual(summary['confirmed'], 1)
+        self.assertEqual(self.on_confirmed.call_args.args[1]['tx_hash'], replacement)
+        self.assertEqual(self.db.status(TX_A), 'confirmed')
+
+    def test_dropped_check_covers_replacements(self):
+        self.add_stale(nonce=5)
+        self.wallet.confirmed_count = 5
+        self.tracker.poll()
+        self.wallet.confirmed_count = 6
+        self.wallet.receipts[self.wallet.replacements[0][1]] = receipt()
+
+        summary = self.tracker.poll()
+
+        self.assertEqual((summary['confirmed'], summary['dropped']), (1, 0))
+
+    def test_shared_transaction_is_replaced_once(self):
+        self.add_stale(unique_id='UID_1')
+        self.db.add(TX_A, age_seconds=3600, unique_id='UID_2')
+        self.wallet.confirmed_count = 5
+
+        summary = self.tracker.poll()
+
+        self.assertEqual((summary['replaced'], summary['errors']), (1, 0))
+        replacement = self.wallet.replacements[0][1]
+        for unique_id in ('UID_1', 'UID_2'):
+            self.assertEqual(self.db.rows[(TX_A, unique_id)]['replacement_tx_hashes'], [replacement])
+
+    def test_failed_count_lookup_leaves_transaction_pending(self):
+        self.add_stale(nonce=5)
+        self.wallet.confirmed_count = None
+
+        summary = self.tracker.poll()
+
+        self.assertEqual(summary['pending'], 1)
+        self.assertEqual(self.db.status(TX_A), 'pending')
+        self.on_dropped.assert_not_called()
+        self.on_stuck.assert_not_called()
+
+    def test_shallow_receipt_waits_for_confirmations(self):
+        self.tracker.confirmations = 3
+        self.db.add(TX_A, age_seconds=3600)
+        self.wallet.receipts[TX_A] = receipt(block_number=99)
+
+        summary = self.tracker.poll()
+
+        self.assertEqual((summary['pending'], summary['stale']), (1, 0))
+        self.on_confirmed.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
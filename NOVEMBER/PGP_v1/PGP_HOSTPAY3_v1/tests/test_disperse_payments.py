@@ -0,0 +1,189 @@
+#!/usr/bin/env python
+"""
+Integration tests for Disperse batch payouts on an in-memory chain
+(eth-tester).
+
+Tests verify that send_disperse_eth() pays every recipient in one
+transaction, that a Disperse transaction mined as reverted raises
+TransactionRevertedError from wait_for_confirmation() (nobody paid, nonce
+used), and that POST /batch falls back to individual sends after a revert
+but hands a receipt timeout to the confirmation tracker without resending.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from eth_account import Account
+    from web3 import Web3, EthereumTesterProvider
+    from wallet_manager import WalletManager, TransactionRevertedError
+
+    # Module-level initialization talks to Secret Manager and Cloud Tasks
+    with patch('google.cloud.secretmanager.SecretManagerServiceClient'), \
+            patch('google.cloud.tasks_v2.CloudTasksClient'):
+        import pgp_hostpay3_v1
+except ImportError:  # web3 / eth-tester not installed
+    EthereumTesterProvider = None
+
+# Hand-assembled disperseEther(address[] recipients, uint256[] values): one
+# CALL per recipient with its value, reverting the whole transaction if any
+# CALL fails (the selector isn't checked). Deployment code + runtime.
+DISPERSE_BYTECODE = (
+    '0x605b80600b6000396000f36004356004016000526024356004016020526000513560405260006060525b6040516060'
+    '51146054576060516001018060605260200260006000600060008460205101358560005101355af11560565750601e56'
+    '5b005b600080fd'
+)
+
+# Contract that reverts every call (and refuses ETH)
+REVERTER_BYTECODE = '0x600580600b6000396000f360006000fd'
+
+RECIPIENTS = ['0x' + f"{index:040x}" for index in range(0x3001, 0x3004)]
+
+
+@unittest.skipIf(EthereumTesterProvider is None, "eth-tester not installed")
+class DisperseTestCase(unittest.TestCase):
+    """Funded WalletManager on eth-tester with a deployed Disperse contract."""
+
+    def setUp(self):
+        w3 = Web3(EthereumTesterProvider())
+        account = Account.create()
+        w3.eth.send_transaction({
+            'from': w3.eth.accounts[0],
+            'to': account.address,
+            'value': w3.to_wei(10, 'ether')
+        })
+
+        with patch.object(WalletManager, '_connect_to_web3', return_value=False):
+            self.wallet = WalletManager(account.address, account.key.hex(), 'http://127.0.0.1:1')
+        self.wallet.w3 = w3
+        self.wallet.chain_id = w3.eth.chain_id
+        self.wallet.nonce_allocator.chain_id = w3.eth.chain_id
+        self.w3 = w3
+
+        self.disperse = self.deploy(DISPERSE_BYTECODE)
+        self.reverter = self.deploy(REVERTER_BYTECODE)
+
+    def deploy(self, bytecode):
+        tx_hash = self.w3.eth.send_transaction({'from': self.w3.eth.accounts[0], 'data': bytecode})
+        return self.w3.eth.get_transaction_receipt(tx_hash)['contractAddress']
+
+    def payments(self, recipients):
+        return [
+            {'unique_id': f"UID_{index}", 'to_address': recipient, 'amount': 0.01 * (index + 1)}
+            for index, recipient in enumerate(recipients)
+        ]
+
+    def balance(self, address):
+        return self.w3.eth.get_balance(Web3.to_checksum_address(address))
+
+    def sent_count(self):
+        return self.w3.eth.get_transaction_count(self.wallet.wallet_address)
+
+
+class TestSendDisperseEth(DisperseTestCase):
+    """Test suite for send_disperse_eth() and wait_for_confirmation()."""
+
+    def test_one_transaction_pays_every_recipient(self):
+        tx_hash = self.wallet.send_disperse_eth(self.disperse, self.payments(RECIPIENTS))
+
+        result = self.wallet.wait_for_confirmation(tx_hash, "DISPERSE")
+
+        self.assertEqual(result['status'], "success")
+        self.assertEqual(self.sent_count(), 1)
+        self.assertEqual(
+            [self.balance(recipient) for recipient in RECIPIENTS],
+            [self.w3.to_wei(0.01 * (index + 1), 'ether') for index in range(len(RECIPIENTS))]
+        )
+
+    def test_reverted_transaction_raises_typed_error(self):
+        payments = self.payments([RECIPIENTS[0], self.reverter])
+        # Gas estimation would catch the revert before signing: force it on-chain
+        with patch.object(self.w3.eth, 'estimate_gas', return_value=200000):
+            tx_hash = self.wallet.send_disperse_eth(self.disperse, payments)
+
+        with self.assertRaises(TransactionRevertedError) as context:
+            self.wallet.wait_for_confirmation(tx_hash, "DISPERSE")
+
+        self.assertEqual(context.exception.tx_hash, tx_hash)
+        self.assertIn("reverted", str(context.exception))  # Still classified by ErrorClassifier
+        self.assertEqual(self.balance(RECIPIENTS[0]), 0)
+        self.assertEqual(self.sent_count(), 1)
+
+
+class TestBatchEndpointDisperse(DisperseTestCase):
+    """Test suite for the Disperse path of POST /batch."""
+
+    def setUp(self):
+        super().setUp()
+        self.finished = []
+        self.unconfirmed = []
+
+        def finish(payment, tx_hash, tx_result=None):
+            self.finished.append((payment['unique_id'], tx_hash, tx_result))
+            return {"unique_id": payment['unique_id'], "status": "completed", "tx_hash": tx_hash}
+
+        def unconfirmed(payment, tx_hash, error):
+            self.unconfirmed.append((payment['unique_id'], tx_hash, error))
+            return {"unique_id": payment['unique_id'], "status": "unconfirmed", "tx_hash": tx_hash}
+
+        token_manager = Mock()
+        token_manager.decrypt_pgp_hostpay1_to_pgp_hostpay3_token.side_effect = self.decrypt
+
+        for name, value in (('wallet_manager', self.wallet), ('token_manager', token_manager),
+                            ('async_confirmations', False), ('finish_broadcast_payment', finish),
+                            ('track_unconfirmed_payment', unconfirmed)):
+            patcher = patch.object(pgp_hostpay3_v1, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.client = pgp_hostpay3_v1.app.test_client()
+
+    def decrypt(self, token):
+        index = RECIPIENTS.index(token)
+        return {
+            'unique_id': f"UID_{index}", 'cn_api_id': f"cn_{index}", 'from_currency': 'eth',
+            'from_network': 'eth', 'from_amount': 0.01 * (index + 1), 'payin_address': token,
+            'context': 'instant'
+        }
+
+    def post_batch(self, disperse_address):
+        with patch.object(pgp_hostpay3_v1, 'DISPERSE_CONTRACT_ADDRESS', disperse_address), \
+                patch.object(self.w3.eth, 'estimate_gas', return_value=200000):
+            return self.client.post("/batch", json={"tokens": RECIPIENTS})
+
+    def test_disperse_pays_batch_in_one_transaction(self):
+        response = self.post_batch(self.disperse)
+
+        self.assertEqual(response.get_json()['summary'], {"completed": 3})
+        self.assertEqual(self.sent_count(), 1)
+        self.assertEqual(len({tx_hash for _, tx_hash, _ in self.finished}), 1)
+        self.assertTrue(all(tx_result['status'] == "success" for _, _, tx_result in self.finished))
+
+    def test_reverted_disperse_falls_back_to_individual_sends(self):
+        response = self.post_batch(self.reverter)
+
+        self.assertEqual(response.get_json()['summary'], {"completed": 3})
+        # One reverted Disperse transaction, then one transaction per payment
+        self.assertEqual(self.sent_count(), 1 + len(RECIPIENTS))
+        self.assertEqual(len({tx_hash for _, tx_hash, _ in self.finished}), len(RECIPIENTS))
+        self.assertEqual(
+            [self.balance(recipient) for recipient in RECIPIENTS],
+            [self.w3.to_wei(0.01 * (index + 1), 'ether') for index in range(len(RECIPIENTS))]
+        )
+        self.assertEqual(self.unconfirmed, [])
+
+    def test_receipt_timeout_is_not_resent(self):
+        with patch.object(self.w3.eth, 'wait_for_transaction_receipt', side_effect=Exception("timed out")):
+            response = self.post_batch(self.disperse)
+
+        self.assertEqual(response.get_json()['summary'], {"unconfirmed": 3})
+        self.assertEqual(self.sent_count(), 1)
+        self.assertEqual(len({tx_hash for _, tx_hash, _ in self.unconfirmed}), 1)
+        self.assertEqual(self.finished, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+Unit tests for the block-memoized gas oracle and balance cache.
+
+Tests verify that fee data is fetched once per block, that cached fees are
+only reused after a failed refresh while they are recent (in blocks and
+seconds), that eth_gasPrice is the fallback and that get_gas_price() raises
+when neither is available, and that BlockCache reloads after clear() (as
+after a broadcast) and on a new block.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gas_oracle import GasOracle, BlockCache, GWEI
+
+FEE_HISTORY = {
+    'baseFeePerGas': [10 * GWEI, 12 * GWEI],
+    'reward': [[1 * GWEI, 2 * GWEI, 3 * GWEI, 4 * GWEI]]
+}
+
+
+class FakeEth:
+    """web3.eth double with a settable block number."""
+
+    def __init__(self):
+        self.block_number = 100
+        self.gas_price_result = 30 * GWEI
+        self.fee_history = Mock(return_value=FEE_HISTORY)
+
+    @property
+    def gas_price(self):
+        if isinstance(self.gas_price_result, Exception):
+            raise self.gas_price_result
+        return self.gas_price_result
+
+
+def make_oracle(eth, **kwargs):
+    w3 = Mock()
+    w3.eth = eth
+    kwargs.setdefault('poll_seconds', 0)
+    return GasOracle(lambda: w3, **kwargs)
+
+
+class TestGasOracle(unittest.TestCase):
+    """Test suite for GasOracle.get_gas_price()."""
+
+    def setUp(self):
+        self.eth = FakeEth()
+        self.oracle = make_oracle(self.eth, max_stale_blocks=2, max_stale_seconds=60)
+
+    def test_fees_fetched_once_per_block(self):
+        first = self.oracle.get_gas_price()
+        second = self.oracle.get_gas_price('fast')
+
+        self.assertEqual(self.eth.fee_history.call_count, 1)
+        self.assertEqual(first['maxPriorityFeePerGas'], 2 * GWEI)
+        self.assertEqual(second['maxPriorityFeePerGas'], 3 * GWEI)
+        self.assertEqual(first['maxFeePerGas'], 2 * 12 * GWEI + 2 * GWEI)
+
+        self.eth.block_number = 101
+        self.oracle.get_gas_price()
+
+        self.assertEqual(self.eth.fee_history.call_count, 2)
+
+    def test_recent_fees_reused_when_refresh_fails(self):
+        self.oracle.get_gas_price()
+        self.eth.fee_history.side_effect = Exception("429 Too Many Requests")
+        self.eth.block_number = 102
+
+        gas = self.oracle.get_gas_price()
+
+        self.assertEqual(gas['maxPriorityFeePerGas'], 2 * GWEI)
+
+    def test_fees_too_many_blocks_old_fall_back_to_gas_price(self):
+        self.oracle.get_gas_price()
+        self.eth.fee_history.side_effect = Exception("429 Too Many Requests")
+        self.eth.block_number = 103
+
+        gas = self.oracle.get_gas_price()
+
+        self.assertEqual(gas['maxFeePerGas'], 30 * GWEI)
+
+    def test_fees_too_many_seconds_old_fall_back_to_gas_price(self):
+        self.oracle.get_gas_price()
+        self.eth.fee_history.side_effect = Exception("429 Too Many Requests")
+        self.eth.block_number = 101
+
+        with patch('gas_oracle.time.monotonic', return_value=self.oracle._fees_fetched_at + 61):
+            gas = self.oracle.get_gas_price()
+
+        self.assertEqual(gas['maxFeePerGas'], 30 * GWEI)
+
+    def test_raises_without_recent_fees_or_gas_price(self):
+        self.eth.fee_history.side_effect = Exception("429 Too Many Requests")
+        self.eth.gas_price_result = Exception("RPC down")
+
+        with self.assertRaisesRegex(Exception, "Gas price unavailable"):
+            self.oracle.get_gas_price()
+
+    def test_legacy_mode_uses_gas_price(self):
+        oracle = make_oracle(self.eth, eip1559=False)
+
+        gas = oracle.get_gas_price()
+
+        self.assertEqual(gas['gasPrice'], 30 * GWEI)
+        self.eth.fee_history.assert_not_called()
+
+    def test_fallback_priority_fee_capped_at_gas_price(self):
+        self.eth.gas_price_result = GWEI // 2
+        oracle = make_oracle(self.eth, eip1559=False)
+
+        gas = oracle.get_gas_price()
+
+        self.assertEqual(gas['maxPriorityFeePerGas'], GWEI // 2)
+
+
+class TestBlockCache(unittest.TestCase):
+    """Test suite for BlockCache (per-block balances)."""
+
+    def setUp(self):
+        self.block = [100]
+        self.cache = BlockCache(lambda: self.block[0])
+        self.load = Mock(side_effect=lambda block: f"balance@{block}")
+
+    def test_value_cached_within_block(self):
+        self.assertEqual(self.cache.get('eth', self.load), "balance@100")
+        self.assertEqual(self.cache.get('eth', self.load), "balance@100")
+        self.assertEqual(self.load.call_count, 1)
+
+    def test_new_block_reloads(self):
+        self.cache.get('eth', self.load)
+        self.block[0] = 101
+
+        self.assertEqual(self.cache.get('eth', self.load), "balance@101")
+
+    def test_clear_after_broadcast_reloads_same_block(self):
+        self.cache.get('eth', self.load)
+        self.cache.clear()
+        self.cache.get('eth', self.load)
+
+        self.assertEqual(self.load.call_count, 2)
+
+    def test_unknown_block_is_not_cached(self):
+        self.block[0] = None
+
+        self.cache.get('eth', self.load)
+        self.cache.get('eth', self.load)
+
+        self.assertEqual(self.load.call_count, 2)
+        self.load.assert_called_with('latest')
+
+
+if __name__ == '__main__':
+    unittest.main()
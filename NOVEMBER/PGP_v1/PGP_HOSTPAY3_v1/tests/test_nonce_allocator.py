@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+"""
+Unit tests for the host wallet nonce allocator.
+
+Tests verify that concurrent reservations never share a nonce, that only
+the latest reservation can be released, and that a re-sync moves the
+counter forward when the chain is ahead but only moves it back over a gap
+once every signed transaction in it is unknown to the node (otherwise the
+counter is left alone and an alert is logged).
+"""
+import os
+import sys
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nonce_allocator import NonceAllocator
+
+WALLET = '0x' + 'ab' * 20
+TX_A = '0x' + 'aa' * 32
+TX_B = '0x' + 'bb' * 32
+
+
+class Chain:
+    """Pending count and known transactions of a fake node."""
+
+    def __init__(self, pending_count=0):
+        self.pending_count = pending_count
+        self.known = {}
+
+    def get_pending_count(self):
+        return self.pending_count
+
+    def is_transaction_known(self, tx_hash):
+        return self.known.get(tx_hash, False)
+
+
+def make_allocator(chain, **kwargs):
+    kwargs.setdefault('resync_interval', 10 ** 6)
+    kwargs.setdefault('gap_grace_seconds', 0)
+    return NonceAllocator(
+        WALLET,
+        chain.get_pending_count,
+        is_transaction_known=chain.is_transaction_known,
+        **kwargs
+    )
+
+
+class TestReservation(unittest.TestCase):
+    """Test suite for reserve() and release() (in-process counter)."""
+
+    def test_concurrent_reservations_are_unique_and_sequential(self):
+        chain = Chain(pending_count=7)
+        allocator = make_allocator(chain, gap_grace_seconds=3600)
+        nonces = []
+        lock = threading.Lock()
+
+        def reserve_many():
+            for _ in range(50):
+                nonce = allocator.reserve()
+                with lock:
+                    nonces.append(nonce)
+
+        threads = [threading.Thread(target=reserve_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(nonces), list(range(7, 7 + 400)))
+
+    def test_only_latest_reservation_is_released(self):
+        allocator = make_allocator(Chain(pending_count=3))
+        first = allocator.reserve()
+        second = allocator.reserve()
+
+        self.assertFalse(allocator.release(first))
+        self.assertTrue(allocator.release(second))
+        self.assertEqual(allocator.reserve(), second)
+
+    def test_database_backend_reserves_from_shared_counter(self):
+        db = Mock()
+        db.reserve_wallet_nonce.side_effect = [None, 12]
+        allocator = make_allocator(Chain(pending_count=12), db_manager=db)
+
+        self.assertEqual(allocator.reserve(), 12)
+        db.seed_wallet_nonce.assert_called_once_with(WALLET, 1, 12)
+
+    def test_record_failure_raises_with_database_backend(self):
+        db = Mock()
+        db.record_wallet_nonce_transaction.return_value = False
+        allocator = make_allocator(Chain(), db_manager=db)
+
+        with self.assertRaises(Exception):
+            allocator.record_transaction(4, TX_A)
+
+
+class TestResync(unittest.TestCase):
+    """Test suite for resync() gap rules (in-process counter)."""
+
+    def setUp(self):
+        self.chain = Chain(pending_count=5)
+        self.allocator = make_allocator(self.chain)
+        for _ in range(2):
+            self.allocator.reserve()  # Counter at 7
+
+    def test_chain_ahead_moves_counter_forward(self):
+        self.chain.pending_count = 9
+
+        self.assertEqual(self.allocator.resync(), 9)
+
+    def test_unsigned_gap_is_reclaimed(self):
+        self.assertEqual(self.allocator.resync(), 5)
+        self.assertEqual(self.allocator.reserve(), 5)
+
+    def test_gap_within_grace_period_is_kept(self):
+        self.allocator.gap_grace_seconds = 3600
+
+        self.assertEqual(self.allocator.resync(), 7)
+
+    def test_gap_of_dropped_transactions_is_reclaimed(self):
+        self.allocator.record_transaction(5, TX_A)
+        self.allocator.record_transaction(6, TX_B)
+
+        self.assertEqual(self.allocator.resync(), 5)
+
+    @patch('builtins.print')
+    def test_known_transaction_keeps_counter_and_alerts(self, mock_print):
+        self.allocator.record_transaction(5, TX_A)
+        self.allocator.record_transaction(6, TX_B)
+        self.chain.known[TX_B] = True
+
+        self.assertEqual(self.allocator.resync(), 7)
+        printed = ' '.join(str(call.args[0]) for call in mock_print.call_args_list)
+        self.assertIn('nonce_gap_unresolved', printed)
+        self.assertIn(TX_B, printed)
+
+    def test_failed_lookup_keeps_counter(self):
+        self.allocator.record_transaction(5, TX_A)
+        self.chain.is_transaction_known = Mock(side_effect=Exception("RPC down"))
+        self.allocator.is_transaction_known = self.chain.is_transaction_known
+
+        self.assertEqual(self.allocator.resync(), 7)
+
+    def test_signed_gap_without_lookup_is_kept(self):
+        self.allocator.is_transaction_known = None
+        self.allocator.record_transaction(5, TX_A)
+
+        self.assertEqual(self.allocator.resync(), 7)
+
+    def test_mined_records_are_pruned(self):
+        self.allocator.record_transaction(5, TX_A)
+        self.chain.pending_count = 6
+        self.allocator.resync()
+
+        self.assertNotIn(5, self.allocator._signed)
+
+
+class TestDatabaseResync(unittest.TestCase):
+    """Test suite for resync() with the shared counter."""
+
+    def setUp(self):
+        self.chain = Chain(pending_count=5)
+        self.db = Mock()
+        self.db.sync_wallet_nonce.return_value = (7, 600.0)
+        self.db.get_wallet_nonce_transactions.return_value = {5: TX_A}
+        self.db.reclaim_wallet_nonce_gap.return_value = True
+        self.allocator = make_allocator(self.chain, db_manager=self.db, gap_grace_seconds=120)
+
+    def test_verified_gap_is_reclaimed_against_checked_counter(self):
+        self.assertEqual(self.allocator.resync(), 5)
+        self.db.reclaim_wallet_nonce_gap.assert_called_once_with(WALLET, 1, 5, 7, 120)
+
+    def test_known_transaction_skips_reclaim(self):
+        self.chain.known[TX_A] = True
+
+        self.assertEqual(self.allocator.resync(), 7)
+        self.db.reclaim_wallet_nonce_gap.assert_not_called()
+
+    def test_recent_reservation_skips_gap_check(self):
+        self.db.sync_wallet_nonce.return_value = (7, 30.0)
+
+        self.assertEqual(self.allocator.resync(), 7)
+        self.db.get_wallet_nonce_transactions.assert_not_called()
+
+    def test_unreadable_records_skip_reclaim(self):
+        self.db.get_wallet_nonce_transactions.return_value = None
+
+        self.assertEqual(self.allocator.resync(), 7)
+        self.db.reclaim_wallet_nonce_gap.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+"""
+Unit tests for the failed transaction recovery worker.
+
+Tests verify that a payment whose earlier attempt is confirmed on-chain is
+resolved without resending, that an earlier attempt whose nonce is still
+open waits for a later run, that one whose nonce can't be established goes
+to manual review, that one whose nonce was used by another transaction
+(dropped) is resent, that the signed hash is
+recorded before broadcast, that a failure after signing (e.g. a timeout)
+goes to manual review unless the node reports the hash as unknown, that
+errors before signing are retried or reviewed by classification, and that
+a lost claim sends nothing and leaves the row alone.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recovery_worker import RecoveryWorker
+
+TX_A = '0x' + 'aa' * 32
+TX_B = '0x' + 'bb' * 32
+CLAIMED_AT = '2026-10-17 12:00:00'
+
+
+def make_row(**overrides):
+    row = {
+        'id': 7, 'unique_id': 'UID_1', 'cn_api_id': 'cn_1', 'from_currency': 'eth',
+        'from_network': 'eth', 'from_amount': 0.1, 'payin_address': '0xpayin',
+        'context': 'instant', 'error_code': 'NETWORK_TIMEOUT', 'error_message': 'Read timed out',
+        'last_error_details': {'payment_amount': 0.1}, 'retry_count': 1,
+        'claimed_at': CLAIMED_AT, 'attempt_tx_hashes': []
+    }
+    row.update(overrides)
+    return row
+
+
+class FakeWallet:
+    """WalletManager double: receipts, signed nonces and transactions known to the node."""
+
+    def __init__(self):
+        self.receipts = {}
+        self.known = {}
+        self.nonces = {TX_A: 5}
+        self.confirmed_count = 6
+
+    def get_transaction_receipts(self, tx_hashes):
+        return {tx_hash: self.receipts.get(tx_hash) for tx_hash in tx_hashes}
+
+    def any_receipt(self, tx_hashes):
+        return any(self.receipts.get(tx_hash) for tx_hash in tx_hashes)
+
+    def get_signed_transaction(self, tx_hash):
+        if tx_hash not in self.nonces:
+            return None
+        return {"nonce": self.nonces[tx_hash], "transaction": {}}
+
+    def get_confirmed_transaction_count(self):
+        return self.confirmed_count
+
+    def is_transaction_known(self, tx_hash):
+        return self.known.get(tx_hash, False)
+
+
+class TestRecoveryWorker(unittest.TestCase):
+    """Test suite for RecoveryWorker.run()."""
+
+    def setUp(self):
+        self.db = Mock()
+        self.db.record_failed_transaction_attempt.return_value = True
+        self.wallet = FakeWallet()
+        self.execute_payment = Mock(return_value={"status": "submitted", "tx_hash": TX_B})
+        self.worker = RecoveryWorker(
+            self.db, self.wallet,
+            execute_payment=self.execute_payment,
+            max_retries=5
+        )
+
+    def run_with(self, row):
+        self.db.claim_retryable_failed_transactions.return_value = [row]
+        return self.worker.run()
+
+    def final_status(self):
+        return self.db.update_failed_transaction_status.call_args.args[1]
+
+    def sign_then_raise(self, tx_hash, error):
+        def execute(row, amount, on_signed):
+            on_signed(tx_hash)
+            raise error
+        self.execute_payment.side_effect = execute
+
+    def test_earlier_attempt_confirmed_on_chain_is_resolved(self):
+        self.wallet.receipts[TX_A] = {"status": 1, "block_number": 10, "gas_used": 21000}
+
+        summary = self.run_with(make_row(attempt_tx_hashes=[TX_A]))
+
+        self.assertEqual(summary['recovered'], 1)
+        self.execute_payment.assert_not_called()
+        self.db.mark_failed_transaction_recovered.assert_called_once_with(
+            'UID_1', TX_A, recovered_by="recovery_worker", transaction_id=7
+        )
+
+    def test_earlier_attempt_with_open_nonce_waits(self):
+        self.wallet.confirmed_count = 5  # Nonce 5 not used yet: TX_A can still be mined
+
+        summary = self.run_with(make_row(last_error_details={'payment_amount': 0.1, 'tx_hash': TX_A}))
+
+        self.assertEqual(summary['retry_later'], 1)
+        self.execute_payment.assert_not_called()
+        self.assertEqual(self.final_status(), 'failed_retryable')
+
+    def test_open_nonce_without_retries_left_needs_review(self):
+        self.wallet.confirmed_count = 5
+
+        summary = self.run_with(make_row(attempt_tx_hashes=[TX_A], retry_count=5))
+
+        self.assertEqual(summary['needs_review'], 1)
+        self.execute_payment.assert_not_called()
+
+    def test_earlier_attempt_with_unknown_nonce_needs_review(self):
+        del self.wallet.nonces[TX_A]  # Not recorded, and the node doesn't return it
+
+        summary = self.run_with(make_row(attempt_tx_hashes=[TX_A]))
+
+        self.assertEqual(summary['needs_review'], 1)
+        self.execute_payment.assert_not_called()
+        self.assertEqual(self.final_status(), 'failed_pending_review')
+
+    def test_mined_replacement_is_resolved(self):
+        self.wallet.receipts[TX_B] = {"status": 1, "block_number": 10, "gas_used": 21000}
+
+        summary = self.run_with(make_row(last_error_details={
+            'payment_amount': 0.1, 'tx_hash': TX_A, 'replacement_tx_hashes': [TX_B]
+        }))
+
+        self.assertEqual(summary['recovered'], 1)
+        self.execute_payment.assert_not_called()
+        self.db.mark_failed_transaction_recovered.assert_called_once_with(
+            'UID_1', TX_B, recovered_by="recovery_worker", transaction_id=7
+        )
+
+    def test_dropped_earlier_attempt_is_resent(self):
+        summary = self.run_with(make_row(attempt_tx_hashes=[TX_A]))
+
+        self.assertEqual(summary['recovered'], 1)
+        self.execute_payment.assert_called_once()
+        self.db.mark_failed_transaction_recovered.assert_called_once_with(
+            'UID_1', TX_B, recovered_by="recovery_worker", transaction_id=7
+        )
+
+    def test_signed_hash_recorded_against_claim(self):
+        self.sign_then_raise(TX_B, Exception("Read timed out"))
+        self.wallet.known[TX_B] = True
+
+        self.run_with(make_row())
+
+        self.db.record_failed_transaction_attempt.assert_called_once_with(7, CLAIMED_AT, TX_B)
+
+    def test_timeout_after_signing_needs_review(self):
+        self.sign_then_raise(TX_B, Exception("Read timed out"))
+        self.wallet.known[TX_B] = None  # Lookup failed too
+
+        summary = self.run_with(make_row())
+
+        self.assertEqual(summary['needs_review'], 1)
+        self.assertEqual(self.final_status(), 'failed_pending_review')
+
+    def test_timeout_after_signing_unknown_to_node_is_retried(self):
+        self.sign_then_raise(TX_B, Exception("Read timed out"))
+
+        summary = self.run_with(make_row())
+
+        self.assertEqual(summary['retry_later'], 1)
+        self.assertEqual(self.final_status(), 'failed_retryable')
+
+    def test_non_retryable_error_needs_review(self):
+        self.execute_payment.side_effect = ValueError("Invalid destination address")
+
+        summary = self.run_with(make_row())
+
+        self.assertEqual(summary['needs_review'], 1)
+        self.assertEqual(self.final_status(), 'failed_pending_review')
+
+    def test_retryable_error_before_signing_is_retried(self):
+        self.execute_payment.side_effect = Exception("429 Too Many Requests")
+
+        summary = self.run_with(make_row())
+
+        self.assertEqual(summary['retry_later'], 1)
+        self.assertEqual(self.final_status(), 'failed_retryable')
+
+    def test_lost_claim_sends_nothing(self):
+        self.db.record_failed_transaction_attempt.return_value = False
+        self.sign_then_raise(TX_B, AssertionError("must not broadcast"))
+
+        summary = self.run_with(make_row())
+
+        self.assertEqual(summary['claim_lost'], 1)
+        self.db.update_failed_transaction_status.assert_not_called()
+
+    def test_reclaimed_row_without_retries_left_needs_review(self):
+        summary = self.run_with(make_row(retry_count=6))
+
+        self.assertEqual(summary['needs_review'], 1)
+        self.execute_payment.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
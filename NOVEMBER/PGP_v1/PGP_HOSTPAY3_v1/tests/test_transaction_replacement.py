@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+"""
+Integration tests for WalletManager.replace_transaction() on an in-memory
+chain (eth-tester).
+
+Tests verify that a signed transaction which never reached the chain is
+replaced at the same nonce with higher fees and mined, that the signed
+transaction is recovered from the node when it isn't held in-process, that
+a failing on_signed callback sends nothing, and that replacing a
+transaction whose nonce was already used is rejected.
+"""
+import os
+import sys
+import unittest
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from eth_account import Account
+    from web3 import Web3, EthereumTesterProvider
+    from wallet_manager import WalletManager
+except ImportError:  # web3 / eth-tester not installed
+    EthereumTesterProvider = None
+
+RECIPIENT = '0x' + f"{0x2001:040x}"
+
+
+@unittest.skipIf(EthereumTesterProvider is None, "eth-tester not installed")
+class TestReplaceTransaction(unittest.TestCase):
+    """Test suite for replace_transaction() against eth-tester."""
+
+    def setUp(self):
+        w3 = Web3(EthereumTesterProvider())
+        account = Account.create()
+        w3.eth.send_transaction({
+            'from': w3.eth.accounts[0],
+            'to': account.address,
+            'value': w3.to_wei(10, 'ether')
+        })
+
+        with patch.object(WalletManager, '_connect_to_web3', return_value=False):
+            self.wallet = WalletManager(account.address, account.key.hex(), 'http://127.0.0.1:1')
+        self.wallet.w3 = w3
+        self.wallet.chain_id = w3.eth.chain_id
+        self.wallet.nonce_allocator.chain_id = w3.eth.chain_id
+        self.w3 = w3
+
+    def send_dropped(self):
+        """Sign and 'broadcast' a payment the node then loses."""
+        with patch.object(self.w3.eth, 'send_raw_transaction', side_effect=lambda raw: Web3.keccak(raw)):
+            result = self.wallet.send_batch_payments([
+                {'unique_id': 'UID_1', 'to_address': RECIPIENT, 'amount': 0.01}
+            ])[0]
+        self.assertEqual(result['status'], 'pending')
+        return result['tx_hash']
+
+    def test_replacement_reuses_nonce_with_higher_fees(self):
+        tx_hash = self.send_dropped()
+        original = self.wallet.get_signed_transaction(tx_hash)
+
+        replacement = self.wallet.replace_transaction(tx_hash)
+
+        mined = self.w3.eth.get_transaction(replacement)
+        self.assertNotEqual(replacement, tx_hash)
+        self.assertEqual(mined['nonce'], original['nonce'])
+        self.assertGreater(mined['maxFeePerGas'], original['transaction']['maxFeePerGas'])
+        self.assertGreater(mined['maxPriorityFeePerGas'], original['transaction']['maxPriorityFeePerGas'])
+        self.assertEqual(self.w3.eth.get_transaction_receipt(replacement)['status'], 1)
+        self.assertEqual(self.w3.eth.get_balance(Web3.to_checksum_address(RECIPIENT)), self.w3.to_wei(0.01, 'ether'))
+        self.assertEqual(self.wallet.get_signed_transaction(replacement)['nonce'], original['nonce'])
+
+    def test_signed_transaction_recovered_from_node(self):
+        tx_hash = self.wallet.send_batch_payments([
+            {'unique_id': 'UID_1', 'to_address': RECIPIENT, 'amount': 0.01}
+        ])[0]['tx_hash']
+        self.wallet._signed_transactions.clear()
+
+        record = self.wallet.get_signed_transaction(tx_hash)
+
+        self.assertEqual(record['nonce'], 0)
+        self.assertEqual(record['transaction']['to'], Web3.to_checksum_address(RECIPIENT))
+        self.assertEqual(record['transaction']['value'], self.w3.to_wei(0.01, 'ether'))
+
+    def test_failed_on_signed_sends_nothing(self):
+        tx_hash = self.send_dropped()
+
+        def fail(new_tx_hash):
+            raise Exception("db down")
+
+        with self.assertRaises(Exception):
+            self.wallet.replace_transaction(tx_hash, on_signed=fail)
+
+        self.assertEqual(self.w3.eth.get_transaction_count(self.wallet.wallet_address), 0)
+
+    def test_used_nonce_is_not_replaced(self):
+        tx_hash = self.send_dropped()
+        self.wallet.replace_transaction(tx_hash)
+
+        with self.assertRaises(Exception):
+            self.wallet.replace_transaction(tx_hash)
+
+        self.assertEqual(self.w3.eth.get_transaction_count(self.wallet.wallet_address), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
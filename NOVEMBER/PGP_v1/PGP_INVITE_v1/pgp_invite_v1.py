@@ -5,26 +5,24 @@ Receives encrypted tokens from PGP_ORCHESTRATOR_v1 via Cloud Tasks,
 sends Telegram one-time invitation links to users.
 Implements infinite retry via Cloud Tasks (60s fixed backoff, 24h max duration).
 
-ARCHITECTURE - Sync Route with asyncio.run():
-This service uses a SYNCHRONOUS Flask route with asyncio.run() to handle
-python-telegram-bot's async API calls. This approach is optimal for Cloud Run.
-
-Why sync route with asyncio.run():
-- Creates a fresh, isolated event loop for EACH request
-- Prevents "Event loop is closed" errors in serverless environments
-- Each request gets a fresh Bot instance with new httpx connection pool
-- Event loop lifecycle is contained within the request scope
-- Cloud Run's stateless model works perfectly with this pattern
-- Previous async route approach failed because event loops closed between requests
+ARCHITECTURE - Sync Route with PGP_COMMON async bridge:
+This service uses a SYNCHRONOUS Flask route that runs python-telegram-bot's
+async API calls on the process-wide async bridge (PGP_COMMON.utils.run_async).
+
+Why the async bridge:
+- One long-lived event loop thread per process instead of one loop per request
+- One Bot instance whose httpx connection pool (and TLS session to
+  api.telegram.org) is reused by every request
+- The loop never closes between requests, so "Event loop is closed" errors
+  (which the previous per-request asyncio.run() pattern worked around) cannot occur
 
 Key Implementation:
-- Bot instance created per-request (not at module level)
-- asyncio.run() creates isolated event loop for async telegram operations
-- Event loop and connections properly cleaned up after each request
+- get_bot() creates and initializes the Bot once, on the bridge loop
+- run_async() executes the invite coroutine and waits with a timeout
 """
 import os
 import time
-import asyncio
+import threading
 from flask import Flask, request, abort, jsonify
 from telegram import Bot
 from telegram.error import TelegramError
@@ -45,7 +43,8 @@ from PGP_COMMON.utils import (
     ValidationError,
     validate_telegram_user_id,
     validate_telegram_channel_id,
-    validate_payment_id
+    validate_payment_id,
+    run_async
 )
 
 from PGP_COMMON.logging import setup_logger
@@ -99,16 +98,41 @@ except Exception as e:
     logger.error(f"❌ [APP] Failed to initialize token manager: {e}", exc_info=True)
     token_manager = None
 
-# Store bot token at module level (Bot instance created per-request)
+# Store bot token at module level (shared Bot instance created on first request)
 try:
     bot_token = config.get('telegram_bot_token')
     if not bot_token:
         raise ValueError("TELEGRAM_BOT_TOKEN not available")
-    logger.info(f"✅ [APP] Telegram bot token loaded (Bot instance will be created per-request)")
+    logger.info(f"✅ [APP] Telegram bot token loaded (shared Bot instance created on first request)")
 except Exception as e:
     logger.error(f"❌ [APP] Failed to load Telegram bot token: {e}", exc_info=True)
     bot_token = None
 
+# Upper bound for the Telegram calls of one request (Cloud Tasks retries on 500)
+TELEGRAM_CALL_TIMEOUT_SECONDS = 60
+
+# Shared Bot bound to the async bridge loop (connection pool reused across requests)
+_bot = None
+_bot_lock = threading.Lock()
+
+
+def get_bot() -> Bot:
+    """
+    Get the shared Bot instance, initializing it on the async bridge loop once.
+
+    Returns:
+        Initialized Bot (only await its methods through run_async)
+    """
+    global _bot
+
+    with _bot_lock:
+        if _bot is None:
+            bot = Bot(bot_token)
+            run_async(bot.initialize(), timeout=TELEGRAM_CALL_TIMEOUT_SECONDS)
+            _bot = bot
+            logger.info(f"🤖 [APP] Shared Telegram Bot initialized on async bridge loop")
+        return _bot
+
 
 # ============================================================================
 # MAIN ENDPOINT: POST / - Receives request from PGP_ORCHESTRATOR_v1 via Cloud Tasks
@@ -121,8 +145,8 @@ def send_telegram_invite():
 
     Flow:
     1. Decrypt token from PGP_ORCHESTRATOR_v1
-    2. Create fresh Bot instance for this request
-    3. Use asyncio.run() to execute async telegram operations in isolated event loop
+    2. Get the shared Bot instance (created once per process)
+    3. Run async telegram operations on the shared async bridge loop
     4. Create Telegram invite link
     5. Send invite message to user
     6. Return 200 (Cloud Tasks marks success)
@@ -291,52 +315,47 @@ def send_telegram_invite():
         tier_number = channel_details.get('tier_number', 'Unknown')
 
         # Define async function to handle telegram operations
-        async def send_invite_async():
+        async def send_invite_async(bot: Bot):
             """
             Async function to handle telegram bot operations.
-            ✅ H-03 FIX: Uses context manager for proper connection cleanup.
-            Creates fresh Bot instance with isolated httpx connection pool that
-            is automatically closed even on exceptions.
+            Runs on the async bridge loop with the shared Bot, so the httpx
+            connection pool is reused instead of opened and closed per request.
             """
-            # ✅ H-03 FIX: Use async context manager for automatic cleanup
-            async with Bot(bot_token) as bot:
-                logger.info(f"📨 [ENDPOINT] Creating Telegram invite link for channel {closed_channel_id}")
-
-                # Create one-time invite link (expires in 1 hour, 1 use only)
-                invite = await bot.create_chat_invite_link(
-                    chat_id=closed_channel_id,
-                    expire_date=int(time.time()) + 3600,
-                    member_limit=1
-                )
-                logger.info(f"✅ [ENDPOINT] Invite link created: {invite.invite_link}")
-
-                # Send invite message to user with enhanced format
-                await bot.send_message(
-                    chat_id=user_id,
-                    text=(
-                        "🎉 Your ONE-TIME Invitation Link\n\n"
-                        f"📺 Channel: {channel_title}\n"
-                        f"🔗 {invite.invite_link}\n\n"
-                        f"📋 Subscription Details:\n"
-                        f"├ 🎯 Tier: {tier_number}\n"
-                        f"├ 💰 Price: ${subscription_price} USD\n"
-                        f"└ ⏳ Duration: {subscription_time_days} days"
-                    ),
-                    disable_web_page_preview=True
-                )
-                logger.info(f"✅ [ENDPOINT] Enhanced invite message sent to user {user_id}")
-                logger.info(f"📺 [ENDPOINT] Message details: {channel_title}, Tier {tier_number}, ${subscription_price}, {subscription_time_days} days")
+            logger.info(f"📨 [ENDPOINT] Creating Telegram invite link for channel {closed_channel_id}")
 
-                return {
-                    "success": True,
-                    "invite_link": invite.invite_link
-                }
-                # ✅ H-03 FIX: Bot shutdown() automatically called here
-                # Connection pool properly closed even if exceptions occurred
+            # Create one-time invite link (expires in 1 hour, 1 use only)
+            invite = await bot.create_chat_invite_link(
+                chat_id=closed_channel_id,
+                expire_date=int(time.time()) + 3600,
+                member_limit=1
+            )
+            logger.info(f"✅ [ENDPOINT] Invite link created: {invite.invite_link}")
+
+            # Send invite message to user with enhanced format
+            await bot.send_message(
+                chat_id=user_id,
+                text=(
+                    "🎉 Your ONE-TIME Invitation Link\n\n"
+                    f"📺 Channel: {channel_title}\n"
+                    f"🔗 {invite.invite_link}\n\n"
+                    f"📋 Subscription Details:\n"
+                    f"├ 🎯 Tier: {tier_number}\n"
+                    f"├ 💰 Price: ${subscription_price} USD\n"
+                    f"└ ⏳ Duration: {subscription_time_days} days"
+                ),
+                disable_web_page_preview=True
+            )
+            logger.info(f"✅ [ENDPOINT] Enhanced invite message sent to user {user_id}")
+            logger.info(f"📺 [ENDPOINT] Message details: {channel_title}, Tier {tier_number}, ${subscription_price}, {subscription_time_days} days")
+
+            return {
+                "success": True,
+                "invite_link": invite.invite_link
+            }
 
-        # Execute async function in isolated event loop
+        # Execute async function on the shared async bridge loop
         try:
-            result = asyncio.run(send_invite_async())
+            result = run_async(send_invite_async(get_bot()), timeout=TELEGRAM_CALL_TIMEOUT_SECONDS)
 
             # ================================================================
             # IDEMPOTENCY: Mark invite as sent in database
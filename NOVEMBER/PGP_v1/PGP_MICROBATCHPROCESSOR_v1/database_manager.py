@@ -4,10 +4,17 @@ Database Manager for PGP_MICROBATCHPROCESSOR_v1 (Micro-Batch Conversion Service)
 Handles database connections and operations for batch_conversions and payout_accumulation tables.
 """
 from datetime import datetime
-from decimal import Decimal, getcontext
+from decimal import Decimal, getcontext, ROUND_DOWN
 from typing import Optional, List, Dict
 from PGP_COMMON.database import BaseDatabaseManager
 
+# payout_accumulation.accumulated_amount_usdt is NUMERIC(18, 8): shares are
+# quantized to this scale before storing so the stored values sum exactly
+USDT_SHARE_QUANTUM = Decimal('0.00000001')
+
+# Rows per UPDATE ... FROM (VALUES ...) statement (2 bind parameters per row)
+DISTRIBUTION_CHUNK_SIZE = 1000
+
 
 class DatabaseManager(BaseDatabaseManager):
     """
@@ -257,10 +264,12 @@ class DatabaseManager(BaseDatabaseManager):
 
             # Query accumulated_amount_usdt (stores pending USD value for unconverted payments)
             # For records in a batch, this will still have the original USD amount
+            # ORDER BY id makes the distribution (and its remainder row) reproducible
             cur.execute(
                 """SELECT id, accumulated_amount_usdt
                    FROM payout_accumulation
-                   WHERE batch_conversion_id = %s""",
+                   WHERE batch_conversion_id = %s
+                   ORDER BY id""",
                 (batch_conversion_id,)
             )
 
@@ -295,6 +304,11 @@ class DatabaseManager(BaseDatabaseManager):
 
         Formula: usdt_share_i = (payment_i / total_pending) × actual_usdt_received
 
+        Every share except the last is rounded down to the column scale
+        (8 decimals); the last record takes the remainder, so the shares sum
+        exactly to actual_usdt_received and the result is reproducible for the
+        same input order.
+
         Args:
             pending_records: List of dicts with 'id' and 'accumulated_amount_usdt'
             actual_usdt_received: Total USDT received from ChangeNow
@@ -309,6 +323,7 @@ class DatabaseManager(BaseDatabaseManager):
 
             # Calculate total pending
             total_pending = sum(Decimal(str(r['accumulated_amount_usdt'])) for r in pending_records)
+            actual_usdt_received = Decimal(str(actual_usdt_received)).quantize(USDT_SHARE_QUANTUM, rounding=ROUND_DOWN)
 
             print(f"💰 [DISTRIBUTION] Total pending: ${total_pending}")
             print(f"💰 [DISTRIBUTION] Actual USDT received: ${actual_usdt_received}")
@@ -323,7 +338,9 @@ class DatabaseManager(BaseDatabaseManager):
                 if i == len(pending_records) - 1:
                     usdt_share = actual_usdt_received - running_total
                 else:
-                    usdt_share = (record_usd / total_pending) * actual_usdt_received
+                    usdt_share = ((record_usd / total_pending) * actual_usdt_received).quantize(
+                        USDT_SHARE_QUANTUM, rounding=ROUND_DOWN
+                    )
                     running_total += usdt_share
 
                 percentage = (record_usd / total_pending) * 100
@@ -350,71 +367,30 @@ class DatabaseManager(BaseDatabaseManager):
             print(f"❌ [DISTRIBUTION] Calculation error: {e}")
             return []
 
-    def update_record_usdt_share(
-        self,
-        record_id: int,
-        usdt_share: Decimal,
-        tx_hash: str
-    ) -> bool:
-        """
-        Update individual record with USDT share and mark completed.
-
-        Args:
-            record_id: Payout accumulation record ID
-            usdt_share: Proportional USDT share
-            tx_hash: Transaction hash
-
-        Returns:
-            True if successful, False if failed
-        """
-        conn = None
-        try:
-            conn = self.get_connection()
-            if not conn:
-                print(f"❌ [DATABASE] Failed to establish connection")
-                return False
-
-            cur = conn.cursor()
-
-            cur.execute(
-                """UPDATE payout_accumulation
-                   SET accumulated_amount_usdt = %s,
-                       conversion_status = 'completed',
-                       conversion_tx_hash = %s,
-                       updated_at = NOW()
-                   WHERE id = %s""",
-                (str(usdt_share), tx_hash, record_id)
-            )
-
-            conn.commit()
-
-            cur.close()
-            conn.close()
-            return True
-
-        except Exception as e:
-            print(f"❌ [DATABASE] Update error for record {record_id}: {e}")
-            if conn:
-                conn.rollback()
-                conn.close()
-            return False
-
-    def finalize_batch_conversion(
+    def apply_usdt_distribution(
         self,
         batch_conversion_id: str,
+        distributions: List[Dict],
         actual_usdt_received: Decimal,
         tx_hash: str
     ) -> bool:
         """
-        Mark batch_conversion as completed.
+        Apply all USDT shares and finalize the batch in ONE transaction.
+
+        Shares are written with set-based UPDATE ... FROM (VALUES ...) statements
+        (chunked for very large batches) and the batch_conversions row is
+        finalized on the same connection. Either every record is distributed and
+        the batch is completed, or nothing is committed.
 
         Args:
             batch_conversion_id: UUID of the batch
+            distributions: List of dicts with 'id' and 'usdt_share'
+                           (from distribute_usdt_proportionally)
             actual_usdt_received: Actual USDT received from swap
             tx_hash: Transaction hash
 
         Returns:
-            True if successful, False if failed
+            True if committed, False if rolled back
         """
         conn = None
         try:
@@ -424,7 +400,38 @@ class DatabaseManager(BaseDatabaseManager):
                 return False
 
             cur = conn.cursor()
-            print(f"💾 [DATABASE] Finalizing batch conversion {batch_conversion_id}")
+            print(f"💾 [DATABASE] Applying {len(distributions)} USDT share(s) for batch {batch_conversion_id}")
+
+            updated = 0
+            for start in range(0, len(distributions), DISTRIBUTION_CHUNK_SIZE):
+                chunk = distributions[start:start + DISTRIBUTION_CHUNK_SIZE]
+                values_sql = ", ".join(["(%s::integer, %s::numeric)"] * len(chunk))
+
+                # Placeholder order: SET tx_hash, VALUES rows, WHERE batch id
+                params = [tx_hash]
+                for distribution in chunk:
+                    params.extend([distribution['id'], str(distribution['usdt_share'])])
+                params.append(batch_conversion_id)
+
+                cur.execute(
+                    f"""UPDATE payout_accumulation AS pa
+                        SET accumulated_amount_usdt = v.usdt_share,
+                            conversion_status = 'completed',
+                            conversion_tx_hash = %s,
+                            updated_at = NOW()
+                        FROM (VALUES {values_sql}) AS v(id, usdt_share)
+                        WHERE pa.id = v.id
+                          AND pa.batch_conversion_id = %s""",
+                    tuple(params)
+                )
+                updated += cur.rowcount
+
+            if updated != len(distributions):
+                print(f"❌ [DATABASE] Updated {updated} of {len(distributions)} record(s) - rolling back")
+                conn.rollback()
+                cur.close()
+                conn.close()
+                return False
 
             cur.execute(
                 """UPDATE batch_conversions
@@ -437,14 +444,14 @@ class DatabaseManager(BaseDatabaseManager):
             )
 
             conn.commit()
-            print(f"✅ [DATABASE] Batch conversion finalized")
+            print(f"✅ [DATABASE] Distributed USDT to {updated} record(s) and finalized batch")
 
             cur.close()
             conn.close()
             return True
 
         except Exception as e:
-            print(f"❌ [DATABASE] Update error: {e}")
+            print(f"❌ [DATABASE] Distribution error for batch {batch_conversion_id}: {e}")
             if conn:
                 conn.rollback()
                 conn.close()
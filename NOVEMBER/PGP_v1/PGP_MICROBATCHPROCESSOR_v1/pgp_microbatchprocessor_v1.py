@@ -16,7 +16,7 @@ from token_manager import TokenManager
 from cloudtasks_client import CloudTasksClient
 
 from PGP_COMMON.logging import setup_logger
-from PGP_COMMON.utils import ChangeNowClient
+from PGP_COMMON.utils import ChangeNowClient, ChangeNowRetryLater
 logger = setup_logger(__name__)
 
 app = Flask(__name__)
@@ -179,15 +179,28 @@ def check_threshold():
             logger.info(f"🔄 [ENDPOINT] Calling ChangeNow estimate API: USDT → ETH")
 
             # Fallback: Use USDT→ETH estimate to find ETH equivalent of USD amount
-            estimate_response = changenow_client.get_estimated_amount_v2_with_retry(
-                from_currency='usdt',
-                to_currency='eth',
-                from_network='eth',
-                to_network='eth',
-                from_amount=str(total_pending),
-                flow='standard',
-                type_='direct'
-            )
+            try:
+                estimate_response = changenow_client.get_estimated_amount_v2_with_retry(
+                    from_currency='usdt',
+                    to_currency='eth',
+                    from_network='eth',
+                    to_network='eth',
+                    from_amount=str(total_pending),
+                    flow='standard',
+                    type_='direct'
+                )
+            except ChangeNowRetryLater as retry:
+                # Nothing written yet - the next scheduled run picks the batch up again
+                logger.warning(f"⏳ [ENDPOINT] ChangeNow unavailable after {retry.attempts} attempts ({retry.reason}) - "
+                               f"deferring batch to the next run")
+                sys.stdout.flush()
+                response = jsonify({
+                    "status": "retry_later",
+                    "message": "ChangeNow unavailable, batch deferred",
+                    "retry_after_seconds": retry.delay_seconds
+                })
+                response.headers['Retry-After'] = str(retry.delay_seconds)
+                return response, 503
 
             if not estimate_response or 'toAmount' not in estimate_response:
                 logger.error(f"❌ [ENDPOINT] Failed to get ETH estimate from ChangeNow")
@@ -205,14 +218,27 @@ def check_threshold():
         logger.debug(f"📊 [ENDPOINT] Creating ChangeNow swap: ETH → USDT")
         logger.info(f"💰 [ENDPOINT] Swap amount: {eth_for_swap} ETH → ~${total_pending} USDT")
 
-        swap_result = changenow_client.create_fixed_rate_transaction_with_retry(
-            from_currency='eth',
-            to_currency='usdt',
-            from_amount=float(eth_for_swap),  # ✅ Use ACTUAL ETH or fallback estimate
-            address=host_wallet_usdt,
-            from_network='eth',
-            to_network='eth'  # USDT on Ethereum network (ERC-20)
-        )
+        try:
+            swap_result = changenow_client.create_fixed_rate_transaction_with_retry(
+                from_currency='eth',
+                to_currency='usdt',
+                from_amount=float(eth_for_swap),  # ✅ Use ACTUAL ETH or fallback estimate
+                address=host_wallet_usdt,
+                from_network='eth',
+                to_network='eth'  # USDT on Ethereum network (ERC-20)
+            )
+        except ChangeNowRetryLater as retry:
+            # Nothing written yet - the next scheduled run picks the batch up again
+            logger.warning(f"⏳ [ENDPOINT] ChangeNow unavailable after {retry.attempts} attempts ({retry.reason}) - "
+                           f"deferring batch to the next run")
+            sys.stdout.flush()
+            response = jsonify({
+                "status": "retry_later",
+                "message": "ChangeNow unavailable, batch deferred",
+                "retry_after_seconds": retry.delay_seconds
+            })
+            response.headers['Retry-After'] = str(retry.delay_seconds)
+            return response, 503
 
         if not swap_result or 'id' not in swap_result:
             logger.error(f"❌ [ENDPOINT] Failed to create ChangeNow swap")
@@ -346,8 +372,8 @@ def swap_executed():
     1. Decrypt token from PGP_HOSTPAY1_v1
     2. Fetch all pending records for batch_conversion_id
     3. Calculate proportional USDT distribution
-    4. Update each record with usdt_share
-    5. Mark batch as completed
+    4. Update all records with usdt_share and mark batch as completed
+       (single transaction - a failure leaves the batch untouched)
 
     Returns:
         JSON response with distribution summary
@@ -442,39 +468,26 @@ def swap_executed():
                 "message": "Distribution calculation failed"
             }), 500
 
-        # Update each record with usdt_share
-        logger.info(f"💾 [ENDPOINT] Updating records with USDT shares")
-        for distribution in distributions:
-            record_id = distribution['id']
-            usdt_share = distribution['usdt_share']
-
-            success = db_manager.update_record_usdt_share(
-                record_id=record_id,
-                usdt_share=usdt_share,
-                tx_hash=tx_hash
-            )
-
-            if success:
-                logger.info(f"✅ [ENDPOINT] Record {record_id}: ${usdt_share} USDT")
-            else:
-                logger.error(f"❌ [ENDPOINT] Failed to update record {record_id}")
-
-        # Finalize batch conversion
-        logger.info(f"💾 [ENDPOINT] Finalizing batch conversion")
-        batch_finalized = db_manager.finalize_batch_conversion(
+        # Apply all shares and finalize the batch in one transaction
+        logger.info(f"💾 [ENDPOINT] Applying USDT shares and finalizing batch conversion")
+        batch_finalized = db_manager.apply_usdt_distribution(
             batch_conversion_id=batch_conversion_id,
+            distributions=distributions,
             actual_usdt_received=actual_usdt_received,
             tx_hash=tx_hash
         )
 
         if not batch_finalized:
-            logger.error(f"❌ [ENDPOINT] Failed to finalize batch conversion")
+            logger.error(f"❌ [ENDPOINT] Failed to apply distribution - batch left unchanged")
             sys.stdout.flush()
             return jsonify({
                 "status": "error",
                 "message": "Failed to finalize batch"
             }), 500
 
+        for distribution in distributions:
+            logger.debug(f"✅ [ENDPOINT] Record {distribution['id']}: ${distribution['usdt_share']} USDT")
+
         logger.info(f"✅ [ENDPOINT] Batch conversion finalized successfully")
         logger.info(f"🎉 [ENDPOINT] Proportional distribution completed")
 
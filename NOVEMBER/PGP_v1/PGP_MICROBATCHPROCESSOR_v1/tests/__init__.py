@@ -0,0 +1,3 @@
+"""
+Tests for PGP_MICROBATCHPROCESSOR_v1 application.
+"""
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Unit tests for micro-batch USDT distribution.
+
+Tests verify that the stored shares always sum exactly to the USDT received
+(8-decimal column scale) and that apply_usdt_distribution() writes every
+share and finalizes the batch in one committed transaction.
+"""
+import os
+import sys
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import database_manager
+from database_manager import DatabaseManager, USDT_SHARE_QUANTUM
+
+
+def make_manager(conn=None):
+    """DatabaseManager without a Cloud SQL engine; get_connection() returns conn."""
+    manager = DatabaseManager.__new__(DatabaseManager)
+    manager.get_connection = Mock(return_value=conn)
+    return manager
+
+
+def make_records(amounts):
+    return [{'id': i + 1, 'accumulated_amount_usdt': amount} for i, amount in enumerate(amounts)]
+
+
+class TestDistributeUsdtProportionally(unittest.TestCase):
+    """Test suite for the rounding invariant."""
+
+    def assert_exact_distribution(self, amounts, received):
+        manager = make_manager()
+        distributions = manager.distribute_usdt_proportionally(make_records(amounts), received)
+
+        expected_total = Decimal(str(received)).quantize(USDT_SHARE_QUANTUM, rounding='ROUND_DOWN')
+        self.assertEqual(len(distributions), len(amounts))
+        self.assertEqual(sum(d['usdt_share'] for d in distributions), expected_total)
+        for distribution in distributions:
+            # Every share fits the NUMERIC(18, 8) column without rounding
+            self.assertEqual(distribution['usdt_share'], distribution['usdt_share'].quantize(USDT_SHARE_QUANTUM))
+            self.assertGreaterEqual(distribution['usdt_share'], 0)
+        return distributions
+
+    def test_thirds_sum_exactly(self):
+        distributions = self.assert_exact_distribution(['1', '1', '1'], Decimal('10'))
+
+        self.assertEqual([d['usdt_share'] for d in distributions],
+                         [Decimal('3.33333333'), Decimal('3.33333333'), Decimal('3.33333334')])
+
+    def test_uneven_amounts_sum_exactly(self):
+        self.assert_exact_distribution(
+            ['5.01', '17.3', '0.07', '250', '3.333333', '99.99'],
+            Decimal('371.12345678')
+        )
+
+    def test_many_tiny_records_sum_exactly(self):
+        self.assert_exact_distribution(['0.01'] * 997 + ['1234.5'], Decimal('1187.77777777'))
+
+    def test_received_beyond_column_scale_is_truncated(self):
+        distributions = self.assert_exact_distribution(['2', '3'], Decimal('9.123456789'))
+
+        self.assertEqual(sum(d['usdt_share'] for d in distributions), Decimal('9.12345678'))
+
+    def test_float_input_sums_exactly(self):
+        self.assert_exact_distribution([10.1, 20.2, 30.3], 58.71)
+
+    def test_same_input_is_reproducible(self):
+        records = make_records(['7', '11', '13'])
+        first = make_manager().distribute_usdt_proportionally(records, Decimal('29.99'))
+        second = make_manager().distribute_usdt_proportionally(records, Decimal('29.99'))
+
+        self.assertEqual([d['usdt_share'] for d in first], [d['usdt_share'] for d in second])
+
+
+class TestApplyUsdtDistribution(unittest.TestCase):
+    """Test suite for the single-transaction write."""
+
+    def setUp(self):
+        self.conn = Mock()
+        self.cursor = self.conn.cursor.return_value
+        self.manager = make_manager(self.conn)
+
+    def test_chunks_commit_once(self):
+        original_chunk_size = database_manager.DISTRIBUTION_CHUNK_SIZE
+        database_manager.DISTRIBUTION_CHUNK_SIZE = 2
+        try:
+            distributions = self.manager.distribute_usdt_proportionally(make_records(['1', '2', '3']), Decimal('6'))
+            rowcounts = iter([2, 1])
+            self.cursor.execute.side_effect = lambda *args: setattr(self.cursor, 'rowcount', next(rowcounts, 1))
+
+            applied = self.manager.apply_usdt_distribution('batch-1', distributions, Decimal('6'), '0xhash')
+        finally:
+            database_manager.DISTRIBUTION_CHUNK_SIZE = original_chunk_size
+
+        self.assertTrue(applied)
+        # Two share chunks + batch finalization
+        self.assertEqual(self.cursor.execute.call_count, 3)
+        self.conn.commit.assert_called_once()
+        self.conn.rollback.assert_not_called()
+
+    def test_missing_rows_roll_back(self):
+        distributions = self.manager.distribute_usdt_proportionally(make_records(['1', '2']), Decimal('3'))
+        self.cursor.rowcount = 1
+
+        applied = self.manager.apply_usdt_distribution('batch-1', distributions, Decimal('3'), '0xhash')
+
+        self.assertFalse(applied)
+        self.conn.commit.assert_not_called()
+        self.conn.rollback.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
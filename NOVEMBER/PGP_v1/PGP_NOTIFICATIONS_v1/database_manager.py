@@ -8,8 +8,7 @@ import os
 from typing import Optional, Tuple, Dict, Any
 from decimal import Decimal
 import logging
-from google.cloud.sql.connector import Connector
-from sqlalchemy import create_engine, pool, text
+from sqlalchemy import text
 from PGP_COMMON.database import BaseDatabaseManager
 
 logger = logging.getLogger(__name__)
@@ -18,12 +17,12 @@ logger = logging.getLogger(__name__)
 class DatabaseManager(BaseDatabaseManager):
     """
     Manages database connections and notification queries using SQLAlchemy.
-    Inherits common connection pooling from BaseDatabaseManager.
+    Inherits the shared connection pool (self.engine) from BaseDatabaseManager.
     """
 
     def __init__(self, instance_connection_name: str, dbname: str, user: str, password: str):
         """
-        Initialize database manager with SQLAlchemy connection pool.
+        Initialize database manager on the shared PGP_COMMON connection pool.
 
         Args:
             instance_connection_name: Cloud SQL instance connection name (project:region:instance)
@@ -31,81 +30,27 @@ class DatabaseManager(BaseDatabaseManager):
             user: Database user
             password: Database password
         """
-        # Call base class constructor
-        super().__init__(
-            instance_connection_name=instance_connection_name,
-            dbname=dbname,
-            user=user,
-            password=password,
-            service_name="PGP_NOTIFICATIONS_v1"
-        )
-
         # Validate credentials
         if not password:
             raise RuntimeError("Database password not available. Cannot initialize DatabaseManager.")
         if not all([instance_connection_name, dbname, user]):
             raise RuntimeError("Critical database configuration missing.")
 
-        # Initialize connection pool with notification service settings
-        self.connector = None
-        self.engine = None
-        self._initialize_pool()
+        # Call base class constructor (smaller pool for notification service)
+        super().__init__(
+            instance_connection_name=instance_connection_name,
+            db_name=dbname,
+            db_user=user,
+            db_password=password,
+            service_name="PGP_NOTIFICATIONS_v1",
+            pool_size=3,
+            max_overflow=2
+        )
 
-        logger.info(f"🗄️ [DATABASE] Initialized with connection pool")
+        logger.info(f"🗄️ [DATABASE] Initialized with shared connection pool")
         logger.info(f"   Instance: {instance_connection_name}")
         logger.info(f"   Database: {dbname}")
 
-    def _get_conn(self):
-        """
-        Get database connection using Cloud SQL Connector.
-        Called by SQLAlchemy when it needs a new connection.
-
-        Returns:
-            Database connection object (pg8000 connection)
-        """
-        conn = self.connector.connect(
-            self.instance_connection_name,
-            "pg8000",
-            user=self.user,
-            password=self.password,
-            db=self.dbname
-        )
-        return conn
-
-    def _initialize_pool(self):
-        """
-        Initialize SQLAlchemy engine with connection pool (NEW_ARCHITECTURE pattern).
-
-        Creates:
-        - Cloud SQL Connector instance
-        - SQLAlchemy engine with QueuePool
-        - Automatic connection health checks and recycling
-        """
-        try:
-            # Initialize Cloud SQL connector
-            self.connector = Connector()
-
-            logger.info("🔌 [DATABASE] Initializing Cloud SQL connector with SQLAlchemy...")
-
-            # Create SQLAlchemy engine with connection pool
-            self.engine = create_engine(
-                "postgresql+pg8000://",
-                creator=self._get_conn,
-                poolclass=pool.QueuePool,
-                pool_size=3,           # Smaller pool for notification service
-                max_overflow=2,        # Limited overflow
-                pool_timeout=30,       # 30 seconds
-                pool_recycle=1800,     # 30 minutes
-                pool_pre_ping=True,    # Health check before using connection
-                echo=False
-            )
-
-            logger.info("✅ [DATABASE] Connection pool initialized (NEW_ARCHITECTURE)")
-
-        except Exception as e:
-            logger.error(f"❌ [DATABASE] Failed to initialize pool: {e}", exc_info=True)
-            raise
-
     # ========================================================================
     # Service-Specific Methods
     # ========================================================================
@@ -6,10 +6,13 @@ Wraps Telegram Bot API for sending messages
 from telegram import Bot
 from telegram.error import TelegramError, Forbidden, BadRequest
 import logging
-import asyncio
+from PGP_COMMON.utils import run_async
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for one Bot API call made from a request thread
+TELEGRAM_CALL_TIMEOUT_SECONDS = 30
+
 
 class TelegramClient:
     """Wraps Telegram Bot API for sending messages"""
@@ -24,14 +27,11 @@ class TelegramClient:
         if not bot_token:
             raise ValueError("Bot token is required")
 
+        # Bot lives on the PGP_COMMON async bridge loop: its httpx connection
+        # pool is reused by every request instead of one loop per client
         self.bot = Bot(token=bot_token)
 
-        # Create persistent event loop (reused for all requests)
-        # This prevents "Event loop is closed" errors on subsequent requests
-        self.loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(self.loop)
-
-        logger.info("🤖 [TELEGRAM] Client initialized with persistent event loop")
+        logger.info("🤖 [TELEGRAM] Client initialized on shared async bridge loop")
 
     def send_message(
         self,
@@ -55,15 +55,15 @@ class TelegramClient:
         try:
             logger.info(f"📤 [TELEGRAM] Sending message to chat_id {chat_id}")
 
-            # Reuse persistent event loop (prevents "Event loop is closed" error)
-            # DO NOT create new loop or close it - keep for subsequent requests
-            self.loop.run_until_complete(
+            # Run on the process-wide bridge loop (persistent, never closed between requests)
+            run_async(
                 self.bot.send_message(
                     chat_id=chat_id,
                     text=text,
                     parse_mode=parse_mode,
                     disable_web_page_preview=disable_web_page_preview
-                )
+                ),
+                timeout=TELEGRAM_CALL_TIMEOUT_SECONDS
             )
 
             logger.info(f"✅ [TELEGRAM] Message delivered to {chat_id}")
@@ -90,11 +90,14 @@ class TelegramClient:
 
     def close(self):
         """
-        Close event loop on service shutdown
+        Close the Bot's HTTP connection pool on service shutdown
 
         Note: This should be called during Flask app teardown, but in Cloud Run
-        the container lifecycle handles cleanup automatically.
+        the container lifecycle handles cleanup automatically. The async bridge
+        loop itself is shared and stopped at process exit.
         """
-        if hasattr(self, 'loop') and self.loop and not self.loop.is_closed():
-            self.loop.close()
-            logger.info("🔒 [TELEGRAM] Event loop closed")
+        try:
+            run_async(self.bot.shutdown(), timeout=TELEGRAM_CALL_TIMEOUT_SECONDS)
+            logger.info("🔒 [TELEGRAM] Bot connection pool closed")
+        except Exception as e:
+            logger.warning(f"⚠️ [TELEGRAM] Error closing bot: {e}")
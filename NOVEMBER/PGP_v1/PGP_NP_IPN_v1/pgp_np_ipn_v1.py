@@ -9,7 +9,6 @@ import json
 import requests
 from flask import Flask, request, jsonify, abort
 from flask_cors import CORS
-from google.cloud.sql.connector import Connector
 from typing import Optional
 from PGP_COMMON.utils import (
     CryptoPricingClient,
@@ -157,17 +156,6 @@ else:
 
 logger.info(f"🎯 [APP] Initialization complete - Ready to process IPN callbacks")
 
-# Initialize Cloud SQL Connector
-connector = None
-if all([CLOUD_SQL_CONNECTION_NAME, DATABASE_NAME, DATABASE_USER, DATABASE_PASSWORD]):
-    try:
-        connector = Connector()
-        logger.info(f"✅ [DATABASE] Cloud SQL Connector initialized")
-    except Exception as e:
-        logger.error(f"❌ [DATABASE] Failed to initialize Cloud SQL Connector: {e}", exc_info=True)
-else:
-    logger.warning(f"⚠️ [DATABASE] Skipping connector initialization - missing credentials")
-
 # ============================================================================
 # CLOUD TASKS INITIALIZATION
 # ============================================================================
@@ -236,6 +224,8 @@ logger.info(f"💰 [PRICING] Supports both uppercase and lowercase crypto symbol
 # DATABASE MANAGER INITIALIZATION
 # ============================================================================
 # Initialize database manager (moved from inline functions)
+# All connections come from the shared PGP_COMMON engine (one Cloud SQL
+# Connector and connection pool per process)
 db_manager = None
 if all([CLOUD_SQL_CONNECTION_NAME, DATABASE_NAME, DATABASE_USER, DATABASE_PASSWORD]):
     try:
@@ -1002,7 +992,7 @@ def health_check():
         "components": {
             "ipn_secret": "configured" if NOWPAYMENTS_IPN_SECRET else "missing",
             "database_credentials": "configured" if all([CLOUD_SQL_CONNECTION_NAME, DATABASE_NAME, DATABASE_USER, DATABASE_PASSWORD]) else "missing",
-            "connector": "initialized" if connector else "not_initialized",
+            "database_pool": "initialized" if db_manager else "not_initialized",
             "database_connectivity": "healthy" if db_healthy else f"unhealthy: {db_error}"
         }
     }
@@ -1013,7 +1003,7 @@ def health_check():
         DATABASE_NAME,
         DATABASE_USER,
         DATABASE_PASSWORD,
-        connector,
+        db_manager,
         db_healthy  # ✅ M-11: Database must be reachable for service to be healthy
     ]) else 503
 
@@ -81,7 +81,8 @@ class CloudTasksClient(BaseCloudTasksClient):
         payout_network: str,
         subscription_price: str,
         actual_eth_amount: float = 0.0,
-        payout_mode: str = 'instant'
+        payout_mode: str = 'instant',
+        task_id: Optional[str] = None
     ) -> Optional[str]:
         """
         Enqueue a payment split request to PGP_SPLIT1 (formerly PGP_SPLIT1_v1).
@@ -97,9 +98,11 @@ class CloudTasksClient(BaseCloudTasksClient):
             subscription_price: Subscription price as string
             actual_eth_amount: ACTUAL ETH from NowPayments outcome (default 0 for backward compat)
             payout_mode: 'instant' or 'threshold' - determines swap currency routing
+            task_id: Optional deterministic task ID - a retried enqueue with the
+                     same ID is deduplicated by Cloud Tasks
 
         Returns:
-            Task name if successful, None if failed
+            Task name if successful (or already created), None if failed
         """
         try:
             print(f"💰 [CLOUD_TASKS] Enqueueing payment split to PGP_SPLIT1")
@@ -125,7 +128,8 @@ class CloudTasksClient(BaseCloudTasksClient):
             return self.create_signed_task(
                 queue_name=queue_name,
                 target_url=target_url,
-                payload=webhook_data
+                payload=webhook_data,
+                task_id=task_id
             )
 
         except Exception as e:
@@ -311,238 +311,257 @@ def process_validated_payment():
             logger.error(f"❌ [VALIDATED] Input validation failed: {e}", exc_info=True)
             abort(400, f"Invalid request parameters: {e}")
 
-        # ============================================================================
-        # IDEMPOTENCY CHECK: Atomic check using IdempotencyManager
-        # ============================================================================
-
-        logger.debug("")
-        logger.debug(f"🔍 [IDEMPOTENCY] Checking if payment {nowpayments_payment_id} already processed...")
-
-        if not idempotency_manager:
-            logger.warning(f"⚠️ [IDEMPOTENCY] IdempotencyManager not available - skipping idempotency check")
-            logger.warning(f"⚠️ [IDEMPOTENCY] Race condition protection disabled (fail-open mode)")
-        else:
-            try:
-                # ✅ ATOMIC CHECK: Try to claim processing (INSERT...ON CONFLICT)
-                can_process, existing_data = idempotency_manager.check_and_claim_processing(
-                    payment_id=nowpayments_payment_id,
-                    user_id=user_id,
-                    channel_id=closed_channel_id,
-                    service_column='pgp_orchestrator_processed'
-                )
-
-                if not can_process:
-                    # Another request already processed this payment
-                    logger.info(f"✅ [IDEMPOTENCY] Payment {nowpayments_payment_id} already processed")
-                    logger.info(f"   Service: pgp_orchestrator_processed = TRUE")
-                    if existing_data:
-                        logger.info(f"   Payment status: {existing_data.get('payment_status')}")
-                        logger.info(f"   Telegram invite sent: {existing_data.get('telegram_invite_sent')}")
-                        logger.info(f"   Created at: {existing_data.get('created_at')}")
-                    logger.info(f"=" * 80)
-
-                    return jsonify({
-                        "status": "success",
-                        "message": "Payment already processed (idempotency check)",
-                        "payment_id": nowpayments_payment_id,
-                        "already_processed": True
-                    }), 200
-
-                # ✅ We won the race - safe to process
-                logger.info(f"🆕 [IDEMPOTENCY] Claimed processing for payment {nowpayments_payment_id}")
-                logger.info(f"🔒 [IDEMPOTENCY] Atomic lock acquired - safe to proceed")
-
-            except ValueError as e:
-                logger.error(f"❌ [IDEMPOTENCY] Validation error: {e}", exc_info=True)
-                logger.warning(f"⚠️ [IDEMPOTENCY] Invalid payment data - proceeding with caution")
-            except Exception as e:
-                logger.error(f"❌ [IDEMPOTENCY] Error during atomic check: {e}", exc_info=True)
-                logger.warning(f"⚠️ [IDEMPOTENCY] Proceeding with processing (fail-open mode)")
-
-        logger.debug("")
+        if not db_manager:
+            logger.error(f"❌ [VALIDATED] Database manager not available", exc_info=True)
+            abort(500, "Database unavailable")
 
         # ============================================================================
-        # CRITICAL: Defense-in-depth - Validate payment_status again
+        # UNIT OF WORK: Idempotency claim, payout routing and completion flag
+        # share ONE pooled connection and ONE commit (no partial writes)
         # ============================================================================
-        payment_status = payment_data.get('payment_status', '').lower()
+        with db_manager.transaction():
+            # ============================================================================
+            # IDEMPOTENCY CHECK: Atomic check using IdempotencyManager
+            # ============================================================================
 
-        ALLOWED_PAYMENT_STATUSES = ['finished']
+            logger.debug("")
+            logger.debug(f"🔍 [IDEMPOTENCY] Checking if payment {nowpayments_payment_id} already processed...")
 
-        logger.debug(f"🔍 [GCWEBHOOK1] Payment status received: '{payment_status}'")
-        logger.info(f"✅ [GCWEBHOOK1] Allowed statuses: {ALLOWED_PAYMENT_STATUSES}")
+            if not idempotency_manager:
+                logger.warning(f"⚠️ [IDEMPOTENCY] IdempotencyManager not available - skipping idempotency check")
+                logger.warning(f"⚠️ [IDEMPOTENCY] Race condition protection disabled (fail-open mode)")
+            else:
+                try:
+                    # ✅ ATOMIC CHECK: Try to claim processing (INSERT...ON CONFLICT)
+                    can_process, existing_data = idempotency_manager.check_and_claim_processing(
+                        payment_id=nowpayments_payment_id,
+                        user_id=user_id,
+                        channel_id=closed_channel_id,
+                        service_column='pgp_orchestrator_processed'
+                    )
+
+                    if not can_process:
+                        # Another request already processed this payment
+                        logger.info(f"✅ [IDEMPOTENCY] Payment {nowpayments_payment_id} already processed")
+                        logger.info(f"   Service: pgp_orchestrator_processed = TRUE")
+                        if existing_data:
+                            logger.info(f"   Payment status: {existing_data.get('payment_status')}")
+                            logger.info(f"   Telegram invite sent: {existing_data.get('telegram_invite_sent')}")
+                            logger.info(f"   Created at: {existing_data.get('created_at')}")
+                        logger.info(f"=" * 80)
+
+                        return jsonify({
+                            "status": "success",
+                            "message": "Payment already processed (idempotency check)",
+                            "payment_id": nowpayments_payment_id,
+                            "already_processed": True
+                        }), 200
+
+                    # ✅ We won the race - safe to process
+                    logger.info(f"🆕 [IDEMPOTENCY] Claimed processing for payment {nowpayments_payment_id}")
+                    logger.info(f"🔒 [IDEMPOTENCY] Atomic lock acquired - safe to proceed")
+
+                except ValueError as e:
+                    logger.error(f"❌ [IDEMPOTENCY] Validation error: {e}", exc_info=True)
+                    logger.warning(f"⚠️ [IDEMPOTENCY] Invalid payment data - proceeding with caution")
+                except Exception as e:
+                    # The unit of work is rollback-only after a failed statement - let Cloud Tasks retry
+                    logger.error(f"❌ [IDEMPOTENCY] Error during atomic check: {e}", exc_info=True)
+                    raise
 
-        if payment_status not in ALLOWED_PAYMENT_STATUSES:
-            logger.info(f"=" * 80)
-            logger.info(f"⏸️ [GCWEBHOOK1] PAYMENT STATUS VALIDATION FAILED (Second Layer)")
+            logger.debug("")
+
+            # ============================================================================
+            # CRITICAL: Defense-in-depth - Validate payment_status again
+            # ============================================================================
+            payment_status = payment_data.get('payment_status', '').lower()
+
+            ALLOWED_PAYMENT_STATUSES = ['finished']
+
+            logger.debug(f"🔍 [GCWEBHOOK1] Payment status received: '{payment_status}'")
+            logger.info(f"✅ [GCWEBHOOK1] Allowed statuses: {ALLOWED_PAYMENT_STATUSES}")
+
+            if payment_status not in ALLOWED_PAYMENT_STATUSES:
+                logger.info(f"=" * 80)
+                logger.info(f"⏸️ [GCWEBHOOK1] PAYMENT STATUS VALIDATION FAILED (Second Layer)")
+                logger.info(f"=" * 80)
+                logger.info(f"📊 [GCWEBHOOK1] Current status: '{payment_status}'")
+                logger.info(f"⏳ [GCWEBHOOK1] Required status: 'finished'")
+                logger.info(f"👤 [GCWEBHOOK1] User ID: {payment_data.get('user_id')}")
+                logger.info(f"💰 [GCWEBHOOK1] Amount: {payment_data.get('subscription_price')}")
+                logger.info(f"🛡️ [GCWEBHOOK1] Defense-in-depth check prevented processing")
+                logger.info(f"=" * 80)
+
+                # Return 200 OK to prevent Cloud Tasks retry
+                # This should never happen if np-webhook is working correctly
+                return jsonify({
+                    "status": "rejected",
+                    "message": f"Payment status not ready for processing (current: {payment_status})",
+                    "payment_status": payment_status,
+                    "required_status": "finished",
+                    "defense_layer": "gcwebhook1_second_layer"
+                }), 200
+
+            # If we reach here, payment_status is 'finished' - proceed with routing
             logger.info(f"=" * 80)
-            logger.info(f"📊 [GCWEBHOOK1] Current status: '{payment_status}'")
-            logger.info(f"⏳ [GCWEBHOOK1] Required status: 'finished'")
-            logger.info(f"👤 [GCWEBHOOK1] User ID: {payment_data.get('user_id')}")
-            logger.info(f"💰 [GCWEBHOOK1] Amount: {payment_data.get('subscription_price')}")
-            logger.info(f"🛡️ [GCWEBHOOK1] Defense-in-depth check prevented processing")
+            logger.info(f"✅ [GCWEBHOOK1] PAYMENT STATUS VALIDATED (Second Layer): '{payment_status}'")
+            logger.info(f"✅ [GCWEBHOOK1] Proceeding with instant/threshold routing")
             logger.info(f"=" * 80)
 
-            # Return 200 OK to prevent Cloud Tasks retry
-            # This should never happen if np-webhook is working correctly
-            return jsonify({
-                "status": "rejected",
-                "message": f"Payment status not ready for processing (current: {payment_status})",
-                "payment_status": payment_status,
-                "required_status": "finished",
-                "defense_layer": "gcwebhook1_second_layer"
-            }), 200
-
-        # If we reach here, payment_status is 'finished' - proceed with routing
-        logger.info(f"=" * 80)
-        logger.info(f"✅ [GCWEBHOOK1] PAYMENT STATUS VALIDATED (Second Layer): '{payment_status}'")
-        logger.info(f"✅ [GCWEBHOOK1] Proceeding with instant/threshold routing")
-        logger.info(f"=" * 80)
-
-        # Extract remaining required fields (user_id, closed_channel_id, payment_id already extracted for idempotency)
-        wallet_address = payment_data.get('wallet_address')
-        payout_currency = payment_data.get('payout_currency')
-        payout_network = payment_data.get('payout_network')
-        subscription_time_days = payment_data.get('subscription_time_days')
-        subscription_price = payment_data.get('subscription_price')
+            # Extract remaining required fields (user_id, closed_channel_id, payment_id already extracted for idempotency)
+            wallet_address = payment_data.get('wallet_address')
+            payout_currency = payment_data.get('payout_currency')
+            payout_network = payment_data.get('payout_network')
+            subscription_time_days = payment_data.get('subscription_time_days')
+            subscription_price = payment_data.get('subscription_price')
 
-        # CRITICAL: This is the ACTUAL outcome amount in USD from CoinGecko
-        outcome_amount_usd = payment_data.get('outcome_amount_usd')
+            # CRITICAL: This is the ACTUAL outcome amount in USD from CoinGecko
+            outcome_amount_usd = payment_data.get('outcome_amount_usd')
 
-        # NowPayments metadata
-        nowpayments_pay_address = payment_data.get('nowpayments_pay_address')
-        nowpayments_outcome_amount = payment_data.get('nowpayments_outcome_amount')
+            # NowPayments metadata
+            nowpayments_pay_address = payment_data.get('nowpayments_pay_address')
+            nowpayments_outcome_amount = payment_data.get('nowpayments_outcome_amount')
 
-        # Normalize types for subscription_time_days (user_id and closed_channel_id already normalized)
-        try:
-            subscription_time_days = int(subscription_time_days) if subscription_time_days is not None else None
-        except (ValueError, TypeError) as e:
-            logger.error(f"❌ [VALIDATED] Type conversion error for subscription_time_days: {e}", exc_info=True)
-            logger.info(f"   subscription_time_days: {payment_data.get('subscription_time_days')} (type: {type(payment_data.get('subscription_time_days'))})")
-            abort(400, f"Invalid subscription_time_days type: {e}")
-
-        logger.debug("")
-        logger.info(f"✅ [VALIDATED] Payment Data Received:")
-        logger.info(f"   User ID: {user_id}")
-        logger.info(f"   Channel ID: {closed_channel_id}")
-        logger.info(f"   Wallet: {wallet_address}")
-        logger.info(f"   Payout: {payout_currency} on {payout_network}")
-        logger.info(f"   Subscription Days: {subscription_time_days}")
-        logger.info(f"   Declared Price: ${subscription_price}")
-        logger.info(f"   💰 ACTUAL Outcome (USD): ${outcome_amount_usd}")
-        logger.info(f"   💰 ACTUAL Outcome (ETH): {nowpayments_outcome_amount}")  # ✅ ADD LOG
-        logger.info(f"   Payment ID: {nowpayments_payment_id}")
-
-        # Validate required fields
-        if not all([user_id, closed_channel_id, outcome_amount_usd]):
-            logger.error(f"❌ [VALIDATED] Missing required fields", exc_info=True)
-            logger.info(f"   user_id: {user_id}")
-            logger.info(f"   closed_channel_id: {closed_channel_id}")
-            logger.info(f"   outcome_amount_usd: {outcome_amount_usd}")
-            abort(400, "Missing required payment data")
-
-        # ========================================================================
-        # PAYOUT ROUTING DECISION
-        # ========================================================================
-        logger.debug("")
-        logger.debug(f"🔍 [VALIDATED] Checking payout strategy for channel {closed_channel_id}")
-
-        if not db_manager:
-            logger.error(f"❌ [VALIDATED] Database manager not available", exc_info=True)
-            abort(500, "Database unavailable")
-
-        payout_mode, payout_threshold = db_manager.get_payout_strategy(closed_channel_id)
-        logger.info(f"💰 [VALIDATED] Payout mode: {payout_mode}")
+            # Normalize types for subscription_time_days (user_id and closed_channel_id already normalized)
+            try:
+                subscription_time_days = int(subscription_time_days) if subscription_time_days is not None else None
+            except (ValueError, TypeError) as e:
+                logger.error(f"❌ [VALIDATED] Type conversion error for subscription_time_days: {e}", exc_info=True)
+                logger.info(f"   subscription_time_days: {payment_data.get('subscription_time_days')} (type: {type(payment_data.get('subscription_time_days'))})")
+                abort(400, f"Invalid subscription_time_days type: {e}")
 
-        if payout_mode == "threshold":
-            logger.info(f"🎯 [VALIDATED] Threshold payout mode - ${payout_threshold} threshold")
-            logger.info(f"📊 [VALIDATED] Processing accumulation inline (PGP_ACCUMULATOR_v1 removed)")
+            logger.debug("")
+            logger.info(f"✅ [VALIDATED] Payment Data Received:")
+            logger.info(f"   User ID: {user_id}")
+            logger.info(f"   Channel ID: {closed_channel_id}")
+            logger.info(f"   Wallet: {wallet_address}")
+            logger.info(f"   Payout: {payout_currency} on {payout_network}")
+            logger.info(f"   Subscription Days: {subscription_time_days}")
+            logger.info(f"   Declared Price: ${subscription_price}")
+            logger.info(f"   💰 ACTUAL Outcome (USD): ${outcome_amount_usd}")
+            logger.info(f"   💰 ACTUAL Outcome (ETH): {nowpayments_outcome_amount}")  # ✅ ADD LOG
+            logger.info(f"   Payment ID: {nowpayments_payment_id}")
 
-            # Get subscription ID for accumulation record
-            subscription_id = db_manager.get_subscription_id(user_id, closed_channel_id)
+            # Validate required fields
+            if not all([user_id, closed_channel_id, outcome_amount_usd]):
+                logger.error(f"❌ [VALIDATED] Missing required fields", exc_info=True)
+                logger.info(f"   user_id: {user_id}")
+                logger.info(f"   closed_channel_id: {closed_channel_id}")
+                logger.info(f"   outcome_amount_usd: {outcome_amount_usd}")
+                abort(400, "Missing required payment data")
 
             # ========================================================================
-            # INLINE ACCUMULATION LOGIC (moved from PGP_ACCUMULATOR_v1)
+            # PAYOUT ROUTING DECISION
             # ========================================================================
-            # Calculate adjusted amount (remove TP fee - same as PGP_ACCUMULATOR did)
-            from decimal import Decimal
-
-            tp_flat_fee = Decimal('3')  # 3% TelePay fee
-            fee_amount = Decimal(str(outcome_amount_usd)) * (tp_flat_fee / Decimal('100'))
-            adjusted_amount_usd = Decimal(str(outcome_amount_usd)) - fee_amount
-
             logger.debug("")
-            logger.info(f"💸 [VALIDATED] Calculating accumulation (inline)")
-            logger.info(f"   💰 Original amount: ${outcome_amount_usd}")
-            logger.info(f"   💸 TP fee ({tp_flat_fee}%): ${fee_amount}")
-            logger.info(f"   ✅ Adjusted amount: ${adjusted_amount_usd}")
+            logger.debug(f"🔍 [VALIDATED] Checking payout strategy for channel {closed_channel_id}")
 
-            # Store accumulated_eth (the adjusted USD amount pending conversion)
-            accumulated_eth = adjusted_amount_usd
+            payout_mode, payout_threshold = db_manager.get_payout_strategy(closed_channel_id)
+            logger.info(f"💰 [VALIDATED] Payout mode: {payout_mode}")
 
-            logger.info(f"💾 [VALIDATED] Writing to payout_accumulation table directly")
+            if payout_mode == "threshold":
+                logger.info(f"🎯 [VALIDATED] Threshold payout mode - ${payout_threshold} threshold")
+                logger.info(f"📊 [VALIDATED] Processing accumulation inline (PGP_ACCUMULATOR_v1 removed)")
 
-            # Write to payout_accumulation table using PGP_COMMON method
-            accumulation_id = db_manager.insert_payout_accumulation_pending(
-                client_id=closed_channel_id,
-                user_id=user_id,
-                subscription_id=subscription_id,
-                payment_amount_usd=outcome_amount_usd,
-                payment_currency='usd',
-                payment_timestamp=datetime.now().isoformat(),
-                accumulated_eth=accumulated_eth,
-                client_wallet_address=wallet_address,
-                client_payout_currency=payout_currency,
-                client_payout_network=payout_network,
-                nowpayments_payment_id=nowpayments_payment_id,
-                nowpayments_pay_address=nowpayments_pay_address,
-                nowpayments_outcome_amount=nowpayments_outcome_amount
-            )
+                # Get subscription ID for accumulation record
+                subscription_id = db_manager.get_subscription_id(user_id, closed_channel_id)
 
-            if not accumulation_id:
-                logger.error(f"❌ [VALIDATED] Failed to insert accumulation record", exc_info=True)
-                abort(500, "Failed to store payment accumulation")
+                # ========================================================================
+                # INLINE ACCUMULATION LOGIC (moved from PGP_ACCUMULATOR_v1)
+                # ========================================================================
+                # Calculate adjusted amount (remove TP fee - same as PGP_ACCUMULATOR did)
+                from decimal import Decimal
 
-            logger.info(f"✅ [VALIDATED] Payment accumulated successfully (inline)")
-            logger.info(f"🆔 [VALIDATED] Accumulation ID: {accumulation_id}")
-            logger.info(f"⏳ [VALIDATED] Awaiting micro-batch conversion by PGP_MICROBATCHPROCESSOR_v1")
-            # ========================================================================
+                tp_flat_fee = Decimal('3')  # 3% TelePay fee
+                fee_amount = Decimal(str(outcome_amount_usd)) * (tp_flat_fee / Decimal('100'))
+                adjusted_amount_usd = Decimal(str(outcome_amount_usd)) - fee_amount
 
-        else:  # instant payout
-            logger.info(f"⚡ [VALIDATED] Instant payout mode - processing immediately")
-            logger.info(f"📊 [VALIDATED] Routing to PGP_SPLIT1_v1 for payment split")
+                logger.debug("")
+                logger.info(f"💸 [VALIDATED] Calculating accumulation (inline)")
+                logger.info(f"   💰 Original amount: ${outcome_amount_usd}")
+                logger.info(f"   💸 TP fee ({tp_flat_fee}%): ${fee_amount}")
+                logger.info(f"   ✅ Adjusted amount: ${adjusted_amount_usd}")
 
-            # Get PGP_SPLIT1_v1 configuration
-            pgp_split1_queue = config.get('pgp_split1_queue')
-            pgp_split1_url = config.get('pgp_split1_url')
+                # Store accumulated_eth (the adjusted USD amount pending conversion)
+                accumulated_eth = adjusted_amount_usd
 
-            if not pgp_split1_queue or not pgp_split1_url:
-                logger.error(f"❌ [VALIDATED] PGP_SPLIT1_v1 configuration missing", exc_info=True)
-                abort(500, "PGP_SPLIT1_v1 configuration error")
+                logger.info(f"💾 [VALIDATED] Writing to payout_accumulation table directly")
 
-            # Queue to PGP_SPLIT1_v1 with ACTUAL outcome amount
-            logger.debug("")
-            logger.info(f"🚀 [VALIDATED] Queuing to PGP_SPLIT1_v1...")
-            logger.info(f"   💰 Using ACTUAL outcome: ${outcome_amount_usd} (not ${subscription_price})")
+                # Write to payout_accumulation table using PGP_COMMON method
+                accumulation_id = db_manager.insert_payout_accumulation_pending(
+                    client_id=closed_channel_id,
+                    user_id=user_id,
+                    subscription_id=subscription_id,
+                    payment_amount_usd=outcome_amount_usd,
+                    payment_currency='usd',
+                    payment_timestamp=datetime.now().isoformat(),
+                    accumulated_eth=accumulated_eth,
+                    client_wallet_address=wallet_address,
+                    client_payout_currency=payout_currency,
+                    client_payout_network=payout_network,
+                    nowpayments_payment_id=nowpayments_payment_id,
+                    nowpayments_pay_address=nowpayments_pay_address,
+                    nowpayments_outcome_amount=nowpayments_outcome_amount
+                )
 
-            task_name = cloudtasks_client.enqueue_pgp_split1_payment_split(
-                queue_name=pgp_split1_queue,
-                target_url=pgp_split1_url,
-                user_id=user_id,
-                closed_channel_id=closed_channel_id,
-                wallet_address=wallet_address,
-                payout_currency=payout_currency,
-                payout_network=payout_network,
-                subscription_price=outcome_amount_usd,  # ✅ ACTUAL USD amount
-                actual_eth_amount=float(nowpayments_outcome_amount) if nowpayments_outcome_amount else 0.0,  # ✅ ADD ACTUAL ETH
-                payout_mode='instant'  # ✅ NEW: Pass instant mode to PGP_SPLIT1_v1
-            )
+                if not accumulation_id:
+                    logger.error(f"❌ [VALIDATED] Failed to insert accumulation record", exc_info=True)
+                    abort(500, "Failed to store payment accumulation")
+
+                logger.info(f"✅ [VALIDATED] Payment accumulated successfully (inline)")
+                logger.info(f"🆔 [VALIDATED] Accumulation ID: {accumulation_id}")
+                logger.info(f"⏳ [VALIDATED] Awaiting micro-batch conversion by PGP_MICROBATCHPROCESSOR_v1")
+                # ========================================================================
+
+            else:  # instant payout
+                logger.info(f"⚡ [VALIDATED] Instant payout mode - processing immediately")
+                logger.info(f"📊 [VALIDATED] Routing to PGP_SPLIT1_v1 for payment split")
+
+                # Get PGP_SPLIT1_v1 configuration
+                pgp_split1_queue = config.get('pgp_split1_queue')
+                pgp_split1_url = config.get('pgp_split1_url')
+
+                if not pgp_split1_queue or not pgp_split1_url:
+                    logger.error(f"❌ [VALIDATED] PGP_SPLIT1_v1 configuration missing", exc_info=True)
+                    abort(500, "PGP_SPLIT1_v1 configuration error")
+
+                # Queue to PGP_SPLIT1_v1 with ACTUAL outcome amount
+                logger.debug("")
+                logger.info(f"🚀 [VALIDATED] Queuing to PGP_SPLIT1_v1...")
+                logger.info(f"   💰 Using ACTUAL outcome: ${outcome_amount_usd} (not ${subscription_price})")
+
+                # The enqueue runs before the unit of work commits. If the commit
+                # fails, Cloud Tasks retries this request; the deterministic task
+                # name makes that retry's enqueue a no-op instead of a second split.
+                task_name = cloudtasks_client.enqueue_pgp_split1_payment_split(
+                    queue_name=pgp_split1_queue,
+                    target_url=pgp_split1_url,
+                    user_id=user_id,
+                    closed_channel_id=closed_channel_id,
+                    wallet_address=wallet_address,
+                    payout_currency=payout_currency,
+                    payout_network=payout_network,
+                    subscription_price=outcome_amount_usd,  # ✅ ACTUAL USD amount
+                    actual_eth_amount=float(nowpayments_outcome_amount) if nowpayments_outcome_amount else 0.0,  # ✅ ADD ACTUAL ETH
+                    payout_mode='instant',  # ✅ NEW: Pass instant mode to PGP_SPLIT1_v1
+                    task_id=f"split1-{nowpayments_payment_id}"
+                )
 
-            if task_name:
-                logger.info(f"✅ [VALIDATED] Successfully enqueued to PGP_SPLIT1_v1")
-                logger.info(f"🆔 [VALIDATED] Task: {task_name}")
-            else:
-                logger.error(f"❌ [VALIDATED] Failed to enqueue to PGP_SPLIT1_v1", exc_info=True)
-                abort(500, "Failed to enqueue to PGP_SPLIT1_v1")
+                if task_name:
+                    logger.info(f"✅ [VALIDATED] Successfully enqueued to PGP_SPLIT1_v1")
+                    logger.info(f"🆔 [VALIDATED] Task: {task_name}")
+                else:
+                    logger.error(f"❌ [VALIDATED] Failed to enqueue to PGP_SPLIT1_v1", exc_info=True)
+                    abort(500, "Failed to enqueue to PGP_SPLIT1_v1")
+
+            # ========================================================================
+            # IDEMPOTENCY: Mark payment as processed (same commit as routing writes)
+            # ========================================================================
+            if idempotency_manager:
+                idempotency_manager.mark_service_complete(
+                    payment_id=nowpayments_payment_id,
+                    service_column='pgp_orchestrator_processed'
+                )
 
         # ========================================================================
         # TELEGRAM INVITE
@@ -603,13 +622,6 @@ def process_validated_payment():
             else:
                 logger.warning(f"⚠️ [VALIDATED] Failed to enqueue Telegram invite")
 
-        # ============================================================================
-        # IDEMPOTENCY: Mark payment as processed
-        # ============================================================================
-        # NOTE: Payment already marked as processed atomically at the start (C-04 fix)
-        # The atomic UPSERT prevents race conditions and ensures idempotency
-        # No need for separate UPDATE here - it was done in one atomic operation
-
         logger.debug("")
         logger.info(f"🎉 [VALIDATED] Payment processing completed successfully")
         logger.info(f"=" * 80)
@@ -1,7 +1,12 @@
 #!/usr/bin/env python
 """
 Health and monitoring blueprint.
-Provides health check and status endpoints.
+Provides health check, liveness, readiness and status endpoints.
+
+Liveness (/health/live) only says the process is serving requests.
+Readiness (/health/ready) says the services needed to handle webhooks are
+initialized. Background startup tasks (see startup_tasks.py) report progress
+on /health but never affect readiness.
 """
 import logging
 from flask import Blueprint, jsonify, current_app, request
@@ -11,6 +16,15 @@ logger = logging.getLogger(__name__)
 # Create blueprint
 health_bp = Blueprint('health', __name__)
 
+# Services that must be in app config before webhooks can be handled
+REQUIRED_SERVICES = ('notification_service', 'payment_service', 'database_manager')
+
+
+def get_startup_progress():
+    """Get background startup task progress, or None if no runner is configured."""
+    startup_tasks = current_app.config.get('startup_tasks')
+    return startup_tasks.snapshot() if startup_tasks else None
+
 
 @health_bp.route('/health', methods=['GET'])
 def health_check():
@@ -44,7 +58,8 @@ def health_check():
                 'rate_limiting': 'enabled' if current_app.config.get('rate_limiter') else 'disabled',
                 'https': 'enabled' if request.is_secure else 'disabled',
                 'security_headers': 'enabled'
-            }
+            },
+            'startup': get_startup_progress()
         }), 200
 
     except Exception as e:
@@ -55,6 +70,40 @@ def health_check():
         }), 500
 
 
+@health_bp.route('/health/live', methods=['GET'])
+def liveness():
+    """
+    Liveness probe.
+
+    Returns 200 whenever the process can serve HTTP. No dependency checks,
+    so a slow database or Telegram API never gets the instance restarted.
+    """
+    return jsonify({'status': 'alive', 'service': 'PGP_SERVER_v1'}), 200
+
+
+@health_bp.route('/health/ready', methods=['GET'])
+def readiness():
+    """
+    Readiness probe.
+
+    Returns 200 once the services required for webhooks are initialized,
+    503 otherwise. Startup tasks still running in background do not block
+    readiness; their progress is included for visibility.
+    """
+    missing = [name for name in REQUIRED_SERVICES if not current_app.config.get(name)]
+
+    body = {
+        'status': 'ready' if not missing else 'not_ready',
+        'service': 'PGP_SERVER_v1',
+        'startup': get_startup_progress()
+    }
+    if missing:
+        body['missing'] = missing
+        return jsonify(body), 503
+
+    return jsonify(body), 200
+
+
 @health_bp.route('/status', methods=['GET'])
 def status():
     """
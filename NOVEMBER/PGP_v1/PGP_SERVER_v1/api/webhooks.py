@@ -3,15 +3,18 @@
 Webhooks blueprint for external service integrations.
 Handles incoming webhooks from Cloud Run services.
 """
-import asyncio
 import logging
 import hmac
 import hashlib
 import os
 from flask import Blueprint, request, jsonify, current_app, abort
+from PGP_COMMON.utils import run_async
 
 logger = logging.getLogger(__name__)
 
+# Upper bound for sending one payment notification from a request thread
+NOTIFICATION_TIMEOUT_SECONDS = 30
+
 # Create blueprint
 webhooks_bp = Blueprint('webhooks', __name__, url_prefix='/webhooks')
 
@@ -52,20 +55,17 @@ def handle_notification():
             logger.error("❌ [WEBHOOK] Notification service not initialized")
             return jsonify({'error': 'Notification service not available'}), 503
 
-        # Send notification asynchronously
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        success = loop.run_until_complete(
+        # Send notification on the shared async bridge loop (the notification
+        # service's Bot and its connection pool are reused across requests)
+        success = run_async(
             notification_service.send_payment_notification(
                 open_channel_id=data['open_channel_id'],
                 payment_type=data['payment_type'],
                 payment_data=data['payment_data']
-            )
+            ),
+            timeout=NOTIFICATION_TIMEOUT_SECONDS
         )
 
-        loop.close()
-
         if success:
             logger.info(f"✅ [WEBHOOK] Notification sent successfully")
             return jsonify({
@@ -29,6 +29,7 @@ from bot_manager import BotManager
 # from notification_service import NotificationService  # REPLACED by services.NotificationService (Phase 1)
 
 from telegram import Bot  # For bot initialization
+from startup_tasks import StartupTaskRunner
 
 class AppInitializer:
     def __init__(self):
@@ -65,6 +66,11 @@ class AppInitializer:
         self.security_config = None
         self.payment_service = None  # New modular payment service
         self.flask_app = None  # Flask app with security
+
+        # Startup fan-out jobs: 'staged' runs them in background after the server is up,
+        # 'blocking' runs them inside initialize() (pre-staged behavior)
+        self.startup_mode = (os.getenv('STARTUP_MODE') or 'staged').strip().lower()
+        self.startup_tasks = None
     
     def initialize(self):
         """Initialize all application components."""
@@ -148,7 +154,6 @@ class AppInitializer:
         )
         
         # Initialize subscription manager with configurable check interval
-        import os
         check_interval = int(os.getenv("SUBSCRIPTION_CHECK_INTERVAL", "60"))
         self.subscription_manager = SubscriptionManager(
             bot_token=self.config['bot_token'],
@@ -165,20 +170,62 @@ class AppInitializer:
         )
         self.logger.info("✅ Notification Service initialized (NEW_ARCHITECTURE)")
 
-        # Initialize broadcast data
+        # Open channel broadcast + closed channel donation messages (scale with channel count)
+        self.startup_tasks = self._create_startup_tasks()
+
+        # 🆕 NEW_ARCHITECTURE: Initialize Flask server with security
+        self._initialize_flask_app()
+
+        if self.startup_mode == 'blocking':
+            self.logger.info("⏳ STARTUP_MODE=blocking - running startup tasks before serving")
+            self.start_background_tasks()
+            self.startup_tasks.join()
+
+    def _create_startup_tasks(self) -> StartupTaskRunner:
+        """
+        Register the startup fan-out jobs.
+
+        Both jobs iterate over every registered channel, so they run on a
+        background StartupTaskRunner instead of delaying port binding.
+        Progress is reported on /health.
+
+        Returns:
+            StartupTaskRunner (not started yet)
+        """
+        runner = StartupTaskRunner()
+
         if self.broadcast_manager:
-            self.broadcast_manager.fetch_open_channel_list()
-            self.broadcast_manager.broadcast_hash_links()
+            async def broadcast_open_channels(progress):
+                self.broadcast_manager.fetch_open_channel_list()
+                await self.broadcast_manager.broadcast_hash_links(progress=progress)
+                return {'total_channels': len(self.broadcast_manager.open_channel_list)}
+
+            runner.add_task('open_channel_broadcast', broadcast_open_channels)
 
-        # Send donation messages to closed channels
         if self.closed_channel_manager:
-            import asyncio
-            self.logger.info("📨 Sending donation messages to closed channels...")
-            result = asyncio.run(self.closed_channel_manager.send_donation_message_to_closed_channels())
-            self.logger.info(f"✅ Donation broadcast complete: {result['successful']}/{result['total_channels']} successful")
+            async def send_closed_channel_donations(progress):
+                self.logger.info("📨 Sending donation messages to closed channels...")
+                result = await self.closed_channel_manager.send_donation_message_to_closed_channels(
+                    progress=progress
+                )
+                self.logger.info(f"✅ Donation broadcast complete: {result['successful']}/{result['total_channels']} successful")
+                return {key: result[key] for key in ('total_channels', 'successful', 'failed')}
 
-        # 🆕 NEW_ARCHITECTURE: Initialize Flask server with security
-        self._initialize_flask_app()
+            runner.add_task('closed_channel_donations', send_closed_channel_donations)
+
+        return runner
+
+    def start_background_tasks(self):
+        """
+        Start the startup fan-out jobs in the background.
+
+        Call once the Flask server has been started so the port is bound first.
+        Safe to call more than once.
+        """
+        if not self.startup_tasks:
+            raise RuntimeError("Startup tasks not created. Call initialize() first.")
+
+        self.startup_tasks.start()
 
     def _initialize_security_config(self) -> dict:
         """
@@ -270,6 +317,7 @@ class AppInitializer:
         self.flask_app.config['notification_service'] = self.notification_service
         self.flask_app.config['payment_service'] = self.payment_service
         self.flask_app.config['database_manager'] = self.db_manager
+        self.flask_app.config['startup_tasks'] = self.startup_tasks
 
         self.logger.info("✅ Flask server initialized with security")
         self.logger.info("   HMAC: enabled")
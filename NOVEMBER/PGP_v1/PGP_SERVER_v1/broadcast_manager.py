@@ -3,6 +3,7 @@ import requests
 import base64
 import asyncio
 import logging
+from typing import Callable, Optional
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Bot
 from database import DatabaseManager
 
@@ -123,7 +124,7 @@ class BroadcastManager:
             logger.error(f"❌ Error deleting message {message_id} from {chat_id}: {e}")
             return False
 
-    async def broadcast_hash_links(self):
+    async def broadcast_hash_links(self, progress: Optional[Callable[[int, int], None]] = None):
         """
         Broadcast subscription links to open channels.
 
@@ -133,11 +134,19 @@ class BroadcastManager:
 
         Note: Donation buttons are no longer included in open channel broadcasts.
         Donations are now handled in closed channels. See closed_channel_manager.py.
+
+        Args:
+            progress: Optional callback called as progress(done, total) before each
+                      channel and once at the end (used for startup progress on /health)
         """
         if not self.open_channel_list:
             self.fetch_open_channel_list()
 
-        for chat_id in self.open_channel_list:
+        total = len(self.open_channel_list)
+        for index, chat_id in enumerate(self.open_channel_list):
+            if progress:
+                progress(index, total)
+
             data = self.open_channel_info_map.get(chat_id, {})
 
             # NEW: Get old message ID for deletion
@@ -211,4 +220,7 @@ class BroadcastManager:
                 )
 
             except Exception as e:
-                logging.error(f"❌ Send error to {chat_id}: {e}")
\ No newline at end of file
+                logging.error(f"❌ Send error to {chat_id}: {e}")
+
+        if progress:
+            progress(total, total)
\ No newline at end of file
@@ -8,7 +8,7 @@ separation of concerns from broadcast_manager (which handles open channels).
 """
 
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 from telegram import Bot, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.error import TelegramError, Forbidden, BadRequest
 from database import DatabaseManager
@@ -47,7 +47,8 @@ class ClosedChannelManager:
 
     async def send_donation_message_to_closed_channels(
         self,
-        force_resend: bool = False
+        force_resend: bool = False,
+        progress: Optional[Callable[[int, int], None]] = None
     ) -> Dict[str, Any]:
         """
         Send donation button to all closed channels where bot is admin.
@@ -59,6 +60,8 @@ class ClosedChannelManager:
         Args:
             force_resend: If True, sends even if message was recently sent.
                          Currently not implemented - reserved for future use.
+            progress: Optional callback called as progress(done, total) before each
+                      channel and once at the end (used for startup progress on /health)
 
         Returns:
             Dictionary with summary statistics:
@@ -83,7 +86,10 @@ class ClosedChannelManager:
 
         self.logger.info(f"📨 Starting donation message broadcast to {total_channels} closed channels")
 
-        for channel_info in closed_channels:
+        for index, channel_info in enumerate(closed_channels):
+            if progress:
+                progress(index, total_channels)
+
             closed_channel_id = channel_info["closed_channel_id"]
             open_channel_id = channel_info["open_channel_id"]
             donation_message = channel_info.get("closed_channel_donation_message", "Consider supporting our channel!")
@@ -198,6 +204,9 @@ class ClosedChannelManager:
             # Small delay to avoid rate limiting
             await asyncio.sleep(0.1)
 
+        if progress:
+            progress(total_channels, total_channels)
+
         # Log summary
         self.logger.info(
             f"✅ Donation broadcast complete: {successful}/{total_channels} successful, "
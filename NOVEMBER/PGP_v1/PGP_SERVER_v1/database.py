@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 import psycopg2
 import os
+from datetime import datetime
 from typing import Optional, Tuple, List, Dict, Any
 from telegram import Update
 from telegram.ext import ContextTypes, ConversationHandler
@@ -573,64 +574,121 @@ class DatabaseManager:
             print(f"❌ [DB] Error updating channel config: {e}")
             return False
     
-    def fetch_expired_subscriptions(self) -> List[Tuple[int, int, str, str]]:
+    def fetch_expired_subscriptions(
+        self,
+        now: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[int, int, str, str]]:
         """
         Fetch all expired subscriptions from database.
 
+        Expiry is evaluated in SQL with a row comparison on (expire_date, expire_time),
+        served by the partial index idx_private_channel_users_active_expiry
+        (migration 007), so only expired rows are read.
+
+        Args:
+            now: Reference time (default: datetime.now(), same clock as before)
+            limit: Optional maximum number of rows, oldest expiry first
+
         Returns:
             List of tuples: (user_id, private_channel_id, expire_time, expire_date)
         """
-        from datetime import datetime
         from sqlalchemy import text
 
+        now = now or datetime.now()
         expired_subscriptions = []
 
         try:
             with self.pool.engine.connect() as conn:
-                # Query active subscriptions with expiration data
                 query = """
                     SELECT user_id, private_channel_id, expire_time, expire_date
                     FROM private_channel_users_database
                     WHERE is_active = true
-                    AND expire_time IS NOT NULL
-                    AND expire_date IS NOT NULL
+                    AND (expire_date, expire_time) < (:now_date, :now_time)
+                    ORDER BY expire_date, expire_time
                 """
+                params = {"now_date": now.date(), "now_time": now.time()}
+                if limit:
+                    query += " LIMIT :limit"
+                    params["limit"] = limit
+
+                result = conn.execute(text(query), params)
+                expired_subscriptions = [tuple(row) for row in result.fetchall()]
+
+        except Exception as e:
+            print(f"❌ Database error fetching expired subscriptions: {e}")
 
-                result = conn.execute(text(query))
-                results = result.fetchall()
+        return expired_subscriptions
 
-                current_datetime = datetime.now()
+    def fetch_upcoming_expirations(
+        self,
+        until: Optional[datetime] = None,
+        since: Optional[datetime] = None,
+        after_id: Optional[int] = None
+    ) -> List[Tuple[int, int, int, datetime]]:
+        """
+        Fetch active subscriptions expiring in a time window, for the in-process expiry index.
 
-                for row in results:
-                    user_id, private_channel_id, expire_time_str, expire_date_str = row
+        Args:
+            until: Only rows expiring at or before this time (None = no upper bound)
+            since: Only rows expiring after this time (None = no lower bound)
+            after_id: Only rows with id greater than this (new subscriptions)
 
-                    try:
-                        # Parse expiration time and date
-                        if isinstance(expire_date_str, str):
-                            expire_date_obj = datetime.strptime(expire_date_str, '%Y-%m-%d').date()
-                        else:
-                            expire_date_obj = expire_date_str
+        Returns:
+            List of tuples: (id, user_id, private_channel_id, expire_at)
+        """
+        from sqlalchemy import text
 
-                        if isinstance(expire_time_str, str):
-                            expire_time_obj = datetime.strptime(expire_time_str, '%H:%M:%S').time()
-                        else:
-                            expire_time_obj = expire_time_str
+        conditions = ["is_active = true"]
+        params = {}
 
-                        # Combine date and time
-                        expire_datetime = datetime.combine(expire_date_obj, expire_time_obj)
+        if until is not None:
+            conditions.append("(expire_date, expire_time) <= (:until_date, :until_time)")
+            params.update({"until_date": until.date(), "until_time": until.time()})
+        if since is not None:
+            conditions.append("(expire_date, expire_time) > (:since_date, :since_time)")
+            params.update({"since_date": since.date(), "since_time": since.time()})
+        if after_id is not None:
+            conditions.append("id > :after_id")
+            params["after_id"] = after_id
 
-                        # Check if subscription has expired
-                        if current_datetime > expire_datetime:
-                            expired_subscriptions.append((user_id, private_channel_id, expire_time_str, expire_date_str))
+        query = f"""
+            SELECT id, user_id, private_channel_id, expire_date, expire_time
+            FROM private_channel_users_database
+            WHERE {' AND '.join(conditions)}
+        """
 
-                    except Exception as e:
+        upcoming = []
+        try:
+            with self.pool.engine.connect() as conn:
+                for row_id, user_id, private_channel_id, expire_date, expire_time in conn.execute(text(query), params):
+                    try:
+                        upcoming.append((row_id, user_id, private_channel_id, _combine_expiry(expire_date, expire_time)))
+                    except ValueError as e:
                         print(f"❌ Error parsing expiration data for user {user_id}: {e}")
-                        continue
 
         except Exception as e:
-            print(f"❌ Database error fetching expired subscriptions: {e}")
+            print(f"❌ Database error fetching upcoming expirations: {e}")
 
-        return expired_subscriptions
+        return upcoming
+
+    def get_max_subscription_id(self) -> int:
+        """
+        Get the highest subscription row id (watermark for new subscriptions).
+
+        Returns:
+            Highest id in private_channel_users_database, 0 if empty or on error
+        """
+        from sqlalchemy import text
+
+        try:
+            with self.pool.engine.connect() as conn:
+                result = conn.execute(text("SELECT COALESCE(MAX(id), 0) FROM private_channel_users_database"))
+                return int(result.scalar() or 0)
+
+        except Exception as e:
+            print(f"❌ Database error fetching max subscription id: {e}")
+            return 0
     
     def deactivate_subscription(self, user_id: int, private_channel_id: int) -> bool:
         """
@@ -671,6 +729,42 @@ class DatabaseManager:
             print(f"❌ [ERROR] Database error deactivating subscription for user {user_id}, channel {private_channel_id}: {e}")
             return False
 
+    def deactivate_subscriptions_bulk(self, subscriptions: List[Tuple[int, int]]) -> int:
+        """
+        Mark many subscriptions as inactive with a single UPDATE.
+
+        Args:
+            subscriptions: List of (user_id, private_channel_id) pairs
+
+        Returns:
+            Number of subscriptions deactivated (-1 on database error)
+        """
+        from sqlalchemy import text, bindparam
+
+        if not subscriptions:
+            return 0
+
+        try:
+            with self.pool.engine.connect() as conn:
+                update_query = text("""
+                    UPDATE private_channel_users_database
+                    SET is_active = false
+                    WHERE (user_id, private_channel_id) IN :subscriptions AND is_active = true
+                """).bindparams(bindparam("subscriptions", expanding=True))
+
+                result = conn.execute(update_query, {
+                    "subscriptions": [tuple(pair) for pair in subscriptions]
+                })
+                conn.commit()
+                rows_affected = result.rowcount
+
+                print(f"📝 [DEBUG] Marked {rows_affected}/{len(subscriptions)} subscriptions as inactive")
+                return rows_affected
+
+        except Exception as e:
+            print(f"❌ [ERROR] Database error deactivating {len(subscriptions)} subscriptions: {e}")
+            return -1
+
     def get_notification_settings(self, open_channel_id: str) -> Optional[Tuple[bool, Optional[int]]]:
         """
         Get notification settings for a channel.
@@ -820,6 +914,15 @@ class DatabaseManager:
             return False
 
 
+def _combine_expiry(expire_date, expire_time) -> datetime:
+    """Combine expire_date/expire_time (DATE/TIME or legacy strings) into a datetime."""
+    if isinstance(expire_date, str):
+        expire_date = datetime.strptime(expire_date, '%Y-%m-%d').date()
+    if isinstance(expire_time, str):
+        expire_time = datetime.strptime(expire_time, '%H:%M:%S').time()
+    return datetime.combine(expire_date, expire_time)
+
+
 def _valid_channel_id(text: str) -> bool:
     """Validate that a channel ID is properly formatted."""
     if text.lstrip("-").isdigit():
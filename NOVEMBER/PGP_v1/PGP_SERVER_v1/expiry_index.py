@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+In-process index of upcoming subscription expirations.
+
+A min-heap of expiry times that lets SubscriptionManager sleep exactly until
+the next subscription lapses instead of polling on a fixed interval.
+Entries are only wake-up hints: the database query stays authoritative for
+which subscriptions are expired, so a renewed subscription left in the heap
+only causes one early, empty check.
+"""
+import heapq
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+
+class ExpiryIndex:
+    """
+    Min-heap of (expire_at, user_id, private_channel_id).
+
+    Holds only expirations up to `horizon` (now + lookahead), so memory stays
+    bounded by the subscriptions lapsing in the lookahead window.
+
+    Attributes:
+        horizon: Expirations at or before this time have been loaded
+        last_id: Highest subscription row id seen (watermark for new subscriptions)
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int, int]] = []
+        self.horizon: Optional[datetime] = None
+        self.last_id = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, expire_at: datetime, user_id: int, private_channel_id: int) -> None:
+        """Add an expiration (ignored if it lies beyond the loaded horizon)."""
+        if self.horizon is not None and expire_at > self.horizon:
+            return
+        heapq.heappush(self._heap, (expire_at, user_id, private_channel_id))
+
+    def next_expiry(self) -> Optional[datetime]:
+        """Get the earliest known expiration, or None if the index is empty."""
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> List[Tuple[datetime, int, int]]:
+        """
+        Remove and return all entries that expired at or before now.
+
+        Args:
+            now: Reference time
+
+        Returns:
+            Due entries, earliest first
+        """
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap))
+        return due
+
+    def seconds_until_next(self, now: datetime, max_wait: float) -> float:
+        """
+        Get how long to sleep until the next expiration.
+
+        Args:
+            now: Reference time
+            max_wait: Upper bound (fallback poll interval)
+
+        Returns:
+            Seconds to sleep, between 0 and max_wait
+        """
+        next_expiry = self.next_expiry()
+        if next_expiry is None:
+            return max_wait
+        return min(max_wait, max(0.0, (next_expiry - now).total_seconds()))
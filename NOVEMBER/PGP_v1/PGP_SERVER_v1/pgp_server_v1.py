@@ -71,6 +71,10 @@ def main():
             flask_thread = Thread(target=server.start, daemon=True)
             flask_thread.start()
 
+        # Startup fan-out jobs run in background now that the server is starting
+        # (no-op if STARTUP_MODE=blocking already ran them)
+        app.start_background_tasks()
+
         # Run the Telegram bot and subscription monitoring
         asyncio.run(run_application(app))
         
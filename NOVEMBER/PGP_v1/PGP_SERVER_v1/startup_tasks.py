@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""
+Background startup tasks for PGP_SERVER_v1.
+
+Runs the startup fan-out jobs (open channel broadcast, closed channel donation
+messages) after the Flask server is up, so boot time no longer grows with the
+number of registered channels. Progress is exposed on /health.
+"""
+import time
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Task states
+PENDING = 'pending'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+
+
+class StartupTask:
+    """
+    One background startup job and its progress.
+
+    Attributes:
+        name: Task name shown on /health
+        job: Coroutine function called as job(progress); progress(done, total)
+             may be called any number of times to report progress
+    """
+
+    def __init__(self, name: str, job: Callable[[Callable[[int, int], None]], Awaitable[Any]]):
+        self.name = name
+        self.job = job
+        self.state = PENDING
+        self.done = 0
+        self.total = None
+        self.result = None
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+
+    def report_progress(self, done: int, total: int) -> None:
+        self.done = done
+        self.total = total
+
+    def to_dict(self) -> Dict[str, Any]:
+        duration = None
+        if self.started_at is not None:
+            duration = round((self.finished_at or time.time()) - self.started_at, 3)
+
+        return {
+            'name': self.name,
+            'state': self.state,
+            'done': self.done,
+            'total': self.total,
+            'duration_seconds': duration,
+            'result': self.result,
+            'error': self.error
+        }
+
+
+class StartupTaskRunner:
+    """
+    Runs startup tasks one after another on a daemon thread with its own event loop.
+
+    Tasks run in registration order. A failing task is recorded and the
+    remaining tasks still run. Background tasks never affect readiness.
+    """
+
+    def __init__(self):
+        self._tasks: List[StartupTask] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_task(self, name: str, job: Callable[[Callable[[int, int], None]], Awaitable[Any]]) -> None:
+        """
+        Register a startup task. Must be called before start().
+
+        Args:
+            name: Task name shown on /health
+            job: Coroutine function taking a progress(done, total) callback
+        """
+        if self._thread is not None:
+            raise RuntimeError("Cannot add startup tasks after the runner has started")
+        self._tasks.append(StartupTask(name, job))
+
+    def start(self) -> None:
+        """Start running the registered tasks in the background."""
+        if self._thread is not None:
+            return
+
+        self._thread = threading.Thread(target=self._run, name='startup-tasks', daemon=True)
+        self._thread.start()
+        logger.info(f"🚀 [STARTUP] Running {len(self._tasks)} startup task(s) in background")
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for all tasks to finish.
+
+        Returns:
+            True if all tasks have finished
+        """
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.is_complete()
+
+    def is_complete(self) -> bool:
+        with self._lock:
+            return all(task.state in (COMPLETED, FAILED) for task in self._tasks)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a JSON-serializable view of startup progress for /health.
+
+        Returns:
+            {'complete': bool, 'tasks': [{'name', 'state', 'done', 'total', ...}]}
+        """
+        with self._lock:
+            tasks = [task.to_dict() for task in self._tasks]
+
+        return {
+            'complete': all(task['state'] in (COMPLETED, FAILED) for task in tasks),
+            'tasks': tasks
+        }
+
+    def _run(self) -> None:
+        asyncio.run(self._run_all())
+
+    async def _run_all(self) -> None:
+        for task in self._tasks:
+            await self._run_task(task)
+
+    async def _run_task(self, task: StartupTask) -> None:
+        def progress(done: int, total: int) -> None:
+            with self._lock:
+                task.report_progress(done, total)
+
+        with self._lock:
+            task.state = RUNNING
+            task.started_at = time.time()
+
+        logger.info(f"⏳ [STARTUP] Task '{task.name}' started")
+
+        try:
+            result = await task.job(progress)
+            with self._lock:
+                task.result = result
+                task.state = COMPLETED
+                task.finished_at = time.time()
+            logger.info(f"✅ [STARTUP] Task '{task.name}' completed in {task.finished_at - task.started_at:.1f}s")
+
+        except Exception as e:
+            with self._lock:
+                task.error = str(e)
+                task.state = FAILED
+                task.finished_at = time.time()
+            logger.error(f"❌ [STARTUP] Task '{task.name}' failed: {e}", exc_info=True)
@@ -6,13 +6,29 @@ Runs background task to check for expired subscriptions and remove users from ch
 Architecture:
 - Delegates all database operations to DatabaseManager (single source of truth for SQL)
 - Handles Telegram Bot API calls directly for removing users from channels
-- Runs as background async task checking for expirations at regular intervals
+- Runs as background async task that wakes when the next subscription lapses
+  (in-process ExpiryIndex), with check_interval as the fallback poll interval
 """
+import os
+import time
 import asyncio
 import logging
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional
 from telegram import Bot
-from telegram.error import TelegramError
+from telegram.error import TelegramError, RetryAfter
 from database import DatabaseManager
+from expiry_index import ExpiryIndex
+
+# How far ahead upcoming expirations are loaded into the in-process index
+DEFAULT_EXPIRY_LOOKAHEAD_SECONDS = 3600
+
+# Removal pipeline: concurrent Telegram removals, bulk deactivation per batch
+DEFAULT_REMOVAL_CONCURRENCY = 10
+DEFAULT_REMOVAL_BATCH_SIZE = 500
+TELEGRAM_MAX_RETRIES = 3
 
 class SubscriptionManager:
     """
@@ -24,9 +40,12 @@ class SubscriptionManager:
     - Updates subscription status via DatabaseManager
 
     Architecture Pattern:
-    - Background task: Runs every 60 seconds checking for expirations
+    - Background task: Sleeps until the next known expiration (min-heap), at most
+      check_interval seconds, then runs the indexed expiry query
     - Database delegation: All SQL queries handled by DatabaseManager
-    - Telegram API: Direct bot.ban_chat_member() + unban for user removal
+    - Telegram API: Direct bot.ban_chat_member() + unban for user removal,
+      bounded concurrency, shared pause on RetryAfter
+    - Database calls run on a small thread pool so the bot's event loop never blocks
     """
 
     def __init__(self, bot_token: str, db_manager: DatabaseManager, check_interval: int = 60):
@@ -36,7 +55,7 @@ class SubscriptionManager:
         Args:
             bot_token: Telegram bot token for API calls
             db_manager: Database manager instance (single source of truth for SQL)
-            check_interval: Seconds between expiration checks (default: 60)
+            check_interval: Maximum seconds between expiration checks (default: 60)
         """
         self.bot_token = bot_token
         self.db_manager = db_manager
@@ -44,7 +63,25 @@ class SubscriptionManager:
         self.logger = logging.getLogger(__name__)
         self.is_running = False
         self.check_interval = check_interval
-        
+
+        # Upcoming expirations within the lookahead window (wake-up hints only)
+        self.expiry_index = ExpiryIndex()
+        self.expiry_lookahead_seconds = int(
+            (os.getenv('SUBSCRIPTION_EXPIRY_LOOKAHEAD_SECONDS') or '').strip()
+            or DEFAULT_EXPIRY_LOOKAHEAD_SECONDS
+        )
+        self._last_index_refresh: Optional[datetime] = None
+
+        # Removal pipeline
+        self.removal_concurrency = int(
+            (os.getenv('SUBSCRIPTION_REMOVAL_CONCURRENCY') or '').strip() or DEFAULT_REMOVAL_CONCURRENCY
+        )
+        self.removal_batch_size = int(
+            (os.getenv('SUBSCRIPTION_REMOVAL_BATCH_SIZE') or '').strip() or DEFAULT_REMOVAL_BATCH_SIZE
+        )
+        self._rate_limited_until = 0.0
+        self._db_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='subscription-db')
+
     async def start_monitoring(self):
         """Start the subscription monitoring background task."""
         if self.is_running:
@@ -54,11 +91,12 @@ class SubscriptionManager:
         self.is_running = True
         self.logger.info(
             f"🕐 Starting subscription expiration monitoring "
-            f"({self.check_interval}-second intervals)"
+            f"(next-expiry wake-ups, {self.check_interval}-second fallback interval)"
         )
 
         while self.is_running:
             try:
+                await self._db(self.refresh_expiry_index)
                 stats = await self.check_expired_subscriptions()
 
                 # Log warning if high failure rate
@@ -70,21 +108,86 @@ class SubscriptionManager:
                             f"({stats['failed_count']}/{stats['expired_count']})"
                         )
 
-                await asyncio.sleep(self.check_interval)  # Use configurable interval
+                # Everything due has just been handled (or was renewed) - sleep until the next expiry
+                now = datetime.now()
+                self.expiry_index.pop_due(now)
+                await asyncio.sleep(self.expiry_index.seconds_until_next(now, self.check_interval))
 
             except Exception as e:
                 self.logger.error(f"Error in subscription monitoring loop: {e}")
                 await asyncio.sleep(self.check_interval)  # Continue loop even after errors
     
+    def refresh_expiry_index(self, now: Optional[datetime] = None, force: bool = False) -> None:
+        """
+        Incrementally refresh the in-process expiry index.
+
+        The first call loads every active subscription expiring within the
+        lookahead window (already expired ones are left to the expiry query). Later calls (at most once per check_interval) only load
+        the newly uncovered slice of the window plus subscriptions created since
+        the last refresh, so no call rescans the whole table.
+
+        Args:
+            now: Reference time (default: datetime.now())
+            force: Refresh even if the last refresh was less than check_interval ago
+        """
+        now = now or datetime.now()
+        index = self.expiry_index
+
+        if (
+            not force
+            and self._last_index_refresh is not None
+            and (now - self._last_index_refresh).total_seconds() < self.check_interval
+        ):
+            return
+
+        new_horizon = now + timedelta(seconds=self.expiry_lookahead_seconds)
+
+        try:
+            if index.horizon is None:
+                # Watermark first: rows created during the initial load are picked up next time
+                last_id = self.db_manager.get_max_subscription_id()
+                rows = self.db_manager.fetch_upcoming_expirations(until=new_horizon, since=now)
+            else:
+                new_rows = self.db_manager.fetch_upcoming_expirations(after_id=index.last_id)
+                last_id = max([index.last_id] + [row[0] for row in new_rows])
+                rows = new_rows + self.db_manager.fetch_upcoming_expirations(
+                    until=new_horizon, since=index.horizon
+                )
+
+            index.horizon = new_horizon
+            index.last_id = last_id
+            for _, user_id, private_channel_id, expire_at in rows:
+                index.push(expire_at, user_id, private_channel_id)
+
+            self._last_index_refresh = now
+            self.logger.debug(
+                f"🗂️ Expiry index refreshed: {len(rows)} loaded, {len(index)} upcoming, "
+                f"next at {index.next_expiry()}"
+            )
+
+        except Exception as e:
+            # Index is only an optimization - monitoring falls back to check_interval polling
+            self.logger.error(f"❌ Error refreshing expiry index: {e}")
+
     def stop_monitoring(self):
         """Stop the subscription monitoring task."""
         self.is_running = False
         self.logger.info("⏹️ Stopping subscription expiration monitoring")
     
+    async def _db(self, func, *args, **kwargs):
+        """Run a blocking DatabaseManager call on the DB thread pool (keeps the bot's loop free)."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._db_executor, functools.partial(func, *args, **kwargs))
+
     async def check_expired_subscriptions(self):
         """
         Check for expired subscriptions and process them.
 
+        Removal pipeline:
+        - Expired subscriptions are processed in batches of removal_batch_size
+        - Within a batch, up to removal_concurrency removals run concurrently
+        - Each batch is deactivated with one bulk database call on the DB thread pool
+
         Returns:
             Dict with processing statistics:
             {
@@ -94,8 +197,8 @@ class SubscriptionManager:
             }
         """
         try:
-            # Get all active subscriptions with expiration data (delegate to DatabaseManager)
-            expired_subscriptions = self.db_manager.fetch_expired_subscriptions()
+            # Get expired subscriptions (delegate to DatabaseManager, off the event loop)
+            expired_subscriptions = await self._db(self.db_manager.fetch_expired_subscriptions)
 
             expired_count = len(expired_subscriptions)
 
@@ -107,36 +210,30 @@ class SubscriptionManager:
 
             processed_count = 0
             failed_count = 0
+            semaphore = asyncio.Semaphore(self.removal_concurrency)
 
-            # Process each expired subscription
-            for subscription in expired_subscriptions:
-                user_id, private_channel_id, expire_time, expire_date = subscription
+            for batch_start in range(0, expired_count, self.removal_batch_size):
+                batch = expired_subscriptions[batch_start:batch_start + self.removal_batch_size]
 
-                try:
-                    # Remove user from channel
-                    success = await self.remove_user_from_channel(user_id, private_channel_id)
+                results = await asyncio.gather(
+                    *(self._remove_expired_subscription(semaphore, subscription) for subscription in batch)
+                )
 
-                    # Deactivate in database (delegate to DatabaseManager)
-                    if success:
-                        self.db_manager.deactivate_subscription(user_id, private_channel_id)
-                        processed_count += 1
-                        self.logger.info(
-                            f"✅ Successfully processed: user {user_id}, channel {private_channel_id}"
-                        )
-                    else:
-                        # Still mark as inactive even if removal failed
-                        self.db_manager.deactivate_subscription(user_id, private_channel_id)
-                        failed_count += 1
-                        self.logger.warning(
-                            f"⚠️ Removal failed but marked inactive: user {user_id}"
-                        )
+                # Mark inactive whether or not removal succeeded (errors are retried next check)
+                to_deactivate = [
+                    (subscription[0], subscription[1])
+                    for subscription, result in zip(batch, results)
+                    if result is not None
+                ]
+                if to_deactivate:
+                    deactivated = await self._db(self.db_manager.deactivate_subscriptions_bulk, to_deactivate)
+                    if deactivated < 0:
+                        # Nothing was marked inactive - the whole batch comes back next check
+                        failed_count += len(batch)
+                        continue
 
-                except Exception as e:
-                    failed_count += 1
-                    self.logger.error(
-                        f"❌ Error processing expired subscription: "
-                        f"user {user_id}, channel {private_channel_id}: {e}"
-                    )
+                processed_count += sum(1 for result in results if result is True)
+                failed_count += sum(1 for result in results if result is not True)
 
             # Log summary statistics
             self.logger.info(
@@ -154,44 +251,108 @@ class SubscriptionManager:
             self.logger.error(f"❌ Error checking expired subscriptions: {e}")
             return {"expired_count": 0, "processed_count": 0, "failed_count": 0}
 
-    async def remove_user_from_channel(self, user_id: int, private_channel_id: int) -> bool:
+    async def _remove_expired_subscription(self, semaphore: asyncio.Semaphore, subscription) -> Optional[bool]:
+        """
+        Remove one expired subscriber, bounded by the pipeline semaphore.
+
+        Returns:
+            True if removed, False if removal failed (still deactivated),
+            None if still rate limited or on unexpected error (left active,
+            retried next check)
+        """
+        user_id, private_channel_id, expire_time, expire_date = subscription
+
+        async with semaphore:
+            try:
+                success = await self.remove_user_from_channel(user_id, private_channel_id)
+
+                if success is None:
+                    self.logger.warning(
+                        f"⏱️ Removal deferred (rate limited), left active for next check: user {user_id}"
+                    )
+                    return None
+
+                if success:
+                    self.logger.info(
+                        f"✅ Successfully processed: user {user_id}, channel {private_channel_id}"
+                    )
+                else:
+                    self.logger.warning(
+                        f"⚠️ Removal failed but marked inactive: user {user_id}"
+                    )
+                return bool(success)
+
+            except Exception as e:
+                self.logger.error(
+                    f"❌ Error processing expired subscription: "
+                    f"user {user_id}, channel {private_channel_id}: {e}"
+                )
+                return None
+
+    async def _wait_for_rate_limit(self) -> None:
+        """Wait while the bot is rate limited (shared by all concurrent removals)."""
+        delay = self._rate_limited_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def remove_user_from_channel(self, user_id: int, private_channel_id: int) -> Optional[bool]:
         """
         Remove user from private channel using Telegram Bot API.
-        
+
+        On RetryAfter, all concurrent removals pause for the requested time and
+        this removal is retried (up to TELEGRAM_MAX_RETRIES attempts).
+
         Args:
             user_id: User's Telegram ID
             private_channel_id: Private channel ID to remove user from
-            
+
         Returns:
-            True if successful, False otherwise
+            True if successful, False if removal failed,
+            None if still rate limited after TELEGRAM_MAX_RETRIES attempts (retry later)
         """
-        try:
-            # Use ban_chat_member to remove user from channel
-            await self.bot.ban_chat_member(
-                chat_id=private_channel_id,
-                user_id=user_id
-            )
-            
-            # Immediately unban to allow future rejoining if they pay again
-            await self.bot.unban_chat_member(
-                chat_id=private_channel_id,
-                user_id=user_id,
-                only_if_banned=True
-            )
-            
-            self.logger.info(f"🚫 Successfully removed user {user_id} from channel {private_channel_id}")
-            return True
-            
-        except TelegramError as e:
-            if "Bad Request: user not found" in str(e) or "user is not a member" in str(e):
-                self.logger.info(f"ℹ️ User {user_id} is no longer in channel {private_channel_id} (already left)")
-                return True  # Consider this successful since user is already gone
-            elif "Forbidden" in str(e):
-                self.logger.error(f"❌ Bot lacks permission to remove user {user_id} from channel {private_channel_id}")
-                return False
-            else:
-                self.logger.error(f"❌ Telegram API error removing user {user_id} from channel {private_channel_id}: {e}")
+        for attempt in range(1, TELEGRAM_MAX_RETRIES + 1):
+            await self._wait_for_rate_limit()
+
+            try:
+                # Use ban_chat_member to remove user from channel
+                await self.bot.ban_chat_member(
+                    chat_id=private_channel_id,
+                    user_id=user_id
+                )
+
+                # Immediately unban to allow future rejoining if they pay again
+                await self.bot.unban_chat_member(
+                    chat_id=private_channel_id,
+                    user_id=user_id,
+                    only_if_banned=True
+                )
+
+                self.logger.info(f"🚫 Successfully removed user {user_id} from channel {private_channel_id}")
+                return True
+
+            except RetryAfter as e:
+                retry_after = e.retry_after
+                if isinstance(retry_after, timedelta):  # PTB_TIMEDELTA opt-in
+                    retry_after = retry_after.total_seconds()
+                self._rate_limited_until = max(self._rate_limited_until, time.monotonic() + retry_after)
+                self.logger.warning(
+                    f"⏱️ Rate limited removing user {user_id}, pausing removals for {retry_after}s "
+                    f"(attempt {attempt}/{TELEGRAM_MAX_RETRIES})"
+                )
+
+            except TelegramError as e:
+                if "Bad Request: user not found" in str(e) or "user is not a member" in str(e):
+                    self.logger.info(f"ℹ️ User {user_id} is no longer in channel {private_channel_id} (already left)")
+                    return True  # Consider this successful since user is already gone
+                elif "Forbidden" in str(e):
+                    self.logger.error(f"❌ Bot lacks permission to remove user {user_id} from channel {private_channel_id}")
+                    return False
+                else:
+                    self.logger.error(f"❌ Telegram API error removing user {user_id} from channel {private_channel_id}: {e}")
+                    return False
+            except Exception as e:
+                self.logger.error(f"❌ Unexpected error removing user {user_id} from channel {private_channel_id}: {e}")
                 return False
-        except Exception as e:
-            self.logger.error(f"❌ Unexpected error removing user {user_id} from channel {private_channel_id}: {e}")
-            return False
\ No newline at end of file
+
+        self.logger.error(f"❌ Still rate limited after {TELEGRAM_MAX_RETRIES} attempts removing user {user_id}")
+        return None
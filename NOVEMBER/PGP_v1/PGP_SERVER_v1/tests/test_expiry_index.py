@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Unit tests for the in-process subscription expiry index.
+
+Tests verify heap ordering and wake-up timing, and that SubscriptionManager
+refreshes the index incrementally instead of reloading every subscription.
+"""
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from expiry_index import ExpiryIndex
+from subscription_manager import SubscriptionManager
+
+NOW = datetime(2025, 11, 13, 12, 0, 0)
+
+
+class TestExpiryIndex(unittest.TestCase):
+    """Test suite for ExpiryIndex."""
+
+    def test_pop_due_returns_earliest_first(self):
+        index = ExpiryIndex()
+        index.push(NOW + timedelta(seconds=30), 3, -1003)
+        index.push(NOW - timedelta(seconds=10), 1, -1001)
+        index.push(NOW, 2, -1002)
+
+        due = index.pop_due(NOW)
+
+        self.assertEqual([entry[1] for entry in due], [1, 2])
+        self.assertEqual(index.next_expiry(), NOW + timedelta(seconds=30))
+
+    def test_seconds_until_next(self):
+        index = ExpiryIndex()
+        self.assertEqual(index.seconds_until_next(NOW, 60), 60)
+
+        index.push(NOW + timedelta(seconds=5), 1, -1001)
+        self.assertEqual(index.seconds_until_next(NOW, 60), 5)
+        self.assertEqual(index.seconds_until_next(NOW, 2), 2)
+        self.assertEqual(index.seconds_until_next(NOW + timedelta(seconds=9), 60), 0)
+
+    def test_push_beyond_horizon_is_ignored(self):
+        index = ExpiryIndex()
+        index.horizon = NOW + timedelta(hours=1)
+        index.push(NOW + timedelta(hours=2), 1, -1001)
+        self.assertEqual(len(index), 0)
+
+
+class TestSubscriptionManagerExpiryIndex(unittest.TestCase):
+    """Test suite for SubscriptionManager.refresh_expiry_index."""
+
+    def setUp(self):
+        self.db_manager = Mock()
+        self.db_manager.get_max_subscription_id = Mock(return_value=100)
+        self.db_manager.fetch_upcoming_expirations = Mock(return_value=[
+            (7, 111, -1001, NOW + timedelta(minutes=5))
+        ])
+        self.manager = SubscriptionManager(
+            bot_token="fake_token_for_testing",
+            db_manager=self.db_manager,
+            check_interval=60
+        )
+        self.manager.expiry_lookahead_seconds = 3600
+
+    def test_initial_load_covers_lookahead_window(self):
+        self.manager.refresh_expiry_index(now=NOW)
+
+        self.db_manager.fetch_upcoming_expirations.assert_called_once_with(
+            until=NOW + timedelta(hours=1), since=NOW
+        )
+        self.assertEqual(self.manager.expiry_index.last_id, 100)
+        self.assertEqual(self.manager.expiry_index.next_expiry(), NOW + timedelta(minutes=5))
+
+    def test_refresh_is_incremental(self):
+        self.manager.refresh_expiry_index(now=NOW)
+        self.db_manager.fetch_upcoming_expirations.reset_mock()
+
+        later = NOW + timedelta(minutes=2)
+        self.db_manager.fetch_upcoming_expirations.side_effect = [
+            [(101, 222, -1002, NOW + timedelta(minutes=3))],  # new subscriptions
+            [],                                               # newly uncovered window slice
+        ]
+        self.manager.refresh_expiry_index(now=later)
+
+        calls = self.db_manager.fetch_upcoming_expirations.call_args_list
+        self.assertEqual(calls[0].kwargs, {'after_id': 100})
+        self.assertEqual(calls[1].kwargs, {
+            'until': later + timedelta(hours=1),
+            'since': NOW + timedelta(hours=1)
+        })
+        self.assertEqual(self.manager.expiry_index.last_id, 101)
+        self.assertEqual(self.manager.expiry_index.next_expiry(), NOW + timedelta(minutes=3))
+        self.db_manager.get_max_subscription_id.assert_called_once()
+
+    def test_refresh_throttled_to_check_interval(self):
+        self.manager.refresh_expiry_index(now=NOW)
+        self.manager.refresh_expiry_index(now=NOW + timedelta(seconds=10))
+
+        self.assertEqual(self.db_manager.fetch_upcoming_expirations.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+"""
+Unit tests for background startup tasks and liveness/readiness probes.
+
+Tests verify that startup fan-out jobs run off the boot path, report
+progress, survive failures, and that /health/ready does not wait for them.
+"""
+import os
+import sys
+import asyncio
+import threading
+import unittest
+
+from flask import Flask
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from startup_tasks import StartupTaskRunner, COMPLETED, FAILED
+from api.health import health_bp
+
+
+class TestStartupTaskRunner(unittest.TestCase):
+    """Test suite for StartupTaskRunner."""
+
+    def test_tasks_run_in_order_with_progress(self):
+        order = []
+
+        async def first(progress):
+            for i in range(3):
+                progress(i, 3)
+                await asyncio.sleep(0)
+            progress(3, 3)
+            order.append('first')
+            return {'total_channels': 3}
+
+        async def second(progress):
+            order.append('second')
+
+        runner = StartupTaskRunner()
+        runner.add_task('first', first)
+        runner.add_task('second', second)
+        runner.start()
+
+        self.assertTrue(runner.join(timeout=5))
+        self.assertEqual(order, ['first', 'second'])
+
+        snapshot = runner.snapshot()
+        self.assertTrue(snapshot['complete'])
+        self.assertEqual(snapshot['tasks'][0]['state'], COMPLETED)
+        self.assertEqual((snapshot['tasks'][0]['done'], snapshot['tasks'][0]['total']), (3, 3))
+        self.assertEqual(snapshot['tasks'][0]['result'], {'total_channels': 3})
+
+    def test_failed_task_does_not_stop_remaining_tasks(self):
+        async def broken(progress):
+            raise RuntimeError("database unavailable")
+
+        async def healthy(progress):
+            return 'ok'
+
+        runner = StartupTaskRunner()
+        runner.add_task('broken', broken)
+        runner.add_task('healthy', healthy)
+        runner.start()
+        runner.join(timeout=5)
+
+        tasks = runner.snapshot()['tasks']
+        self.assertEqual(tasks[0]['state'], FAILED)
+        self.assertIn("database unavailable", tasks[0]['error'])
+        self.assertEqual(tasks[1]['state'], COMPLETED)
+
+    def test_add_task_after_start_raises(self):
+        runner = StartupTaskRunner()
+        runner.start()
+        runner.join(timeout=5)
+
+        async def late(progress):
+            pass
+
+        with self.assertRaises(RuntimeError):
+            runner.add_task('late', late)
+
+
+class TestHealthProbes(unittest.TestCase):
+    """Test suite for /health, /health/live and /health/ready."""
+
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.register_blueprint(health_bp)
+        self.client = self.app.test_client()
+
+        self.release = threading.Event()
+
+        async def slow_broadcast(progress):
+            progress(1, 10)
+            while not self.release.is_set():
+                await asyncio.sleep(0.01)
+
+        self.runner = StartupTaskRunner()
+        self.runner.add_task('open_channel_broadcast', slow_broadcast)
+        self.app.config['startup_tasks'] = self.runner
+
+    def tearDown(self):
+        self.release.set()
+        self.runner.join(timeout=5)
+
+    def test_liveness_has_no_dependencies(self):
+        response = self.client.get('/health/live')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['status'], 'alive')
+
+    def test_readiness_requires_services(self):
+        response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('database_manager', response.get_json()['missing'])
+
+    def test_ready_while_startup_tasks_running(self):
+        for name in ('notification_service', 'payment_service', 'database_manager'):
+            self.app.config[name] = object()
+
+        self.runner.start()
+        while self.runner.snapshot()['tasks'][0]['done'] != 1:
+            threading.Event().wait(0.01)
+
+        response = self.client.get('/health/ready')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.get_json()['startup']['complete'])
+
+        health = self.client.get('/health').get_json()
+        task = health['startup']['tasks'][0]
+        self.assertEqual(task['name'], 'open_channel_broadcast')
+        self.assertEqual((task['done'], task['total']), (1, 10))
+
+
+if __name__ == '__main__':
+    unittest.main()
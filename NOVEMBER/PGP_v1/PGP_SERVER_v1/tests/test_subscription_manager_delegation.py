@@ -20,6 +20,7 @@ class TestSubscriptionManagerDelegation(unittest.TestCase):
         self.mock_db_manager = Mock()
         self.mock_db_manager.fetch_expired_subscriptions = Mock(return_value=[])
         self.mock_db_manager.deactivate_subscription = Mock(return_value=True)
+        self.mock_db_manager.deactivate_subscriptions_bulk = Mock(side_effect=lambda pairs: len(pairs))
 
         # Import SubscriptionManager here to avoid import errors
         import sys
@@ -80,10 +81,9 @@ class TestSubscriptionManagerDelegation(unittest.TestCase):
 
         asyncio.run(run_test())
 
-        # Assert deactivate_subscription was called with correct parameters
-        self.mock_db_manager.deactivate_subscription.assert_called_once_with(
-            123456,
-            -1001234567890
+        # Assert the batch was deactivated with one bulk call
+        self.mock_db_manager.deactivate_subscriptions_bulk.assert_called_once_with(
+            [(123456, -1001234567890)]
         )
 
     def test_deactivate_called_even_on_removal_failure(self):
@@ -100,10 +100,9 @@ class TestSubscriptionManagerDelegation(unittest.TestCase):
 
         asyncio.run(run_test())
 
-        # Assert deactivate_subscription was still called (mark inactive even on failure)
-        self.mock_db_manager.deactivate_subscription.assert_called_once_with(
-            123456,
-            -1001234567890
+        # Assert subscription was still deactivated (mark inactive even on failure)
+        self.mock_db_manager.deactivate_subscriptions_bulk.assert_called_once_with(
+            [(123456, -1001234567890)]
         )
 
     def test_no_sql_in_subscription_manager(self):
@@ -210,6 +209,116 @@ class TestSubscriptionManagerDelegation(unittest.TestCase):
         self.assertEqual(stats['failed_count'], 1)
 
 
+class TestRemovalPipeline(unittest.TestCase):
+    """Test suite for the concurrent, batched removal pipeline."""
+
+    def setUp(self):
+        import sys
+        import os
+        sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        from subscription_manager import SubscriptionManager
+
+        self.mock_db_manager = Mock()
+        self.mock_db_manager.deactivate_subscriptions_bulk = Mock(side_effect=lambda pairs: len(pairs))
+        self.manager = SubscriptionManager(
+            bot_token="fake_token_for_testing",
+            db_manager=self.mock_db_manager,
+            check_interval=60
+        )
+
+    def test_bounded_concurrency_and_bulk_batches(self):
+        """Removals run concurrently up to the limit; each batch is one bulk deactivation."""
+        self.mock_db_manager.fetch_expired_subscriptions = Mock(return_value=[
+            (user_id, -1001111111111, '12:00:00', '2025-11-13') for user_id in range(5)
+        ])
+        self.manager.removal_concurrency = 2
+        self.manager.removal_batch_size = 3
+        active = [0]
+        peak = [0]
+
+        async def mock_remove(user_id, channel_id):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0.01)
+            active[0] -= 1
+            return True
+
+        async def run_test():
+            with patch.object(self.manager, 'remove_user_from_channel', side_effect=mock_remove):
+                return await self.manager.check_expired_subscriptions()
+
+        stats = asyncio.run(run_test())
+
+        self.assertEqual(stats['processed_count'], 5)
+        self.assertEqual(peak[0], 2)
+        batches = [call.args[0] for call in self.mock_db_manager.deactivate_subscriptions_bulk.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [3, 2])
+
+    def test_unexpected_error_leaves_subscription_active(self):
+        """A subscription whose processing raised is not deactivated (retried next check)."""
+        self.mock_db_manager.fetch_expired_subscriptions = Mock(return_value=[
+            (111111, -1001111111111, '12:00:00', '2025-11-13'),
+            (222222, -1001222222222, '13:00:00', '2025-11-13')
+        ])
+
+        async def mock_remove(user_id, channel_id):
+            if user_id == 222222:
+                raise RuntimeError("boom")
+            return True
+
+        async def run_test():
+            with patch.object(self.manager, 'remove_user_from_channel', side_effect=mock_remove):
+                return await self.manager.check_expired_subscriptions()
+
+        stats = asyncio.run(run_test())
+
+        self.assertEqual(stats['failed_count'], 1)
+        self.mock_db_manager.deactivate_subscriptions_bulk.assert_called_once_with(
+            [(111111, -1001111111111)]
+        )
+
+    def test_retry_after_pauses_and_retries(self):
+        """RetryAfter pauses removals for the requested time, then retries."""
+        from telegram.error import RetryAfter
+
+        self.manager.bot = Mock()
+        self.manager.bot.ban_chat_member = AsyncMock(side_effect=[RetryAfter(0), None])
+        self.manager.bot.unban_chat_member = AsyncMock(return_value=True)
+
+        result = asyncio.run(self.manager.remove_user_from_channel(111111, -1001111111111))
+
+        self.assertTrue(result)
+        self.assertEqual(self.manager.bot.ban_chat_member.call_count, 2)
+        self.manager.bot.unban_chat_member.assert_called_once()
+
+    def test_rate_limit_exhaustion_leaves_subscription_active(self):
+        """Still rate limited after all attempts: not deactivated, retried next check."""
+        from telegram.error import RetryAfter
+
+        self.manager.bot = Mock()
+        self.manager.bot.unban_chat_member = AsyncMock(return_value=True)
+
+        self.mock_db_manager.fetch_expired_subscriptions.return_value = [
+            (111111, -1001111111111, '12:00:00', '2025-11-01'),
+            (222222, -1002222222222, '12:00:00', '2025-11-01')
+        ]
+        self.mock_db_manager.deactivate_subscriptions_bulk.return_value = 1
+
+        async def ban(chat_id, user_id):
+            if user_id == 111111:
+                raise RetryAfter(0)
+
+        self.manager.bot.ban_chat_member = AsyncMock(side_effect=ban)
+
+        stats = asyncio.run(self.manager.check_expired_subscriptions())
+
+        self.assertEqual(stats['processed_count'], 1)
+        self.assertEqual(stats['failed_count'], 1)
+        self.mock_db_manager.deactivate_subscriptions_bulk.assert_called_once_with(
+            [(222222, -1002222222222)]
+        )
+
+
 if __name__ == '__main__':
     print("🧪 Running SubscriptionManager Database Delegation Tests\n")
     print("=" * 70)
@@ -15,7 +15,7 @@ from flask import Flask, request, abort, jsonify
 from config_manager import ConfigManager
 from token_manager import TokenManager
 from cloudtasks_client import CloudTasksClient
-from PGP_COMMON.utils import ChangeNowClient
+from PGP_COMMON.utils import ChangeNowClient, ChangeNowRetryLater
 
 from PGP_COMMON.logging import setup_logger
 logger = setup_logger(__name__)
@@ -70,7 +70,8 @@ def process_usdt_eth_estimate():
 
     Flow:
     1. Decrypt token from PGP_SPLIT1_v1
-    2. Call ChangeNow API v2 for USDT→ETH estimate (with infinite retry)
+    2. Call ChangeNow API v2 for USDT→ETH estimate (a few in-process attempts;
+       still failing: 503 so Cloud Tasks redelivers the request)
     3. Encrypt response token
     4. Enqueue Cloud Task back to PGP_SPLIT1_v1
 
@@ -123,28 +124,37 @@ def process_usdt_eth_estimate():
         logger.info(f"💎 [ENDPOINT] ACTUAL ETH (from NowPayments): {actual_eth_amount}")
         logger.info(f"🎯 [ENDPOINT] Target: {payout_currency.upper()} on {payout_network.upper()}")
 
-        # Call ChangeNow API with infinite retry
+        # Call ChangeNow API (bounded in-process retry, then hand back to Cloud Tasks)
         if not changenow_client:
             logger.error(f"❌ [ENDPOINT] ChangeNow client not available")
             abort(500, "ChangeNow client unavailable")
 
         logger.info(f"🌐 [ENDPOINT] Calling ChangeNow API for {swap_currency.upper()}→{payout_currency.upper()} estimate (with retry)")
 
-        estimate_response = changenow_client.get_estimated_amount_v2_with_retry(
-            from_currency=swap_currency,  # ✅ UPDATED: Dynamic (eth or usdt)
-            to_currency=payout_currency,
-            from_network="eth",  # Both ETH and USDT use ETH network
-            to_network=payout_network,
-            from_amount=str(adjusted_amount),  # ✅ UPDATED: Generic variable name
-            flow="standard",
-            type_="direct"
-        )
+        try:
+            estimate_response = changenow_client.get_estimated_amount_v2_with_retry(
+                from_currency=swap_currency,  # ✅ UPDATED: Dynamic (eth or usdt)
+                to_currency=payout_currency,
+                from_network="eth",  # Both ETH and USDT use ETH network
+                to_network=payout_network,
+                from_amount=str(adjusted_amount),  # ✅ UPDATED: Generic variable name
+                flow="standard",
+                type_="direct"
+            )
+        except ChangeNowRetryLater as retry:
+            # Hand the retry back to Cloud Tasks instead of blocking this request
+            logger.warning(f"⏳ [ENDPOINT] ChangeNow unavailable after {retry.attempts} attempts ({retry.reason}) - "
+                           f"returning 503, Cloud Tasks will redeliver")
+            response = jsonify({
+                "status": "retry_later",
+                "message": "ChangeNow unavailable, retry scheduled by Cloud Tasks",
+                "retry_after_seconds": retry.delay_seconds
+            })
+            response.headers['Retry-After'] = str(retry.delay_seconds)
+            return response, 503
 
-        # Note: estimate_response will always return (or timeout after 24h)
-        # due to infinite retry in ChangeNowClient
         if not estimate_response:
-            # This should never happen due to infinite retry, but handle it anyway
-            logger.error(f"❌ [ENDPOINT] ChangeNow API returned None (should not happen)")
+            logger.error(f"❌ [ENDPOINT] ChangeNow API returned no estimate")
             abort(500, "ChangeNow API failure")
 
         # Extract estimate data
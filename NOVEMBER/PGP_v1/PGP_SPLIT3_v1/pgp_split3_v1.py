@@ -3,7 +3,8 @@
 PGP_SPLIT3_v1: ETH→ClientCurrency Swapper Service
 Receives encrypted tokens from PGP_SPLIT1_v1, creates ChangeNow fixed-rate transactions (ETH→ClientCurrency),
 and returns encrypted responses back to PGP_SPLIT1_v1 via Cloud Tasks.
-Implements infinite retry logic for resilience against API failures.
+ChangeNow failures are retried a few times in-process, then handed back to
+Cloud Tasks (503 response, the queue redelivers the request).
 """
 import time
 from typing import Dict, Any
@@ -13,7 +14,7 @@ from flask import Flask, request, abort, jsonify
 from config_manager import ConfigManager
 from token_manager import TokenManager
 from cloudtasks_client import CloudTasksClient
-from PGP_COMMON.utils import ChangeNowClient
+from PGP_COMMON.utils import ChangeNowClient, ChangeNowRetryLater
 
 from PGP_COMMON.logging import setup_logger
 logger = setup_logger(__name__)
@@ -68,7 +69,8 @@ def process_eth_client_swap():
 
     Flow:
     1. Decrypt token from PGP_SPLIT1_v1
-    2. Create ChangeNow fixed-rate transaction (ETH→ClientCurrency) with infinite retry
+    2. Create ChangeNow fixed-rate transaction (ETH→ClientCurrency); still failing
+       after a few in-process attempts: 503 so Cloud Tasks redelivers the request
     3. Encrypt response token with full transaction data
     4. Enqueue Cloud Task back to PGP_SPLIT1_v1
 
@@ -123,27 +125,37 @@ def process_eth_client_swap():
         logger.info(f"💎 [ENDPOINT] ACTUAL ETH (from NowPayments): {actual_eth_amount}")
         logger.info(f"🎯 [ENDPOINT] Target: {payout_currency.upper()} on {payout_network.upper()}")
 
-        # Create ChangeNow fixed-rate transaction with infinite retry
+        # Create ChangeNow fixed-rate transaction (bounded in-process retry, then hand back to Cloud Tasks)
         if not changenow_client:
             logger.error(f"❌ [ENDPOINT] ChangeNow client not available")
             abort(500, "ChangeNow client unavailable")
 
         logger.info(f"🌐 [ENDPOINT] Creating ChangeNow transaction {swap_currency.upper()}→{payout_currency.upper()} (with retry)")
 
-        transaction = changenow_client.create_fixed_rate_transaction_with_retry(
-            from_currency=swap_currency,  # ✅ UPDATED: Dynamic (eth or usdt)
-            to_currency=payout_currency,
-            from_amount=swap_amount,  # ✅ UPDATED: Generic variable name
-            address=wallet_address,
-            from_network="eth",  # Both ETH and USDT use ETH network
-            to_network=payout_network,
-            user_id=str(user_id)
-        )
+        try:
+            transaction = changenow_client.create_fixed_rate_transaction_with_retry(
+                from_currency=swap_currency,  # ✅ UPDATED: Dynamic (eth or usdt)
+                to_currency=payout_currency,
+                from_amount=swap_amount,  # ✅ UPDATED: Generic variable name
+                address=wallet_address,
+                from_network="eth",  # Both ETH and USDT use ETH network
+                to_network=payout_network,
+                user_id=str(user_id)
+            )
+        except ChangeNowRetryLater as retry:
+            # Hand the retry back to Cloud Tasks instead of blocking this request
+            logger.warning(f"⏳ [ENDPOINT] ChangeNow unavailable after {retry.attempts} attempts ({retry.reason}) - "
+                           f"returning 503, Cloud Tasks will redeliver")
+            response = jsonify({
+                "status": "retry_later",
+                "message": "ChangeNow unavailable, retry scheduled by Cloud Tasks",
+                "retry_after_seconds": retry.delay_seconds
+            })
+            response.headers['Retry-After'] = str(retry.delay_seconds)
+            return response, 503
 
-        # Note: transaction will always return (or timeout after 24h) due to infinite retry
         if not transaction:
-            # This should never happen due to infinite retry, but handle it anyway
-            logger.error(f"❌ [ENDPOINT] ChangeNow API returned None (should not happen)")
+            logger.error(f"❌ [ENDPOINT] ChangeNow API returned no transaction")
             abort(500, "ChangeNow API failure")
 
         # Extract transaction data
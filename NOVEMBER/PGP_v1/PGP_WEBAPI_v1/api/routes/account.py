@@ -13,6 +13,7 @@ from api.models.auth import (
     PasswordChangeRequest, PasswordChangeResponse
 )
 from api.services.auth_service import AuthService
+from api.services.password_hasher import PasswordHasherBusy
 from api.services.token_service import TokenService
 from api.services.email_service import EmailService
 from api.utils.audit_logger import AuditLogger
@@ -169,6 +170,9 @@ def change_email():
             'details': e.errors()
         }), 400
 
+    except PasswordHasherBusy:
+        raise  # 503 + Retry-After (app error handler)
+
     except Exception as e:
         print(f"❌ Email change error: {e}")
         return jsonify({
@@ -503,6 +507,9 @@ def change_password():
             'details': e.errors()
         }), 400
 
+    except PasswordHasherBusy:
+        raise  # 503 + Retry-After (app error handler)
+
     except Exception as e:
         print(f"❌ Password change error: {e}")
         return jsonify({
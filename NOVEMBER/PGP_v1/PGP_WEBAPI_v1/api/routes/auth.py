@@ -14,6 +14,7 @@ from api.models.auth import (
     GenericMessageResponse, ForgotPasswordRequest, ResetPasswordRequest
 )
 from api.services.auth_service import AuthService
+from api.services.password_hasher import PasswordHasherBusy
 from api.services.email_service import EmailService
 from api.utils.audit_logger import AuditLogger
 from database.connection import db_manager
@@ -152,6 +153,9 @@ def signup():
             'error': error_msg
         }), 400
 
+    except PasswordHasherBusy:
+        raise  # 503 + Retry-After (app error handler)
+
     except Exception as e:
         print(f"❌ Signup internal error: {e}")
         return jsonify({
@@ -231,6 +235,9 @@ def login():
             'error': error_msg
         }), 401
 
+    except PasswordHasherBusy:
+        raise  # 503 + Retry-After (app error handler)
+
     except Exception as e:
         print(f"❌ Login internal error: {e}")
         return jsonify({
@@ -569,6 +576,9 @@ def reset_password():
             'error': error_msg
         }), 400
 
+    except PasswordHasherBusy:
+        raise  # 503 + Retry-After (app error handler)
+
     except Exception as e:
         print(f"❌ Reset password internal error: {e}")
         return jsonify({
@@ -11,6 +11,7 @@ from api.models.channel import ChannelRegistrationRequest, ChannelUpdateRequest
 from api.services.channel_service import ChannelService
 from api.services.broadcast_service import BroadcastService
 from database.connection import db_manager
+from database.cache import read_cache, USER_CHANNELS_CACHE_TTL
 
 channels_bp = Blueprint('channels', __name__)
 
@@ -113,9 +114,16 @@ def get_channels():
     try:
         user_id = get_jwt_identity()
 
-        # Get channels
-        with db_manager.get_db() as conn:
-            channels = ChannelService.get_user_channels(conn, user_id)
+        # Get channels (read-through cache, invalidated on register/update/delete)
+        def load_channels():
+            with db_manager.get_db() as conn:
+                return ChannelService.get_user_channels(conn, user_id)
+
+        channels = read_cache.get_or_load(
+            ('user_channels', user_id),
+            load_channels,
+            ttl=USER_CHANNELS_CACHE_TTL
+        )
 
         return jsonify({
             'channels': channels,
@@ -3,12 +3,12 @@
 🔐 Authentication Service for PGP_WEBAPI_v1
 Handles user registration, login, and password management
 """
-import bcrypt
 from datetime import datetime, timedelta
 from flask import current_app
 from flask_jwt_extended import create_access_token, create_refresh_token
 from typing import Optional, Dict, Any
 from api.services.token_service import TokenService
+from api.services.password_hasher import password_hasher, PasswordHasherBusy
 from itsdangerous import SignatureExpired, BadSignature
 
 
@@ -18,17 +18,18 @@ class AuthService:
     @staticmethod
     def hash_password(password: str) -> str:
         """
-        Hash a password using bcrypt
+        Hash a password using bcrypt (on the bounded hashing pool, BCRYPT_ROUNDS cost)
 
         Args:
             password: Plain text password
 
         Returns:
             Hashed password string
+
+        Raises:
+            PasswordHasherBusy: If the hashing pool is saturated
         """
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-        return hashed.decode('utf-8')
+        return password_hasher.hash(password)
 
     @staticmethod
     def verify_password(password: str, password_hash: str) -> bool:
@@ -41,8 +42,11 @@ class AuthService:
 
         Returns:
             True if password matches, False otherwise
+
+        Raises:
+            PasswordHasherBusy: If the hashing pool is saturated
         """
-        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+        return password_hasher.verify(password, password_hash)
 
     @staticmethod
     def create_user(conn, username: str, email: str, password: str) -> dict:
@@ -176,13 +180,30 @@ class AuthService:
             # REMOVED: Email verification check (allow unverified logins)
             # Old code: if not email_verified: raise ValueError(...)
 
-            # Update last_login
+            # Upgrade the hash if BCRYPT_ROUNDS changed since it was created
+            new_password_hash = None
+            if password_hasher.needs_rehash(password_hash):
+                try:
+                    new_password_hash = AuthService.hash_password(password)
+                except PasswordHasherBusy:
+                    pass  # Retried on a later login
+
+            # Update last_login (and rehashed password)
             cursor = conn.cursor()
-            cursor.execute("""
-                UPDATE registered_users
-                SET last_login = NOW()
-                WHERE user_id = %s
-            """, (user_id,))
+            if new_password_hash:
+                cursor.execute("""
+                    UPDATE registered_users
+                    SET last_login = NOW(),
+                        password_hash = %s
+                    WHERE user_id = %s
+                """, (new_password_hash, user_id))
+                print(f"🔄 Rehashed password for user {user_id} (cost {password_hasher.rounds})")
+            else:
+                cursor.execute("""
+                    UPDATE registered_users
+                    SET last_login = NOW()
+                    WHERE user_id = %s
+                """, (user_id,))
             cursor.close()
 
             return {
@@ -5,11 +5,26 @@ Handles channel CRUD operations
 """
 from typing import List, Optional, Dict
 from decimal import Decimal
+from database.connection import db_manager
+from database.cache import read_cache
 
 
 class ChannelService:
     """Handles channel management operations"""
 
+    @staticmethod
+    def invalidate_user_channels(user_id: Optional[str] = None):
+        """
+        Drop cached get_user_channels() results once the current transaction commits
+
+        Args:
+            user_id: Owner whose list changed (None = every user's cached list)
+        """
+        if user_id is None:
+            db_manager.after_commit(lambda: read_cache.invalidate_namespace('user_channels'))
+        else:
+            db_manager.after_commit(lambda: read_cache.invalidate(('user_channels', user_id)))
+
     @staticmethod
     def count_user_channels(conn, user_id: str) -> int:
         """
@@ -116,6 +131,7 @@ class ChannelService:
             ))
 
             cursor.close()
+            ChannelService.invalidate_user_channels(user_id)
             print(f"✅ Channel {channel_data.open_channel_id} registered with notification settings")
             return True
 
@@ -325,6 +341,7 @@ class ChannelService:
         """
         cursor.execute(query, values)
         cursor.close()
+        ChannelService.invalidate_user_channels()
 
         print(f"✅ Channel {channel_id} updated successfully")
         return True
@@ -347,6 +364,7 @@ class ChannelService:
             WHERE open_channel_id = %s
         """, (channel_id,))
         cursor.close()
+        ChannelService.invalidate_user_channels()
 
         print(f"✅ Channel {channel_id} deleted successfully")
         return True
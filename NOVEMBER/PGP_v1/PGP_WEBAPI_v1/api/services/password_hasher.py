@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+"""
+🔑 Password Hasher for PGP_WEBAPI_v1
+Runs bcrypt on a small bounded worker pool instead of the request thread
+
+bcrypt releases the GIL while hashing, so a thread pool sized to the CPU
+count uses every core while capping how many hashes run at once. When the
+pool and its queue are full, callers get PasswordHasherBusy immediately
+(surfaced as 503 + Retry-After) instead of tying up more request threads,
+so a login burst can't starve the rest of the API.
+"""
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import bcrypt
+
+# bcrypt work factor for new hashes (bcrypt.gensalt() default is 12)
+BCRYPT_ROUNDS = int((os.getenv('BCRYPT_ROUNDS') or '').strip() or 12)
+
+# Concurrent hashes (defaults to the CPU count)
+PASSWORD_HASH_WORKERS = int((os.getenv('PASSWORD_HASH_WORKERS') or '').strip() or (os.cpu_count() or 2))
+
+# Requests allowed to wait for a worker before new ones are rejected
+PASSWORD_HASH_MAX_QUEUE = int((os.getenv('PASSWORD_HASH_MAX_QUEUE') or '').strip() or PASSWORD_HASH_WORKERS * 4)
+
+# Retry-After (seconds) sent with 503 responses when the pool is saturated
+PASSWORD_HASH_RETRY_AFTER = int((os.getenv('PASSWORD_HASH_RETRY_AFTER_SECONDS') or '').strip() or 2)
+
+_HASH_ROUNDS_PATTERN = re.compile(r'^\$2[abxy]?\$(\d{2})\$')
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool is saturated"""
+
+    def __init__(self, retry_after: int = PASSWORD_HASH_RETRY_AFTER):
+        super().__init__('Password hashing capacity exhausted')
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """Bounded bcrypt worker pool with configurable work factor"""
+
+    def __init__(
+        self,
+        rounds: int = BCRYPT_ROUNDS,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_queue: int = PASSWORD_HASH_MAX_QUEUE,
+        retry_after: int = PASSWORD_HASH_RETRY_AFTER
+    ):
+        """
+        Initialize the hasher (worker threads start on first use)
+
+        Args:
+            rounds: bcrypt cost for new hashes (4-31)
+            workers: Hashes run concurrently
+            max_queue: Hashes allowed to wait for a worker
+            retry_after: Seconds clients are told to wait when saturated
+        """
+        if not 4 <= rounds <= 31:
+            raise ValueError(f'bcrypt rounds must be between 4 and 31, got {rounds}')
+
+        self.rounds = rounds
+        self.workers = max(1, workers)
+        self.retry_after = retry_after
+        self._slots = threading.BoundedSemaphore(self.workers + max(0, max_queue))
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+
+    def _run(self, fn, *args):
+        """Run fn on the pool, rejecting immediately when every slot is taken"""
+        if not self._slots.acquire(blocking=False):
+            print(f"⚠️ [AUTH] Password hashing pool saturated - rejecting (retry after {self.retry_after}s)")
+            raise PasswordHasherBusy(self.retry_after)
+
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            self._slots.release()
+
+    def hash(self, password: str) -> str:
+        """
+        Hash a password with the configured work factor
+
+        Raises:
+            PasswordHasherBusy: If the pool is saturated
+        """
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        hashed = self._run(bcrypt.hashpw, password.encode('utf-8'), salt)
+        return hashed.decode('utf-8')
+
+    def verify(self, password: str, password_hash: str) -> bool:
+        """
+        Verify a password against a bcrypt hash
+
+        Raises:
+            PasswordHasherBusy: If the pool is saturated
+        """
+        return self._run(bcrypt.checkpw, password.encode('utf-8'), password_hash.encode('utf-8'))
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """True if password_hash was made with a different work factor than configured"""
+        return get_hash_rounds(password_hash) != self.rounds
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+def get_hash_rounds(password_hash: str) -> Optional[int]:
+    """
+    Read the work factor from a bcrypt hash
+
+    Returns:
+        Cost (e.g. 12 for '$2b$12$...') or None if it isn't a bcrypt hash
+    """
+    match = _HASH_ROUNDS_PATTERN.match(password_hash or '')
+    return int(match.group(1)) if match else None
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+📦 Precompressed JSON Responses for PGP_WEBAPI_v1
+Serializes a payload once and keeps identity/gzip/brotli bodies with strong
+ETags, so hot read-only endpoints are served from memory with 304 support.
+"""
+import gzip
+import json
+import hashlib
+from typing import Any, Dict, Optional, Tuple
+from flask import Request, Response
+
+# Brotli is optional (gzip is always available)
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+class PrecompressedJSON:
+    """One serialized JSON payload with precompressed variants and strong ETags"""
+
+    def __init__(self, data: Any):
+        """
+        Serialize and compress the payload
+
+        Args:
+            data: JSON-serializable data (keys are sorted so equal data gives an equal ETag)
+        """
+        body = json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        self.version = hashlib.sha256(body).hexdigest()[:32]
+
+        # Content-Encoding -> (body, ETag); each representation gets its own strong ETag
+        self.variants: Dict[str, Tuple[bytes, str]] = {
+            'identity': (body, f'"{self.version}"'),
+            'gzip': (gzip.compress(body, compresslevel=9, mtime=0), f'"{self.version}-gzip"'),
+        }
+        if BROTLI_AVAILABLE:
+            self.variants['br'] = (brotli.compress(body, quality=11), f'"{self.version}-br"')
+
+    @property
+    def etags(self) -> set:
+        return {etag for _, etag in self.variants.values()}
+
+    def choose_encoding(self, accept_encoding: Optional[str]) -> str:
+        """
+        Pick the smallest variant the client accepts
+
+        Args:
+            accept_encoding: Accept-Encoding request header
+
+        Returns:
+            'br', 'gzip' or 'identity'
+        """
+        accepted = set()
+        for part in (accept_encoding or '').split(','):
+            coding, _, params = part.strip().partition(';')
+            if params.replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+                continue
+            accepted.add(coding.strip().lower())
+
+        for encoding in ('br', 'gzip'):
+            if encoding in self.variants and (encoding in accepted or '*' in accepted):
+                return encoding
+        return 'identity'
+
+    def make_response(self, request: Request, max_age: int) -> Response:
+        """
+        Build a 200 (or 304 when If-None-Match matches) response for the request
+
+        Args:
+            request: Current Flask request
+            max_age: Cache-Control max-age in seconds
+
+        Returns:
+            Flask Response
+        """
+        encoding = self.choose_encoding(request.headers.get('Accept-Encoding'))
+        body, etag = self.variants[encoding]
+
+        if_none_match = request.headers.get('If-None-Match', '')
+        # Any of our tags matches: the representations only differ in encoding
+        not_modified = if_none_match.strip() == '*' or any(
+            tag.strip().removeprefix('W/') in self.etags for tag in if_none_match.split(',')
+        )
+
+        if not_modified:
+            response = Response(status=304)
+        else:
+            response = Response(body, status=200, mimetype='application/json')
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+            response.direct_passthrough = True
+
+        response.headers['ETag'] = etag
+        response.headers['Cache-Control'] = f'public, max-age={max_age}'
+        response.headers['Vary'] = 'Accept-Encoding'
+        return response
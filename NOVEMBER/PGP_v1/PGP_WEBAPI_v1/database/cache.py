@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+🗃️ Read-Through Cache for PGP_WEBAPI_v1
+Caches effectively-static reads (currency_to_network mappings, user channel lists)
+so dashboard page loads don't hit the database for every call.
+
+Keys are tuples whose first element is the namespace, e.g. ('user_channels', user_id).
+Writers invalidate through db_manager.after_commit(), so a cleared entry is
+never refilled from data older than the commit.
+"""
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Default TTLs in seconds (0 disables caching for the namespace)
+CURRENCY_NETWORK_CACHE_TTL = int((os.getenv('CURRENCY_NETWORK_CACHE_TTL_SECONDS') or '').strip() or 3600)
+USER_CHANNELS_CACHE_TTL = int((os.getenv('USER_CHANNELS_CACHE_TTL_SECONDS') or '').strip() or 60)
+
+DEFAULT_MAX_ENTRIES = 10000
+
+
+class ReadThroughCache:
+    """Thread-safe TTL cache with read-through loading and namespace invalidation"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        # Bumped on every invalidation: loads that started earlier don't store their result
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key: Tuple[Hashable, ...], loader: Callable[[], Any], ttl: float) -> Any:
+        """
+        Get a cached value, loading and caching it on a miss
+
+        Args:
+            key: Cache key tuple (first element is the namespace)
+            loader: Called without arguments on a miss; exceptions propagate and nothing is cached
+            ttl: Seconds to keep the value (<= 0 bypasses the cache)
+
+        Returns:
+            Cached or freshly loaded value (treat as read-only)
+        """
+        if ttl <= 0:
+            return loader()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+
+        with self._lock:
+            if generation == self._generation:
+                if len(self._entries) >= self.max_entries:
+                    self._evict_expired(time.monotonic())
+                if len(self._entries) < self.max_entries:
+                    self._entries[key] = (time.monotonic() + ttl, value)
+        return value
+
+    def invalidate(self, key: Tuple[Hashable, ...]) -> None:
+        """Remove one entry"""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def invalidate_namespace(self, namespace: Hashable) -> None:
+        """Remove every entry whose key starts with namespace"""
+        with self._lock:
+            self._generation += 1
+            for key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def _evict_expired(self, now: float) -> None:
+        for key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+
+
+# Global read cache instance
+read_cache = ReadThroughCache()
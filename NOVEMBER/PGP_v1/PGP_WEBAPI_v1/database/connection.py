@@ -2,64 +2,148 @@
 """
 💾 Database Connection Manager for PGP_WEBAPI_v1
 Handles PostgreSQL connection pooling via Cloud SQL Connector
+
+Connections come from the process-wide PGP_COMMON pool (one Cloud SQL
+Connector + QueuePool per process). Inside a Flask request, every
+get_db() block reuses one checked-out connection, which is returned to the
+pool at app-context teardown.
 """
-import pg8000
-from google.cloud.sql.connector import Connector
+import threading
 from contextlib import contextmanager
+from typing import Callable
+from flask import g, has_app_context
+from PGP_COMMON.database.connection_pool import get_shared_engine
 from config_manager import config_manager
 
+SERVICE_NAME = "PGP_WEBAPI_v1"
+
 
 class DatabaseManager:
-    """Manages database connections using Cloud SQL Connector"""
+    """Manages pooled database connections using Cloud SQL Connector"""
 
     def __init__(self):
         self.config = config_manager.get_config()
-        self.connector = Connector()
-        print("💾 DatabaseManager initialized")
+        self._engine = None
+        self._engine_lock = threading.Lock()
+        self._local = threading.local()
+        print("💾 DatabaseManager initialized (pooled connections)")
+
+    @property
+    def engine(self):
+        """Shared pooled engine (created on first use, no connection opened until checkout)"""
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    self._engine = get_shared_engine(
+                        self.config['cloud_sql_connection_name'],
+                        self.config['database_name'],
+                        self.config['database_user'],
+                        self.config['database_password'],
+                        service_name=SERVICE_NAME
+                    )
+        return self._engine
+
+    def init_app(self, app):
+        """Return the request's pooled connection when the app context tears down"""
+        app.teardown_appcontext(self._release_request_connection)
 
     def get_connection(self):
         """
-        Create a database connection using Cloud SQL Connector
+        Check out a database connection from the pool
 
         Returns:
-            pg8000 connection object
+            pg8000 connection proxied by the pool (close() returns it to the pool)
         """
         try:
-            conn = self.connector.connect(
-                self.config['cloud_sql_connection_name'],
-                "pg8000",
-                user=self.config['database_user'],
-                password=self.config['database_password'],
-                db=self.config['database_name']
-            )
-            return conn
+            return self.engine.raw_connection()
         except Exception as e:
             print(f"❌ Database connection error: {e}")
             raise
 
+    def _checkout(self):
+        """Get the request-scoped connection (or a fresh one outside a request)"""
+        if not has_app_context():
+            return self.get_connection()
+
+        conn = g.get('webapi_db_conn')
+        if conn is None:
+            conn = self.get_connection()
+            g.webapi_db_conn = conn
+        return conn
+
+    def _checkin(self, conn):
+        """Return a connection to the pool unless it is held for the rest of the request"""
+        if not has_app_context():
+            conn.close()
+
+    def _release_request_connection(self, exc=None):
+        conn = g.pop('webapi_db_conn', None)
+        if conn is not None:
+            try:
+                conn.close()  # Back to the pool (the pool rolls back anything uncommitted)
+            except Exception as e:
+                print(f"⚠️ Error returning connection to pool: {e}")
+
+    def after_commit(self, callback: Callable[[], None]):
+        """
+        Run callback after the current get_db() block commits (e.g. cache invalidation)
+
+        Callbacks are dropped if the block rolls back. Outside a get_db() block
+        the callback runs immediately.
+        """
+        if getattr(self._local, 'depth', 0) > 0:
+            self._local.after_commit.append(callback)
+        else:
+            callback()
+
     @contextmanager
     def get_db(self):
         """
         Context manager for database connections
 
+        The outermost block commits on success and rolls back on error; nested
+        blocks share its connection and transaction.
+
         Usage:
             with db_manager.get_db() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT ...")
         """
-        conn = None
+        local = self._local
+        outermost = getattr(local, 'depth', 0) == 0
+
+        if outermost:
+            local.conn = self._checkout()
+            local.after_commit = []
+        conn = local.conn
+        local.depth = getattr(local, 'depth', 0) + 1
+
         try:
-            conn = self.get_connection()
             yield conn
-            conn.commit()
+            if outermost:
+                conn.commit()
+                for callback in local.after_commit:
+                    try:
+                        callback()
+                    except Exception as e:
+                        print(f"⚠️ after_commit callback failed: {e}")
         except Exception as e:
-            if conn:
-                conn.rollback()
+            if outermost:
+                try:
+                    conn.rollback()
+                except Exception as rollback_error:
+                    print(f"⚠️ Rollback failed: {rollback_error}")
+                if has_app_context():
+                    # Don't reuse a connection that just failed for the rest of the request
+                    self._release_request_connection()
             print(f"❌ Database transaction error: {e}")
             raise
         finally:
-            if conn:
-                conn.close()
+            local.depth -= 1
+            if outermost:
+                local.conn = None
+                local.after_commit = []
+                self._checkin(conn)
 
 
 # Global database manager instance
@@ -25,6 +25,8 @@ from api.routes.auth import auth_bp
 from api.routes.account import account_bp
 from api.routes.channels import channels_bp
 from api.routes.mappings import mappings_bp
+from database.connection import db_manager
+from api.services.password_hasher import PasswordHasherBusy
 from api.middleware.rate_limiter import setup_rate_limiting, get_rate_limit_error_handler
 from PGP_COMMON.logging import setup_logger
 
@@ -122,6 +124,9 @@ app.register_blueprint(account_bp, url_prefix='/api/auth/account')
 app.register_blueprint(channels_bp, url_prefix='/api/channels')
 app.register_blueprint(mappings_bp, url_prefix='/api/mappings')
 
+# Return each request's pooled database connection at teardown
+db_manager.init_app(app)
+
 
 # Health check endpoint
 @app.route('/api/health', methods=['GET'])
@@ -193,6 +198,19 @@ def internal_error(error):
     }), 500
 
 
+@app.errorhandler(PasswordHasherBusy)
+def password_hasher_busy(error):
+    """Handle saturated password hashing pool (login/signup bursts)"""
+    response = jsonify({
+        'success': False,
+        'error': 'Service busy',
+        'message': 'Too many authentication requests in progress. Please retry shortly.'
+    })
+    response.status_code = 503
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+
 @jwt.expired_token_loader
 def expired_token_callback(jwt_header, jwt_payload):
     """Handle expired JWT tokens"""
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests for the Password Hasher
+Tests hashing/verification on the pool, work-factor rehash detection and
+backpressure when the pool is saturated
+"""
+import pytest
+import os
+import sys
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from api.services.password_hasher import PasswordHasher, PasswordHasherBusy, get_hash_rounds
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(rounds=4, workers=1, max_queue=0, retry_after=3)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_hash_and_verify(hasher):
+    password_hash = hasher.hash('SecurePass123!')
+
+    assert password_hash.startswith('$2b$04$')
+    assert hasher.verify('SecurePass123!', password_hash)
+    assert not hasher.verify('WrongPass123!', password_hash)
+
+
+def test_needs_rehash_when_cost_changes(hasher):
+    stronger = PasswordHasher(rounds=5, workers=1)
+    try:
+        old_hash = hasher.hash('SecurePass123!')
+        assert not hasher.needs_rehash(old_hash)
+        assert stronger.needs_rehash(old_hash)
+        assert not stronger.needs_rehash(stronger.hash('SecurePass123!'))
+    finally:
+        stronger.shutdown()
+
+
+def test_get_hash_rounds():
+    assert get_hash_rounds('$2b$12$abcdefghijklmnopqrstuuABCDEFGHIJKLMNOPQRSTUVWXYZ01234') == 12
+    assert get_hash_rounds('not-a-bcrypt-hash') is None
+    assert get_hash_rounds(None) is None
+
+
+def test_invalid_rounds_rejected():
+    with pytest.raises(ValueError):
+        PasswordHasher(rounds=3)
+
+
+def test_saturated_pool_rejects_with_retry_after(hasher):
+    started = threading.Event()
+    release = threading.Event()
+
+    def occupy_worker():
+        started.set()
+        release.wait(5)
+
+    # Occupy the only slot (workers=1, max_queue=0)
+    blocker = threading.Thread(target=hasher._run, args=(occupy_worker,))
+    blocker.start()
+    started.wait(5)
+
+    try:
+        with pytest.raises(PasswordHasherBusy) as exc_info:
+            hasher.hash('SecurePass123!')
+        assert exc_info.value.retry_after == 3
+    finally:
+        release.set()
+        blocker.join(5)
+
+    # Slot is released once the work finishes
+    assert hasher.verify('SecurePass123!', hasher.hash('SecurePass123!'))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests for Precompressed JSON Responses
+Tests content negotiation, strong ETags and 304 revalidation
+"""
+import pytest
+import os
+import sys
+import gzip
+import json
+from flask import Flask, request
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from api.utils.precompressed import PrecompressedJSON
+
+MAPPINGS = {
+    'network_to_currencies': {'ETH': [{'currency': 'USDT', 'currency_name': 'Tether'}]},
+    'currency_to_networks': {'USDT': [{'network': 'ETH', 'network_name': 'Ethereum'}]},
+    'networks_with_names': {'ETH': 'Ethereum'},
+    'currencies_with_names': {'USDT': 'Tether'}
+}
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    payload = PrecompressedJSON(MAPPINGS)
+
+    @app.route('/currency-network')
+    def currency_network():
+        return payload.make_response(request, max_age=300)
+
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def test_identity_response(client):
+    response = client.get('/currency-network')
+
+    assert response.status_code == 200
+    assert response.json == MAPPINGS
+    assert 'Content-Encoding' not in response.headers
+    assert response.headers['Cache-Control'] == 'public, max-age=300'
+    assert response.headers['Vary'] == 'Accept-Encoding'
+
+
+def test_gzip_response(client):
+    response = client.get('/currency-network', headers={'Accept-Encoding': 'gzip, deflate'})
+
+    assert response.headers['Content-Encoding'] in ('gzip', 'br')
+    if response.headers['Content-Encoding'] == 'gzip':
+        assert json.loads(gzip.decompress(response.data)) == MAPPINGS
+
+
+def test_refused_encoding_is_not_used():
+    payload = PrecompressedJSON(MAPPINGS)
+    assert payload.choose_encoding('gzip;q=0, br;q=0') == 'identity'
+    assert payload.choose_encoding(None) == 'identity'
+
+
+def test_if_none_match_returns_304(client):
+    etag = client.get('/currency-network').headers['ETag']
+    response = client.get('/currency-network', headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+
+def test_etag_from_other_encoding_still_matches(client):
+    gzip_etag = client.get('/currency-network', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+    response = client.get('/currency-network', headers={'If-None-Match': gzip_etag})
+
+    assert response.status_code == 304
+
+
+def test_stale_etag_returns_body(client):
+    response = client.get('/currency-network', headers={'If-None-Match': '"outdated"'})
+
+    assert response.status_code == 200
+    assert response.json == MAPPINGS
+
+
+def test_etag_depends_only_on_content():
+    reordered = dict(reversed(list(MAPPINGS.items())))
+    assert PrecompressedJSON(MAPPINGS).version == PrecompressedJSON(reordered).version
+    assert PrecompressedJSON(MAPPINGS).version != PrecompressedJSON({}).version
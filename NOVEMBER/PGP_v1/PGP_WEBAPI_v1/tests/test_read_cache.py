@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+🧪 Unit Tests for the Read-Through Cache
+Tests TTL expiry, namespace invalidation and the stale-load guard
+"""
+import pytest
+import os
+import sys
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from database.cache import ReadThroughCache
+
+
+class CountingLoader:
+    """Loader that records how often the database would have been queried"""
+
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+@pytest.fixture
+def cache():
+    return ReadThroughCache()
+
+
+def test_second_read_is_served_from_cache(cache):
+    loader = CountingLoader({'BTC': ['BTC']})
+
+    assert cache.get_or_load(('currency_network',), loader, ttl=60) == {'BTC': ['BTC']}
+    assert cache.get_or_load(('currency_network',), loader, ttl=60) == {'BTC': ['BTC']}
+    assert loader.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_expired_entry_is_reloaded(cache):
+    loader = CountingLoader('channels')
+
+    cache.get_or_load(('user_channels', 'u1'), loader, ttl=0.01)
+    time.sleep(0.02)
+    cache.get_or_load(('user_channels', 'u1'), loader, ttl=0.01)
+    assert loader.calls == 2
+
+
+def test_zero_ttl_bypasses_cache(cache):
+    loader = CountingLoader('value')
+
+    cache.get_or_load(('user_channels', 'u1'), loader, ttl=0)
+    cache.get_or_load(('user_channels', 'u1'), loader, ttl=0)
+    assert loader.calls == 2
+
+
+def test_loader_error_is_not_cached(cache):
+    def failing_loader():
+        raise RuntimeError("database unavailable")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load(('currency_network',), failing_loader, ttl=60)
+
+    loader = CountingLoader('ok')
+    assert cache.get_or_load(('currency_network',), loader, ttl=60) == 'ok'
+    assert loader.calls == 1
+
+
+def test_invalidate_namespace_only_clears_that_namespace(cache):
+    u1, u2, mappings = CountingLoader('a'), CountingLoader('b'), CountingLoader('m')
+    cache.get_or_load(('user_channels', 'u1'), u1, ttl=60)
+    cache.get_or_load(('user_channels', 'u2'), u2, ttl=60)
+    cache.get_or_load(('currency_network',), mappings, ttl=60)
+
+    cache.invalidate_namespace('user_channels')
+
+    cache.get_or_load(('user_channels', 'u1'), u1, ttl=60)
+    cache.get_or_load(('user_channels', 'u2'), u2, ttl=60)
+    cache.get_or_load(('currency_network',), mappings, ttl=60)
+    assert (u1.calls, u2.calls, mappings.calls) == (2, 2, 1)
+
+
+def test_load_racing_an_invalidation_is_not_stored(cache):
+    # The loader read the row before a writer committed and invalidated:
+    # its (stale) result is returned but must not be cached.
+    def stale_loader():
+        cache.invalidate(('user_channels', 'u1'))
+        return 'stale'
+
+    assert cache.get_or_load(('user_channels', 'u1'), stale_loader, ttl=60) == 'stale'
+
+    fresh = CountingLoader('fresh')
+    assert cache.get_or_load(('user_channels', 'u1'), fresh, ttl=60) == 'fresh'
+    assert fresh.calls == 1
+
+
+def test_max_entries_bounds_the_cache():
+    cache = ReadThroughCache(max_entries=2)
+    for user_id in ('u1', 'u2', 'u3'):
+        cache.get_or_load(('user_channels', user_id), CountingLoader(user_id), ttl=60)
+
+    assert len(cache._entries) == 2
@@ -8,15 +8,19 @@
 # Date: 2025-11-18
 #
 # DESCRIPTION:
-#   Deploys 3 Cloud Scheduler jobs for automated batch processing:
+#   Deploys 5 Cloud Scheduler jobs for automated batch processing:
 #   1. PGP_BATCHPROCESSOR_v1 - Every 5 minutes (threshold payout detection)
 #   2. PGP_MICROBATCHPROCESSOR_v1 - Every 15 minutes (ETH→USDT conversion)
 #   3. PGP_BROADCAST_v1 - Daily at 9:00 AM UTC (scheduled broadcasts)
+#   4. PGP_HOSTPAY3_v1 - Every minute (payout confirmation tracking)
+#   5. PGP_HOSTPAY3_v1 - Every 5 minutes (failed payout recovery)
 #
 # SCHEDULER JOBS:
 #   ✅ pgp-batchprocessor-v1-job (*/5 * * * *)
 #   ✅ pgp-microbatchprocessor-v1-job (*/15 * * * *)
 #   ✅ pgp-broadcast-v1-daily-job (0 9 * * *)
+#   ✅ pgp-hostpay3-v1-confirm-job (* * * * *)
+#   ✅ pgp-hostpay3-v1-recovery-job (*/5 * * * *)
 #
 # PREREQUISITES:
 #   - GCP project "pgp-live" exists and is accessible
@@ -408,6 +412,128 @@ deploy_broadcast_job() {
     print_success "Broadcast Scheduler job deployed successfully"
 }
 
+deploy_hostpay3_confirmation_job() {
+    print_section "Deploying PGP_HOSTPAY3_v1 Confirmation Job"
+
+    local JOB_NAME="pgp-hostpay3-v1-confirm-job"
+    local SERVICE_NAME="pgp-hostpay3-v1"
+    local SCHEDULE="* * * * *"  # Every minute
+    local ENDPOINT="/confirm-pending"
+
+    print_info "Job Name: $JOB_NAME"
+    print_info "Schedule: Every minute (1440 executions/day)"
+    print_info "Endpoint: POST $ENDPOINT"
+    print_info "Purpose: Confirm sent payouts and send their completion callbacks"
+
+    # Get service URL
+    print_step "Fetching Cloud Run service URL..."
+    local SERVICE_URL
+    SERVICE_URL=$(get_service_url "$SERVICE_NAME") || return 1
+    local URI="${SERVICE_URL}${ENDPOINT}"
+    print_success "Service URL: $SERVICE_URL"
+
+    # Check if job already exists
+    if job_exists "$JOB_NAME"; then
+        print_warning "Job $JOB_NAME already exists"
+
+        if [ "$DRY_RUN" = false ]; then
+            read -p "$(echo -e ${YELLOW}Update existing job? [y/N]: ${NC})" -n 1 -r
+            echo
+            if [[ ! $REPLY =~ ^[Yy]$ ]]; then
+                print_info "Skipping job update"
+                return 0
+            fi
+
+            # Update existing job
+            execute_cmd "Updating Cloud Scheduler job: $JOB_NAME" \
+                gcloud scheduler jobs update http "$JOB_NAME" \
+                --location="$LOCATION" \
+                --project="$PROJECT_ID" \
+                --schedule="$SCHEDULE" \
+                --uri="$URI" \
+                --http-method=POST \
+                --oidc-service-account-email="pgp-hostpay3-v1-sa@${PROJECT_ID}.iam.gserviceaccount.com" \
+                --time-zone="$TIMEZONE"
+        else
+            echo -e "${YELLOW}[DRY-RUN] Would update job: $JOB_NAME${NC}"
+        fi
+    else
+        # Create new job
+        execute_cmd "Creating Cloud Scheduler job: $JOB_NAME" \
+            gcloud scheduler jobs create http "$JOB_NAME" \
+            --location="$LOCATION" \
+            --project="$PROJECT_ID" \
+            --schedule="$SCHEDULE" \
+            --uri="$URI" \
+            --http-method=POST \
+            --oidc-service-account-email="pgp-hostpay3-v1-sa@${PROJECT_ID}.iam.gserviceaccount.com" \
+            --time-zone="$TIMEZONE"
+    fi
+
+    print_success "HostPay3 Confirmation job deployed successfully"
+}
+
+deploy_hostpay3_recovery_job() {
+    print_section "Deploying PGP_HOSTPAY3_v1 Recovery Job"
+
+    local JOB_NAME="pgp-hostpay3-v1-recovery-job"
+    local SERVICE_NAME="pgp-hostpay3-v1"
+    local SCHEDULE="*/5 * * * *"  # Every 5 minutes
+    local ENDPOINT="/recover-failed"
+
+    print_info "Job Name: $JOB_NAME"
+    print_info "Schedule: Every 5 minutes (288 executions/day)"
+    print_info "Endpoint: POST $ENDPOINT"
+    print_info "Purpose: Retry payouts that failed with retryable errors"
+
+    # Get service URL
+    print_step "Fetching Cloud Run service URL..."
+    local SERVICE_URL
+    SERVICE_URL=$(get_service_url "$SERVICE_NAME") || return 1
+    local URI="${SERVICE_URL}${ENDPOINT}"
+    print_success "Service URL: $SERVICE_URL"
+
+    # Check if job already exists
+    if job_exists "$JOB_NAME"; then
+        print_warning "Job $JOB_NAME already exists"
+
+        if [ "$DRY_RUN" = false ]; then
+            read -p "$(echo -e ${YELLOW}Update existing job? [y/N]: ${NC})" -n 1 -r
+            echo
+            if [[ ! $REPLY =~ ^[Yy]$ ]]; then
+                print_info "Skipping job update"
+                return 0
+            fi
+
+            # Update existing job
+            execute_cmd "Updating Cloud Scheduler job: $JOB_NAME" \
+                gcloud scheduler jobs update http "$JOB_NAME" \
+                --location="$LOCATION" \
+                --project="$PROJECT_ID" \
+                --schedule="$SCHEDULE" \
+                --uri="$URI" \
+                --http-method=POST \
+                --oidc-service-account-email="pgp-hostpay3-v1-sa@${PROJECT_ID}.iam.gserviceaccount.com" \
+                --time-zone="$TIMEZONE"
+        else
+            echo -e "${YELLOW}[DRY-RUN] Would update job: $JOB_NAME${NC}"
+        fi
+    else
+        # Create new job
+        execute_cmd "Creating Cloud Scheduler job: $JOB_NAME" \
+            gcloud scheduler jobs create http "$JOB_NAME" \
+            --location="$LOCATION" \
+            --project="$PROJECT_ID" \
+            --schedule="$SCHEDULE" \
+            --uri="$URI" \
+            --http-method=POST \
+            --oidc-service-account-email="pgp-hostpay3-v1-sa@${PROJECT_ID}.iam.gserviceaccount.com" \
+            --time-zone="$TIMEZONE"
+    fi
+
+    print_success "HostPay3 Recovery job deployed successfully"
+}
+
 # ============================================================================
 # VERIFICATION FUNCTIONS
 # ============================================================================
@@ -419,6 +545,8 @@ verify_deployment() {
         "pgp-batchprocessor-v1-job"
         "pgp-microbatchprocessor-v1-job"
         "pgp-broadcast-v1-daily-job"
+        "pgp-hostpay3-v1-confirm-job"
+        "pgp-hostpay3-v1-recovery-job"
     )
 
     if [ "$DRY_RUN" = true ]; then
@@ -479,13 +607,15 @@ OPTIONS:
     --help            Show this help message
 
 DEPLOYMENT OVERVIEW:
-    Creates 3 Cloud Scheduler jobs:
+    Creates 5 Cloud Scheduler jobs:
     1. pgp-batchprocessor-v1-job (every 5 minutes)
     2. pgp-microbatchprocessor-v1-job (every 15 minutes)
     3. pgp-broadcast-v1-daily-job (daily at 9:00 AM UTC)
+    4. pgp-hostpay3-v1-confirm-job (every minute)
+    5. pgp-hostpay3-v1-recovery-job (every 5 minutes)
 
 PREREQUISITES:
-    - Cloud Run services deployed (pgp-batchprocessor-v1, pgp-microbatchprocessor-v1, pgp-broadcast-v1)
+    - Cloud Run services deployed (pgp-batchprocessor-v1, pgp-microbatchprocessor-v1, pgp-broadcast-v1, pgp-hostpay3-v1)
     - Service accounts created with Cloud Run Invoker role
     - cloudscheduler.googleapis.com API enabled
 
@@ -500,7 +630,7 @@ EXAMPLES:
     $0 --project my-project-id
 
 COST:
-    ~\$0.30/month (3 jobs × \$0.10/job/month)
+    ~\$0.50/month (5 jobs × \$0.10/job/month)
 
 For more information, see PGP_MAP_UPDATED.md
 EOF
@@ -535,7 +665,7 @@ main() {
     echo -e "${BLUE}Project:     ${NC}$PROJECT_ID"
     echo -e "${BLUE}Location:    ${NC}$LOCATION"
     echo -e "${BLUE}Timezone:    ${NC}$TIMEZONE"
-    echo -e "${BLUE}Jobs:        ${NC}3 Cloud Scheduler jobs"
+    echo -e "${BLUE}Jobs:        ${NC}5 Cloud Scheduler jobs"
 
     if [ "$DRY_RUN" = true ]; then
         echo -e "${YELLOW}Mode:        ${NC}DRY-RUN (preview only)"
@@ -548,13 +678,15 @@ main() {
     deploy_batchprocessor_job || exit 1
     deploy_microbatchprocessor_job || exit 1
     deploy_broadcast_job || exit 1
+    deploy_hostpay3_confirmation_job || exit 1
+    deploy_hostpay3_recovery_job || exit 1
 
     # Verify deployment
     verify_deployment
 
     # Print summary
     print_header "DEPLOYMENT COMPLETE"
-    print_success "Cloud Scheduler Jobs Deployed: 3"
+    print_success "Cloud Scheduler Jobs Deployed: 4"
     print_success "Status: All jobs enabled"
 
     echo -e "\n${CYAN}📋 Next Steps:${NC}"
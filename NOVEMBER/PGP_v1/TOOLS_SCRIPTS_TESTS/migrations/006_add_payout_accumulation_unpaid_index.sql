@@ -0,0 +1,63 @@
+-- ============================================================================
+-- Migration 006: Partial Index for Unpaid, Converted Payout Accumulations
+-- ============================================================================
+-- Purpose:
+--   Speed up PGP_BATCHPROCESSOR_v1 find_clients_over_threshold(), which runs
+--   every batch cycle and aggregates only rows with
+--   is_paid_out = FALSE AND is_conversion_complete = TRUE.
+--
+--   The partial index only contains rows still waiting for a payout, so it stays
+--   small as paid rows accumulate. The query still reads the matching heap rows
+--   (wallet address, payout currency/network and nowpayments_outcome_amount are
+--   not in the index), so this is an index scan over the unpaid rows rather than
+--   an index-only scan; covering every selected column would roughly duplicate
+--   the table.
+--
+-- Indexes Created:
+--   - idx_payout_accumulation_unpaid_converted
+--
+-- Usage:
+--   psql -h $DB_HOST -U postgres -d pgp-live-db -f 006_add_payout_accumulation_unpaid_index.sql
+--
+-- Notes:
+--   CREATE INDEX CONCURRENTLY does not lock writes but cannot run inside a
+--   transaction block, so this migration has no BEGIN/COMMIT.
+--
+-- Rollback:
+--   See 006_rollback.sql
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+\echo '📇 [MIGRATION 006] Creating partial index on payout_accumulation...'
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payout_accumulation_unpaid_converted
+    ON payout_accumulation (client_id)
+    WHERE is_paid_out = FALSE AND is_conversion_complete = TRUE;
+
+-- Verify index was created and is valid (a failed CONCURRENTLY build leaves an INVALID index)
+DO $$
+DECLARE
+    index_valid BOOLEAN;
+BEGIN
+    SELECT i.indisvalid INTO index_valid
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE c.relname = 'idx_payout_accumulation_unpaid_converted';
+
+    IF index_valid IS NULL THEN
+        RAISE EXCEPTION '❌ Index idx_payout_accumulation_unpaid_converted not found after creation';
+    ELSIF NOT index_valid THEN
+        RAISE EXCEPTION '❌ Index idx_payout_accumulation_unpaid_converted is INVALID. Drop it and re-run this migration.';
+    END IF;
+
+    RAISE NOTICE '✅ Index idx_payout_accumulation_unpaid_converted verified';
+END $$;
+
+ANALYZE payout_accumulation;
+
+\echo '🎉 [MIGRATION 006] Complete! Threshold query can use the partial index.'
+
+-- ============================================================================
+-- Migration Complete
+-- ============================================================================
@@ -0,0 +1,19 @@
+-- ============================================================================
+-- Rollback: 006 - Drop Partial Index for Unpaid, Converted Payout Accumulations
+-- ============================================================================
+-- Purpose: Rollback migration 006 if needed
+--
+-- Dropping the index only affects query performance, not correctness.
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+\echo '🔄 [ROLLBACK 006] Dropping idx_payout_accumulation_unpaid_converted...'
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_payout_accumulation_unpaid_converted;
+
+\echo '🔄 [ROLLBACK 006] Complete'
+
+-- ============================================================================
+-- Rollback Complete
+-- ============================================================================
@@ -0,0 +1,62 @@
+-- ============================================================================
+-- Migration 007: Partial Composite Index for Active Subscription Expiry
+-- ============================================================================
+-- Purpose:
+--   Speed up PGP_SERVER_v1 DatabaseManager.fetch_expired_subscriptions() and
+--   fetch_upcoming_expirations(), which filter active subscriptions with
+--   (expire_date, expire_time) row comparisons.
+--
+--   Before this index every check loaded all active rows and filtered in
+--   Python. With it the expiry query is an index range scan over only the
+--   expired rows. Inactive rows are excluded, so the index stays small.
+--   INCLUDE (user_id, private_channel_id) makes the query index-only.
+--
+-- Indexes Created:
+--   - idx_private_channel_users_active_expiry
+--
+-- Usage:
+--   psql -h $DB_HOST -U postgres -d pgp-live-db -f 007_add_subscription_expiry_index.sql
+--
+-- Notes:
+--   CREATE INDEX CONCURRENTLY does not lock writes but cannot run inside a
+--   transaction block, so this migration has no BEGIN/COMMIT.
+--
+-- Rollback:
+--   See 007_rollback.sql
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+\echo '📇 [MIGRATION 007] Creating expiry index on private_channel_users_database...'
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_private_channel_users_active_expiry
+    ON private_channel_users_database (expire_date, expire_time)
+    INCLUDE (user_id, private_channel_id)
+    WHERE is_active = TRUE;
+
+-- Verify index was created and is valid (a failed CONCURRENTLY build leaves an INVALID index)
+DO $$
+DECLARE
+    index_valid BOOLEAN;
+BEGIN
+    SELECT i.indisvalid INTO index_valid
+    FROM pg_index i
+    JOIN pg_class c ON c.oid = i.indexrelid
+    WHERE c.relname = 'idx_private_channel_users_active_expiry';
+
+    IF index_valid IS NULL THEN
+        RAISE EXCEPTION '❌ Index idx_private_channel_users_active_expiry not found after creation';
+    ELSIF NOT index_valid THEN
+        RAISE EXCEPTION '❌ Index idx_private_channel_users_active_expiry is INVALID. Drop it and re-run this migration.';
+    END IF;
+
+    RAISE NOTICE '✅ Index idx_private_channel_users_active_expiry verified';
+END $$;
+
+ANALYZE private_channel_users_database;
+
+\echo '🎉 [MIGRATION 007] Complete! Expiry checks can use the partial index.'
+
+-- ============================================================================
+-- Migration Complete
+-- ============================================================================
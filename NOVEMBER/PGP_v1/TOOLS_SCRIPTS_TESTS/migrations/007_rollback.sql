@@ -0,0 +1,19 @@
+-- ============================================================================
+-- Rollback: 007 - Drop Partial Composite Index for Active Subscription Expiry
+-- ============================================================================
+-- Purpose: Rollback migration 007 if needed
+--
+-- Dropping the index only affects query performance, not correctness.
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+\echo '🔄 [ROLLBACK 007] Dropping idx_private_channel_users_active_expiry...'
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_private_channel_users_active_expiry;
+
+\echo '🔄 [ROLLBACK 007] Complete'
+
+-- ============================================================================
+-- Rollback Complete
+-- ============================================================================
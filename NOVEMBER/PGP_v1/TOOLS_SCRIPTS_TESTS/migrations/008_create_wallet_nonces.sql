@@ -0,0 +1,61 @@
+-- ============================================================================
+-- Migration 008: Create Wallet Nonce Counter Table
+-- ============================================================================
+-- Purpose:
+--   Shared nonce counter for PGP_HOSTPAY3_v1 (nonce_allocator.py).
+--
+--   Each payout used to read eth_getTransactionCount for the host wallet, so
+--   two concurrent payouts got the same nonce and one of them failed or
+--   replaced the other. Instances now reserve nonces from this row with one
+--   atomic UPDATE ... RETURNING, so payouts can run concurrently.
+--
+--   The counter is seeded from the wallet's 'pending' transaction count and
+--   re-synced with the chain by the service (forward when the chain is
+--   ahead, back when reserved nonces were dropped).
+--
+-- Tables Created:
+--   - wallet_nonces: Next nonce per (wallet_address, chain_id)
+--
+-- Usage:
+--   psql -h $DB_HOST -U postgres -d pgp-live-db -f 008_create_wallet_nonces.sql
+--
+-- Rollback:
+--   See 008_rollback.sql
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+\echo '🔢 [MIGRATION 008] Creating wallet_nonces table...'
+
+CREATE TABLE IF NOT EXISTS wallet_nonces (
+    -- Lowercase hex address of the sending wallet
+    wallet_address VARCHAR(42) NOT NULL,
+    chain_id INTEGER NOT NULL DEFAULT 1,
+
+    -- Next nonce to hand out
+    next_nonce BIGINT NOT NULL,
+    CHECK (next_nonce >= 0),
+
+    -- Last reservation (gaps are only reclaimed after a grace period)
+    reserved_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    created_at TIMESTAMP DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW(),
+
+    PRIMARY KEY (wallet_address, chain_id)
+);
+
+COMMENT ON TABLE wallet_nonces IS
+'PGP_HOSTPAY3_v1: Shared transaction nonce counter per host wallet';
+
+COMMENT ON COLUMN wallet_nonces.next_nonce IS
+'Next nonce to reserve (UPDATE ... SET next_nonce = next_nonce + 1 RETURNING next_nonce - 1)';
+
+COMMIT;
+
+\echo '🎉 [MIGRATION 008] Complete! wallet_nonces is ready (rows are seeded on first payout).'
+
+-- ============================================================================
+-- Migration Complete
+-- ============================================================================
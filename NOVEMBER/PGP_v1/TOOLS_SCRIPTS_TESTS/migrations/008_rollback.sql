@@ -0,0 +1,20 @@
+-- ============================================================================
+-- Rollback: 008 - Drop Wallet Nonce Counter Table
+-- ============================================================================
+-- Purpose: Rollback migration 008 if needed
+--
+-- PGP_HOSTPAY3_v1 checks for the table at startup and falls back to an
+-- in-process nonce counter (one payout instance at a time) without it.
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+\echo '🔄 [ROLLBACK 008] Dropping wallet_nonces...'
+
+DROP TABLE IF EXISTS wallet_nonces;
+
+\echo '🔄 [ROLLBACK 008] Complete'
+
+-- ============================================================================
+-- Rollback Complete
+-- ============================================================================
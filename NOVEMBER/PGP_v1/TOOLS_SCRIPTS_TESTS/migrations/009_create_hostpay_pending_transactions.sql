@@ -0,0 +1,74 @@
+-- ============================================================================
+-- Migration 009: Create HostPay Pending Transactions Table
+-- ============================================================================
+-- Purpose:
+--   Asynchronous confirmation tracking for PGP_HOSTPAY3_v1
+--   (confirmation_tracker.py).
+--
+--   Payouts used to block the request for up to 300s in
+--   wait_for_transaction_receipt(). HOSTPAY3 now broadcasts, records the
+--   transaction here as 'pending' and returns. The /confirm-pending endpoint
+--   (Cloud Scheduler) batch-polls receipts for all pending rows and sends
+--   the PGP_HOSTPAY1_v1 /payment-completed (or PGP_ACCUMULATOR
+--   /swap-executed) callback once each transaction is mined.
+--
+-- Tables Created:
+--   - hostpay_pending_transactions: Broadcast payouts awaiting a receipt
+--
+-- Usage:
+--   psql -h $DB_HOST -U postgres -d pgp-live-db -f 009_create_hostpay_pending_transactions.sql
+--
+-- Rollback:
+--   See 009_rollback.sql
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+\echo '⏳ [MIGRATION 009] Creating hostpay_pending_transactions table...'
+
+CREATE TABLE IF NOT EXISTS hostpay_pending_transactions (
+    tx_hash VARCHAR(66) PRIMARY KEY,
+
+    -- Payment details needed for the completion callback
+    unique_id VARCHAR(64) NOT NULL,
+    cn_api_id VARCHAR(16) NOT NULL,
+    from_currency VARCHAR(10) NOT NULL,
+    from_network VARCHAR(10) NOT NULL,
+    from_amount NUMERIC(20, 8) NOT NULL DEFAULT 0,
+    actual_eth_amount NUMERIC(20, 18) NOT NULL DEFAULT 0,
+    payin_address VARCHAR(95) NOT NULL,
+    context VARCHAR(20) NOT NULL DEFAULT 'instant',
+
+    -- pending -> confirmed | reverted
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    CHECK (status IN ('pending', 'confirmed', 'reverted')),
+    block_number INTEGER,
+    gas_used INTEGER,
+
+    submitted_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    resolved_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+\echo '📇 [MIGRATION 009] Creating pending index...'
+
+-- Tracker scans only pending rows, oldest first
+CREATE INDEX IF NOT EXISTS idx_hostpay_pending_transactions_pending
+    ON hostpay_pending_transactions(submitted_at)
+    WHERE status = 'pending';
+
+CREATE INDEX IF NOT EXISTS idx_hostpay_pending_transactions_unique_id
+    ON hostpay_pending_transactions(unique_id);
+
+COMMENT ON TABLE hostpay_pending_transactions IS
+'PGP_HOSTPAY3_v1: Broadcast payouts awaiting on-chain confirmation';
+
+COMMIT;
+
+\echo '🎉 [MIGRATION 009] Complete! hostpay_pending_transactions is ready.'
+
+-- ============================================================================
+-- Migration Complete
+-- ============================================================================
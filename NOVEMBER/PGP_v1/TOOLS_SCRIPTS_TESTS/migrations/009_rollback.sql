@@ -0,0 +1,23 @@
+-- ============================================================================
+-- Rollback: 009 - Drop HostPay Pending Transactions Table
+-- ============================================================================
+-- Purpose: Rollback migration 009 if needed
+--
+-- PGP_HOSTPAY3_v1 checks for the table at startup and waits for receipts
+-- inside the payment request (previous behavior) without it.
+--
+-- WARNING: Run /confirm-pending until no rows are 'pending' first, otherwise
+-- those payouts never send their completion callback.
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+\echo '🔄 [ROLLBACK 009] Dropping hostpay_pending_transactions...'
+
+DROP TABLE IF EXISTS hostpay_pending_transactions;
+
+\echo '🔄 [ROLLBACK 009] Complete'
+
+-- ============================================================================
+-- Rollback Complete
+-- ============================================================================
@@ -0,0 +1,54 @@
+-- ============================================================================
+-- Migration 010: Create Wallet Nonce Reservations Table
+-- ============================================================================
+-- Purpose:
+--   Signed transaction hash per reserved nonce for PGP_HOSTPAY3_v1
+--   (nonce_allocator.py).
+--
+--   The shared counter (migration 008) used to move back to the chain's
+--   pending count whenever it had been ahead for NONCE_GAP_GRACE_SECONDS.
+--   A transaction that was broadcast but not yet visible to the node (slow
+--   propagation, RPC failover) then had its nonce handed out again, and the
+--   second payout replaced or raced the first. Each nonce's signed hash is
+--   now recorded before broadcast, and a gap is only reclaimed once the node
+--   reports every recorded hash in it as unknown.
+--
+-- Tables Created:
+--   - wallet_nonce_reservations: Signed tx hash per (wallet, chain, nonce)
+--
+-- Usage:
+--   psql -h $DB_HOST -U postgres -d pgp-live-db -f 010_create_wallet_nonce_reservations.sql
+--
+-- Rollback:
+--   See 010_rollback.sql
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+\echo '🔢 [MIGRATION 010] Creating wallet_nonce_reservations table...'
+
+CREATE TABLE IF NOT EXISTS wallet_nonce_reservations (
+    -- Lowercase hex address of the sending wallet
+    wallet_address VARCHAR(42) NOT NULL,
+    chain_id INTEGER NOT NULL DEFAULT 1,
+    nonce BIGINT NOT NULL,
+
+    -- Hash of the last transaction signed with this nonce
+    tx_hash VARCHAR(66) NOT NULL,
+    signed_at TIMESTAMP NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (wallet_address, chain_id, nonce)
+);
+
+COMMENT ON TABLE wallet_nonce_reservations IS
+'PGP_HOSTPAY3_v1: Signed transaction per reserved nonce (rows below the chain pending count are pruned on re-sync)';
+
+COMMIT;
+
+\echo '🎉 [MIGRATION 010] Complete! wallet_nonce_reservations is ready.'
+
+-- ============================================================================
+-- Migration Complete
+-- ============================================================================
@@ -0,0 +1,20 @@
+-- ============================================================================
+-- Rollback: 010 - Drop Wallet Nonce Reservations Table
+-- ============================================================================
+-- Purpose: Rollback migration 010 if needed
+--
+-- PGP_HOSTPAY3_v1 checks for the table at startup and falls back to an
+-- in-process nonce counter (one payout instance at a time) without it.
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+\echo '🔄 [ROLLBACK 010] Dropping wallet_nonce_reservations...'
+
+DROP TABLE IF EXISTS wallet_nonce_reservations;
+
+\echo '🔄 [ROLLBACK 010] Complete'
+
+-- ============================================================================
+-- Rollback Complete
+-- ============================================================================
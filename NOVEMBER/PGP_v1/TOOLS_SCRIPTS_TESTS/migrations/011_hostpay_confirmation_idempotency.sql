@@ -0,0 +1,71 @@
+-- ============================================================================
+-- Migration 011: HostPay Confirmation Idempotency and Dropped Transactions
+-- ============================================================================
+-- Purpose:
+--   Support for the PGP_HOSTPAY3_v1 confirmation tracker
+--   (confirmation_tracker.py):
+--
+--   1. Unique (unique_id, tx_hash) on split_payout_hostpay. A confirmed
+--      payout whose response couldn't be enqueued is retried on the next
+--      poll; insert_hostpay_transaction() now uses ON CONFLICT DO NOTHING
+--      so the retry doesn't log the payment twice.
+--   2. 'dropped' status on hostpay_pending_transactions: no receipt after
+--      CONFIRMATION_STALE_SECONDS and unknown to the node.
+--   3. escalated_at on hostpay_pending_transactions: stuck transactions the
+--      node still knows are alerted once.
+--
+-- Usage:
+--   psql -h $DB_HOST -U postgres -d pgp-live-db -f 011_hostpay_confirmation_idempotency.sql
+--
+-- Rollback:
+--   See 011_rollback.sql
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+\echo '🔒 [MIGRATION 011] Checking split_payout_hostpay for duplicate (unique_id, tx_hash)...'
+
+DO $$
+DECLARE
+    duplicate_count INTEGER;
+BEGIN
+    SELECT COUNT(*) INTO duplicate_count
+    FROM (
+        SELECT unique_id, tx_hash
+        FROM split_payout_hostpay
+        WHERE tx_hash IS NOT NULL
+        GROUP BY unique_id, tx_hash
+        HAVING COUNT(*) > 1
+    ) duplicates;
+
+    IF duplicate_count > 0 THEN
+        RAISE EXCEPTION '❌ Found % duplicate (unique_id, tx_hash) rows. Clean up duplicates before running this migration.', duplicate_count;
+    END IF;
+
+    RAISE NOTICE '✅ No duplicate (unique_id, tx_hash) rows found. Safe to proceed.';
+END $$;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_split_payout_hostpay_unique_id_tx_hash
+    ON split_payout_hostpay(unique_id, tx_hash);
+
+\echo '🕳️ [MIGRATION 011] Adding dropped status and escalated_at to hostpay_pending_transactions...'
+
+ALTER TABLE hostpay_pending_transactions
+    DROP CONSTRAINT IF EXISTS hostpay_pending_transactions_status_check;
+
+ALTER TABLE hostpay_pending_transactions
+    ADD CONSTRAINT hostpay_pending_transactions_status_check
+    CHECK (status IN ('pending', 'confirmed', 'reverted', 'dropped'));
+
+ALTER TABLE hostpay_pending_transactions
+    ADD COLUMN IF NOT EXISTS escalated_at TIMESTAMP;
+
+COMMIT;
+
+\echo '🎉 [MIGRATION 011] Complete!'
+
+-- ============================================================================
+-- Migration Complete
+-- ============================================================================
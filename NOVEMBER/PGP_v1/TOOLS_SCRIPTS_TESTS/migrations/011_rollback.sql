@@ -0,0 +1,39 @@
+-- ============================================================================
+-- Rollback: 011 - HostPay Confirmation Idempotency and Dropped Transactions
+-- ============================================================================
+-- Purpose: Rollback migration 011 if needed
+--
+-- WARNING: PGP_HOSTPAY3_v1 needs this migration for insert_hostpay_transaction()
+-- (ON CONFLICT target) and the confirmation tracker. Roll back the service first.
+-- Rows with status 'dropped' are moved to 'reverted' so the old check holds.
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+\echo '🔄 [ROLLBACK 011] Reverting hostpay_pending_transactions changes...'
+
+UPDATE hostpay_pending_transactions SET status = 'reverted' WHERE status = 'dropped';
+
+ALTER TABLE hostpay_pending_transactions
+    DROP CONSTRAINT IF EXISTS hostpay_pending_transactions_status_check;
+
+ALTER TABLE hostpay_pending_transactions
+    ADD CONSTRAINT hostpay_pending_transactions_status_check
+    CHECK (status IN ('pending', 'confirmed', 'reverted'));
+
+ALTER TABLE hostpay_pending_transactions
+    DROP COLUMN IF EXISTS escalated_at;
+
+\echo '🔄 [ROLLBACK 011] Dropping split_payout_hostpay (unique_id, tx_hash) index...'
+
+DROP INDEX IF EXISTS idx_split_payout_hostpay_unique_id_tx_hash;
+
+COMMIT;
+
+\echo '🔄 [ROLLBACK 011] Complete'
+
+-- ============================================================================
+-- Rollback Complete
+-- ============================================================================
@@ -0,0 +1,39 @@
+-- ============================================================================
+-- Migration 012: One HostPay Pending Row per Payment
+-- ============================================================================
+-- Purpose:
+--   Key hostpay_pending_transactions by (tx_hash, unique_id) instead of
+--   tx_hash alone.
+--
+--   POST /batch can pay a whole ETH group in one Disperse transaction, and
+--   items whose broadcast or receipt wait failed after signing are now
+--   handed to the confirmation tracker instead of being resent. Every
+--   payment in a Disperse transaction needs its own pending row (and its own
+--   completion callback), so several rows share one tx_hash.
+--
+-- Usage:
+--   psql -h $DB_HOST -U postgres -d pgp-live-db -f 012_hostpay_pending_transactions_per_payment.sql
+--
+-- Rollback:
+--   See 012_rollback.sql
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+\echo '🔑 [MIGRATION 012] Re-keying hostpay_pending_transactions on (tx_hash, unique_id)...'
+
+ALTER TABLE hostpay_pending_transactions
+    DROP CONSTRAINT IF EXISTS hostpay_pending_transactions_pkey;
+
+ALTER TABLE hostpay_pending_transactions
+    ADD CONSTRAINT hostpay_pending_transactions_pkey PRIMARY KEY (tx_hash, unique_id);
+
+COMMIT;
+
+\echo '🎉 [MIGRATION 012] Complete!'
+
+-- ============================================================================
+-- Migration Complete
+-- ============================================================================
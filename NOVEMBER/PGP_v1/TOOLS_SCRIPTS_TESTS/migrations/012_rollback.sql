@@ -0,0 +1,46 @@
+-- ============================================================================
+-- Rollback: 012 - One HostPay Pending Row per Payment
+-- ============================================================================
+-- Purpose: Rollback migration 012 if needed
+--
+-- WARNING: PGP_HOSTPAY3_v1 needs this migration (ON CONFLICT target of
+-- insert_pending_transaction()). Roll back the service first, and run
+-- /confirm-pending until no Disperse transaction has more than one row.
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+\echo '🔄 [ROLLBACK 012] Checking for transactions with several pending rows...'
+
+DO $$
+DECLARE
+    shared_count INTEGER;
+BEGIN
+    SELECT COUNT(*) INTO shared_count
+    FROM (
+        SELECT tx_hash
+        FROM hostpay_pending_transactions
+        GROUP BY tx_hash
+        HAVING COUNT(*) > 1
+    ) shared;
+
+    IF shared_count > 0 THEN
+        RAISE EXCEPTION '❌ Found % tx_hash values with several rows. Resolve them before rolling back.', shared_count;
+    END IF;
+END $$;
+
+ALTER TABLE hostpay_pending_transactions
+    DROP CONSTRAINT IF EXISTS hostpay_pending_transactions_pkey;
+
+ALTER TABLE hostpay_pending_transactions
+    ADD CONSTRAINT hostpay_pending_transactions_pkey PRIMARY KEY (tx_hash);
+
+COMMIT;
+
+\echo '🔄 [ROLLBACK 012] Complete'
+
+-- ============================================================================
+-- Rollback Complete
+-- ============================================================================
@@ -0,0 +1,66 @@
+-- ============================================================================
+-- Migration 013: Failed Transactions Recovery Lease and Attempt Hashes
+-- ============================================================================
+-- Purpose:
+--   Support for the PGP_HOSTPAY3_v1 recovery worker (recovery_worker.py):
+--
+--   1. claimed_at: a claim ('recovering') is a lease. Rows left
+--      'recovering' by a worker that died are claimed again once the lease
+--      (RECOVERY_LEASE_SECONDS) has expired; before this they stayed
+--      'recovering' forever. The claim also fences recording an attempt, so
+--      a worker whose lease was taken over never broadcasts.
+--   2. attempt_tx_hashes: the signed hash of every recovery attempt,
+--      recorded before broadcast. Before resending, the worker checks all
+--      hashes of the payment on-chain (it used to parse only the last error
+--      message). Existing rows are backfilled with the hashes found in
+--      error_message and last_error_details.
+--
+-- Usage:
+--   psql -h $DB_HOST -U postgres -d pgp-live-db -f 013_failed_transactions_recovery_lease.sql
+--
+-- Rollback:
+--   See 013_rollback.sql
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+\echo '🔒 [MIGRATION 013] Adding claimed_at and attempt_tx_hashes to failed_transactions...'
+
+ALTER TABLE failed_transactions
+    ADD COLUMN IF NOT EXISTS claimed_at TIMESTAMP;
+
+ALTER TABLE failed_transactions
+    ADD COLUMN IF NOT EXISTS attempt_tx_hashes TEXT[] NOT NULL DEFAULT '{}';
+
+-- Rows already stuck in 'recovering' become reclaimable
+UPDATE failed_transactions
+SET claimed_at = COALESCE(last_retry_attempt, updated_at)
+WHERE status = 'recovering' AND claimed_at IS NULL;
+
+\echo '🔗 [MIGRATION 013] Backfilling attempt_tx_hashes from earlier errors...'
+
+UPDATE failed_transactions
+SET attempt_tx_hashes = ARRAY(
+    SELECT DISTINCT match[1]
+    FROM regexp_matches(
+        COALESCE(error_message, '') || ' ' || COALESCE(last_error_details::text, ''),
+        '(0x[0-9a-fA-F]{64})',
+        'g'
+    ) AS match
+)
+WHERE attempt_tx_hashes = '{}';
+
+-- Worker looks up expired leases
+CREATE INDEX IF NOT EXISTS idx_failed_transactions_recovering
+    ON failed_transactions(claimed_at)
+    WHERE status = 'recovering';
+
+COMMIT;
+
+\echo '🎉 [MIGRATION 013] Complete!'
+
+-- ============================================================================
+-- Migration Complete
+-- ============================================================================
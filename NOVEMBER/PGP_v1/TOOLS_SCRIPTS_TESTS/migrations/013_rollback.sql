@@ -0,0 +1,31 @@
+-- ============================================================================
+-- Rollback: 013 - Failed Transactions Recovery Lease and Attempt Hashes
+-- ============================================================================
+-- Purpose: Rollback migration 013 if needed
+--
+-- WARNING: PGP_HOSTPAY3_v1 needs this migration for POST /recover-failed.
+-- Roll back the service first. The recorded attempt hashes are lost: review
+-- any 'recovering' or 'failed_retryable' row with attempts before retrying.
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+\echo '🔄 [ROLLBACK 013] Dropping recovery lease and attempt hashes...'
+
+DROP INDEX IF EXISTS idx_failed_transactions_recovering;
+
+ALTER TABLE failed_transactions
+    DROP COLUMN IF EXISTS attempt_tx_hashes;
+
+ALTER TABLE failed_transactions
+    DROP COLUMN IF EXISTS claimed_at;
+
+COMMIT;
+
+\echo '🔄 [ROLLBACK 013] Complete'
+
+-- ============================================================================
+-- Rollback Complete
+-- ============================================================================
@@ -0,0 +1,32 @@
+-- ============================================================================
+-- Rollback: 014 - Signed Transactions and Same-Nonce Replacements
+-- ============================================================================
+-- Purpose: Rollback migration 014 if needed
+--
+-- WARNING: PGP_HOSTPAY3_v1 checks for wallet_signed_transactions at startup
+-- and waits for receipts in-request without it (no confirmation tracker).
+-- Replacement hashes of pending transactions are lost: check any pending
+-- row that was replaced before resending its payment.
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+\echo '🔄 [ROLLBACK 014] Dropping signed transactions and replacement tracking...'
+
+ALTER TABLE hostpay_pending_transactions
+    DROP COLUMN IF EXISTS replaced_at;
+
+ALTER TABLE hostpay_pending_transactions
+    DROP COLUMN IF EXISTS replacement_tx_hashes;
+
+DROP TABLE IF EXISTS wallet_signed_transactions;
+
+COMMIT;
+
+\echo '🔄 [ROLLBACK 014] Complete'
+
+-- ============================================================================
+-- Rollback Complete
+-- ============================================================================
@@ -0,0 +1,69 @@
+-- ============================================================================
+-- Migration 014: Signed Transactions and Same-Nonce Replacements
+-- ============================================================================
+-- Purpose:
+--   Drop detection by nonce for PGP_HOSTPAY3_v1 (confirmation_tracker.py,
+--   recovery_worker.py).
+--
+--   A stale transaction used to count as dropped as soon as one RPC node
+--   returned null for eth_getTransactionByHash. The payment was then stored
+--   as failed_retryable and resent, while the original could still be
+--   mined elsewhere. A transaction now only counts as dropped once the
+--   wallet's confirmed transaction count is past its nonce and none of its
+--   hashes has a receipt. While the nonce is still open it is rebroadcast at
+--   the same nonce with higher fees instead.
+--
+--   1. wallet_signed_transactions: nonce and fields of every signed
+--      transaction, recorded before broadcast (the node may not return a
+--      dropped transaction).
+--   2. hostpay_pending_transactions.replacement_tx_hashes / replaced_at:
+--      replacements of a pending transaction, so receipts are checked for
+--      every hash and fees are bumped at most once per stale interval.
+--
+-- Usage:
+--   psql -h $DB_HOST -U postgres -d pgp-live-db -f 014_signed_transactions_and_replacements.sql
+--
+-- Rollback:
+--   See 014_rollback.sql
+-- ============================================================================
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+\echo '🔐 [MIGRATION 014] Creating wallet_signed_transactions table...'
+
+CREATE TABLE IF NOT EXISTS wallet_signed_transactions (
+    tx_hash VARCHAR(66) PRIMARY KEY,
+
+    -- Lowercase hex address of the sending wallet
+    wallet_address VARCHAR(42) NOT NULL,
+    chain_id INTEGER NOT NULL DEFAULT 1,
+    nonce BIGINT NOT NULL,
+
+    -- Unsigned transaction fields (to, value, data, gas, fees)
+    transaction JSONB NOT NULL,
+    signed_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_wallet_signed_transactions_nonce
+    ON wallet_signed_transactions(wallet_address, chain_id, nonce);
+
+COMMENT ON TABLE wallet_signed_transactions IS
+'PGP_HOSTPAY3_v1: Nonce and fields of every signed transaction (drop checks and replacements)';
+
+\echo '⛽ [MIGRATION 014] Adding replacement tracking to hostpay_pending_transactions...'
+
+ALTER TABLE hostpay_pending_transactions
+    ADD COLUMN IF NOT EXISTS replacement_tx_hashes TEXT[] NOT NULL DEFAULT '{}';
+
+ALTER TABLE hostpay_pending_transactions
+    ADD COLUMN IF NOT EXISTS replaced_at TIMESTAMP;
+
+COMMIT;
+
+\echo '🎉 [MIGRATION 014] Complete!'
+
+-- ============================================================================
+-- Migration Complete
+-- ============================================================================
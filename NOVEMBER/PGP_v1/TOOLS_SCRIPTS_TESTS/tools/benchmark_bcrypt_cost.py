@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+bcrypt work-factor benchmark for PGP_WEBAPI_v1 password hashing.
+
+Run it on the target machine type (e.g. the Cloud Run instance size) to pick
+BCRYPT_ROUNDS against a latency budget. For each cost it records:
+
+    single     Latency of one hash on an idle machine (median / p95)
+    loaded     Latency per hash with --workers hashes in flight (median / p95)
+    throughput Hashes per second with --workers threads (= max logins/sec per instance)
+
+bcrypt releases the GIL, so the loaded numbers match what the WebAPI's
+password hashing pool (PASSWORD_HASH_WORKERS threads) achieves. The
+recommended cost is the highest one whose loaded p95 fits --budget-ms.
+
+Usage:
+    # Costs 10-14 with one worker per CPU, 250 ms budget
+    python TOOLS_SCRIPTS_TESTS/tools/benchmark_bcrypt_cost.py
+
+    # Specific costs, 2 workers (e.g. a 2 vCPU instance), JSON report
+    python TOOLS_SCRIPTS_TESTS/tools/benchmark_bcrypt_cost.py --rounds 11 12 13 --workers 2 --output bcrypt.json
+"""
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import platform
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+PASSWORD = b'benchmark-Password-123!'
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100.0 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def time_hash(salt):
+    start = time.perf_counter()
+    bcrypt.hashpw(PASSWORD, salt)
+    return (time.perf_counter() - start) * 1000
+
+
+def benchmark_rounds(rounds, samples, workers):
+    """
+    Measure one work factor.
+
+    Returns:
+        Dict with single/loaded latency (ms) and throughput (hashes/sec)
+    """
+    salt = bcrypt.gensalt(rounds=rounds)
+
+    single = [time_hash(salt) for _ in range(samples)]
+
+    loaded_samples = samples * workers
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        start = time.perf_counter()
+        loaded = list(executor.map(lambda _: time_hash(salt), range(loaded_samples)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        'rounds': rounds,
+        'single_median_ms': round(statistics.median(single), 1),
+        'single_p95_ms': round(percentile(single, 95), 1),
+        'loaded_median_ms': round(statistics.median(loaded), 1),
+        'loaded_p95_ms': round(percentile(loaded, 95), 1),
+        'throughput_per_sec': round(loaded_samples / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="bcrypt work-factor benchmark for BCRYPT_ROUNDS")
+    parser.add_argument('--rounds', type=int, nargs='+', default=[10, 11, 12, 13, 14],
+                        help="Work factors to measure (default: 10-14)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2,
+                        help="Concurrent hashes, i.e. PASSWORD_HASH_WORKERS (default: CPU count)")
+    parser.add_argument('--samples', type=int, default=10, help="Hashes per measurement (default: 10)")
+    parser.add_argument('--budget-ms', type=float, default=250.0,
+                        help="Latency budget for one hash under load (default: 250)")
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    print(f"🔑 bcrypt {bcrypt.__version__} | Python {platform.python_version()} | "
+          f"{os.cpu_count()} CPUs | {args.workers} workers | budget {args.budget_ms:.0f} ms")
+    print(f"{'cost':>4}  {'single p50':>10}  {'single p95':>10}  {'loaded p50':>10}  {'loaded p95':>10}  {'hashes/s':>8}")
+
+    results = []
+    for rounds in sorted(args.rounds):
+        result = benchmark_rounds(rounds, args.samples, args.workers)
+        results.append(result)
+        marker = '✅' if result['loaded_p95_ms'] <= args.budget_ms else '❌'
+        print(f"{rounds:>4}  {result['single_median_ms']:>10}  {result['single_p95_ms']:>10}  "
+              f"{result['loaded_median_ms']:>10}  {result['loaded_p95_ms']:>10}  "
+              f"{result['throughput_per_sec']:>8}  {marker}")
+
+    within_budget = [r['rounds'] for r in results if r['loaded_p95_ms'] <= args.budget_ms]
+    recommended = max(within_budget) if within_budget else None
+
+    if recommended is None:
+        print(f"⚠️ No measured cost fits {args.budget_ms:.0f} ms - raise the budget or add workers")
+    else:
+        print(f"💡 Recommended BCRYPT_ROUNDS={recommended}")
+
+    if args.output:
+        report = {
+            'bcrypt_version': bcrypt.__version__,
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'workers': args.workers,
+            'budget_ms': args.budget_ms,
+            'recommended_rounds': recommended,
+            'results': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to {args.output}")
+
+    return 0 if recommended is not None else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,572 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for PGP_v1 service entry points.
+
+Every run starts a fresh Python interpreter per service (a cold start), imports
+the service entry module with GCP clients stubbed, and records:
+
+    import               Entry module import (includes module-level initialization)
+    config_manager_init  Time spent in ConfigManager construction / initialize_config()
+    db_manager_init      Time spent in DatabaseManager construction
+    app_init             Application factory / initializer (services that have one)
+    first_request        First GET of the service health endpoint (Flask test client)
+
+config_manager_init and db_manager_init are measured inside import/app_init,
+so they are not added to the total. Peak RSS is sampled after each phase, and a
+second interpreter run with `-X importtime` gives a per-module import breakdown.
+
+Stubbed (no network, no credentials needed):
+- google.cloud.secretmanager SecretManagerServiceClient
+- google.cloud.tasks_v2 CloudTasksClient
+- google.cloud.sql.connector Connector (connect() raises ConnectionError)
+- Outbound HTTP through requests and httpx (raises a connection error)
+
+Static secrets are seeded with placeholder environment variables (existing
+environment values win), so config and database managers follow their normal
+initialization path.
+
+Usage:
+    # All services, JSON report
+    python TOOLS_SCRIPTS_TESTS/tools/benchmark_cold_start.py --output cold_start.json
+
+    # Some services, 5 runs each (median reported)
+    python TOOLS_SCRIPTS_TESTS/tools/benchmark_cold_start.py pgp_split3_v1 pgp_np_ipn_v1 --repeat 5
+
+    # Compare with a report from another commit (exit code 1 on regression)
+    python TOOLS_SCRIPTS_TESTS/tools/benchmark_cold_start.py --output new.json --compare old.json --threshold 20
+"""
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+import threading
+import importlib.abc
+import importlib.util
+from datetime import datetime, timezone
+
+PGP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RESULT_MARKER = "@@COLD_START_RESULT@@"
+
+# Entry module -> how to boot it
+SERVICES = {
+    'pgp_orchestrator_v1': {'dir': 'PGP_ORCHESTRATOR_v1'},
+    'pgp_split1_v1': {'dir': 'PGP_SPLIT1_v1'},
+    'pgp_split2_v1': {'dir': 'PGP_SPLIT2_v1'},
+    'pgp_split3_v1': {'dir': 'PGP_SPLIT3_v1'},
+    'pgp_hostpay1_v1': {'dir': 'PGP_HOSTPAY1_v1'},
+    'pgp_hostpay2_v1': {'dir': 'PGP_HOSTPAY2_v1'},
+    'pgp_hostpay3_v1': {'dir': 'PGP_HOSTPAY3_v1'},
+    'pgp_np_ipn_v1': {'dir': 'PGP_NP_IPN_v1'},
+    'pgp_batchprocessor_v1': {'dir': 'PGP_BATCHPROCESSOR_v1'},
+    'pgp_microbatchprocessor_v1': {'dir': 'PGP_MICROBATCHPROCESSOR_v1'},
+    'pgp_invite_v1': {'dir': 'PGP_INVITE_v1'},
+    'pgp_broadcast_v1': {'dir': 'PGP_BROADCAST_v1'},
+    'pgp_notifications_v1': {'dir': 'PGP_NOTIFICATIONS_v1', 'app_factory': 'create_app'},
+    'pgp_webapi_v1': {'dir': 'PGP_WEBAPI_v1', 'health': '/api/health'},
+    'pgp_server_v1': {'dir': 'PGP_SERVER_v1', 'initializer': 'app_initializer:AppInitializer'},
+}
+
+# Placeholder values for static secrets (os.environ.setdefault)
+BENCHMARK_ENV = {
+    'CLOUD_TASKS_PROJECT_ID': 'benchmark-project',
+    'CLOUD_TASKS_LOCATION': 'us-central1',
+    'CLOUD_SQL_CONNECTION_NAME': 'benchmark-project:us-central1:benchmark-db',
+    'DATABASE_NAME_SECRET': 'benchmark_db',
+    'DATABASE_USER_SECRET': 'benchmark_user',
+    'DATABASE_PASSWORD_SECRET': 'benchmark_password',
+    'SUCCESS_URL_SIGNING_KEY': 'benchmark-signing-key',
+    'TPS_HOSTPAY_SIGNING_KEY': 'benchmark-signing-key',
+    'JWT_SECRET_KEY': 'benchmark-jwt-secret',
+    'SIGNUP_SECRET_KEY': 'benchmark-signup-secret',
+    'TELEGRAM_BOT_SECRET_NAME': 'benchmark-bot-token',
+    'TELEGRAM_BOT_USERNAME': 'benchmark_bot',
+    'HOST_WALLET_PRIVATE_KEY': '0x' + '11' * 32,
+    'HOST_WALLET_ETH_ADDRESS': '0x' + '22' * 20,
+    'ETHEREUM_RPC_URL': 'http://127.0.0.1:9',
+    'REDIS_HOST': '127.0.0.1',
+    'REDIS_PORT': '9',
+    'LOG_LEVEL': 'WARNING',
+}
+
+# Classes whose construction counts towards config_manager_init / db_manager_init
+TIMED_CLASSES = {
+    'config_manager': ('config_manager_init', 'ConfigManager', ('__init__', 'initialize_config', 'get_config')),
+    'PGP_COMMON.config.base_config': ('config_manager_init', 'BaseConfigManager', ('__init__',)),
+    'database_manager': ('db_manager_init', 'DatabaseManager', ('__init__',)),
+    'database': ('db_manager_init', 'DatabaseManager', ('__init__',)),
+    'database.connection': ('db_manager_init', 'DatabaseManager', ('__init__',)),
+    'PGP_COMMON.database.db_manager': ('db_manager_init', 'BaseDatabaseManager', ('__init__',)),
+}
+
+
+# ========== WORKER (runs inside the cold interpreter) ==========
+
+class _Recorder:
+    """Accumulates time spent in wrapped methods per phase (nested calls counted once)."""
+
+    def __init__(self):
+        self.totals = {}
+        self._depth = threading.local()
+
+    def wrap(self, phase, func):
+        recorder = self
+
+        def timed(*args, **kwargs):
+            depth = getattr(recorder._depth, phase, 0)
+            setattr(recorder._depth, phase, depth + 1)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                setattr(recorder._depth, phase, depth)
+                if depth == 0:
+                    elapsed = time.perf_counter() - start
+                    recorder.totals[phase] = recorder.totals.get(phase, 0.0) + elapsed
+
+        timed.__wrapped__ = func
+        timed.__name__ = getattr(func, '__name__', 'timed')
+        return timed
+
+
+RECORDER = _Recorder()
+
+
+class _StubSecretPayload:
+    def __init__(self, data):
+        self.data = data
+
+
+class _StubSecretResponse:
+    def __init__(self, name):
+        upper = (name or '').upper()
+        if any(k in upper for k in ('THRESHOLD', 'TTL', 'PERCENT', 'INTERVAL', 'FEE', 'TOLERANCE', 'LIMIT')):
+            value = '1'
+        elif 'URL' in upper:
+            value = 'https://benchmark.invalid'
+        else:
+            value = 'benchmark-secret'
+        self.payload = _StubSecretPayload(value.encode())
+
+
+class StubSecretManagerServiceClient:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def access_secret_version(self, request=None, name=None, **kwargs):
+        if isinstance(request, dict):
+            name = request.get('name', name)
+        return _StubSecretResponse(name)
+
+
+class _StubTask:
+    def __init__(self, name):
+        self.name = name
+
+
+class StubCloudTasksClient:
+    def __init__(self, *args, **kwargs):
+        self._count = 0
+
+    def queue_path(self, project, location, queue):
+        return f"projects/{project}/locations/{location}/queues/{queue}"
+
+    def create_task(self, request=None, **kwargs):
+        self._count += 1
+        return _StubTask(f"{(request or {}).get('parent', 'queue')}/tasks/benchmark-{self._count}")
+
+
+class StubConnector:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def connect(self, *args, **kwargs):
+        raise ConnectionError("Cloud SQL connector stubbed by cold-start benchmark")
+
+    def close(self):
+        pass
+
+
+def _patch_requests_adapters(module):
+    def send(self, request, *args, **kwargs):
+        raise module.ConnectionError(f"Network disabled by cold-start benchmark: {request.url}")
+    module.HTTPAdapter.send = send
+
+
+def _patch_httpx(module):
+    def handle_request(self, request):
+        raise module.ConnectError("Network disabled by cold-start benchmark", request=request)
+
+    async def handle_async_request(self, request):
+        raise module.ConnectError("Network disabled by cold-start benchmark", request=request)
+
+    module.HTTPTransport.handle_request = handle_request
+    module.AsyncHTTPTransport.handle_async_request = handle_async_request
+
+
+def _patch_timed_classes(module_name, module):
+    phase, class_name, methods = TIMED_CLASSES[module_name]
+    cls = getattr(module, class_name, None)
+    if not isinstance(cls, type):
+        return
+    for method_name in methods:
+        func = cls.__dict__.get(method_name)
+        if callable(func):
+            setattr(cls, method_name, RECORDER.wrap(phase, func))
+
+
+# Module name -> patch applied right after the real module finished executing
+POST_IMPORT_PATCHES = {
+    'google.cloud.secretmanager': lambda m: setattr(m, 'SecretManagerServiceClient', StubSecretManagerServiceClient),
+    'google.cloud.secretmanager_v1': lambda m: setattr(m, 'SecretManagerServiceClient', StubSecretManagerServiceClient),
+    'google.cloud.tasks_v2': lambda m: setattr(m, 'CloudTasksClient', StubCloudTasksClient),
+    'google.cloud.sql.connector': lambda m: setattr(m, 'Connector', StubConnector),
+    'requests.adapters': _patch_requests_adapters,
+    'httpx': _patch_httpx,
+}
+for _name in TIMED_CLASSES:
+    POST_IMPORT_PATCHES[_name] = (lambda n: lambda m: _patch_timed_classes(n, m))(_name)
+
+
+class _PatchingLoader(importlib.abc.Loader):
+    def __init__(self, loader, patch):
+        self._loader = loader
+        self._patch = patch
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._loader.exec_module(module)
+        self._patch(module)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _PatchingFinder(importlib.abc.MetaPathFinder):
+    """Imports modules normally, then applies POST_IMPORT_PATCHES (real import cost is kept)."""
+
+    def find_spec(self, fullname, path, target=None):
+        patch = POST_IMPORT_PATCHES.get(fullname)
+        if patch is None:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, 'find_spec'):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+                    spec.loader = _PatchingLoader(spec.loader, patch)
+                return spec
+        return None
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def _resolve(spec_string, module):
+    """Resolve 'module:attr' (or 'attr' on the entry module)."""
+    if ':' in spec_string:
+        module_name, attr = spec_string.split(':', 1)
+        return getattr(importlib.import_module(module_name), attr)
+    return getattr(module, spec_string)
+
+
+def run_worker(service_name, phases):
+    """Boot one service in this (cold) interpreter and print the measurements."""
+    spec = SERVICES[service_name]
+    for key, value in BENCHMARK_ENV.items():
+        os.environ.setdefault(key, value)
+
+    sys.meta_path.insert(0, _PatchingFinder())
+
+    result = {'service': service_name, 'phases_ms': {}, 'peak_rss_mb': {}, 'errors': []}
+    result['peak_rss_mb']['start'] = _peak_rss_mb()
+
+    def timed(phase, func):
+        start = time.perf_counter()
+        try:
+            return func()
+        except BaseException as e:  # SystemExit from a failed service init is a result too
+            result['errors'].append(f"{phase}: {type(e).__name__}: {e}")
+            return None
+        finally:
+            result['phases_ms'][phase] = round((time.perf_counter() - start) * 1000, 2)
+            result['peak_rss_mb'][phase] = _peak_rss_mb()
+
+    module = timed('import', lambda: importlib.import_module(service_name))
+
+    app = None
+    if module is not None and phases != 'import':
+        app = getattr(module, 'app', None)
+        if spec.get('app_factory'):
+            app = timed('app_init', lambda: _resolve(spec['app_factory'], module)())
+        elif spec.get('initializer'):
+            def init_server():
+                initializer = _resolve(spec['initializer'], module)()
+                initializer.initialize()
+                return (initializer.get_managers() or {}).get('flask_app')
+            app = timed('app_init', init_server)
+
+        if app is not None and hasattr(app, 'test_client'):
+            def first_request():
+                response = app.test_client().get(spec.get('health', '/health'))
+                result['first_request_status'] = response.status_code
+            timed('first_request', first_request)
+        else:
+            result['errors'].append("first_request: no Flask app found")
+
+    for phase, seconds in RECORDER.totals.items():
+        result['phases_ms'][phase] = round(seconds * 1000, 2)
+
+    print(RESULT_MARKER + json.dumps(result), flush=True)
+
+
+# ========== CONTROLLER ==========
+
+def _service_env(service_name):
+    env = dict(os.environ)
+    service_dir = os.path.join(PGP_ROOT, SERVICES[service_name]['dir'])
+    env['PYTHONPATH'] = os.pathsep.join(
+        p for p in (service_dir, PGP_ROOT, env.get('PYTHONPATH')) if p
+    )
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    return env, service_dir
+
+
+def _run_subprocess(service_name, extra_args, phases, timeout):
+    env, service_dir = _service_env(service_name)
+    cmd = [sys.executable, *extra_args, os.path.abspath(__file__), '--worker', service_name, '--phases', phases]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=service_dir, env=env, capture_output=True, text=True, timeout=timeout)
+    wall_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    result = None
+    for line in proc.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            result = json.loads(line[len(RESULT_MARKER):])
+    if result is None:
+        tail = (proc.stderr or proc.stdout).strip().splitlines()[-5:]
+        result = {'service': service_name, 'phases_ms': {}, 'peak_rss_mb': {},
+                  'errors': [f"worker exited with code {proc.returncode}: {' | '.join(tail)}"]}
+    result['process_wall_ms'] = wall_ms
+    return result, proc.stderr
+
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def parse_importtime(stderr, top=25):
+    """
+    Parse `-X importtime` output.
+
+    Returns:
+        {'total_ms', 'top_modules': [{'module', 'cumulative_ms', 'self_ms'}], 'by_package': {pkg: self_ms}}
+    """
+    modules = []
+    by_package = {}
+    total_us = 0
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = int(match.group(1)), int(match.group(2)), match.group(3), match.group(4)
+        modules.append((name, cumulative_us, self_us))
+        package = name.split('.')[0]
+        if package == 'google' and name.count('.') >= 2:
+            package = '.'.join(name.split('.')[:3])  # google.cloud.<product>
+        by_package[package] = by_package.get(package, 0) + self_us
+        if len(indent) <= 1:  # top-level import
+            total_us += cumulative_us
+
+    modules.sort(key=lambda m: m[1], reverse=True)
+    return {
+        'total_ms': round(total_us / 1000, 2),
+        'top_modules': [
+            {'module': n, 'cumulative_ms': round(c / 1000, 2), 'self_ms': round(s / 1000, 2)}
+            for n, c, s in modules[:top]
+        ],
+        'by_package': {
+            k: round(v / 1000, 2)
+            for k, v in sorted(by_package.items(), key=lambda kv: kv[1], reverse=True)[:top]
+        },
+    }
+
+
+def _summarize(runs):
+    """Median/min/max per phase over repeated runs."""
+    phases = {}
+    for run in runs:
+        for phase, ms in run['phases_ms'].items():
+            phases.setdefault(phase, []).append(ms)
+    summary = {
+        phase: {'median_ms': round(statistics.median(v), 2), 'min_ms': min(v), 'max_ms': max(v)}
+        for phase, v in phases.items()
+    }
+    peak = {}
+    for run in runs:
+        for phase, mb in run['peak_rss_mb'].items():
+            if mb is not None:
+                peak[phase] = max(peak.get(phase, 0), mb)
+    return summary, peak
+
+
+def benchmark_service(service_name, repeat, importtime, timeout):
+    """Run the cold-start measurements for one service."""
+    print(f"⏱️  [BENCHMARK] {service_name} ({repeat} run(s))", flush=True)
+    runs = []
+    for _ in range(repeat):
+        try:
+            run, _ = _run_subprocess(service_name, [], 'all', timeout)
+        except subprocess.TimeoutExpired:
+            run = {'service': service_name, 'phases_ms': {}, 'peak_rss_mb': {},
+                   'errors': [f"timed out after {timeout}s"]}
+        runs.append(run)
+
+    phases, peak_rss = _summarize(runs)
+    counted = ('import', 'app_init', 'first_request')
+    total = round(sum(phases[p]['median_ms'] for p in counted if p in phases), 2)
+    errors = sorted({e for run in runs for e in run['errors']})
+
+    report = {
+        'status': 'error' if any(e.startswith(('import:', 'app_init:', 'worker', 'timed out')) for e in errors) else 'ok',
+        'total_ms': total,
+        'phases': phases,
+        'peak_rss_mb': peak_rss,
+        'process_wall_ms': round(statistics.median(r.get('process_wall_ms', 0) for r in runs), 2),
+        'first_request_status': runs[-1].get('first_request_status'),
+        'errors': errors,
+    }
+
+    if importtime:
+        try:
+            _, stderr = _run_subprocess(service_name, ['-X', 'importtime'], 'import', timeout)
+            report['importtime'] = parse_importtime(stderr)
+        except subprocess.TimeoutExpired:
+            report['errors'].append(f"importtime run timed out after {timeout}s")
+
+    icon = '✅' if report['status'] == 'ok' else '❌'
+    print(
+        f"{icon} [BENCHMARK] {service_name}: total {total} ms "
+        f"(import {phases.get('import', {}).get('median_ms')} ms, "
+        f"peak RSS {max(peak_rss.values()) if peak_rss else None} MB)",
+        flush=True
+    )
+    return report
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=PGP_ROOT, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except Exception:
+        return None
+
+
+def compare_reports(baseline, current, threshold_pct, min_delta_ms):
+    """
+    Print per-service phase deltas against a baseline report.
+
+    A phase regresses when it is slower by more than threshold_pct percent AND
+    by more than min_delta_ms (keeps sub-millisecond noise out).
+
+    Returns:
+        List of "service.phase" entries that regressed
+    """
+    regressions = []
+    print(f"\n📊 [BENCHMARK] Comparison with baseline {baseline.get('git_commit') or '(unknown commit)'}")
+    for service, data in current['services'].items():
+        base = baseline.get('services', {}).get(service)
+        if not base:
+            print(f"   {service}: no baseline")
+            continue
+        for phase, stats in data['phases'].items():
+            base_stats = base.get('phases', {}).get(phase)
+            if not base_stats or not base_stats['median_ms']:
+                continue
+            delta = stats['median_ms'] - base_stats['median_ms']
+            pct = delta / base_stats['median_ms'] * 100
+            flag = ''
+            if pct > threshold_pct and delta > min_delta_ms:
+                flag = '  ⚠️ REGRESSION'
+                regressions.append(f"{service}.{phase}")
+            print(
+                f"   {service}.{phase}: {base_stats['median_ms']} → {stats['median_ms']} ms "
+                f"({pct:+.1f}%){flag}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark for PGP_v1 service entry points")
+    parser.add_argument('services', nargs='*', help="Entry modules to benchmark (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="Cold runs per service (default: 3)")
+    parser.add_argument('--output', help="Write the JSON report to this file")
+    parser.add_argument('--compare', help="Baseline JSON report to compare against")
+    parser.add_argument('--threshold', type=float, default=20.0,
+                        help="Regression threshold in percent for --compare (default: 20)")
+    parser.add_argument('--min-delta-ms', type=float, default=5.0,
+                        help="Ignore regressions smaller than this many ms (default: 5)")
+    parser.add_argument('--no-importtime', action='store_true', help="Skip the -X importtime breakdown")
+    parser.add_argument('--timeout', type=int, default=180, help="Per-run timeout in seconds (default: 180)")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--phases', default='all', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.phases)
+        return 0
+
+    services = args.services or list(SERVICES)
+    unknown = [s for s in services if s not in SERVICES]
+    if unknown:
+        parser.error(f"unknown service(s): {', '.join(unknown)} (known: {', '.join(SERVICES)})")
+
+    report = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'services': {},
+    }
+    for service in services:
+        report['services'][service] = benchmark_service(
+            service, max(1, args.repeat), not args.no_importtime, args.timeout
+        )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 [BENCHMARK] Report written to {args.output}")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_reports(baseline, report, args.threshold, args.min_delta_ms)
+        if regressions:
+            print(f"❌ [BENCHMARK] {len(regressions)} regression(s) over {args.threshold}%: {', '.join(regressions)}")
+            return 1
+        print("✅ [BENCHMARK] No regressions")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())